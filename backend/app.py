@@ -7,6 +7,7 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import sys
 import os
+from datetime import datetime
 
 # Add backend to path
 sys.path.insert(0, os.path.dirname(__file__))
@@ -15,7 +16,12 @@ from config import Config
 from models import Crop, Soil, Region, GameState
 from services.nasa_power_api import NASAPowerAPI
 from services.geocoding_service import GeocodingService
+from services.rate_limiter import RateLimitDeferred
+from services.climate_delta import ClimateDelta
 from services.data_provider import DataProvider
+from services.sowing_optimizer import SowingOptimizer
+from services.weather_store import WeatherStore
+from services.warmup import CacheWarmer
 
 app = Flask(__name__)
 app.config.from_object(Config)
@@ -24,7 +30,27 @@ CORS(app)
 # Initialize services
 nasa_api = NASAPowerAPI()
 geocoding_service = GeocodingService()
-data_provider = DataProvider()
+data_provider = DataProvider(geocoding=geocoding_service)
+sowing_optimizer = SowingOptimizer(WeatherStore(Config.WEATHER_STORE_DIR), nasa_api)
+
+# Scenario regions are searchable locally (popular regions are indexed by the service)
+geocoding_service.gazetteer.add_scenarios(data_provider.historical_loader.get_available_scenarios())
+
+# Warm caches (synchronously when WARMUP_BLOCKING, e.g. gunicorn --preload)
+cache_warmer = CacheWarmer(
+    data_provider,
+    Config.POPULAR_REGIONS,
+    max_workers=Config.WARMUP_MAX_WORKERS,
+    timeout=Config.WARMUP_TIMEOUT,
+    prefetch_live=Config.WARMUP_PREFETCH_LIVE,
+    sync_raster=Config.NEAREST_RASTER_SYNC
+)
+if not Config.WARMUP_ENABLED:
+    cache_warmer.mark_ready()
+elif Config.WARMUP_BLOCKING:
+    cache_warmer.run()
+else:
+    cache_warmer.start()
 
 # Store active game states (in production, use database)
 game_sessions = {}
@@ -36,10 +62,21 @@ def health_check():
     return jsonify({'status': 'ok', 'message': 'TerraGrow API is running'})
 
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness endpoint: 503 until the startup warm-up has finished"""
+    status = cache_warmer.to_dict()
+
+    if not cache_warmer.is_ready():
+        return jsonify(status), 503
+
+    return jsonify(status)
+
+
 @app.route('/api/search-location', methods=['GET'])
 def search_location():
     """
-    Search for a location using Nominatim
+    Search for a location (local gazetteer, Nominatim as fallback)
 
     Query params:
         q (str): Search query
@@ -52,6 +89,14 @@ def search_location():
     try:
         results = geocoding_service.search_location(query)
         return jsonify({'results': results})
+    except RateLimitDeferred as e:
+        # Fast answer with the best local matches instead of queueing on Nominatim
+        retry_after = round(e.retry_after, 1)
+        return jsonify({
+            'results': geocoding_service.gazetteer.search(query),
+            'deferred': True,
+            'retry_after': retry_after
+        }), 200, {'Retry-After': str(max(1, round(retry_after)))}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -95,6 +140,86 @@ def get_scenarios():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/sowing-dates', methods=['GET'])
+def get_sowing_dates():
+    """
+    Best sowing windows over a multi-year daily weather record
+
+    Seasons are scored with the weekly water balance; the daily timestep
+    (/api/init 'timestep') only applies to played games.
+
+    Query params:
+        lat (float): Latitude
+        lon (float): Longitude
+        crop_type (str): Type of crop
+        soil_type (str): Soil type (optional, default 'loam')
+        plan (str): Reference management, 'rainfed' or 'irrigated' (optional)
+        top (int): Number of windows (optional, default 3)
+    """
+    lat = request.args.get('lat', type=float)
+    lon = request.args.get('lon', type=float)
+    crop_type = request.args.get('crop_type')
+    soil_type = request.args.get('soil_type', 'loam')
+    plan = request.args.get('plan', 'rainfed')
+    top = request.args.get('top', 3, type=int)
+
+    if lat is None or lon is None:
+        return jsonify({'error': 'lat and lon are required'}), 400
+
+    if crop_type not in Config.CROPS:
+        return jsonify({'error': f'Invalid crop type: {crop_type}'}), 400
+
+    if soil_type not in Config.SOIL_TYPES:
+        return jsonify({'error': f'Invalid soil type: {soil_type}'}), 400
+
+    if plan not in Config.SOWING_PLANS:
+        return jsonify({'error': f'plan must be one of {sorted(Config.SOWING_PLANS)}'}), 400
+
+    try:
+        result = sowing_optimizer.scan(lat, lon, crop_type, soil_type, plan, top=max(1, min(top, 12)))
+        if result is None:
+            return jsonify({'error': 'No daily weather record available for this location'}), 404
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/climatology', methods=['GET'])
+def get_climatology():
+    """
+    Multi-year climatology of a location: climate summary and a typical year
+
+    Query params:
+        lat (float): Latitude
+        lon (float): Longitude
+        start (str): First day of the typical season, MM-DD (optional, default today)
+        weeks (int): Weeks of typical weather (optional, default 12)
+    """
+    lat = request.args.get('lat', type=float)
+    lon = request.args.get('lon', type=float)
+    start = request.args.get('start')
+    weeks = request.args.get('weeks', 12, type=int)
+
+    if lat is None or lon is None:
+        return jsonify({'error': 'lat and lon are required'}), 400
+
+    try:
+        start_day = (datetime.strptime(f"2001-{start}", '%Y-%m-%d') if start else datetime.now()).timetuple().tm_yday
+    except ValueError:
+        return jsonify({'error': 'start must be MM-DD'}), 400
+
+    climatology = data_provider.climatology
+    summary = climatology.summary(lat, lon)
+    if summary is None:
+        return jsonify({'error': 'No climatology available for this location'}), 404
+
+    return jsonify({
+        'climate': climatology.climate_label(summary),
+        'summary': summary,
+        'typical_weeks': climatology.typical_weeks(lat, lon, start_day, max(1, min(weeks, 52)))
+    })
+
+
 @app.route('/api/init', methods=['POST'])
 def initialize_game():
     """
@@ -106,6 +231,9 @@ def initialize_game():
         crop_type (str): Type of crop (optional, auto-selected)
         season_id (str): Season ID (optional, 'spring_2024' or 'summer_2024')
         region_id (str): Region ID (optional, e.g. 'yaounde_cameroun')
+        variant (int): Weather ensemble member of the scenario (optional, 0 = observed season)
+        delta (dict): Climate-change delta, e.g. {'temperature': 2, 'precipitation': -15} (optional)
+        timestep (str): 'weekly' or 'daily' water balance (optional, default Config.SIMULATION_TIMESTEP)
     """
     data = request.get_json()
 
@@ -114,16 +242,31 @@ def initialize_game():
     crop_type = data.get('crop_type')
     season_id = data.get('season_id')
     region_id = data.get('region_id')
+    variant = data.get('variant', 0)
+    timestep = data.get('timestep', Config.SIMULATION_TIMESTEP)
 
     if lat is None or lon is None:
         return jsonify({'error': 'lat and lon are required'}), 400
 
+    if timestep not in Config.SIMULATION_TIMESTEPS:
+        return jsonify({'error': f'timestep must be one of {", ".join(Config.SIMULATION_TIMESTEPS)}'}), 400
+
+    if isinstance(variant, bool) or not isinstance(variant, int) or not 0 <= variant < Config.ENSEMBLE_SIZE:
+        return jsonify({'error': f'variant must be an integer between 0 and {Config.ENSEMBLE_SIZE - 1}'}), 400
+
+    try:
+        delta = ClimateDelta.from_dict(data.get('delta'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     try:
         # Get region data (with optional historical scenario)
         region_data = data_provider.get_game_data(
             lat, lon,
             season_id=season_id,
-            region_id=region_id
+            region_id=region_id,
+            variant=variant,
+            delta=delta
         )
 
         # Create region object
@@ -132,7 +275,8 @@ def initialize_game():
             lat=lat,
             lon=lon,
             climate=region_data['climate'],
-            soil_type=region_data.get('soil_type', 'loam')
+            soil_type=region_data.get('soil_type', 'loam'),
+            data={'climatology': region_data.get('climatology'), 'koppen': region_data.get('koppen')}
         )
 
         # Auto-select crop if not provided
@@ -149,29 +293,54 @@ def initialize_game():
             region=region,
             crop_type=crop_type,
             crop_params=Config.CROPS[crop_type],
-            soil_params=Config.SOIL_TYPES[region_data.get('soil_type', 'loam')],
-            initial_budget=Config.INITIAL_BUDGET
+            soil_params=dict(Config.SOIL_TYPES[region_data.get('soil_type', 'loam')],
+                             **(region_data.get('soil_properties') or {})),
+            initial_budget=Config.INITIAL_BUDGET,
+            soil_observations=region_data.get('soil_observations'),
+            nudge_weight=Config.SMAP_NUDGE_WEIGHT,
+            timestep=timestep
         )
 
-        # Store weather data
+        # Store weather data (daily values split the weeks in the daily timestep)
         game_state.weather_data = region_data.get('weather_data', [])
+        game_state.daily_weather = region_data.get('daily_weather')
 
         # Generate session ID
         session_id = f"{lat}_{lon}_{crop_type}"
         game_sessions[session_id] = game_state
 
+        # Backfill the region name once reverse geocoding completes
+        name_future = region_data.get('name_future')
+        if name_future is not None:
+            name_future.add_done_callback(
+                lambda future: _backfill_region_name(game_state, future)
+            )
+
         # Return initial state
         return jsonify({
             'session_id': session_id,
             'state': game_state.to_dict(),
             'recommended_crops': region.get_recommended_crops(),
-            'weather_preview': game_state.weather_data[:4] if game_state.weather_data else []
+            'weather_preview': game_state.weather_data[:4] if game_state.weather_data else [],
+            'name_pending': name_future is not None and not name_future.done()
         })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def _backfill_region_name(game_state, future):
+    """Replace the placeholder region name with the reverse geocoded one"""
+    try:
+        location_info = future.result()
+    except Exception as e:
+        print(f"Reverse geocoding error: {e}")
+        return
+
+    if location_info.get('name'):
+        game_state.region.name = location_info['name']
+
+
 @app.route('/api/action', methods=['POST'])
 def perform_action():
     """
@@ -11,13 +11,34 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'terragrow-dev-secret-key-2025'
     DEBUG = True
 
-    # API endpoints
-    NASA_POWER_API_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
-    NOMINATIM_API_URL = "https://nominatim.openstreetmap.org/search"
+    # API endpoints (overridable, e.g. to use the offline stand-in servers)
+    NASA_POWER_API_URL = os.environ.get('NASA_POWER_API_URL') or "https://power.larc.nasa.gov/api/temporal/daily/point"
+    NASA_POWER_REGIONAL_API_URL = os.environ.get('NASA_POWER_REGIONAL_API_URL') or "https://power.larc.nasa.gov/api/temporal/daily/regional"
+    NOMINATIM_BASE_URL = os.environ.get('NOMINATIM_BASE_URL') or "https://nominatim.openstreetmap.org"
+    NOMINATIM_API_URL = f"{NOMINATIM_BASE_URL}/search"
+    APPEEARS_API_URL = os.environ.get('APPEEARS_API_URL') or "https://appeears.earthdatacloud.nasa.gov/api"
 
     # Cache settings
     CACHE_TTL = 3600  # 1 hour in seconds
 
+    # Custom location fetches (reverse geocoding + weather run concurrently)
+    API_FETCH_WORKERS = int(os.environ.get('API_FETCH_WORKERS', 8))
+    CUSTOM_LOCATION_DEADLINE = float(os.environ.get('CUSTOM_LOCATION_DEADLINE', 35))  # seconds
+    SCENARIO_MATCH_KM = 50  # a scenario closer than this is played as is
+
+    # Custom locations from nearby scenarios (inverse-distance weighting, no network)
+    INTERPOLATION_ENABLED = os.environ.get('INTERPOLATION_ENABLED', 'false').lower() == 'true'
+    INTERPOLATION_NEIGHBOURS = int(os.environ.get('INTERPOLATION_NEIGHBOURS', 4))
+    INTERPOLATION_RADIUS_KM = float(os.environ.get('INTERPOLATION_RADIUS_KM', 300))
+    INTERPOLATION_POWER = 2.0  # weight = distance ** -power
+
+    # Startup warm-up (scenario catalog + popular regions)
+    WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', 'true').lower() == 'true'
+    WARMUP_BLOCKING = os.environ.get('WARMUP_BLOCKING', 'false').lower() == 'true'  # run before gunicorn forks
+    WARMUP_PREFETCH_LIVE = os.environ.get('WARMUP_PREFETCH_LIVE', 'true').lower() == 'true'
+    WARMUP_MAX_WORKERS = int(os.environ.get('WARMUP_MAX_WORKERS', 4))
+    WARMUP_TIMEOUT = float(os.environ.get('WARMUP_TIMEOUT', 60))  # seconds
+
     # Game settings
     INITIAL_BUDGET = 2000  # USD
     WEEKS_PER_SEASON = 12
@@ -26,6 +47,83 @@ class Config:
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
     DATA_DIR = os.path.join(BASE_DIR, '..', 'data')
     REGIONS_DIR = os.path.join(DATA_DIR, 'regions')
+    POWER_PARAMS_FILE = os.path.join(BASE_DIR, '..', 'nasa_all_params.json')
+
+    # Local caches (generated, not versioned)
+    CACHE_DIR = os.environ.get('TERRAGROW_CACHE_DIR') or os.path.join(DATA_DIR, 'cache')
+    WEATHER_STORE_DIR = os.path.join(CACHE_DIR, 'weather')
+    STANDIN_RECORDINGS_DIR = os.path.join(DATA_DIR, 'standin')
+
+    # Nearest scenario / popular region of every cell of a global grid (memory-mapped)
+    NEAREST_RASTER_DIR = os.path.join(CACHE_DIR, 'nearest')
+    NEAREST_RASTER_RESOLUTION = float(os.environ.get('NEAREST_RASTER_RESOLUTION', 0.25))  # degrees
+    NEAREST_RASTER_SYNC = os.environ.get('NEAREST_RASTER_SYNC', 'true').lower() == 'true'  # update during warm-up
+
+    # Köppen-Geiger classes (bundled uint8 raster, see scripts/build_koppen_raster.py)
+    KOPPEN_RASTER_FILE = os.environ.get('KOPPEN_RASTER_FILE') or os.path.join(DATA_DIR, 'koppen', 'koppen.npy')
+
+    # Soil texture and water retention (bundled uint8 grid, see scripts/build_soil_grid.py)
+    SOIL_GRID_FILE = os.environ.get('SOIL_GRID_FILE') or os.path.join(DATA_DIR, 'soil', 'soil_grid.npy')
+
+    # Location search: local gazetteer first, Nominatim below this score
+    GAZETTEER_FILE = os.path.join(CACHE_DIR, 'gazetteer.jsonl')
+    GAZETTEER_MIN_SCORE = float(os.environ.get('GAZETTEER_MIN_SCORE', 0.85))
+
+    # Nominatim policy: 1 request/s for the whole deployment (all workers share the bucket)
+    RATE_LIMIT_DB = os.path.join(CACHE_DIR, 'rate_limits.sqlite3')
+    NOMINATIM_RATE = float(os.environ.get('NOMINATIM_RATE', 1.0))  # requests per second
+    NOMINATIM_SEARCH_MAX_WAIT = float(os.environ.get('NOMINATIM_SEARCH_MAX_WAIT', 0.5))  # seconds
+    NOMINATIM_REVERSE_MAX_WAIT = float(os.environ.get('NOMINATIM_REVERSE_MAX_WAIT', 5.0))  # seconds
+
+    # Reverse geocoding cache (geohash buckets, nearest hit within the radius)
+    REVERSE_GEOCODE_DB = os.path.join(CACHE_DIR, 'reverse_geocode.sqlite3')
+    REVERSE_GEOCODE_PRECISION = 5  # ~4.9 km cells
+    REVERSE_GEOCODE_RADIUS_KM = 3.0
+    REVERSE_GEOCODE_TTL_DAYS = 180
+
+    # NASA POWER bulk fetching
+    POWER_REGIONAL_MAX_PARAMS = int(os.environ.get('POWER_REGIONAL_MAX_PARAMS', 1))
+    POWER_POINT_MAX_PARAMS = 20
+    POWER_REQUEST_INTERVAL = float(os.environ.get('POWER_REQUEST_INTERVAL', 1.0))  # seconds
+
+    # Daily POWER cleaning (-999 fill values and gaps)
+    POWER_MAX_GAP_DAYS = 3  # longer gaps are filled from the day-of-year climatology
+    POWER_CLIMATOLOGY_WINDOW_DAYS = 15  # days either side pooled into a day's climatology
+
+    # Multi-year climatology per POWER cell and day of year (built from the weather store)
+    CLIMATOLOGY_DIR = os.path.join(CACHE_DIR, 'climatology')
+    CLIMATOLOGY_WINDOW_DAYS = 7  # days either side pooled into each day of year
+    CLIMATOLOGY_MIN_YEARS = 3
+    CLIMATOLOGY_WET_DAY_MM = 1.0
+    CLIMATOLOGY_HEAVY_RAIN_MM = 30.0  # daily rain
+    CLIMATOLOGY_DRY_WEEK_MM = 2.0  # 7-day rain total counted as a drought week
+    CLIMATOLOGY_HEAT_C = 35.0  # daily max temperature
+    CLIMATOLOGY_FROST_C = 0.0  # daily min temperature
+    CLIMATOLOGY_COLD_C = 5.0  # daily mean temperature
+    CLIMATOLOGY_EVENT_THRESHOLD = 0.10  # weekly probability for an event to be typical of a region
+
+    # AppEEARS batch extraction (many coordinates per point task, resumable)
+    APPEEARS_STATE_FILE = os.path.join(CACHE_DIR, 'appeears_tasks.json')
+    APPEEARS_OUTPUT_DIR = os.path.join(CACHE_DIR, 'appeears')
+    APPEEARS_MAX_COORDINATES = 500  # per point task
+    APPEEARS_DOWNLOAD_WORKERS = 4
+    APPEEARS_CHUNK_SIZE = 1024 * 1024  # bytes
+    APPEEARS_POLL_MIN = float(os.environ.get('APPEEARS_POLL_MIN', 5))  # seconds
+    APPEEARS_POLL_MAX = float(os.environ.get('APPEEARS_POLL_MAX', 120))  # seconds
+
+    # Large downloads: resumable, sha256-verified, deduplicated by content hash
+    DOWNLOAD_CACHE_DIR = os.path.join(CACHE_DIR, 'blobs')
+    DOWNLOAD_MAX_ATTEMPTS = 5
+
+    # SMAP L3 granules (HDF5)
+    SMAP_DATA_URL = os.environ.get('SMAP_DATA_URL') or "https://n5eil01u.ecs.nsidc.org/SMAP/SPL3SMP.008"
+    SMAP_DATA_DIR = os.path.join(CACHE_DIR, 'smap')
+    SMAP_NUDGE_WEIGHT = float(os.environ.get('SMAP_NUDGE_WEIGHT', 0.0))  # weekly pull toward SMAP (0 = init only)
+
+    # Simulation timestep: 'weekly' (one water balance step per action) or 'daily' (seven per action)
+    # Games only: the sowing-date optimizer (BatchSeason) always plays weekly steps
+    SIMULATION_TIMESTEP = os.environ.get('SIMULATION_TIMESTEP', 'weekly')
+    SIMULATION_TIMESTEPS = ('weekly', 'daily')
 
     # Popular regions (pre-calculated)
     POPULAR_REGIONS = {
@@ -62,6 +160,8 @@ class Config:
             'waterlog_tolerance': 'medium',  # How well crop handles excess water
             'nitrogen_curve': [0.20, 0.50, 0.25, 0.05],  # N needs by growth stage
             'price_per_ton': 300,  # USD/ton
+            'base_temp': 0,  # °C, no development below (growing degree days)
+            'cutoff_temp': 26,  # °C, no extra development above
         },
         'corn': {
             'name': 'Maïs',
@@ -76,6 +176,8 @@ class Config:
             'waterlog_tolerance': 'medium',
             'nitrogen_curve': [0.20, 0.50, 0.25, 0.05],
             'price_per_ton': 250,
+            'base_temp': 10,
+            'cutoff_temp': 30,
         },
         'maize': {  # Alias for corn
             'name': 'Maïs',
@@ -90,6 +192,8 @@ class Config:
             'waterlog_tolerance': 'medium',
             'nitrogen_curve': [0.20, 0.50, 0.25, 0.05],
             'price_per_ton': 250,
+            'base_temp': 10,
+            'cutoff_temp': 30,
         },
         'rice': {
             'name': 'Riz',
@@ -104,6 +208,8 @@ class Config:
             'waterlog_tolerance': 'high',  # Can handle flooded fields
             'nitrogen_curve': [0.25, 0.45, 0.25, 0.05],
             'price_per_ton': 400,
+            'base_temp': 10,
+            'cutoff_temp': 35,
         },
         'sunflower': {
             'name': 'Tournesol',
@@ -118,6 +224,8 @@ class Config:
             'waterlog_tolerance': 'low',  # Hates waterlogging
             'nitrogen_curve': [0.15, 0.55, 0.25, 0.05],
             'price_per_ton': 450,
+            'base_temp': 6,
+            'cutoff_temp': 30,
         },
         'tomato': {
             'name': 'Tomate',
@@ -132,6 +240,8 @@ class Config:
             'waterlog_tolerance': 'medium',
             'nitrogen_curve': [0.20, 0.45, 0.30, 0.05],  # Heavy feeder
             'price_per_ton': 800,  # High value crop
+            'base_temp': 10,
+            'cutoff_temp': 30,
         },
         'lettuce': {
             'name': 'Laitue',
@@ -146,6 +256,8 @@ class Config:
             'waterlog_tolerance': 'high',  # Shallow roots, can handle moisture
             'nitrogen_curve': [0.30, 0.50, 0.15, 0.05],  # Early heavy feeding
             'price_per_ton': 1200,  # Very high value
+            'base_temp': 4,
+            'cutoff_temp': 24,
         },
         'sorghum': {
             'name': 'Sorgho',
@@ -160,6 +272,8 @@ class Config:
             'waterlog_tolerance': 'low',
             'nitrogen_curve': [0.20, 0.50, 0.25, 0.05],
             'price_per_ton': 200,  # Subsistence crop
+            'base_temp': 10,
+            'cutoff_temp': 35,
         }
     }
 
@@ -171,6 +285,8 @@ class Config:
             'wilting_point': 25,  # %
             'drainage_rate': 0.60,  # ✅ Increased from 0.15 to 0.60 for realistic drainage
             'nitrogen_retention': 0.85,
+            'vwc_wilting_point': 0.12,  # m3/m3, maps SMAP observations onto the % scale
+            'vwc_field_capacity': 0.30,
         },
         'sandy': {
             'name': 'Sableux (Sandy)',
@@ -178,6 +294,8 @@ class Config:
             'wilting_point': 15,
             'drainage_rate': 0.85,  # ✅ Increased from 0.30 to 0.85 (sandy drains fast)
             'nitrogen_retention': 0.65,
+            'vwc_wilting_point': 0.05,
+            'vwc_field_capacity': 0.15,
         },
         'clay': {
             'name': 'Argileux (Clay)',
@@ -185,6 +303,78 @@ class Config:
             'wilting_point': 35,
             'drainage_rate': 0.35,  # ✅ Increased from 0.08 to 0.35 (clay drains slowly but still drains)
             'nitrogen_retention': 0.95,
+            'vwc_wilting_point': 0.22,
+            'vwc_field_capacity': 0.40,
+        }
+    }
+
+    # Stochastic weather generator (fallback when no observed weather is available)
+    WEATHER_SEED = int(os.environ.get('WEATHER_SEED', 2024))
+    WEATHER_PROFILES = {
+        'tropical': {  # |lat| < 23
+            'wet_fraction': 0.45,  # share of wet days
+            'persistence': 0.30,  # P(wet | wet) - P(wet | dry)
+            'wet_day_mean': 12.0,  # mm on a wet day
+            'gamma_shape': 0.8,
+            'temperature_mean': 28.0,  # °C
+            'temperature_std': 1.5,
+            'humidity_mean': 72.0,  # %
+            'humidity_std': 8.0,
+            'temperature_humidity_corr': -0.5,
+            'autocorrelation': 0.7,  # day-to-day AR(1) of temperature/humidity anomalies
+            'wet_temperature_shift': -1.0,  # °C on wet days
+            'wet_humidity_shift': 8.0,  # % on wet days
+        },
+        'subtropical': {  # |lat| < 40
+            'wet_fraction': 0.30,
+            'persistence': 0.30,
+            'wet_day_mean': 10.0,
+            'gamma_shape': 0.75,
+            'temperature_mean': 22.0,
+            'temperature_std': 2.5,
+            'humidity_mean': 60.0,
+            'humidity_std': 10.0,
+            'temperature_humidity_corr': -0.5,
+            'autocorrelation': 0.7,
+            'wet_temperature_shift': -1.5,
+            'wet_humidity_shift': 10.0,
+        },
+        'temperate': {
+            'wet_fraction': 0.35,
+            'persistence': 0.35,
+            'wet_day_mean': 6.0,
+            'gamma_shape': 0.7,
+            'temperature_mean': 15.0,
+            'temperature_std': 3.5,
+            'humidity_mean': 68.0,
+            'humidity_std': 10.0,
+            'temperature_humidity_corr': -0.4,
+            'autocorrelation': 0.75,
+            'wet_temperature_shift': -1.5,
+            'wet_humidity_shift': 10.0,
+        }
+    }
+
+    # Block-bootstrap weather ensembles (variants of historical scenarios)
+    ENSEMBLE_SIZE = int(os.environ.get('ENSEMBLE_SIZE', 1000))  # variants per scenario, 0 = observed season
+    ENSEMBLE_BLOCK_WEEKS = 3
+    ENSEMBLE_WINDOW_WEEKS = 2  # how far a block may move from its calendar position
+
+    # Climate-change deltas (e.g. +2 °C, -15% rain), generated on demand
+    DELTA_CACHE_SIZE = int(os.environ.get('DELTA_CACHE_SIZE', 256))  # perturbed scenarios kept in memory
+
+    # Sowing-date optimizer (every start day of a multi-year daily record, batched seasons)
+    SOWING_YEARS = int(os.environ.get('SOWING_YEARS', 10))  # years of daily weather scanned
+    SOWING_WINDOW_DAYS = 7  # width of a recommended sowing window
+    SOWING_RISK_WEIGHT = 0.5  # ranking score = mean yield - weight * yield std across years
+    SOWING_PLANS = {  # reference management applied to every simulated season
+        'rainfed': {
+            'max_irrigation_mm': 0,  # per week
+            'nitrogen_margin': 1.5,  # top soil N up to (1 + margin) x the stage's weekly need
+        },
+        'irrigated': {
+            'max_irrigation_mm': 40,  # tops moisture up to the crop's optimum
+            'nitrogen_margin': 1.5,
         }
     }
 
@@ -0,0 +1,10 @@
+"""
+Gunicorn configuration for TerraGrow Academy
+Loaded automatically by gunicorn when started from backend/
+"""
+
+import os
+
+# With WARMUP_BLOCKING=true the app is imported (and its caches warmed) once
+# in the master process, then shared with every worker through fork.
+preload_app = os.environ.get('WARMUP_BLOCKING', 'false').lower() == 'true'
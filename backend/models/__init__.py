@@ -5,6 +5,9 @@ Models package for TerraGrow Academy
 from .crop_v2 import Crop  # Using V2 with phenological stages and crop-specific tolerances
 from .soil import Soil
 from .region import Region
+from .climate_profile import ClimateProfile
+from .phenology import Phenology
 from .game_state import GameState
+from .batch_season import BatchSeason
 
-__all__ = ['Crop', 'Soil', 'Region', 'GameState']
+__all__ = ['Crop', 'Soil', 'Region', 'ClimateProfile', 'Phenology', 'GameState', 'BatchSeason']
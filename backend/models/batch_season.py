@@ -0,0 +1,179 @@
+"""
+Batch season model for TerraGrow Academy
+Vectorized GameState season: many weather series played at once under a fixed plan
+"""
+
+import numpy as np
+from .crop_v2 import Crop
+
+
+class BatchSeason:
+    """
+    Plays the same season logic as GameState (Soil + Crop V2) on arrays
+
+    Every weather series (e.g. one per sowing date and year) is a row; the
+    weekly loop runs once over all rows. Actions come from a reference
+    management plan instead of a player. Random events are left out: they
+    only produce messages, not state changes. The water balance always
+    takes one step per week: Config.SIMULATION_TIMESTEP only applies to
+    GameState.
+    """
+
+    # Crop V2 stress curves (see Crop._calculate_water_stress)
+    TOLERANCE_RANGES = {'high': 0.35, 'medium': 0.25, 'low': 0.15}
+    DROUGHT_CURVES = {'high': (0.3, 0.8), 'medium': (0.2, 1.2), 'low': (0.1, 1.5)}  # (floor, slope)
+    WATERLOG_CURVES = {'high': (0.7, 0.3), 'medium': (0.4, 0.6), 'low': (0.2, 0.9)}
+
+    def __init__(self, crop_type, crop_params, soil_params, initial_budget=2000, initial_moisture=50,
+                 irrigation_cost=1.5, fertilizer_cost=1.2):
+        """
+        Initialize batch season
+
+        Args:
+            crop_type (str): Type of crop
+            crop_params (dict): Crop parameters from config
+            soil_params (dict): Soil parameters from config
+            initial_budget (float): Starting budget (USD)
+            initial_moisture (float): Initial soil moisture (%)
+            irrigation_cost (float): $ per mm
+            fertilizer_cost (float): $ per kg N
+        """
+        self.crop_type = crop_type
+        self.crop_params = crop_params
+        self.crop = Crop(crop_type, crop_params)
+        self.soil_params = soil_params
+        self.initial_budget = initial_budget
+        self.initial_moisture = initial_moisture
+        self.irrigation_cost = irrigation_cost
+        self.fertilizer_cost = fertilizer_cost
+
+    def nitrogen_requirements(self, temperature):
+        """
+        Weekly crop N uptake by age, from each row's thermal time (Crop V2 tables)
+
+        Args:
+            temperature (ndarray): Weekly mean temperature (°C), shape (n, weeks)
+
+        Returns:
+            ndarray: kg N/ha, shape (n, weeks)
+        """
+        crop = self.crop
+        return crop.phenology.tables(temperature, crop.nitrogen_need, crop.nitrogen_curve)['nitrogen']
+
+    def run(self, rain, temperature, et, plan):
+        """
+        Play every season
+
+        Args:
+            rain (array-like): Weekly precipitation (mm), shape (n, weeks)
+            temperature (array-like): Weekly mean temperature (°C), shape (n, weeks)
+            et (array-like): Weekly evapotranspiration (mm), shape (n, weeks)
+            plan (dict): 'max_irrigation_mm' per week and 'nitrogen_margin'
+                (see Config.SOWING_PLANS)
+
+        Returns:
+            dict: Per-row 'yield' (t/ha), 'revenue', 'total_costs', 'profit',
+                'water_used', 'nitrogen_used' and weekly 'ndvi', 'moisture',
+                'irrigation', 'fertilizer' of shape (n, weeks)
+        """
+        rain = np.atleast_2d(np.asarray(rain, dtype=float))
+        temperature = np.atleast_2d(np.asarray(temperature, dtype=float))
+        et = np.atleast_2d(np.asarray(et, dtype=float))
+        n, weeks = rain.shape
+
+        soil = self.soil_params
+        crop = self.crop
+        needs = self.nitrogen_requirements(temperature)
+
+        moisture = np.full(n, float(self.initial_moisture))
+        nitrogen = np.full(n, 80.0)  # Soil initial nitrogen
+        ndvi = np.full(n, float(crop.ndvi))
+        consecutive = np.zeros(n)
+        budget = np.full(n, float(self.initial_budget))
+
+        history = {key: np.zeros((n, weeks)) for key in ('ndvi', 'moisture', 'irrigation', 'fertilizer')}
+
+        for week in range(weeks):
+            need = needs[:, week]
+
+            # Reference plan: top moisture up to the crop optimum, soil N up to the stage need
+            irrigation = np.clip(crop.optimal_moisture - (moisture + rain[:, week] - et[:, week]),
+                                 0, plan.get('max_irrigation_mm', 0))
+            fertilizer = np.maximum(0, (1 + plan.get('nitrogen_margin', 0)) * need - nitrogen) / 0.8
+
+            # Spend what is left when the plan exceeds the budget (GameState would refuse the action)
+            cost = irrigation * self.irrigation_cost + fertilizer * self.fertilizer_cost
+            scale = np.where(cost > budget, budget / np.maximum(cost, 1e-9), 1.0)
+            irrigation *= scale
+            fertilizer *= scale
+            budget -= irrigation * self.irrigation_cost + fertilizer * self.fertilizer_cost
+
+            # Soil: fertilizer, water balance with drainage and leaching, crop uptake
+            nitrogen = np.minimum(nitrogen + fertilizer * 0.8, 200)
+            moisture = moisture + rain[:, week] + irrigation - et[:, week]
+            drainage = np.where(moisture > soil['field_capacity'],
+                                (moisture - soil['field_capacity']) * soil['drainage_rate'], 0.0)
+            moisture = np.clip(moisture - drainage, soil['wilting_point'], 100)
+            nitrogen = np.maximum(0, nitrogen - drainage * (1 - soil['nitrogen_retention']) * 0.5)
+            nitrogen = np.maximum(0, nitrogen - need)
+
+            # Crop growth
+            stress = (self._water_stress(moisture) * self._nutrient_stress(nitrogen, need)
+                      * self._thermal_stress(temperature[:, week]))
+            consecutive = np.where(stress < 0.5, consecutive + 1, np.maximum(0, consecutive - 1))
+
+            grown = np.minimum(ndvi + crop.growth_rate * stress, crop.max_ndvi)
+            decline = np.select([stress < 0.2, stress < 0.4], [0.06, 0.03], 0.0)
+            decline = decline + np.where(consecutive >= 3, np.minimum((consecutive - 2) * 0.015, 0.08), 0.0)
+            ndvi = np.where(decline > 0, np.maximum(0.05, ndvi - decline), grown)
+
+            history['ndvi'][:, week] = ndvi
+            history['moisture'][:, week] = moisture
+            history['irrigation'][:, week] = irrigation
+            history['fertilizer'][:, week] = fertilizer
+
+        crop_yield = 8.0 * ndvi / crop.max_ndvi  # Crop.get_yield
+        revenue = crop_yield * crop.price_per_ton
+        total_costs = self.initial_budget - budget
+
+        return dict(history, **{
+            'yield': crop_yield,
+            'revenue': revenue,
+            'total_costs': total_costs,
+            'profit': revenue - total_costs,
+            'water_used': history['irrigation'].sum(axis=1),
+            'nitrogen_used': history['fertilizer'].sum(axis=1)
+        })
+
+    def _water_stress(self, moisture):
+        """Crop._calculate_water_stress on an array"""
+        crop = self.crop
+        optimal_min = crop.optimal_moisture * (1 - self.TOLERANCE_RANGES[crop.drought_tolerance])
+        optimal_max = crop.optimal_moisture * (1 + self.TOLERANCE_RANGES[crop.waterlog_tolerance])
+
+        drought_floor, drought_slope = self.DROUGHT_CURVES[crop.drought_tolerance]
+        waterlog_floor, waterlog_slope = self.WATERLOG_CURVES[crop.waterlog_tolerance]
+
+        drought = np.maximum(drought_floor, 1 - (optimal_min - moisture) / optimal_min * drought_slope)
+        waterlog = np.maximum(waterlog_floor, 1 - (moisture - optimal_max) / (100 - optimal_max) * waterlog_slope)
+
+        return np.select(
+            [(moisture >= optimal_min) & (moisture <= optimal_max), moisture < 25, moisture < optimal_min],
+            [1.0, 0.0, drought],
+            waterlog
+        )
+
+    @staticmethod
+    def _nutrient_stress(nitrogen, need):
+        """Crop._calculate_nutrient_stress on an array"""
+        ratio = nitrogen / np.maximum(need, 1e-9)
+        return np.select(
+            [nitrogen >= need * 1.5, nitrogen >= need, nitrogen >= need * 0.5, nitrogen > 0],
+            [1.0, 0.95, 0.5 + ratio * 0.45, ratio * 0.5],
+            0.0
+        )
+
+    def _thermal_stress(self, temperature):
+        """Crop._calculate_thermal_stress on an array"""
+        diff = np.abs(temperature - self.crop.optimal_temp)
+        return np.select([diff <= 3, diff <= 6, diff <= 10, diff <= 15], [1.0, 0.85, 0.6, 0.3], 0.1)
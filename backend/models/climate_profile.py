@@ -0,0 +1,117 @@
+"""
+Climate profile model for TerraGrow Academy
+Climate-dependent game parameters, resolved once per region
+"""
+
+
+class ClimateProfile:
+    """
+    Climate class of a region and everything the game derives from it
+
+    The climate name (e.g. 'Sahel semi-aride', 'Tropical savane') is
+    matched once here; regions and game states read the attributes
+    instead of re-scanning the name every week.
+    """
+
+    CHARACTERISTICS = {
+        'tropical': {
+            'avg_temp': 26,
+            'avg_rain': 150,  # mm per month
+            'rain_variability': 'high',
+            'typical_events': ['heavy_rain', 'drought']
+        },
+        'arid': {
+            'avg_temp': 32,
+            'avg_rain': 50,
+            'rain_variability': 'very_high',
+            'typical_events': ['drought', 'heatwave']
+        },
+        'continental': {
+            'avg_temp': 15,
+            'avg_rain': 80,
+            'rain_variability': 'medium',
+            'typical_events': ['frost', 'cold_snap']
+        },
+        'subtropical': {
+            'avg_temp': 20,
+            'avg_rain': 100,
+            'rain_variability': 'medium',
+            'typical_events': ['heavy_rain', 'drought']
+        },
+        'default': {
+            'avg_temp': 22,
+            'avg_rain': 100,
+            'rain_variability': 'medium',
+            'typical_events': ['drought']
+        }
+    }
+
+    REGIONAL_AVERAGE_YIELD = {'tropical': 5.2, 'arid': 3.8, 'continental': 6.5, 'default': 5.5}  # t/ha
+
+    def __init__(self, name, koppen=None, climatology=None):
+        """
+        Initialize profile
+
+        Args:
+            name (str): Climate name
+            koppen (str): Köppen-Geiger class (e.g. 'BSh'), if known
+            climatology (dict): Location climatology (ClimatologyStore.summary), if built
+        """
+        self.name = name
+        self.koppen = koppen
+        lower = name.lower()
+
+        self.is_tropical = 'tropical' in lower  # also matches 'subtropical'
+        self.is_subtropical = 'subtropical' in lower
+        self.is_sahel = 'sahel' in lower
+        self.is_arid = self.is_sahel or 'arid' in lower  # 'arid', 'aride', 'semi-aride'
+        self.is_semi_arid = self.is_sahel or 'semi-arid' in lower
+        self.is_humid = 'humid' in lower  # 'humid', 'humide'
+        self.is_humide = 'humide' in lower
+        self.is_continental = 'continental' in lower
+        self.is_temperate = self.is_continental or 'océanique' in lower or 'tempéré' in lower
+
+        self.recommended_crops = self._recommended_crops()
+        self.characteristics = climatology or dict(self.CHARACTERISTICS[self._characteristics_class()])
+        self.regional_average_yield = self.REGIONAL_AVERAGE_YIELD[self._yield_class()]
+
+    def _recommended_crops(self):
+        """Crops suited to the climate, best first"""
+        if self.is_tropical or self.is_humid:
+            return ['maize', 'sorghum']
+        if self.is_arid:
+            return ['sorghum', 'maize']
+        if self.is_temperate:
+            return ['wheat', 'maize']
+        return ['maize']  # Default
+
+    def _characteristics_class(self):
+        """Key of CHARACTERISTICS"""
+        if self.is_tropical:
+            return 'tropical'
+        if self.is_semi_arid:
+            return 'arid'
+        if self.is_continental:
+            return 'continental'
+        if self.is_subtropical:
+            return 'subtropical'
+        return 'default'
+
+    def _yield_class(self):
+        """Key of REGIONAL_AVERAGE_YIELD"""
+        if self.is_tropical:
+            return 'tropical'
+        if self.is_arid:
+            return 'arid'
+        if self.is_continental:
+            return 'continental'
+        return 'default'
+
+    def to_dict(self):
+        """Export profile as dictionary"""
+        return {
+            'name': self.name,
+            'koppen': self.koppen,
+            'recommended_crops': list(self.recommended_crops),
+            'regional_average_yield': self.regional_average_yield
+        }
@@ -8,6 +8,8 @@ Improved realistic growth logic with:
 
 import math
 
+from .phenology import Phenology
+
 
 class Crop:
     """Represents a crop with realistic growth behavior"""
@@ -43,18 +45,34 @@ class Crop:
         self.consecutive_stress_weeks = 0
         self.total_stress_accumulated = 0
 
-        # Growth stages
+        # Growth stages (thermal time: stage_weeks only holds at the optimal temperature)
         self.growth_stages = ['Germination', 'Vegetative', 'Flowering', 'Maturation']
         self.stage_weeks = [3, 4, 3, 2]  # Weeks per stage
+        self.phenology = Phenology.from_params(parameters, self.stage_weeks)
+        self.set_temperatures([])
+
+    def set_temperatures(self, temperatures):
+        """
+        Precompute stage and nitrogen tables for the season's weather
+
+        Weeks without a temperature (no weather yet, past the end of the
+        series) develop as at the optimal temperature.
+
+        Args:
+            temperatures (list): Weekly mean temperature (°C)
+        """
+        weeks = max(len(temperatures), sum(self.stage_weeks))
+        series = list(temperatures) + [self.optimal_temp] * (weeks - len(temperatures))
+        tables = self.phenology.tables(series, self.nitrogen_need, self.nitrogen_curve)
+
+        self._gdd = tables['gdd'][0]
+        self._stages = tables['stage'][0]
+        self._nitrogen = tables['nitrogen'][0]
 
     def get_growth_stage(self):
         """Get current growth stage"""
-        cumulative = 0
-        for i, weeks in enumerate(self.stage_weeks):
-            cumulative += weeks
-            if self.age_weeks < cumulative:
-                return i, self.growth_stages[i]
-        return 3, self.growth_stages[3]
+        stage_idx = int(self._stages[min(self.age_weeks, len(self._stages) - 1)])
+        return stage_idx, self.growth_stages[stage_idx]
 
     def get_nitrogen_requirement(self):
         """
@@ -63,20 +81,10 @@ class Crop:
         Returns:
             float: kg N/ha needed this week
         """
-        stage_idx, stage_name = self.get_growth_stage()
-
-        # Get percentage for this stage
-        stage_percentage = self.nitrogen_curve[stage_idx]
-
-        # Calculate weeks in this stage
-        stage_duration = self.stage_weeks[stage_idx]
-
-        # Weekly requirement
-        weekly_need = (self.nitrogen_need * stage_percentage) / stage_duration
+        # Stage share of the season need, spread by thermal time (see Phenology.tables)
+        return float(self._nitrogen[min(self.age_weeks, len(self._nitrogen) - 1)])
 
-        return weekly_need
-
-    def calculate_growth(self, moisture, nitrogen, temperature):
+    def calculate_growth(self, moisture, nitrogen, temperature, daily_moisture=None, daily_temperature=None):
         """
         Calculate crop growth based on environmental conditions
 
@@ -84,14 +92,22 @@ class Crop:
             moisture (float): Current soil moisture (%)
             nitrogen (float): Available nitrogen (kg/ha)
             temperature (float): Current temperature (°C)
+            daily_moisture (list): Moisture of each day of the week (daily timestep, optional)
+            daily_temperature (list): Temperature of each day of the week (daily timestep, optional)
 
         Returns:
             dict: Growth info with educational feedback
         """
-        # Calculate stress factors
-        water_stress = self._calculate_water_stress(moisture)
+        # Calculate stress factors (daily timestep: mean of the daily stresses)
+        if daily_moisture is not None:
+            water_stress = sum(self._calculate_water_stress(m) for m in daily_moisture) / len(daily_moisture)
+        else:
+            water_stress = self._calculate_water_stress(moisture)
         nutrient_stress = self._calculate_nutrient_stress(nitrogen)
-        thermal_stress = self._calculate_thermal_stress(temperature)
+        if daily_temperature is not None:
+            thermal_stress = sum(self._calculate_thermal_stress(t) for t in daily_temperature) / len(daily_temperature)
+        else:
+            thermal_stress = self._calculate_thermal_stress(temperature)
 
         # Overall stress (multiplicative)
         overall_stress = water_stress * nutrient_stress * thermal_stress
@@ -289,6 +305,7 @@ class Crop:
             'name': self.name,
             'ndvi': round(self.ndvi, 3),
             'age_weeks': self.age_weeks,
+            'gdd': round(float(self._gdd[min(self.age_weeks, len(self._gdd) - 1)])),
             'health': self._get_health_status(),
             'stage': stage_name,
             'nitrogen_requirement': round(self.get_nitrogen_requirement(), 1)
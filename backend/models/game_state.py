@@ -4,15 +4,23 @@ Orchestrates the entire game simulation
 """
 
 import random
+
+import numpy as np
+
 from .crop_v2 import Crop  # Using V2 with phenological stages
 from .soil import Soil
 from .region import Region
 
+# Day patterns of a week without daily weather
+EVEN_WEEK = np.full(7, 1 / 7)
+FLAT_WEEK = np.zeros(7)
+
 
 class GameState:
     """Manages the overall game state and simulation"""
 
-    def __init__(self, region, crop_type, crop_params, soil_params, initial_budget=2000):
+    def __init__(self, region, crop_type, crop_params, soil_params, initial_budget=2000,
+                 soil_observations=None, nudge_weight=0.0, timestep='weekly'):
         """
         Initialize game state
 
@@ -22,11 +30,23 @@ class GameState:
             crop_params (dict): Crop parameters
             soil_params (dict): Soil parameters
             initial_budget (float): Starting budget (USD)
+            soil_observations (list): Weekly observed soil moisture (m3/m3, None if missing)
+            nudge_weight (float): Weekly pull toward the observations (0 = initial state only)
+            timestep (str): 'weekly' (one water balance step per week) or 'daily'
+                (seven daily steps per weekly decision)
         """
         self.region = region
         self.crop = Crop(crop_type, crop_params)
         self.soil = Soil(region.soil_type, soil_params)
 
+        # SMAP: start from the observed state of the field
+        self.soil_observations = soil_observations or []
+        self.nudge_weight = nudge_weight
+        if self.soil_observations and self.soil_observations[0] is not None:
+            self.soil.assimilate_observation(self.soil_observations[0], 1.0)
+
+        self.timestep = timestep
+
         self.current_week = 1
         self.max_weeks = 12
         self.budget = initial_budget
@@ -45,6 +65,51 @@ class GameState:
 
         # Weather data (to be filled by API)
         self.weather_data = []
+        self.daily_weather = None
+
+    @property
+    def weather_data(self):
+        """Weekly weather of the season"""
+        return self._weather_data
+
+    @weather_data.setter
+    def weather_data(self, weather_data):
+        """Set the season weather; crop stages are precomputed from its temperatures"""
+        self._weather_data = weather_data
+        self.crop.set_temperatures([week.get('temperature', 25) for week in weather_data])
+
+    @property
+    def daily_weather(self):
+        """Daily weather of the season (daily timestep), or None"""
+        return self._daily_weather
+
+    @daily_weather.setter
+    def daily_weather(self, daily_weather):
+        """
+        Set the daily weather used to split each week into days
+
+        Args:
+            daily_weather (dict): 'precipitation', 'temperature' and/or
+                'evapotranspiration' -> one list of 7 daily values per week
+                (None/NaN = missing), aligned with weather_data
+        """
+        self._daily_weather = daily_weather
+
+        # Per-week day patterns, computed once: shares of the weekly total (rain, ET) or
+        # anomalies around the weekly mean (temperature); incomplete days -> an even week
+        self._day_patterns = {}
+        for key, values in (daily_weather or {}).items():
+            if not values:
+                continue
+            values = np.array(values, dtype=float).reshape(-1, 7)
+            complete = np.isfinite(values).all(axis=1)
+            if key == 'temperature':
+                pattern = values - values.mean(axis=1, keepdims=True)
+                self._day_patterns[key] = np.where(complete[:, None], pattern, 0.0)
+            else:
+                totals = values.sum(axis=1, keepdims=True)
+                usable = complete[:, None] & (totals > 0)
+                self._day_patterns[key] = np.where(usable, values / np.where(usable, totals, 1), 1 / 7)
 
     def simulate_week(self, irrigation_mm, fertilizer_kg, weather_data):
         """
@@ -111,8 +176,22 @@ class GameState:
         # Add fertilizer to soil
         fertilizer_info = self.soil.add_fertilizer(fertilizer_kg)
 
-        # Update soil moisture
-        moisture_info = self.soil.update_moisture(rain, irrigation_mm, et)
+        # Update soil moisture (daily timestep: irrigation spread over the week)
+        week_index = self.current_week - 1
+        days = None
+        if self.timestep == 'daily':
+            days = self._week_days(week_index, rain, temperature, et)
+            moisture_info = self.soil.update_moisture_daily(days['precipitation'], np.full(7, irrigation_mm / 7),
+                                                            days['evapotranspiration'])
+        else:
+            moisture_info = self.soil.update_moisture(rain, irrigation_mm, et)
+
+        # Pull toward this week's observation (precomputed, no I/O)
+        if self.nudge_weight and week_index < len(self.soil_observations) \
+                and self.soil_observations[week_index] is not None:
+            self.soil.assimilate_observation(self.soil_observations[week_index], self.nudge_weight)
+            moisture_info['moisture'] = self.soil.moisture
+            moisture_info['status'] = self.soil._get_moisture_status()
 
         # Extract nutrients (crop uptake based on phenological stage)
         crop_uptake = self.crop.get_nitrogen_requirement()  # Dynamic uptake by growth stage
@@ -122,7 +201,9 @@ class GameState:
         growth_info = self.crop.calculate_growth(
             self.soil.moisture,
             self.soil.nitrogen,
-            temperature
+            temperature,
+            daily_moisture=moisture_info.get('daily_moisture'),
+            daily_temperature=days['temperature'] if days else None
         )
 
         # Check for random events
@@ -168,6 +249,27 @@ class GameState:
             'is_complete': is_final_week  # True only AFTER playing week 12
         }
 
+    def _week_days(self, week_index, rain, temperature, et):
+        """
+        Split a week of weather into seven days
+
+        Weekly rain and ET totals and the mean temperature are kept. The
+        daily pattern comes from self.daily_weather; without it (or for
+        incomplete days) rain and ET are spread evenly.
+
+        Returns:
+            dict: 'precipitation', 'temperature', 'evapotranspiration' arrays of 7 days
+        """
+        def pattern(key, even):
+            values = self._day_patterns.get(key)
+            return values[week_index] if values is not None and week_index < len(values) else even
+
+        return {
+            'precipitation': rain * pattern('precipitation', EVEN_WEEK),
+            'temperature': temperature + pattern('temperature', FLAT_WEEK),
+            'evapotranspiration': et * pattern('evapotranspiration', EVEN_WEEK)
+        }
+
     def _check_random_event(self, weather_data):
         """
         Check for random events based on climate and weather
@@ -182,8 +284,7 @@ class GameState:
         if random.random() > 0.15:
             return None
 
-        climate_chars = self.region.get_climate_characteristics()
-        possible_events = climate_chars['typical_events']
+        possible_events = self.region.profile.characteristics['typical_events']
 
         event_type = random.choice(possible_events)
 
@@ -296,18 +397,18 @@ class GameState:
             list: Smart recommendation messages
         """
         recommendations = []
-        climate = self.region.climate.lower()
+        profile = self.region.profile
         stage = growth_info.get('stage', '')
         nitrogen_req = growth_info.get('nitrogen_requirement', 0)
 
         # Week 1-3: Initial guidance for region type
         if self.current_week <= 3:
-            if 'sahel' in climate or 'arid' in climate:
+            if profile.is_arid:
                 recommendations.append({
                     'type': 'tip',
                     'text': f"💡 Region aride detectee! Irrigation minimum: 30mm/semaine recommandee. Budget projete 12 sem: ~$900"
                 })
-            elif 'tropical' in climate or 'humide' in climate:
+            elif profile.is_tropical or profile.is_humide:
                 recommendations.append({
                     'type': 'tip',
                     'text': f"💡 Region humide! Peu d'irrigation necessaire. Focus sur drainage et fertilisation optimale."
@@ -439,16 +540,7 @@ class GameState:
     def _get_regional_average(self):
         """Get regional average yield"""
         # Simplified regional averages
-        climate = self.region.climate.lower()
-
-        if 'tropical' in climate:
-            return 5.2
-        elif 'sahel' in climate or 'arid' in climate:
-            return 3.8
-        elif 'continental' in climate:
-            return 6.5
-        else:
-            return 5.5
+        return self.region.profile.regional_average_yield
 
     def _generate_recommendations(self):
         """Generate personalized recommendations"""
@@ -480,13 +572,13 @@ class GameState:
             })
 
         # Region-specific advice
-        climate = self.region.climate.lower()
-        if 'tropical' in climate:
+        profile = self.region.profile
+        if profile.is_tropical:
             recs.append({
                 'type': 'info',
                 'text': f"💡 Tip for {self.region.name}: Drainage is crucial during rainy season to avoid leaching."
             })
-        elif 'sahel' in climate or 'arid' in climate:
+        elif profile.is_arid:
             recs.append({
                 'type': 'info',
                 'text': f"💡 Tip for {self.region.name}: Water reserves are essential. Plan strict irrigation."
@@ -502,6 +594,7 @@ class GameState:
             'soil': self.soil.to_dict(),
             'week': self.current_week,
             'max_weeks': self.max_weeks,
+            'timestep': self.timestep,
             'budget': round(self.budget, 2),
             'ndvi_history': [round(x, 3) for x in self.ndvi_history],
             'events': self.events_history
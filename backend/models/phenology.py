@@ -0,0 +1,80 @@
+"""
+Phenology model for TerraGrow Academy
+Thermal-time (growing degree day) development stages
+"""
+
+import numpy as np
+
+
+class Phenology:
+    """
+    Stage transitions follow accumulated growing degree days (GDD)
+
+    Stage GDD totals are calibrated so that a season at the crop's optimal
+    temperature develops in the nominal stage weeks; warmer weeks speed
+    the crop up, cooler weeks slow it down. Tables are computed once per
+    weather series, for every row at once (Crop and BatchSeason share them).
+    """
+
+    def __init__(self, base_temp, cutoff_temp, optimal_temp, stage_weeks):
+        """
+        Initialize phenology
+
+        Args:
+            base_temp (float): No development below this temperature (°C)
+            cutoff_temp (float): No extra development above this temperature (°C)
+            optimal_temp (float): Temperature of the nominal season (°C)
+            stage_weeks (list): Weeks per stage at the optimal temperature
+        """
+        self.base_temp = base_temp
+        self.cutoff_temp = cutoff_temp
+        self.stage_weeks = list(stage_weeks)
+
+        self.stage_gdd = np.array(self.stage_weeks, dtype=float) * self.weekly_gdd(optimal_temp)
+        self.thresholds = np.cumsum(self.stage_gdd)[:-1]  # GDD at the start of stages 2..n
+
+    @classmethod
+    def from_params(cls, parameters, stage_weeks):
+        """Phenology of a crop (Config.CROPS entry)"""
+        return cls(parameters.get('base_temp', 10), parameters.get('cutoff_temp', 30),
+                   parameters['optimal_temp'], stage_weeks)
+
+    def weekly_gdd(self, temperature):
+        """
+        Growing degree days of weeks at a mean temperature
+
+        Args:
+            temperature (array-like): Weekly mean temperature (°C)
+
+        Returns:
+            ndarray: °C·days per week
+        """
+        return 7 * (np.clip(temperature, self.base_temp, self.cutoff_temp) - self.base_temp)
+
+    def tables(self, temperature, nitrogen_need, nitrogen_curve):
+        """
+        Stage and nitrogen uptake of every crop age
+
+        Stage at age a (weeks played) comes from the GDD of the first a
+        weeks. Weekly N uptake is the stage's share of the season need,
+        spread over the stage in proportion to the week's GDD (at the
+        optimal temperature: share / stage weeks, as before).
+
+        Args:
+            temperature (array-like): Weekly mean temperature (°C), shape (weeks,) or (n, weeks)
+            nitrogen_need (float): Season N need (kg/ha)
+            nitrogen_curve (list): Share of the need per stage
+
+        Returns:
+            dict: 'gdd' and 'stage' by age, shape (n, weeks + 1); 'nitrogen'
+                (kg N/ha) by age, shape (n, weeks)
+        """
+        gdd = self.weekly_gdd(np.atleast_2d(np.asarray(temperature, dtype=float)))
+        cumulative = np.concatenate((np.zeros((gdd.shape[0], 1)), np.cumsum(gdd, axis=1)), axis=1)
+
+        # Tolerance: a nominal season reaches each threshold exactly
+        stage = (cumulative[..., None] >= self.thresholds - 1e-6).sum(axis=-1)
+
+        week_stage = stage[:, :-1]
+        nitrogen = nitrogen_need * np.asarray(nitrogen_curve)[week_stage] * gdd / self.stage_gdd[week_stage]
+        return {'gdd': cumulative, 'stage': stage, 'nitrogen': nitrogen}
@@ -3,6 +3,8 @@ Region model for TerraGrow Academy
 Handles region-specific parameters and climate
 """
 
+from .climate_profile import ClimateProfile
+
 
 class Region:
     """Represents a geographical region in the game"""
@@ -17,7 +19,7 @@ class Region:
             lon (float): Longitude
             climate (str): Climate type
             soil_type (str): Dominant soil type
-            data (dict): Optional pre-calculated data
+            data (dict): Optional pre-calculated data ('climatology', 'koppen')
         """
         self.name = name
         self.lat = lat
@@ -25,6 +27,19 @@ class Region:
         self.climate = climate
         self.soil_type = soil_type
         self.data = data or {}
+        self._profile = None
+
+    @property
+    def profile(self):
+        """
+        Climate profile of the region (built on first use, rebuilt if the climate changes)
+
+        Returns:
+            ClimateProfile: Profile
+        """
+        if self._profile is None or self._profile.name != self.climate:
+            self._profile = ClimateProfile(self.climate, self.data.get('koppen'), self.data.get('climatology'))
+        return self._profile
 
     def get_recommended_crops(self):
         """
@@ -33,61 +48,20 @@ class Region:
         Returns:
             list: List of recommended crop types
         """
-        climate_lower = self.climate.lower()
-
-        if 'tropical' in climate_lower or 'humid' in climate_lower:
-            return ['maize', 'sorghum']
-        elif 'sahel' in climate_lower or 'arid' in climate_lower or 'semi-arid' in climate_lower:
-            return ['sorghum', 'maize']
-        elif 'continental' in climate_lower or 'océanique' in climate_lower or 'tempéré' in climate_lower:
-            return ['wheat', 'maize']
-        else:
-            return ['maize']  # Default
+        return list(self.profile.recommended_crops)
 
     def get_climate_characteristics(self):
         """
         Get climate characteristics for this region
 
+        Taken from the location's multi-year climatology when available
+        (data['climatology'], see ClimatologyStore.summary), otherwise
+        typical values of the climate type.
+
         Returns:
             dict: Climate characteristics
         """
-        climate_lower = self.climate.lower()
-
-        if 'tropical' in climate_lower:
-            return {
-                'avg_temp': 26,
-                'avg_rain': 150,  # mm per month
-                'rain_variability': 'high',
-                'typical_events': ['heavy_rain', 'drought']
-            }
-        elif 'sahel' in climate_lower or 'semi-arid' in climate_lower:
-            return {
-                'avg_temp': 32,
-                'avg_rain': 50,
-                'rain_variability': 'very_high',
-                'typical_events': ['drought', 'heatwave']
-            }
-        elif 'continental' in climate_lower:
-            return {
-                'avg_temp': 15,
-                'avg_rain': 80,
-                'rain_variability': 'medium',
-                'typical_events': ['frost', 'cold_snap']
-            }
-        elif 'subtropical' in climate_lower:
-            return {
-                'avg_temp': 20,
-                'avg_rain': 100,
-                'rain_variability': 'medium',
-                'typical_events': ['heavy_rain', 'drought']
-            }
-        else:
-            return {
-                'avg_temp': 22,
-                'avg_rain': 100,
-                'rain_variability': 'medium',
-                'typical_events': ['drought']
-            }
+        return self.profile.characteristics
 
     def to_dict(self):
         """Export region as dictionary"""
@@ -97,6 +71,7 @@ class Region:
             'lon': self.lon,
             'climate': self.climate,
             'soil_type': self.soil_type,
+            'koppen': self.profile.koppen,
             'recommended_crops': self.get_recommended_crops(),
             'characteristics': self.get_climate_characteristics()
         }
@@ -3,6 +3,108 @@ Soil model for TerraGrow Academy
 Handles soil moisture, nitrogen, and water balance
 """
 
+import numpy as np
+
+
+def daily_water_balance(moisture, water_in, water_out, field_capacity, drainage_rate, wilting_point):
+    """
+    Soil.update_moisture applied day by day, on arrays
+
+    A single field's days are solved in runs rather than one at a time
+    (see _water_balance_runs). Several rows step the days together: their
+    regimes change on different days, so per-row runs would cost more
+    passes than the seven vectorized days. drainage_rate is a daily rate
+    (see Soil.update_moisture_daily).
+
+    Args:
+        moisture (float or ndarray): Moisture before the first day (%), scalar or shape (n,)
+        water_in (array-like): Daily rain + irrigation (mm), shape (days,) or (n, days)
+        water_out (array-like): Daily evapotranspiration (mm), same shape
+        field_capacity (float): Drainage above this level (%)
+        drainage_rate (float): Share of the excess drained per day
+        wilting_point (float): Lower bound (%)
+
+    Returns:
+        tuple: (daily moisture, daily drainage), shape of water_in
+    """
+    net = np.asarray(water_in, dtype=float) - np.asarray(water_out, dtype=float)
+    if net.ndim == 1:
+        return _water_balance_runs(float(moisture), net, field_capacity, drainage_rate, wilting_point)
+
+    levels = np.empty(net.shape)
+    drainage = np.empty(net.shape)
+    moisture = np.asarray(moisture, dtype=float)
+    for day in range(net.shape[-1]):
+        moisture = moisture + net[..., day]
+        drained = np.where(moisture > field_capacity, (moisture - field_capacity) * drainage_rate, 0.0)
+        moisture = np.clip(moisture - drained, wilting_point, 100)
+        levels[..., day] = moisture
+        drainage[..., day] = drained
+
+    return levels, drainage
+
+
+def _water_balance_runs(moisture, net, field_capacity, drainage_rate, wilting_point):
+    """
+    Daily water balance of one field, solved in closed form over runs of days
+
+    Each run keeps the regime of its first day:
+    - free (at most field capacity): running sum of the net water,
+      reflected at the wilting point (cumsum + running max)
+    - draining: the excess over field capacity follows
+      e[t] = (1 - rate) * (e[t-1] + net[t]), a discounted cumsum
+    - saturated: held at 100 while each day's water covers its drain
+    A week costs one pass per regime change rather than one per day.
+
+    Args:
+        moisture (float): Moisture before the first day (%)
+        net (ndarray): Daily water in - water out (mm), shape (days,)
+        field_capacity (float): Drainage above this level (%)
+        drainage_rate (float): Share of the excess drained per day
+        wilting_point (float): Lower bound (%)
+
+    Returns:
+        tuple: (daily moisture, daily drainage)
+    """
+    days = len(net)
+    levels = np.empty(days)
+    drainage = np.zeros(days)
+    keep = 1 - drainage_rate
+    decay = keep ** np.arange(1, days + 1)  # keep ** (t + 1)
+    headroom = 100 - field_capacity
+
+    day = 0
+    while day < days:
+        rest = net[day:]
+        start = moisture + rest[0] - field_capacity
+
+        if not start > 0:
+            path = moisture + np.cumsum(rest)
+            path += np.maximum(np.maximum.accumulate(wilting_point - path), 0)
+            drained = 0.0
+            stop = path > field_capacity
+        elif keep * start <= headroom:
+            span = decay[:days - day]
+            excess = span * (moisture - field_capacity + np.cumsum(rest * (keep / span)))
+            path = field_capacity + excess
+            drained = excess * (drainage_rate / keep)
+            stop = (excess <= 0) | (excess > headroom)
+        else:
+            excess = headroom + rest
+            excess[0] = start
+            path = 100.0
+            drained = excess * drainage_rate
+            stop = keep * excess < headroom
+
+        # The first day always fits its regime; the run ends at the first day that does not
+        length = int(stop.argmax()) or days - day
+        levels[day:day + length] = path if np.ndim(path) == 0 else path[:length]
+        drainage[day:day + length] = drained if np.ndim(drained) == 0 else drained[:length]
+        moisture = levels[day + length - 1]
+        day += length
+
+    return levels, drainage
+
 
 class Soil:
     """Represents soil in the game"""
@@ -23,6 +125,10 @@ class Soil:
         self.drainage_rate = parameters['drainage_rate']
         self.nitrogen_retention = parameters['nitrogen_retention']
 
+        # Volumetric water content (m3/m3) at the same points, for SMAP observations
+        self.vwc_wilting_point = parameters.get('vwc_wilting_point', 0.12)
+        self.vwc_field_capacity = parameters.get('vwc_field_capacity', 0.30)
+
         # Current state
         self.moisture = initial_moisture
         self.nitrogen = 80  # kg/ha initial
@@ -73,6 +179,78 @@ class Soil:
             'status': self._get_moisture_status()
         }
 
+    def update_moisture_daily(self, rain, irrigation, evapotranspiration):
+        """
+        Update soil moisture with one water balance step per day
+
+        The soil's drainage rate is a weekly share of the excess; each day
+        drains 1 - (1 - rate) ** (1/7), which over seven days of excess
+        removes the same share as one weekly step.
+
+        Args:
+            rain (array-like): Daily precipitation (mm)
+            irrigation (array-like): Daily irrigation (mm)
+            evapotranspiration (array-like): Daily ET (mm)
+
+        Returns:
+            dict: Moisture update info (weekly totals, as update_moisture)
+                plus 'daily_moisture'
+        """
+        water_in = np.asarray(rain, dtype=float) + np.asarray(irrigation, dtype=float)
+        water_out = np.asarray(evapotranspiration, dtype=float)
+
+        daily_rate = 1 - (1 - self.drainage_rate) ** (1 / 7)
+        levels, drainage = daily_water_balance(self.moisture, water_in, water_out, self.field_capacity,
+                                               daily_rate, self.wilting_point)
+        drainage = float(drainage.sum())
+
+        # Nitrogen leaching from drainage
+        nitrogen_loss = drainage * (1 - self.nitrogen_retention) * 0.5
+        self.nitrogen = max(0, self.nitrogen - nitrogen_loss)
+
+        self.moisture = float(levels[-1])
+
+        return {
+            'moisture': self.moisture,
+            'water_in': float(water_in.sum()),
+            'water_out': float(water_out.sum()),
+            'drainage': drainage,
+            'nitrogen_leached': nitrogen_loss,
+            'status': self._get_moisture_status(),
+            'daily_moisture': levels.tolist()
+        }
+
+    def moisture_from_volumetric(self, vwc):
+        """
+        Convert an observed volumetric water content to the game's % scale
+
+        Wilting point and field capacity are matched between both scales.
+
+        Args:
+            vwc (float): Soil moisture (m3/m3), e.g. from SMAP
+
+        Returns:
+            float: Moisture (%)
+        """
+        relative = (vwc - self.vwc_wilting_point) / (self.vwc_field_capacity - self.vwc_wilting_point)
+        moisture = self.wilting_point + relative * (self.field_capacity - self.wilting_point)
+        return max(self.wilting_point, min(moisture, 100))
+
+    def assimilate_observation(self, vwc, weight):
+        """
+        Nudge moisture toward an observation
+
+        Args:
+            vwc (float): Observed soil moisture (m3/m3)
+            weight (float): 0 (ignore) to 1 (replace by the observation)
+
+        Returns:
+            float: Correction applied (%)
+        """
+        correction = weight * (self.moisture_from_volumetric(vwc) - self.moisture)
+        self.moisture += correction
+        return correction
+
     def add_fertilizer(self, nitrogen_kg):
         """
         Add nitrogen fertilizer
@@ -3,19 +3,32 @@ AppEEARS API Service
 Extracts MODIS NDVI and SMAP soil moisture data
 """
 
+import os
+import sys
 import requests
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import Config
+from .appeears_orchestrator import AppEEARSOrchestrator
+from .download_manager import VerifiedDownloader
+
 
 class AppEEARSAPI:
     """Wrapper for NASA AppEEARS API"""
 
     def __init__(self):
-        self.base_url = "https://appeears.earthdatacloud.nasa.gov/api"
+        self.base_url = Config.APPEEARS_API_URL
         self.token = None
         self.token_expiration = None
+        self.downloader = VerifiedDownloader(
+            Config.DOWNLOAD_CACHE_DIR,
+            chunk_size=Config.APPEEARS_CHUNK_SIZE,
+            max_attempts=Config.DOWNLOAD_MAX_ATTEMPTS
+        )
 
     def login(self, username, password):
         """
@@ -68,6 +81,23 @@ class AppEEARSAPI:
             end_date (str): End date (MM-DD-YYYY)
             layers (list): List of layer dicts [{'product': 'MOD13Q1.061', 'layer': '_250m_16_days_NDVI'}]
 
+        Returns:
+            str: task_id if successful, None otherwise
+        """
+        coordinates = [{'latitude': lat, 'longitude': lon, 'id': f'{lat}_{lon}'}]
+        return self.submit_points_task(task_name, coordinates, start_date, end_date, layers)
+
+    def submit_points_task(self, task_name, coordinates, start_date, end_date, layers):
+        """
+        Submit one point extraction task for many coordinates
+
+        Args:
+            task_name (str): Name for the task
+            coordinates (list): Coordinate dicts [{'latitude': 3.87, 'longitude': 11.52, 'id': 'yaounde'}]
+            start_date (str): Start date (MM-DD-YYYY)
+            end_date (str): End date (MM-DD-YYYY)
+            layers (list): List of layer dicts
+
         Returns:
             str: task_id if successful, None otherwise
         """
@@ -80,11 +110,7 @@ class AppEEARSAPI:
                     'endDate': end_date
                 }],
                 'layers': layers,
-                'coordinates': [{
-                    'latitude': lat,
-                    'longitude': lon,
-                    'id': f'{lat}_{lon}'
-                }]
+                'coordinates': coordinates
             }
         }
 
@@ -154,6 +180,7 @@ class AppEEARSAPI:
 
         start_time = time.time()
         max_wait_seconds = max_wait_minutes * 60
+        delay = Config.APPEEARS_POLL_MIN
 
         while (time.time() - start_time) < max_wait_seconds:
             # Check task status
@@ -182,25 +209,24 @@ class AppEEARSAPI:
                     if 'summary' in progress:
                         print(f"   Progress: {progress['summary']}%")
 
-            # Wait before next check
-            time.sleep(10)
+            # Adaptive backoff: short tasks finish fast, long ones are not hammered
+            time.sleep(min(delay, max(0, max_wait_seconds - (time.time() - start_time))))
+            delay = min(delay * 2, Config.APPEEARS_POLL_MAX)
 
         print(f"⏰ Timeout waiting for task")
         return False
 
-    def download_task_files(self, task_id, output_dir='.'):
+    def get_bundle(self, task_id):
         """
-        Download all files from completed task
+        List the files of a completed task
 
         Args:
             task_id (str): Task ID
-            output_dir (str): Directory to save files
 
         Returns:
-            list: List of downloaded file paths
+            list: File dicts (file_id, file_name, file_size, sha256), None on error
         """
         try:
-            # Get bundle (list of files)
             response = requests.get(
                 f"{self.base_url}/bundle/{task_id}",
                 headers=self.get_headers(),
@@ -209,45 +235,66 @@ class AppEEARSAPI:
 
             if response.status_code != 200:
                 print(f"❌ Failed to get bundle: {response.text}")
-                return []
+                return None
 
-            bundle = response.json()
-            files = bundle.get('files', [])
+            return response.json().get('files', [])
 
-            downloaded_files = []
+        except Exception as e:
+            print(f"❌ Bundle error: {e}")
+            return None
 
-            for file_info in files:
-                file_id = file_info['file_id']
-                file_name = file_info['file_name']
-                file_path = f"{output_dir}/{file_name}"
+    def download_file(self, task_id, file_info, output_dir='.'):
+        """
+        Download one bundle file (resumable, verified against the bundle sha256)
 
-                print(f"📥 Downloading: {file_name}")
+        Args:
+            task_id (str): Task ID
+            file_info (dict): Bundle file entry
+            output_dir (str): Directory to save the file
 
-                # Download file
-                file_response = requests.get(
-                    f"{self.base_url}/bundle/{task_id}/{file_id}",
-                    headers=self.get_headers(),
-                    allow_redirects=True,
-                    stream=True,
-                    timeout=60
-                )
+        Returns:
+            str: Saved file path, None on error
+        """
+        file_path = os.path.join(output_dir, file_info['file_name'])
 
-                if file_response.status_code == 200:
-                    with open(file_path, 'wb') as f:
-                        for chunk in file_response.iter_content(chunk_size=8192):
-                            f.write(chunk)
+        try:
+            path = self.downloader.download(
+                f"{self.base_url}/bundle/{task_id}/{file_info['file_id']}",
+                file_path,
+                sha256=file_info.get('sha256'),
+                size=file_info.get('file_size'),
+                headers=self.get_headers()
+            )
+        except Exception as e:
+            print(f"   ❌ Download error ({file_info['file_name']}): {e}")
+            return None
 
-                    print(f"   ✅ Saved: {file_path}")
-                    downloaded_files.append(file_path)
-                else:
-                    print(f"   ❌ Download failed: {file_response.status_code}")
+        if path:
+            print(f"   ✅ Saved: {file_path}")
+        return path
 
-            return downloaded_files
+    def download_task_files(self, task_id, output_dir='.'):
+        """
+        Download all files from completed task
 
-        except Exception as e:
-            print(f"❌ Download error: {e}")
+        Args:
+            task_id (str): Task ID
+            output_dir (str): Directory to save files
+
+        Returns:
+            list: List of downloaded file paths
+        """
+        files = self.get_bundle(task_id)
+        if not files:
             return []
 
+        print(f"📥 Downloading {len(files)} files")
+
+        with ThreadPoolExecutor(max_workers=Config.APPEEARS_DOWNLOAD_WORKERS) as pool:
+            paths = pool.map(lambda file_info: self.download_file(task_id, file_info, output_dir), files)
+
+        return [path for path in paths if path]
+
     def extract_ndvi_smap_data(self, lat, lon, region_name, output_dir='data/appeears'):
         """
         Complete workflow: Extract NDVI and SMAP data for a location
@@ -261,7 +308,6 @@ class AppEEARSAPI:
         Returns:
             dict: Extracted data or None
         """
-        import os
         os.makedirs(output_dir, exist_ok=True)
 
         # Date range: last 12 months
@@ -284,42 +330,28 @@ class AppEEARSAPI:
             # Note: SMAP requires specific products - check availability
         ]
 
-        # Submit task
-        task_name = f"terragrow_{region_name.lower().replace(' ', '_')}"
-        task_id = self.submit_point_task(
-            task_name=task_name,
-            lat=lat,
-            lon=lon,
-            start_date=start_str,
-            end_date=end_str,
-            layers=layers
+        # Submit (or resume) the task, wait and download
+        orchestrator = AppEEARSOrchestrator(
+            self, Config.APPEEARS_STATE_FILE, output_dir,
+            download_workers=Config.APPEEARS_DOWNLOAD_WORKERS,
+            poll_min=Config.APPEEARS_POLL_MIN,
+            poll_max=Config.APPEEARS_POLL_MAX
+        )
+        result = orchestrator.run(
+            f"terragrow_{region_name.lower().replace(' ', '_')}",
+            [{'id': f'{lat}_{lon}', 'lat': lat, 'lon': lon}],
+            start_str, end_str, layers, max_wait=10 * 60
         )
 
-        if not task_id:
-            return None
-
-        # Wait for completion
-        if not self.wait_for_task(task_id, max_wait_minutes=10):
-            return None
-
-        # Download results
-        files = self.download_task_files(task_id, output_dir)
-
-        if not files:
+        if not result['complete'] or not result['csv_files']:
             return None
 
-        # Parse CSV results
-        csv_files = [f for f in files if f.endswith('.csv')]
-
-        if csv_files:
-            print(f"✅ Data extracted to: {csv_files[0]}")
-            return {
-                'task_id': task_id,
-                'files': files,
-                'csv_file': csv_files[0]
-            }
-
-        return None
+        print(f"✅ Data extracted to: {result['csv_files'][0]}")
+        return {
+            'task_id': result['tasks'][0]['task_id'],
+            'files': result['files'],
+            'csv_file': result['csv_files'][0]
+        }
 
     def list_available_products(self):
         """
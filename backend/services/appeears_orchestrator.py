@@ -0,0 +1,219 @@
+"""
+AppEEARS Orchestrator
+Batches many locations into few point tasks, polls them and downloads results
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AppEEARSOrchestrator:
+    """
+    Resumable multi-coordinate AppEEARS extraction
+
+    Locations are packed into point tasks of up to max_coordinates each.
+    Every task (id, status, downloaded files) is saved to a JSON state file
+    as soon as it changes, so after a restart the same request resumes
+    polling or downloading instead of submitting the tasks again.
+    """
+
+    def __init__(self, api, state_file, output_dir, max_coordinates=500, download_workers=4,
+                 poll_min=5.0, poll_max=120.0):
+        """
+        Initialize orchestrator
+
+        Args:
+            api (AppEEARSAPI): Logged-in API client
+            state_file (str): JSON file of submitted tasks
+            output_dir (str): Downloads go to output_dir/<task name>/
+            max_coordinates (int): Max coordinates per point task
+            download_workers (int): Parallel file downloads
+            poll_min (float): First status polling interval (s)
+            poll_max (float): Longest polling interval (s)
+        """
+        self.api = api
+        self.state_file = state_file
+        self.output_dir = output_dir
+        self.max_coordinates = max_coordinates
+        self.download_workers = download_workers
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self._lock = threading.Lock()
+        self.state = self._load_state()
+
+    def run(self, name, locations, start_date, end_date, layers, max_wait=3600):
+        """
+        Extract layers for all locations
+
+        Args:
+            name (str): Task name prefix
+            locations (list): Location dicts {'id', 'lat', 'lon'}
+            start_date (str): Start date (MM-DD-YYYY)
+            end_date (str): End date (MM-DD-YYYY)
+            layers (list): Layer dicts [{'product': 'MOD13Q1.061', 'layer': '_250m_16_days_NDVI'}]
+            max_wait (float): Max polling time (s); unfinished tasks resume on the next run
+
+        Returns:
+            dict: {'tasks': [task records], 'files': [paths], 'csv_files': [paths], 'complete': bool}
+        """
+        batches = self._batches(locations)
+        keys = [self._ensure_task(name, i, batch, start_date, end_date, layers)
+                for i, batch in enumerate(batches)]
+        keys = [key for key in keys if key]
+
+        self._poll(keys, time.time() + max_wait)
+        self._download(keys)
+
+        tasks = [self.state[key] for key in keys]
+        files = [f['path'] for task in tasks for f in task.get('files', {}).values() if f.get('path')]
+
+        return {
+            'tasks': tasks,
+            'files': files,
+            'csv_files': [f for f in files if f.endswith('.csv')],
+            'complete': len(tasks) == len(batches) and all(task['status'] == 'downloaded' for task in tasks)
+        }
+
+    def _batches(self, locations):
+        """Split locations into AppEEARS coordinate lists"""
+        coordinates = [
+            {'id': str(loc.get('id', f"{loc['lat']}_{loc['lon']}")), 'latitude': loc['lat'], 'longitude': loc['lon']}
+            for loc in locations
+        ]
+        return [coordinates[i:i + self.max_coordinates] for i in range(0, len(coordinates), self.max_coordinates)]
+
+    def _ensure_task(self, name, index, coordinates, start_date, end_date, layers):
+        """
+        Submit a batch unless the same request is already known
+
+        Returns:
+            str: State key, None if submission failed
+        """
+        request = {'coordinates': coordinates, 'start_date': start_date, 'end_date': end_date, 'layers': layers}
+        key = hashlib.sha1(json.dumps(request, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+        task = self.state.get(key)
+        if task and task['status'] != 'error':
+            print(f"↻ Resuming task {task['task_name']} ({task['status']})")
+            return key
+
+        task_name = f"{name}_{index + 1}"
+        task_id = self.api.submit_points_task(task_name, coordinates, start_date, end_date, layers)
+        if not task_id:
+            return None
+
+        self._update(key, {
+            'task_id': task_id,
+            'task_name': task_name,
+            'coordinates': len(coordinates),
+            'status': 'pending',
+            'files': {},
+            'submitted': time.time()
+        })
+        return key
+
+    def _poll(self, keys, deadline):
+        """Poll unfinished tasks, backing off while nothing changes"""
+        delay = self.poll_min
+
+        while True:
+            pending = [key for key in keys if self.state[key]['status'] not in ('done', 'downloaded', 'error')]
+            if not pending or time.time() >= deadline:
+                return
+
+            changed = False
+            for key in pending:
+                task = self.state[key]
+                status = self.api.get_task_status(task['task_id'])
+                if not status:
+                    continue
+
+                progress = status.get('progress', {}).get('summary') if isinstance(status.get('progress'), dict) else None
+                new_status = status.get('status', task['status'])
+                if new_status != task['status'] or progress != task.get('progress'):
+                    changed = True
+                    self._update(key, dict(task, status=new_status, progress=progress))
+                    print(f"   {task['task_name']}: {new_status}" + (f" ({progress}%)" if progress is not None else ""))
+
+            # Any progress resets the interval, otherwise wait twice as long
+            delay = self.poll_min if changed else min(delay * 2, self.poll_max)
+            if any(self.state[key]['status'] not in ('done', 'downloaded', 'error') for key in keys):
+                time.sleep(max(0, min(delay, deadline - time.time())))
+
+    def _download(self, keys):
+        """Download the missing files of finished tasks in parallel"""
+        jobs = []
+        for key in keys:
+            task = self.state[key]
+            if task['status'] not in ('done', 'downloaded'):
+                continue
+
+            if not task['files']:
+                bundle = self.api.get_bundle(task['task_id'])
+                if bundle is None:
+                    continue
+                self._update(key, dict(task, files={f['file_id']: dict(f, path=None) for f in bundle}))
+                task = self.state[key]
+
+            task_dir = os.path.join(self.output_dir, task['task_name'])
+            for file_info in task['files'].values():
+                path = file_info.get('path')
+                if not path or not os.path.exists(path) or os.path.getsize(path) != file_info.get('file_size'):
+                    jobs.append((key, file_info, task_dir))
+
+        if jobs:
+            print(f"📥 Downloading {len(jobs)} files ({self.download_workers} in parallel)")
+            with ThreadPoolExecutor(max_workers=self.download_workers) as pool:
+                list(pool.map(lambda job: self._download_one(*job), jobs))
+
+        for key in keys:
+            task = self.state[key]
+            if task['status'] == 'done' and task['files'] and all(f.get('path') for f in task['files'].values()):
+                self._update(key, dict(task, status='downloaded'))
+
+    def _download_one(self, key, file_info, task_dir):
+        """Download one file and record it in the state"""
+        path = self.api.download_file(self.state[key]['task_id'], file_info, task_dir)
+
+        with self._lock:
+            task = self.state[key]
+            task['files'][file_info['file_id']] = dict(file_info, path=path)
+            self._save_state()
+
+    def _update(self, key, task):
+        """Replace a task record and persist the state"""
+        with self._lock:
+            self.state[key] = task
+            self._save_state()
+
+    def _load_state(self):
+        """Load the task state file"""
+        if not os.path.exists(self.state_file):
+            return {}
+
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Unreadable AppEEARS state, starting fresh: {e}")
+            return {}
+
+    def _save_state(self):
+        """
+        Write the state atomically (caller holds the lock)
+
+        The lock only orders this instance's download threads; the temp
+        file is unique so other orchestrators on the same state file
+        (app and batch script) never write into each other's copy.
+        """
+        directory = os.path.dirname(self.state_file) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
@@ -0,0 +1,112 @@
+"""
+Climate Delta Service
+"+2 °C, -15% rain" variants of historical weekly weather
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+
+class ClimateDelta:
+    """
+    Delta-change perturbation of weekly weather
+
+    Temperatures are shifted, rain totals scaled, and reference ET is
+    recomputed through the temperature term of Hargreaves,
+    ET0 ~ (T + 17.8) * sqrt(Tmax - Tmin) * Ra: a uniform shift keeps the
+    diurnal range and radiation, so ET0 scales by (T + dT + 17.8) / (T + 17.8).
+    Relative humidity is kept as observed.
+    """
+
+    LIMITS = {
+        'temperature': (-10.0, 10.0),  # °C shift
+        'precipitation': (-100.0, 200.0)  # % change
+    }
+    TEMPERATURE_FIELDS = ('temperature_avg', 'temperature_max', 'temperature_min')
+
+    def __init__(self, temperature=0.0, precipitation=0.0):
+        """
+        Initialize delta
+
+        Args:
+            temperature (float): Temperature shift (°C)
+            precipitation (float): Rain change (%), e.g. -15
+        """
+        self.temperature = float(temperature)
+        self.precipitation = float(precipitation)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Parse a request delta ({'temperature': 2, 'precipitation': -15})
+
+        Returns:
+            ClimateDelta: Delta, or None if data is empty
+
+        Raises:
+            ValueError: Unknown key, non-numeric or out-of-range value
+        """
+        if not data:
+            return None
+        if not isinstance(data, dict):
+            raise ValueError("delta must be an object like {'temperature': 2, 'precipitation': -15}")
+
+        values = {}
+        for key, value in data.items():
+            if key not in cls.LIMITS:
+                raise ValueError(f"Unknown delta '{key}' (expected {', '.join(cls.LIMITS)})")
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"delta '{key}' must be a number")
+
+            low, high = cls.LIMITS[key]
+            if not low <= value <= high:
+                raise ValueError(f"delta '{key}' must be between {low:g} and {high:g}")
+            values[key] = value
+
+        return cls(**values)
+
+    def is_zero(self):
+        """True if the delta changes nothing"""
+        return self.temperature == 0 and self.precipitation == 0
+
+    def to_dict(self):
+        """Delta as a JSON-serializable dict"""
+        return {'temperature': self.temperature, 'precipitation': self.precipitation}
+
+    def cache_key(self, *scope):
+        """
+        Hash of the delta and what it applies to (e.g. scenario id, variant)
+
+        Returns:
+            str: sha1 hex digest
+        """
+        payload = json.dumps([list(scope), self.to_dict()], sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def apply(self, arrays):
+        """
+        Apply the delta to weekly weather arrays
+
+        Args:
+            arrays (dict): weather.json field name -> array (any shape)
+
+        Returns:
+            dict: New arrays (fields without a delta are returned unchanged)
+        """
+        result = dict(arrays)
+
+        for field in self.TEMPERATURE_FIELDS:
+            if field in arrays:
+                result[field] = arrays[field] + self.temperature
+
+        if 'precipitation_total' in arrays:
+            result['precipitation_total'] = arrays['precipitation_total'] * (1 + self.precipitation / 100)
+
+        if 'et0_total' in arrays and 'temperature_avg' in arrays:
+            base = np.maximum(arrays['temperature_avg'] + 17.8, 0.1)
+            ratio = np.maximum(arrays['temperature_avg'] + self.temperature + 17.8, 0) / base
+            result['et0_total'] = arrays['et0_total'] * ratio
+
+        return result
@@ -0,0 +1,384 @@
+"""
+Climatology Service
+Multi-year day-of-year statistics per POWER grid cell, stored as memory-mapped arrays
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import Config
+from .evapotranspiration import et0_from_columns
+from .koppen import KOPPEN_LABELS, classify_koppen
+from .nasa_power_bulk import NASAPowerBulkFetcher
+from .power_cleaning import OBSERVED, mask_fill_values
+from .weather_generator import WeatherGenerator
+
+# Month (0-11) of each day of the 365-day calendar
+MONTH_OF_DAY = (np.datetime64('2001-01-01') + np.arange(365)).astype('datetime64[M]').astype(int) % 12
+
+
+class ClimatologyStore:
+    """
+    Per-cell climatology: one float32 array of shape (len(FIELDS), 365)
+
+    Each day of year pools +/- Config.CLIMATOLOGY_WINDOW_DAYS days over all
+    years of the cell's daily record (WeatherStore). Files are .npy, opened
+    memory-mapped, so serving a location reads a few kB and nothing is
+    recomputed. Cells follow the WeatherStore grid.
+    """
+
+    FIELDS = (
+        'temperature_mean', 'temperature_std', 'temperature_p10', 'temperature_p50', 'temperature_p90',
+        'precipitation_mean', 'precipitation_p90', 'wet_day_frequency', 'wet_day_mean',
+        'wet_after_wet', 'wet_after_dry',
+        'humidity_mean', 'et0_mean',
+        'heat_probability', 'frost_probability', 'cold_probability', 'heavy_rain_probability',
+        'dry_week_probability'
+    )
+
+    # Weekly event probabilities (from daily ones) matching GameState event types
+    EVENTS = ('drought', 'heatwave', 'frost', 'heavy_rain', 'cold_snap')
+
+    def __init__(self, store_dir, weather_store):
+        """
+        Initialize store
+
+        Args:
+            store_dir (str): Directory of the climatology files
+            weather_store (WeatherStore): Daily records (and grid) the climatology is built from
+        """
+        self.store_dir = store_dir
+        self.weather_store = weather_store
+        self._maps = {}
+        self._summaries = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def build(self, lat, lon):
+        """
+        Build the climatology of the cell containing (lat, lon)
+
+        Only observed days count: days the cleaning filled in (interpolated
+        or climatology, <param>_QC) are treated as missing.
+
+        Returns:
+            tuple: (row, col) or None without enough years of daily data
+        """
+        cell = self.weather_store.load(lat, lon)
+        if cell is None:
+            return None
+
+        suffix = NASAPowerBulkFetcher.QUALITY_SUFFIX
+        arrays = cell['arrays']
+        columns = {}
+        for name, values in arrays.items():
+            if name.endswith(suffix):
+                continue
+            values = mask_fill_values(values)
+            if name + suffix in arrays:
+                values[np.asarray(arrays[name + suffix]) != OBSERVED] = np.nan
+            columns[name] = values
+        dates = cell['dates']
+        day_of_year = (dates - dates.astype('datetime64[Y]')).astype(int) + 1
+        columns['ET0'] = et0_from_columns(columns, lat, day_of_year, cell['elevation'] or 0.0)
+
+        table = self.compute(dates, columns)
+        if table is None:
+            return None
+
+        row, col = cell['cell']
+        path = self._cell_path(row, col)
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.npy')
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, table)
+        with self._lock:
+            os.replace(tmp_path, path)
+            self._maps.pop((row, col), None)
+            self._summaries.pop((row, col), None)
+        return row, col
+
+    def build_all(self):
+        """
+        Build every cell of the weather store
+
+        Returns:
+            list: Built (row, col) cells
+        """
+        built = []
+        for row, col in self.weather_store.list_cells():
+            lat, lon = self.weather_store.cell_center(row, col)
+            if self.build(lat, lon) is not None:
+                built.append((row, col))
+        return built
+
+    @classmethod
+    def compute(cls, dates, columns):
+        """
+        Day-of-year statistics of daily POWER arrays
+
+        Args:
+            dates (ndarray): datetime64[D] of each value
+            columns (dict): T2M, T2M_MAX, T2M_MIN, PRECTOTCORR, RH2M, ET0 arrays (NaN = missing)
+
+        Returns:
+            ndarray: float32 (len(FIELDS), 365), or None with fewer than
+                Config.CLIMATOLOGY_MIN_YEARS years
+        """
+        years = dates.astype('datetime64[Y]').astype(int)
+        if len(np.unique(years)) < Config.CLIMATOLOGY_MIN_YEARS:
+            return None
+
+        # (year, day of year) grids on a 365-day calendar: 29 February is dropped
+        offset = (dates - dates.astype('datetime64[Y]')).astype(int)
+        leap = ((years + 1970) % 4 == 0) & (((years + 1970) % 100 != 0) | ((years + 1970) % 400 == 0))
+        keep = ~(leap & (offset == 59))
+        day = offset - (leap & (offset > 59))
+        year_index = years - years.min()
+        n_years = int(year_index.max()) + 1
+
+        def grid(name):
+            values = np.full((n_years, 365), np.nan)
+            source = columns.get(name)
+            if source is not None:
+                values[year_index[keep], day[keep]] = np.asarray(source, dtype=float)[keep]
+            return values
+
+        temperature, t_max, t_min = grid('T2M'), grid('T2M_MAX'), grid('T2M_MIN')
+        rain, humidity, et0 = grid('PRECTOTCORR'), grid('RH2M'), grid('ET0')
+
+        # Chronological series for day-to-day and 7-day quantities
+        flat_rain = rain.ravel()
+        wet = np.where(np.isfinite(flat_rain), flat_rain >= Config.CLIMATOLOGY_WET_DAY_MM, np.nan)
+        previous_wet = np.concatenate(([np.nan], wet[:-1]))
+        week_rain = np.full(flat_rain.size, np.nan)
+        if flat_rain.size >= 7:
+            week_rain[:flat_rain.size - 6] = np.lib.stride_tricks.sliding_window_view(flat_rain, 7).sum(axis=1)
+
+        def indicator(condition, values):
+            return np.where(np.isfinite(values), condition, np.nan)
+
+        shape = rain.shape
+        pooled = {
+            'temperature': cls._pool(temperature),
+            'rain': cls._pool(rain),
+            'humidity': cls._pool(humidity),
+            'et0': cls._pool(et0),
+            'wet': cls._pool(wet.reshape(shape)),
+            'wet_amount': cls._pool(np.where(wet.reshape(shape) == 1, rain, np.nan)),
+            'wet_wet': cls._pool(np.where(previous_wet == 1, wet, np.nan).reshape(shape)),
+            'dry_wet': cls._pool(np.where(previous_wet == 0, wet, np.nan).reshape(shape)),
+            'heat': cls._pool(indicator(t_max >= Config.CLIMATOLOGY_HEAT_C, t_max)),
+            'frost': cls._pool(indicator(t_min <= Config.CLIMATOLOGY_FROST_C, t_min)),
+            'cold': cls._pool(indicator(temperature <= Config.CLIMATOLOGY_COLD_C, temperature)),
+            'heavy': cls._pool(indicator(rain >= Config.CLIMATOLOGY_HEAVY_RAIN_MM, rain)),
+            'dry_week': cls._pool(indicator(week_rain < Config.CLIMATOLOGY_DRY_WEEK_MM, week_rain).reshape(shape))
+        }
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # days without data stay NaN
+            percentiles = np.nanpercentile(pooled['temperature'], [10, 50, 90], axis=1)
+            stats = {
+                'temperature_mean': np.nanmean(pooled['temperature'], axis=1),
+                'temperature_std': np.nanstd(pooled['temperature'], axis=1),
+                'temperature_p10': percentiles[0],
+                'temperature_p50': percentiles[1],
+                'temperature_p90': percentiles[2],
+                'precipitation_mean': np.nanmean(pooled['rain'], axis=1),
+                'precipitation_p90': np.nanpercentile(pooled['rain'], 90, axis=1),
+                'wet_day_frequency': np.nanmean(pooled['wet'], axis=1),
+                'wet_day_mean': np.nanmean(pooled['wet_amount'], axis=1),
+                'wet_after_wet': np.nanmean(pooled['wet_wet'], axis=1),
+                'wet_after_dry': np.nanmean(pooled['dry_wet'], axis=1),
+                'humidity_mean': np.nanmean(pooled['humidity'], axis=1),
+                'et0_mean': np.nanmean(pooled['et0'], axis=1),
+                'heat_probability': np.nanmean(pooled['heat'], axis=1),
+                'frost_probability': np.nanmean(pooled['frost'], axis=1),
+                'cold_probability': np.nanmean(pooled['cold'], axis=1),
+                'heavy_rain_probability': np.nanmean(pooled['heavy'], axis=1),
+                'dry_week_probability': np.nanmean(pooled['dry_week'], axis=1)
+            }
+
+        return np.array([stats[field] for field in cls.FIELDS], dtype=np.float32)
+
+    def load(self, lat, lon):
+        """
+        Climatology of the cell containing (lat, lon)
+
+        Returns:
+            dict: Field -> read-only array of 365 days (memory-mapped), or None if not built
+        """
+        row, col = self.weather_store.cell_for(lat, lon)
+        with self._lock:
+            table = self._maps.get((row, col))
+            if table is None:
+                path = self._cell_path(row, col)
+                if not os.path.exists(path):
+                    return None
+                table = np.load(path, mmap_mode='r')
+                self._maps[(row, col)] = table
+
+        return {field: table[i] for i, field in enumerate(self.FIELDS)}
+
+    def daily(self, lat, lon, start_day, days):
+        """
+        Climatology over consecutive days (the year wraps around)
+
+        Args:
+            start_day (int): First day of year (1-366)
+            days (int): Number of days
+
+        Returns:
+            dict: Field -> array of `days` values, or None if not built
+        """
+        climatology = self.load(lat, lon)
+        if climatology is None:
+            return None
+        index = (min(start_day, 365) - 1 + np.arange(days)) % 365
+        return {field: np.asarray(values[index], dtype=float) for field, values in climatology.items()}
+
+    def typical_weeks(self, lat, lon, start_day, weeks=12):
+        """
+        "Typical year" weekly weather: climatological means from a start day
+
+        Returns:
+            list: Weekly dicts like NASAPowerAPI.get_weekly_aggregates, or None if not built
+        """
+        daily = self.daily(lat, lon, start_day, weeks * 7)
+        if daily is None:
+            return None
+
+        def weekly(field, total=False):
+            blocks = daily[field].reshape(weeks, 7)
+            return blocks.sum(axis=1) if total else blocks.mean(axis=1)
+
+        columns = {
+            'temperature': weekly('temperature_mean'),
+            'precipitation': weekly('precipitation_mean', total=True),
+            'humidity': weekly('humidity_mean'),
+            'evapotranspiration': weekly('et0_mean', total=True)
+        }
+        return [dict({key: round(float(values[i]), 1) for key, values in columns.items()},
+                     week=i + 1, completeness=0.0, complete=False) for i in range(weeks)]
+
+    def add_anomalies(self, lat, lon, weeks, start_day):
+        """
+        Annotate weekly weather with its departure from the climatology
+
+        Adds temperature_anomaly (°C) and precipitation_anomaly (mm vs. the
+        week's normal) to each week dict, in place.
+
+        Returns:
+            bool: False if the cell has no climatology
+        """
+        normal = self.typical_weeks(lat, lon, start_day, len(weeks))
+        if normal is None:
+            return False
+
+        for week, typical in zip(weeks, normal):
+            week['temperature_anomaly'] = round(week['temperature'] - typical['temperature'], 1)
+            week['precipitation_anomaly'] = round(week['precipitation'] - typical['precipitation'], 1)
+        return True
+
+    def weather_generator(self, lat, lon, start_day, days):
+        """
+        Stochastic generator fitted to the climatology of a period
+
+        Returns:
+            WeatherGenerator: Generator, or None if not built
+        """
+        daily = self.daily(lat, lon, start_day, days)
+        if daily is None:
+            return None
+        return WeatherGenerator.from_climatology(daily, base=WeatherGenerator.profile_for_latitude(lat))
+
+    def summary(self, lat, lon):
+        """
+        Climate characteristics of a location
+
+        Returns:
+            dict: avg_temp (°C), avg_rain (mm per month), annual_rain,
+                coldest/warmest_month_temp, koppen class, rain_variability,
+                weekly event_probabilities and typical_events; None if not built
+        """
+        cell = self.weather_store.cell_for(lat, lon)
+        if cell in self._summaries:
+            return self._summaries[cell]
+
+        climatology = self.load(lat, lon)
+        if climatology is None:
+            return None
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            temperature = np.asarray(climatology['temperature_mean'], dtype=float)
+            rain = np.nan_to_num(np.asarray(climatology['precipitation_mean'], dtype=float))
+            monthly_temperature = (np.bincount(MONTH_OF_DAY, weights=np.nan_to_num(temperature), minlength=12)
+                                   / np.bincount(MONTH_OF_DAY, minlength=12))
+            monthly_rain = np.bincount(MONTH_OF_DAY, weights=rain, minlength=12)
+
+            def weekly(field):
+                daily_probability = np.nan_to_num(np.asarray(climatology[field], dtype=float))
+                return float(np.mean(1 - (1 - daily_probability) ** 7))
+
+            probabilities = {
+                'drought': float(np.nanmean(climatology['dry_week_probability'])),
+                'heatwave': weekly('heat_probability'),
+                'frost': weekly('frost_probability'),
+                'heavy_rain': weekly('heavy_rain_probability'),
+                'cold_snap': float(np.nanmean(climatology['cold_probability']))
+            }
+        probabilities = {event: round(value if np.isfinite(value) else 0.0, 3) for event, value in probabilities.items()}
+
+        typical = sorted((event for event in self.EVENTS if probabilities[event] >= Config.CLIMATOLOGY_EVENT_THRESHOLD),
+                         key=lambda event: -probabilities[event])[:2]
+
+        seasonality = monthly_rain.std() / monthly_rain.mean() if monthly_rain.mean() > 0 else 0.0
+        if seasonality > 1.0:
+            variability = 'very_high'
+        elif seasonality > 0.6:
+            variability = 'high'
+        elif seasonality > 0.3:
+            variability = 'medium'
+        else:
+            variability = 'low'
+
+        summary = {
+            'avg_temp': round(float(np.nanmean(temperature)), 1),
+            'avg_rain': round(float(monthly_rain.sum() / 12), 1),
+            'annual_rain': round(float(monthly_rain.sum()), 1),
+            'coldest_month_temp': round(float(monthly_temperature.min()), 1),
+            'warmest_month_temp': round(float(monthly_temperature.max()), 1),
+            'koppen': classify_koppen(monthly_temperature, monthly_rain, lat),
+            'rain_variability': variability,
+            'event_probabilities': probabilities,
+            'typical_events': typical or ['drought']
+        }
+        self._summaries[cell] = summary
+        return summary
+
+    @staticmethod
+    def climate_label(summary):
+        """
+        Climate type name (same vocabulary as the scenarios) from a summary
+
+        Returns:
+            str: Name of the summary's Köppen class, e.g. 'Tropical savane', 'Semi-aride chaud'
+        """
+        return KOPPEN_LABELS[summary['koppen']]
+
+    @staticmethod
+    def _pool(values):
+        """(years, 365) -> (365, years * window) samples of each day of year and its neighbours"""
+        half = Config.CLIMATOLOGY_WINDOW_DAYS
+        index = (np.arange(365)[:, None] + np.arange(-half, half + 1)) % 365
+        return np.moveaxis(values[:, index], 0, 1).reshape(365, -1)
+
+    def _cell_path(self, row, col):
+        """Path of a cell file"""
+        return os.path.join(self.store_dir, f"clim_{row}_{col}.npy")
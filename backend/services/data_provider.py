@@ -5,30 +5,50 @@ Hybrid data provider that uses pre-calculated data or NASA API
 
 import json
 import os
+import sys
 import math
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from .nasa_power_api import NASAPowerAPI
 from .geocoding_service import GeocodingService
 from .historical_data_loader import HistoricalDataLoader
+from .climatology import ClimatologyStore
+from .nearest_raster import NearestRaster
+from .koppen import KOPPEN_LABELS, KoppenRaster
+from .soil_grid import SoilGrid
+from .weather_store import WeatherStore
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import Config
 
 
 class DataProvider:
     """Provides game data from static files or APIs"""
 
-    def __init__(self):
-        self.nasa_api = NASAPowerAPI()
-        self.geocoding = GeocodingService()
+    def __init__(self, geocoding=None):
+        self.climatology = ClimatologyStore(Config.CLIMATOLOGY_DIR, WeatherStore(Config.WEATHER_STORE_DIR))
+        self.nasa_api = NASAPowerAPI(climatology=self.climatology)
+        self.koppen = KoppenRaster(Config.KOPPEN_RASTER_FILE)
+        self.soil_grid = SoilGrid(Config.SOIL_GRID_FILE)
+        self.geocoding = geocoding or GeocodingService()
         self.historical_loader = HistoricalDataLoader()
         self.static_regions = self._load_popular_regions()
+        self.nearest_raster = NearestRaster(Config.NEAREST_RASTER_DIR, Config.NEAREST_RASTER_RESOLUTION)
+        self._raster_current = None  # raster layers matching the current catalog (checked on first use)
+
+        # Shared pool for independent API calls (geocoding + weather)
+        self.executor = ThreadPoolExecutor(
+            max_workers=Config.API_FETCH_WORKERS,
+            thread_name_prefix='terragrow-fetch'
+        )
 
     def _load_popular_regions(self):
         """Load popular regions from config"""
-        import sys
-        import os
-        sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-        from config import Config
         return Config.POPULAR_REGIONS
 
-    def get_game_data(self, lat, lon, season_id=None, region_id=None):
+    def get_game_data(self, lat, lon, season_id=None, region_id=None, variant=0, delta=None):
         """
         Get complete game data for a location
 
@@ -37,23 +57,27 @@ class DataProvider:
             lon (float): Longitude
             season_id (str): Optional season ID ('spring_2024', 'summer_2024')
             region_id (str): Optional region ID ('yaounde_cameroun', etc.)
+            variant (int): Weather ensemble member of a historical scenario (0 = observed)
+            delta (ClimateDelta): Climate-change delta for a historical scenario (optional)
 
         Returns:
             dict: Game data including region info and weather
         """
         # If region_id and season_id provided, use historical data
         if region_id and season_id:
-            historical_data = self.historical_loader.load_historical_data(region_id, season_id)
+            historical_data = self.historical_loader.load_historical_data(region_id, season_id, variant, delta)
             if historical_data:
                 return self._format_historical_data(historical_data)
 
         # If only season_id provided, find closest scenario
         if season_id:
-            closest = self.historical_loader.find_closest_scenario(lat, lon, season_id)
-            if closest and closest.get('distance_km', 999) < 50:
+            closest = self._find_closest_scenario(lat, lon, season_id)
+            if closest and closest.get('distance_km', 999) < Config.SCENARIO_MATCH_KM:
                 historical_data = self.historical_loader.load_historical_data(
                     closest['region_id'],
-                    closest['season_id']
+                    closest['season_id'],
+                    variant,
+                    delta
                 )
                 if historical_data:
                     return self._format_historical_data(historical_data)
@@ -65,11 +89,79 @@ class DataProvider:
             # Use popular region data
             return self._get_popular_region_data(closest_region, lat, lon)
         else:
-            # Use API for custom location
-            return self._get_api_region_data(lat, lon)
+            # Custom location: nearby scenarios when enabled, otherwise the API
+            interpolated = self._get_interpolated_region_data(lat, lon, season_id) \
+                if Config.INTERPOLATION_ENABLED else None
+            return interpolated or self._get_api_region_data(lat, lon)
+
+    def nearest_raster_layers(self):
+        """
+        Point sets of the nearest-location raster
+
+        Returns:
+            dict: 'popular_regions' and 'scenarios_<season_id>' -> list of (id, lat, lon)
+        """
+        layers = {'popular_regions': [(key, region['lat'], region['lon'])
+                                      for key, region in self.static_regions.items()]}
+        for scenario in self.historical_loader.get_available_scenarios():
+            layers.setdefault(f"scenarios_{scenario['season_id']}", []).append(
+                (scenario['id'], scenario['lat'], scenario['lon'])
+            )
+        return layers
+
+    def sync_nearest_raster(self):
+        """
+        Update the nearest-location raster (new locations only touch the cells they win)
+
+        Returns:
+            dict: Layer -> change (see NearestRaster.sync)
+        """
+        changes = self.nearest_raster.sync(self.nearest_raster_layers())
+        self._raster_current = set(changes)
+        return changes
+
+    def _raster_lookup(self, layer, lat, lon):
+        """
+        Nearest point of a raster layer, with its exact distance
+
+        Returns:
+            tuple: (point id, distance in km), or None when the layer is missing
+                or out of date (callers then search the points directly)
+        """
+        if self._raster_current is None:
+            self._raster_current = {name for name, points in self.nearest_raster_layers().items()
+                                    if self.nearest_raster.is_current(name, points)}
+
+        if layer not in self._raster_current:
+            return None
+
+        hit = self.nearest_raster.lookup(layer, lat, lon)
+        if hit is None:
+            return None
+
+        point = hit[0]
+        return point['id'], self._calculate_distance(lat, lon, point['lat'], point['lon'])
+
+    def _find_closest_scenario(self, lat, lon, season_id):
+        """Closest scenario of a season: raster lookup, catalog search without one"""
+        hit = self._raster_lookup(f"scenarios_{season_id}", lat, lon)
+        if hit is None:
+            return self.historical_loader.find_closest_scenario(lat, lon, season_id)
+
+        scenario_id, distance = hit
+        return {
+            'id': scenario_id,
+            'region_id': scenario_id[:-len(season_id) - 1],
+            'season_id': season_id,
+            'distance_km': round(distance, 1)
+        }
 
     def _find_closest_region(self, lat, lon):
         """Find the closest popular region"""
+        hit = self._raster_lookup('popular_regions', lat, lon)
+        if hit is not None:
+            return self.static_regions[hit[0]]
+
         min_distance = float('inf')
         closest = None
 
@@ -126,37 +218,201 @@ class DataProvider:
             'lat': region['lat'],
             'lon': region['lon'],
             'climate': region['climate'],
-            'soil_type': static_data.get('soil_type', 'loam') if static_data else 'loam',
+            'koppen': self._estimate_koppen(region['lat'], region['lon']),
+            **self._estimate_soil(region['lat'], region['lon'], soil_type=(static_data or {}).get('soil_type')),
             'weather_data': weather_data,
+            'daily_weather': self._nasa_daily_weather(region['lat'], region['lon'], weather_data),
+            'climatology': self._climatology_for(region['lat'], region['lon'], weather_data),
             'source': 'popular_region'
         }
 
     def _get_api_region_data(self, lat, lon):
-        """Get data for a custom location using APIs"""
-        # Get location name
-        location_info = self.geocoding.reverse_geocode(lat, lon)
-
-        # Determine climate based on latitude (simplified)
-        climate = self._estimate_climate(lat)
-
-        # Get weather data from NASA API
-        weather_data = self.nasa_api.get_weekly_aggregates(lat, lon, weeks=12)
+        """
+        Get data for a custom location using APIs
 
-        # Determine soil type based on climate (simplified)
-        soil_type = self._estimate_soil_type(climate)
+        Reverse geocoding and weather are fetched concurrently under a shared
+        deadline. Only the weather is waited for: if the location name is not
+        resolved yet, a placeholder is returned along with 'name_future' so the
+        caller can backfill the session once geocoding completes.
+        """
+        deadline = time.monotonic() + Config.CUSTOM_LOCATION_DEADLINE
+
+        name_future = self.executor.submit(self.geocoding.reverse_geocode, lat, lon)
+        weather_future = self.executor.submit(self.nasa_api.get_weekly_aggregates, lat, lon, 12)
+
+        # Determine climate from the location's climatology (latitude band without one)
+        climate = self._estimate_climate(lat, lon)
+
+        # Soil from the bundled grid (climate-based without one)
+        soil = self._estimate_soil(lat, lon, climate=climate)
+
+        # Get weather data from NASA API (bounded by the shared deadline)
+        weather_data, daily_weather = None, None
+        try:
+            weather_data = weather_future.result(timeout=max(0, deadline - time.monotonic()))
+            daily_weather = self._nasa_daily_weather(lat, lon, weather_data)
+        except FutureTimeoutError:
+            weather_future.cancel()  # drops it if still queued behind other fetches
+            print(f"NASA POWER deadline exceeded for ({lat}, {lon}), using fallback weather")
+        except Exception as e:
+            print(f"NASA POWER error for ({lat}, {lon}): {e}, using fallback weather")
+
+        if weather_data is None:
+            weather_data = (self.climatology.typical_weeks(lat, lon, self._weather_start_day(12), 12)
+                            or self.nasa_api._get_fallback_weekly_data(12, lat, lon=lon))
+
+        # Location name is cosmetic: use it only if already resolved
+        name = f'Location ({lat}, {lon})'
+        if name_future.done():
+            try:
+                name = name_future.result().get('name', name)
+            except Exception as e:
+                print(f"Reverse geocoding error: {e}")
+            name_future = None
 
         return {
-            'name': location_info.get('name', f'Location ({lat}, {lon})'),
+            'name': name,
+            'name_future': name_future,
             'lat': lat,
             'lon': lon,
             'climate': climate,
-            'soil_type': soil_type,
+            'koppen': self._estimate_koppen(lat, lon),
+            **soil,
             'weather_data': weather_data,
+            'daily_weather': daily_weather,
+            'climatology': self._climatology_for(lat, lon, weather_data),
             'source': 'api'
         }
 
-    def _estimate_climate(self, lat):
-        """Estimate climate type based on latitude"""
+    def _get_interpolated_region_data(self, lat, lon, season_id=None):
+        """
+        Get data for a custom location from nearby cached scenarios (no network)
+
+        Weekly weather is the inverse-distance weighting of the nearest
+        scenarios within Config.INTERPOLATION_RADIUS_KM. Like the API path,
+        the location name is resolved in the background ('name_future').
+
+        Returns:
+            dict: Game data, or None without scenarios in range
+        """
+        historical_data = self.historical_loader.interpolate_scenario(lat, lon, season_id)
+        if not historical_data:
+            return None
+
+        data = self._format_historical_data(historical_data)
+        koppen = self._estimate_koppen(lat, lon)
+        climate = KOPPEN_LABELS[koppen] if koppen else data['climate']
+        data.update(
+            name_future=self.executor.submit(self.geocoding.reverse_geocode, lat, lon),
+            climate=climate,
+            koppen=koppen,
+            **self._estimate_soil(lat, lon, climate=climate),
+            climatology=self.climatology.summary(lat, lon),
+            interpolation=historical_data['interpolation'],
+            source='interpolated'
+        )
+        return data
+
+    def _climatology_for(self, lat, lon, weather_data):
+        """
+        Climate summary of a location; weekly weather gets its anomalies
+
+        Returns:
+            dict: ClimatologyStore.summary, or None if the cell has no climatology
+        """
+        summary = self.climatology.summary(lat, lon)
+        if summary is not None and weather_data and 'temperature_anomaly' not in weather_data[0]:
+            self.climatology.add_anomalies(lat, lon, weather_data, self._weather_start_day(len(weather_data)))
+        return summary
+
+    def _weather_start_day(self, weeks):
+        """Day of year of week 1 of the latest `weeks` weeks of weather"""
+        return (datetime.now() - timedelta(days=weeks * 7)).timetuple().tm_yday
+
+    def _nasa_daily_weather(self, lat, lon, weather_data, weeks=12):
+        """
+        Daily weather behind NASAPowerAPI.get_weekly_aggregates (cached records, daily timestep)
+
+        Returns:
+            dict: See _daily_weather, or None for fallback weather (no cached records)
+        """
+        if len(weather_data) != weeks:
+            return None
+
+        records = self.nasa_api.get_cached_weather_data(lat, lon, weeks * 7)
+        if not records:
+            return None
+
+        columns = {key: [day.get(key) for day in records]
+                   for key in ('precipitation', 'temperature', 'evapotranspiration')}
+        return self._daily_weather(columns, weeks)
+
+    def _store_daily_weather(self, lat, lon, start_date, weeks, source_weeks=None):
+        """
+        Daily weather of a scenario period from the weather store (daily timestep)
+
+        Args:
+            lat (float): Scenario latitude
+            lon (float): Scenario longitude
+            start_date (str): First day of the observed period
+            weeks (int): Weeks of the observed period
+            source_weeks (list): Observed week (0-based) behind each game week,
+                for ensemble variants; None = week i is observed week i
+
+        Returns:
+            dict: See _daily_weather, or None if the cell does not cover every day
+        """
+        start = np.datetime64(start_date, 'D')
+        cell = self.climatology.weather_store.load(lat, lon, start, start + weeks * 7 - 1)
+        if cell is None or len(cell['dates']) != weeks * 7:
+            return None
+
+        columns = {'precipitation': cell['arrays'].get('PRECTOTCORR'), 'temperature': cell['arrays'].get('T2M')}
+        daily = self._daily_weather(columns, weeks)
+        if daily and source_weeks is not None:
+            daily = {key: [values[week] for week in source_weeks] for key, values in daily.items()}
+        return daily
+
+    @staticmethod
+    def _daily_weather(columns, weeks):
+        """
+        Daily values grouped by game week (GameState.daily_weather)
+
+        Args:
+            columns (dict): Field -> daily values from the first day of week 1 (None = missing)
+            weeks (int): Number of weeks
+
+        Returns:
+            dict: Field -> one list of 7 days per week (fields without enough days left
+                out), or None if no field covers the season
+        """
+        daily = {}
+        for key, values in columns.items():
+            if values is None or len(values) < weeks * 7:
+                continue
+            values = np.array(values[:weeks * 7], dtype=float).reshape(weeks, 7)
+            daily[key] = [[None if np.isnan(v) else round(float(v), 2) for v in week] for week in values]
+        return daily or None
+
+    def _estimate_koppen(self, lat, lon):
+        """
+        Köppen-Geiger class of a location: bundled raster, else the cell's climatology
+
+        Returns:
+            str: Class code (e.g. 'BSh'), or None if neither is available
+        """
+        koppen = self.koppen.lookup(lat, lon)
+        if koppen is None:
+            summary = self.climatology.summary(lat, lon)
+            koppen = summary['koppen'] if summary else None
+        return koppen
+
+    def _estimate_climate(self, lat, lon=None):
+        """Estimate climate type from the Köppen-Geiger class, or from latitude without one"""
+        koppen = self._estimate_koppen(lat, lon) if lon is not None else None
+        if koppen is not None:
+            return KOPPEN_LABELS[koppen]
+
         abs_lat = abs(lat)
 
         if abs_lat < 10:
@@ -170,6 +426,35 @@ class DataProvider:
         else:
             return 'Continental froid'
 
+    def _estimate_soil(self, lat, lon, soil_type=None, climate=None):
+        """
+        Soil of a location: the known type, else the bundled grid, else the climate estimate
+
+        Args:
+            lat (float): Latitude
+            lon (float): Longitude
+            soil_type (str): Known soil type (region file), kept over the grid
+            climate (str): Climate name for the estimate without grid or known type
+
+        Returns:
+            dict: 'soil_type' and 'soil_properties' (grid water retention overriding
+                the Config.SOIL_TYPES values, or None)
+        """
+        if soil_type is not None:
+            return {'soil_type': soil_type, 'soil_properties': None}
+
+        cell = self.soil_grid.lookup(lat, lon)
+        if cell is None:
+            return {'soil_type': self._estimate_soil_type(climate) if climate else 'loam', 'soil_properties': None}
+
+        properties = None
+        if cell['vwc_field_capacity'] is not None:
+            properties = {
+                'vwc_field_capacity': cell['vwc_field_capacity'],
+                'vwc_wilting_point': cell['vwc_wilting_point']
+            }
+        return {'soil_type': cell['soil_type'], 'soil_properties': properties}
+
     def _estimate_soil_type(self, climate):
         """Estimate dominant soil type based on climate"""
         climate_lower = climate.lower()
@@ -212,17 +497,33 @@ class DataProvider:
                 'week_num': week['week']
             })
 
-        # Estimate soil type based on climate
-        soil_type = self._estimate_soil_type(metadata['location']['climate_zone'])
+        # Days of the observed period; a variant week takes the days of its source
+        # week. Delta and interpolated series have no observed days of their own:
+        # no daily pattern, GameState spreads their weeks evenly
+        daily_weather = None
+        if not historical_data.get('delta') and 'interpolation' not in historical_data:
+            daily_weather = self._store_daily_weather(
+                metadata['location']['latitude'], metadata['location']['longitude'],
+                metadata['period']['start_date'], len(weather_weeks),
+                source_weeks=[week.get('source_week', week['week']) - 1 for week in weather['weeks']]
+            )
+
+        # Soil at the scenario location (climate-based without a grid)
+        soil = self._estimate_soil(metadata['location']['latitude'], metadata['location']['longitude'],
+                                   climate=metadata['location']['climate_zone'])
 
         return {
             'name': metadata['region_name'],
             'lat': metadata['location']['latitude'],
             'lon': metadata['location']['longitude'],
             'climate': metadata['location']['climate_zone'],
-            'soil_type': soil_type,
+            **soil,
             'weather_data': weather_weeks,
+            'daily_weather': daily_weather,
             'modis_reference': modis['weeks'] if modis else None,
+            'soil_observations': historical_data.get('smap'),
+            'variant': historical_data.get('variant', 0),
+            'delta': historical_data.get('delta'),
             'period': metadata['period'],
             'season_id': metadata['season_id'],
             'region_id': metadata['region_id'],
@@ -0,0 +1,204 @@
+"""
+Download Manager
+Resumable, checksum-verified file downloads with a content-addressed cache
+"""
+
+import hashlib
+import os
+import shutil
+import uuid
+
+import requests
+
+
+class VerifiedDownloader:
+    """
+    Download large files safely
+
+    Data is streamed into `<dest>.part`. An interrupted transfer resumes
+    from the bytes already on disk with an HTTP Range request. The finished
+    file is checked against the expected size and sha256 (when the server
+    publishes them) before it is renamed into place, so a reader never sees
+    a partial or corrupted file. Every verified file is also kept in
+    `blob_dir/<sha256[:2]>/<sha256>`; a later download with a known hash is
+    served from there without touching the network.
+    """
+
+    def __init__(self, blob_dir, chunk_size=1024 * 1024, max_attempts=5):
+        """
+        Initialize downloader
+
+        Args:
+            blob_dir (str): Content-addressed cache directory
+            chunk_size (int): Read size and write buffer (bytes)
+            max_attempts (int): Transfers in a row without progress before giving up
+        """
+        self.blob_dir = blob_dir
+        self.chunk_size = chunk_size
+        self.max_attempts = max_attempts
+
+    def download(self, url, dest_path, sha256=None, size=None, session=None, headers=None, timeout=60):
+        """
+        Download url to dest_path
+
+        Args:
+            url (str): File URL
+            dest_path (str): Final file path
+            sha256 (str): Expected checksum (hex), if known
+            size (int): Expected size (bytes), if known
+            session (requests.Session): Session to use (e.g. with Earthdata auth)
+            headers (dict): Extra request headers
+            timeout (float): Connect/read timeout (s)
+
+        Returns:
+            str: dest_path once verified, None on failure
+        """
+        name = os.path.basename(dest_path)
+        os.makedirs(os.path.dirname(dest_path) or '.', exist_ok=True)
+
+        if sha256 and self._from_cache(sha256, size, dest_path):
+            print(f"   ♻️ From cache: {name}")
+            return dest_path
+
+        part_path = f"{dest_path}.part"
+        failures = 0
+
+        while failures < self.max_attempts:
+            # A resume that adds bytes does not count as a failed attempt
+            before = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            failures += 1
+
+            try:
+                result = self._fetch(url, part_path, session or requests, headers, timeout)
+            except (requests.exceptions.RequestException, OSError) as e:
+                print(f"   ⚠️ Transfer interrupted ({name}, attempt {failures}): {e}")
+                if os.path.exists(part_path) and os.path.getsize(part_path) > before:
+                    failures = 0
+                continue
+
+            if result is None:
+                return None
+
+            digest, total = result
+            actual_size = os.path.getsize(part_path)
+            expected_size = size if size is not None else total
+
+            if expected_size is not None and actual_size < expected_size:
+                print(f"   ⚠️ Incomplete ({name}, {actual_size}/{expected_size} bytes), resuming")
+                if actual_size > before:
+                    failures = 0
+                continue
+
+            if (expected_size is not None and actual_size != expected_size) or (sha256 and digest != sha256):
+                print(f"   ❌ Checksum mismatch ({name}), restarting from zero")
+                os.remove(part_path)
+                continue
+
+            # Atomic: readers see either no file or the complete one
+            os.replace(part_path, dest_path)
+            self._add_to_cache(dest_path, digest)
+            return dest_path
+
+        print(f"   ❌ Download failed after {self.max_attempts} attempts: {name}")
+        return None
+
+    def _fetch(self, url, part_path, session, headers, timeout):
+        """
+        Continue the transfer into part_path
+
+        Returns:
+            tuple: (sha256 of the part file, total size announced by the server or None),
+                None on a non-retryable HTTP error
+        """
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        hasher = hashlib.sha256()
+        if offset:
+            self._hash_file(part_path, hasher)
+
+        request_headers = dict(headers or {})
+        if offset:
+            request_headers['Range'] = f'bytes={offset}-'
+
+        with session.get(url, headers=request_headers, stream=True, timeout=timeout,
+                         allow_redirects=True) as response:
+            if response.status_code == 416:
+                # Nothing left after offset: the part file is already complete
+                return hasher.hexdigest(), offset
+
+            if response.status_code == 200 and offset:
+                # Range ignored by the server: start over
+                offset = 0
+                hasher = hashlib.sha256()
+            elif response.status_code == 429 or response.status_code >= 500:
+                response.raise_for_status()
+            elif response.status_code not in (200, 206):
+                print(f"   ❌ Download failed ({os.path.basename(url)}): {response.status_code}")
+                return None
+
+            total = self._total_size(response, offset)
+
+            # Keep what arrived before a dropped connection: the size check
+            # below notices the short file and the next attempt resumes it
+            response.raw.enforce_content_length = False
+
+            with open(part_path, 'ab' if offset else 'wb', buffering=self.chunk_size) as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+                    hasher.update(chunk)
+
+        return hasher.hexdigest(), total
+
+    @staticmethod
+    def _total_size(response, offset):
+        """Full file size from Content-Range or Content-Length"""
+        content_range = response.headers.get('Content-Range', '')
+        if '/' in content_range and not content_range.endswith('/*'):
+            return int(content_range.rsplit('/', 1)[1])
+
+        length = response.headers.get('Content-Length')
+        if length is not None and response.headers.get('Content-Encoding') in (None, 'identity'):
+            return offset + int(length)
+
+        return None
+
+    def _hash_file(self, path, hasher):
+        """Feed an existing file into a hasher"""
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                hasher.update(chunk)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def _from_cache(self, digest, size, dest_path):
+        """Place a cached blob at dest_path"""
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path) or (size is not None and os.path.getsize(blob_path) != size):
+            return False
+
+        self._place(blob_path, dest_path)
+        return True
+
+    def _add_to_cache(self, path, digest):
+        """Keep a verified file in the blob cache (hard link when possible)"""
+        blob_path = self._blob_path(digest)
+        if os.path.exists(blob_path):
+            return
+
+        try:
+            self._place(path, blob_path)
+        except OSError as e:
+            print(f"   ⚠️ Could not cache {os.path.basename(path)}: {e}")
+
+    @staticmethod
+    def _place(source, dest_path):
+        """Hard link (or copy) source to dest_path atomically"""
+        os.makedirs(os.path.dirname(dest_path) or '.', exist_ok=True)
+        tmp_path = f"{dest_path}.{uuid.uuid4().hex[:8]}.tmp"  # unique: parallel downloads may share a blob
+
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copyfile(source, tmp_path)
+
+        os.replace(tmp_path, dest_path)
@@ -0,0 +1,195 @@
+"""
+Evapotranspiration Service
+Vectorized FAO-56 reference evapotranspiration (ET0) from NASA POWER daily parameters
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+POWER_FILL_VALUE = -999.0
+SIGMA = 4.903e-9  # Stefan-Boltzmann constant (MJ K-4 m-2 day-1)
+SOLAR_CONSTANT = 0.0820  # MJ m-2 min-1
+DEFAULT_WIND = 2.0  # m/s, FAO-56 recommendation when wind is missing
+
+
+def saturation_vapour_pressure(temperature):
+    """e°(T) in kPa (FAO-56 eq. 11)"""
+    return 0.6108 * np.exp(17.27 * temperature / (temperature + 237.3))
+
+
+def wind_speed_2m(speed, height):
+    """Convert wind speed measured at `height` m to 2 m (FAO-56 eq. 47)"""
+    return speed * 4.87 / np.log(67.8 * height - 5.42)
+
+
+def extraterrestrial_radiation(lat, day_of_year):
+    """
+    Daily extraterrestrial radiation Ra (FAO-56 eq. 21)
+
+    Args:
+        lat (array-like): Latitude (degrees)
+        day_of_year (array-like): Day of year (1-366)
+
+    Returns:
+        ndarray: Ra (MJ m-2 day-1), broadcast over the inputs
+    """
+    phi = np.radians(np.asarray(lat, dtype=float))
+    angle = 2 * np.pi * np.asarray(day_of_year, dtype=float) / 365
+
+    inverse_distance = 1 + 0.033 * np.cos(angle)
+    declination = 0.409 * np.sin(angle - 1.39)
+    sunset_angle = np.arccos(np.clip(-np.tan(phi) * np.tan(declination), -1, 1))
+
+    return (24 * 60 / np.pi * SOLAR_CONSTANT * inverse_distance
+            * (sunset_angle * np.sin(phi) * np.sin(declination)
+               + np.cos(phi) * np.cos(declination) * np.sin(sunset_angle)))
+
+
+def hargreaves(t_max, t_min, lat, day_of_year):
+    """
+    Hargreaves ET0 (FAO-56 eq. 52): temperature and radiation geometry only
+
+    Returns:
+        ndarray: ET0 (mm/day)
+    """
+    t_max = np.asarray(t_max, dtype=float)
+    t_min = np.asarray(t_min, dtype=float)
+    t_mean = (t_max + t_min) / 2
+    ra = extraterrestrial_radiation(lat, day_of_year)
+
+    et0 = 0.0023 * (t_mean + 17.8) * np.sqrt(np.maximum(t_max - t_min, 0)) * 0.408 * ra
+    return np.maximum(et0, 0)
+
+
+def penman_monteith(t_max, t_min, rh, wind_2m, radiation, lat, day_of_year, elevation=0.0, pressure=None):
+    """
+    FAO-56 Penman-Monteith ET0 for daily steps (eq. 6, soil heat flux G = 0)
+
+    All arguments broadcast against each other, e.g. (locations, days) arrays
+    with lat and elevation of shape (locations, 1).
+
+    Args:
+        t_max, t_min (array-like): Daily max/min air temperature at 2 m (°C)
+        rh (array-like): Mean relative humidity (%)
+        wind_2m (array-like): Wind speed at 2 m (m/s)
+        radiation (array-like): Incoming shortwave radiation Rs (MJ m-2 day-1)
+        lat (array-like): Latitude (degrees)
+        day_of_year (array-like): Day of year
+        elevation (array-like): Elevation (m)
+        pressure (array-like): Surface pressure (kPa), from elevation where missing
+
+    Returns:
+        ndarray: ET0 (mm/day)
+    """
+    t_max = np.asarray(t_max, dtype=float)
+    t_min = np.asarray(t_min, dtype=float)
+    elevation = np.asarray(elevation, dtype=float)
+    t_mean = (t_max + t_min) / 2
+
+    standard_pressure = 101.3 * ((293 - 0.0065 * elevation) / 293) ** 5.26
+    if pressure is not None:
+        pressure = np.asarray(pressure, dtype=float)
+        standard_pressure = np.where(np.isfinite(pressure), pressure, standard_pressure)
+    gamma = 0.000665 * standard_pressure
+
+    slope = 4098 * saturation_vapour_pressure(t_mean) / (t_mean + 237.3) ** 2
+    es = (saturation_vapour_pressure(t_max) + saturation_vapour_pressure(t_min)) / 2
+    ea = np.asarray(rh, dtype=float) / 100 * es  # FAO-56 eq. 19 (RH mean)
+
+    # Net radiation: net shortwave (albedo 0.23) minus net longwave
+    rs = np.asarray(radiation, dtype=float)
+    rso = (0.75 + 2e-5 * elevation) * extraterrestrial_radiation(lat, day_of_year)
+    relative_shortwave = np.clip(rs / np.maximum(rso, 1e-6), 0.3, 1.0)
+    rnl = (SIGMA * ((t_max + 273.16) ** 4 + (t_min + 273.16) ** 4) / 2
+           * (0.34 - 0.14 * np.sqrt(np.maximum(ea, 0)))
+           * (1.35 * relative_shortwave - 0.35))
+    rn = 0.77 * rs - rnl
+
+    wind_2m = np.asarray(wind_2m, dtype=float)
+    et0 = ((0.408 * slope * rn + gamma * 900 / (t_mean + 273) * wind_2m * (es - ea))
+           / (slope + gamma * (1 + 0.34 * wind_2m)))
+    return np.maximum(et0, 0)
+
+
+def reference_et(t_max, t_min, lat, day_of_year, rh=None, wind_2m=None, radiation=None,
+                 elevation=0.0, pressure=None):
+    """
+    Penman-Monteith where humidity and radiation are available, Hargreaves elsewhere
+
+    Missing values are NaN. Missing wind uses 2 m/s (FAO-56). Entries
+    without max/min temperature stay NaN.
+
+    Returns:
+        ndarray: ET0 (mm/day)
+    """
+    et0 = hargreaves(t_max, t_min, lat, day_of_year)
+    if rh is None or radiation is None:
+        return et0
+
+    wind_2m = DEFAULT_WIND if wind_2m is None else np.where(np.isfinite(wind_2m), wind_2m, DEFAULT_WIND)
+    full = penman_monteith(t_max, t_min, rh, wind_2m, radiation, lat, day_of_year, elevation, pressure)
+
+    return np.where(np.isfinite(full), full, et0)
+
+
+def et0_from_power(parameters, lat, elevation=0.0):
+    """
+    Daily ET0 from a NASA POWER 'parameter' block
+
+    Uses T2M_MAX, T2M_MIN, RH2M, WS2M (or WS10M converted to 2 m),
+    ALLSKY_SFC_SW_DWN and PS when present; POWER fill values (-999) count
+    as missing.
+
+    Args:
+        parameters (dict): {parameter: {YYYYMMDD: value}}
+        lat (float): Latitude
+        elevation (float): Elevation (m)
+
+    Returns:
+        dict: {YYYYMMDD: ET0 (mm/day) or None}
+    """
+    dates = sorted(next((values for values in parameters.values() if values), {}))
+    if not dates:
+        return {}
+
+    def column(name):
+        values = parameters.get(name)
+        if not values:
+            return None
+        array = np.array([values.get(date, np.nan) for date in dates], dtype=float)
+        array[array <= POWER_FILL_VALUE] = np.nan
+        return array
+
+    day_of_year = np.array([datetime.strptime(date, '%Y%m%d').timetuple().tm_yday for date in dates])
+    columns = {name: column(name) for name in parameters}
+    et0 = et0_from_columns({name: values for name, values in columns.items() if values is not None},
+                           lat, day_of_year, elevation)
+
+    return {date: (round(float(value), 2) if np.isfinite(value) else None) for date, value in zip(dates, et0)}
+
+
+def et0_from_columns(columns, lat, day_of_year, elevation=0.0):
+    """
+    Daily ET0 from POWER parameter arrays on one calendar (NaN = missing)
+
+    Args:
+        columns (dict): {parameter: ndarray}, e.g. cleaned by services.power_cleaning
+        lat (float): Latitude
+        day_of_year (array-like): Day of year of each value
+        elevation (float): Elevation (m)
+
+    Returns:
+        ndarray: ET0 (mm/day), NaN without max/min temperature
+    """
+    wind = columns.get('WS2M')
+    if wind is None and columns.get('WS10M') is not None:
+        wind = wind_speed_2m(columns['WS10M'], 10)
+
+    t_max, t_min = columns.get('T2M_MAX'), columns.get('T2M_MIN')
+    if t_max is None or t_min is None:
+        return np.full(len(day_of_year), np.nan)
+
+    return reference_et(t_max, t_min, lat, day_of_year, rh=columns.get('RH2M'), wind_2m=wind,
+                        radiation=columns.get('ALLSKY_SFC_SW_DWN'), elevation=elevation,
+                        pressure=columns.get('PS'))
@@ -0,0 +1,220 @@
+"""
+Gazetteer Service
+Local place-name index for instant location search (typeahead)
+"""
+
+import bisect
+import json
+import os
+import re
+import threading
+import unicodedata
+
+
+class Gazetteer:
+    """
+    In-memory place index with prefix and fuzzy (trigram) matching
+
+    Holds scenario regions, popular regions and every place previously
+    resolved through Nominatim (persisted as JSON lines).
+    """
+
+    # Score by prefix kind: (prefix match, exact match). Partial prefixes stay
+    # below Config.GAZETTEER_MIN_SCORE so "Paris" is not settled by "Parisot"
+    PREFIX_SCORES = {
+        0: (0.8, 1.0),    # Full name
+        1: (0.75, 0.95),  # First word, usually the locality
+        2: (0.7, 0.8)     # Other words (district, country...)
+    }
+    FUZZY_MAX_SCORE = 0.8
+
+    def __init__(self, store_path=None):
+        """
+        Initialize gazetteer
+
+        Args:
+            store_path (str): Optional JSON lines file of resolved places
+        """
+        self.store_path = store_path
+        self.entries = []
+        self._places = {}        # (name, lat, lon) -> entry id
+        self._prefix_keys = []   # sorted (key, kind, entry id), kind: 0 full name, 1 first word, 2 other word
+        self._trigrams = {}      # trigram -> set of entry ids
+        self._entry_keys = []    # entry id -> list of normalized keys
+        self._lock = threading.Lock()
+
+        if store_path and os.path.exists(store_path):
+            self._load(store_path)
+
+    def add(self, name, lat, lon, place_type='', importance=0.5, aliases=(), source='local', persist=False):
+        """
+        Add a place (or new aliases of a known place)
+
+        Args:
+            name (str): Display name
+            lat (float): Latitude
+            lon (float): Longitude
+            place_type (str): Place type (city, region...)
+            importance (float): Ranking weight 0-1
+            aliases (iterable): Extra names the place is searched by
+            source (str): Origin ('scenario', 'popular', 'nominatim')
+            persist (bool): Append to the store file
+
+        Returns:
+            int: Entry id
+        """
+        place_key = (name, round(lat, 4), round(lon, 4))
+        keys = [self.normalize(k) for k in (name, *aliases)]
+        keys = [k for k in keys if k]
+
+        with self._lock:
+            entry_id = self._places.get(place_key)
+
+            if entry_id is None:
+                entry_id = len(self.entries)
+                self._places[place_key] = entry_id
+                self.entries.append({
+                    'name': name,
+                    'lat': lat,
+                    'lon': lon,
+                    'type': place_type,
+                    'importance': importance,
+                    'source': source
+                })
+                self._entry_keys.append([])
+
+            new_keys = [k for k in keys if k not in self._entry_keys[entry_id]]
+            for key in new_keys:
+                self._index_key(key, entry_id)
+
+        if persist and new_keys and self.store_path:
+            self._append(name, lat, lon, place_type, importance, aliases, source)
+
+        return entry_id
+
+    def add_popular_regions(self, regions):
+        """Index Config.POPULAR_REGIONS"""
+        for key, region in regions.items():
+            self.add(region['name'], region['lat'], region['lon'], 'region', 0.8,
+                     aliases=(key,), source='popular')
+
+    def add_scenarios(self, scenarios):
+        """Index historical scenario regions"""
+        for scenario in scenarios:
+            self.add(scenario['region_name'], scenario['lat'], scenario['lon'], 'region', 0.8,
+                     aliases=(scenario['region_id'].replace('_', ' '),), source='scenario')
+
+    def add_results(self, query, results):
+        """
+        Remember Nominatim results, also searchable by the query that found them
+
+        Args:
+            query (str): Original search query
+            results (list): Results as returned by GeocodingService.search_location
+        """
+        for rank, result in enumerate(results):
+            self.add(result['name'], result['lat'], result['lon'], result.get('type', ''),
+                     result.get('importance', 0.5),
+                     aliases=(query,) if rank == 0 else (),
+                     source='nominatim', persist=True)
+
+    def search(self, query, limit=5):
+        """
+        Search places by prefix, then by trigram similarity
+
+        Args:
+            query (str): Search text
+            limit (int): Max results
+
+        Returns:
+            list: Results (name, lat, lon, type, importance, source, score) best first
+        """
+        needle = self.normalize(query)
+        if not needle:
+            return []
+
+        # add() mutates the indexes from request threads
+        with self._lock:
+            return self._search(needle, limit)
+
+    def _search(self, needle, limit):
+        """Search a normalized query (caller holds the lock)"""
+        scores = {}
+
+        # Prefix matches: full name, first word (locality) or any other word
+        start = bisect.bisect_left(self._prefix_keys, (needle, -1, -1))
+        for key, kind, entry_id in self._prefix_keys[start:]:
+            if not key.startswith(needle):
+                break
+            score = self.PREFIX_SCORES[kind][key == needle]
+            scores[entry_id] = max(scores.get(entry_id, 0), score)
+
+        # Fuzzy matches: Dice coefficient on trigrams of the full keys
+        grams = self._grams(needle)
+        overlap = {}
+        for gram in grams:
+            for entry_id in self._trigrams.get(gram, ()):
+                overlap[entry_id] = overlap.get(entry_id, 0) + 1
+
+        for entry_id in overlap:
+            if scores.get(entry_id, 0) >= self.FUZZY_MAX_SCORE:
+                continue
+            best = max(
+                2 * len(grams & self._grams(key)) / (len(grams) + len(self._grams(key)))
+                for key in self._entry_keys[entry_id]
+            )
+            scores[entry_id] = max(scores.get(entry_id, 0), round(best * self.FUZZY_MAX_SCORE, 3))
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -self.entries[item[0]]['importance']))
+
+        return [dict(self.entries[entry_id], score=score) for entry_id, score in ranked[:limit]]
+
+    @staticmethod
+    def normalize(text):
+        """Lowercase, strip accents and punctuation"""
+        text = unicodedata.normalize('NFKD', str(text).lower())
+        text = ''.join(c for c in text if not unicodedata.combining(c))
+        return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text).split())
+
+    def _index_key(self, key, entry_id):
+        """Add one normalized key to the prefix and trigram indexes"""
+        self._entry_keys[entry_id].append(key)
+
+        words = key.split()
+        bisect.insort(self._prefix_keys, (key, 0, entry_id))
+        for position, word in enumerate(words):
+            if word != key:
+                bisect.insort(self._prefix_keys, (word, 1 if position == 0 else 2, entry_id))
+
+        for gram in self._grams(key):
+            self._trigrams.setdefault(gram, set()).add(entry_id)
+
+    @staticmethod
+    def _grams(key):
+        """Trigrams of a padded key"""
+        padded = f"  {key} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _load(self, store_path):
+        """Load persisted places"""
+        with open(store_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    place = json.loads(line)
+                    self.add(place['name'], place['lat'], place['lon'], place.get('type', ''),
+                             place.get('importance', 0.5), place.get('aliases', ()),
+                             place.get('source', 'nominatim'))
+                except (ValueError, KeyError):
+                    continue
+
+    def _append(self, name, lat, lon, place_type, importance, aliases, source):
+        """Append one place to the store file"""
+        os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+        line = json.dumps({
+            'name': name, 'lat': lat, 'lon': lon, 'type': place_type,
+            'importance': importance, 'aliases': list(aliases), 'source': source
+        }, ensure_ascii=False)
+
+        with self._lock:
+            with open(self.store_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
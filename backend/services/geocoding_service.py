@@ -3,36 +3,67 @@ Geocoding Service
 Handles location search using Nominatim API
 """
 
+import os
+import sys
 import requests
-import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import Config
+from .gazetteer import Gazetteer
+from .rate_limiter import TokenBucketLimiter, RateLimitDeferred
+from .reverse_geocode_cache import ReverseGeocodeCache
 
 
 class GeocodingService:
     """Wrapper for Nominatim geocoding API"""
 
-    def __init__(self):
-        self.base_url = "https://nominatim.openstreetmap.org"
+    def __init__(self, gazetteer=None):
+        self.base_url = Config.NOMINATIM_BASE_URL
         self.cache = {}
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # Nominatim requires 1 request per second max
+
+        # Local place index answers most searches without Nominatim
+        self.gazetteer = gazetteer or Gazetteer(Config.GAZETTEER_FILE)
+        self.gazetteer.add_popular_regions(Config.POPULAR_REGIONS)
+
+        # Nominatim requires 1 request per second max, shared across workers
+        self.limiter = TokenBucketLimiter(Config.RATE_LIMIT_DB, 'nominatim', Config.NOMINATIM_RATE)
+
+        # Place names survive restarts and are shared by nearby clicks
+        self.reverse_cache = ReverseGeocodeCache(
+            Config.REVERSE_GEOCODE_DB,
+            precision=Config.REVERSE_GEOCODE_PRECISION,
+            radius_km=Config.REVERSE_GEOCODE_RADIUS_KM,
+            ttl_days=Config.REVERSE_GEOCODE_TTL_DAYS
+        )
 
     def search_location(self, query):
         """
         Search for a location by name
 
+        The local gazetteer is tried first; Nominatim is only queried when
+        it has no match scoring at least Config.GAZETTEER_MIN_SCORE.
+
         Args:
             query (str): Search query (e.g., "Yaoundé, Cameroun")
 
         Returns:
             list: Search results with lat, lon, name
+
+        Raises:
+            RateLimitDeferred: If Nominatim cannot be called within
+                Config.NOMINATIM_SEARCH_MAX_WAIT
         """
+        local_results = self.gazetteer.search(query, limit=5)
+        if local_results and local_results[0]['score'] >= Config.GAZETTEER_MIN_SCORE:
+            return local_results
+
         # Check cache
         cache_key = query.lower()
         if cache_key in self.cache:
             return self.cache[cache_key]
 
         # Rate limiting
-        self._rate_limit()
+        self._rate_limit(Config.NOMINATIM_SEARCH_MAX_WAIT)
 
         params = {
             'q': query,
@@ -69,12 +100,13 @@ class GeocodingService:
 
             # Cache results
             self.cache[cache_key] = results
+            self.gazetteer.add_results(query, results)
 
             return results
 
         except requests.exceptions.RequestException as e:
             print(f"Geocoding error: {e}")
-            return []
+            return local_results
 
     def reverse_geocode(self, lat, lon):
         """
@@ -87,11 +119,16 @@ class GeocodingService:
         Returns:
             dict: Location information
         """
-        cache_key = f"{lat}_{lon}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        # Nearest cached place within Config.REVERSE_GEOCODE_RADIUS_KM
+        cached, fresh = self.reverse_cache.get(lat, lon)
+        if fresh:
+            return cached
 
-        self._rate_limit()
+        try:
+            self._rate_limit(Config.NOMINATIM_REVERSE_MAX_WAIT)
+        except RateLimitDeferred as e:
+            print(f"Reverse geocoding deferred: {e}")
+            return cached or self._unnamed_location(lat, lon)
 
         params = {
             'lat': lat,
@@ -123,26 +160,32 @@ class GeocodingService:
                 'lon': lon
             }
 
-            self.cache[cache_key] = result
+            self.reverse_cache.put(lat, lon, result)
 
             return result
 
         except requests.exceptions.RequestException as e:
             print(f"Reverse geocoding error: {e}")
-            return {
-                'name': f'Location ({lat}, {lon})',
-                'city': '',
-                'country': '',
-                'lat': lat,
-                'lon': lon
-            }
+            return cached or self._unnamed_location(lat, lon)
+
+    def _unnamed_location(self, lat, lon):
+        """Placeholder location info when Nominatim is unavailable"""
+        return {
+            'name': f'Location ({lat}, {lon})',
+            'city': '',
+            'country': '',
+            'lat': lat,
+            'lon': lon
+        }
 
-    def _rate_limit(self):
-        """Ensure we respect Nominatim rate limits"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    def _rate_limit(self, max_wait):
+        """
+        Ensure we respect Nominatim rate limits (process-wide token bucket)
 
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
+        Args:
+            max_wait (float): Longest acceptable wait (s)
 
-        self.last_request_time = time.time()
+        Raises:
+            RateLimitDeferred: If no slot is free within max_wait
+        """
+        self.limiter.acquire(max_wait)
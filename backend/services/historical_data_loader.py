@@ -5,7 +5,19 @@ Loads pre-downloaded NASA POWER and MODIS data from local files
 
 import json
 import os
-import math
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import Config
+from .smap_l3 import SMAPL3Extractor
+from .weather_generator import WeatherGenerator
+from .weather_ensemble import BlockBootstrap
+from .spatial_index import SpatialIndex
 
 
 class HistoricalDataLoader:
@@ -20,13 +32,65 @@ class HistoricalDataLoader:
             'regions'
         )
 
+        # Parsed catalog and scenario files (data/regions is read-only at runtime)
+        self._scenarios = None
+        self._index = None  # SpatialIndex of the scenario locations
+        self._data_cache = {}
+        self._smap_lookup = {}  # scenario id -> weekly SMAP soil moisture (m3/m3 or None)
+        self._weekly_arrays = {}  # scenario id -> {field: weekly array}
+        self._ensembles = {}  # scenario id -> (n_variants, n_weeks) historical week indices
+        self._delta_cache = OrderedDict()  # ClimateDelta.cache_key -> perturbed scenario data (LRU)
+        self.bootstrap = BlockBootstrap(Config.ENSEMBLE_BLOCK_WEEKS, Config.ENSEMBLE_WINDOW_WEEKS)
+        self._lock = threading.Lock()
+
     def get_available_scenarios(self):
         """
         Get list of all available region/season combinations
 
+        The catalog is scanned once and cached; callers receive copies so they
+        can annotate entries (e.g. distance_km) without touching the cache.
+
         Returns:
             list: Available scenarios with metadata
         """
+        if self._scenarios is None:
+            with self._lock:
+                if self._scenarios is None:
+                    scenarios = self._scan_scenarios()
+                    self._smap_lookup = self._build_smap_lookup(scenarios)
+                    for scenario in scenarios:
+                        scenario['has_smap'] = scenario['id'] in self._smap_lookup
+                    self._index = SpatialIndex([s['lat'] for s in scenarios], [s['lon'] for s in scenarios])
+                    self._scenarios = scenarios
+
+        return [dict(scenario) for scenario in self._scenarios]
+
+    def refresh_catalog(self):
+        """Drop cached catalog and scenario data so they are re-read from disk"""
+        with self._lock:
+            self._scenarios = None
+            self._index = None
+            self._data_cache = {}
+            self._smap_lookup = {}
+            self._weekly_arrays = {}
+            self._ensembles = {}
+            self._delta_cache = OrderedDict()
+
+    def preload_all(self):
+        """
+        Parse every available scenario into the in-memory cache
+
+        Returns:
+            int: Number of scenarios loaded
+        """
+        loaded = 0
+        for scenario in self.get_available_scenarios():
+            if self.load_historical_data(scenario['region_id'], scenario['season_id']):
+                loaded += 1
+        return loaded
+
+    def _scan_scenarios(self):
+        """Scan data/regions/ for scenario folders"""
         scenarios = []
 
         if not os.path.exists(self.data_dir):
@@ -87,18 +151,161 @@ class HistoricalDataLoader:
 
         return scenarios
 
-    def load_historical_data(self, region_id, season_id):
+    def _build_smap_lookup(self, scenarios):
+        """
+        Weekly SMAP soil moisture of every scenario cell, from local granules
+
+        Each granule is opened once for all scenarios whose period covers
+        that day, so the game loop never reads HDF5 files.
+
+        Args:
+            scenarios (list): Scanned scenarios
+
+        Returns:
+            dict: scenario id -> list of weekly means (None for weeks without data)
+        """
+        extractor = SMAPL3Extractor(Config.SMAP_DATA_DIR)
+        granules = extractor.list_granules() if extractor.available else {}
+        if not granules:
+            return {}
+
+        # day -> [(scenario id, week index, lat, lon)]
+        requests = {}
+        for scenario in scenarios:
+            try:
+                start = datetime.strptime(scenario['period']['start_date'], '%Y-%m-%d')
+                weeks = int(scenario['period']['total_weeks'])
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            for day_offset in range(weeks * 7):
+                day = (start + timedelta(days=day_offset)).strftime('%Y%m%d')
+                if day in granules:
+                    requests.setdefault(day, []).append(
+                        (scenario['id'], day_offset // 7, scenario['lat'], scenario['lon'])
+                    )
+
+        sums = {}
+        for day, entries in requests.items():
+            try:
+                values = extractor.extract(granules[day], [(lat, lon) for _, _, lat, lon in entries], day)
+            except Exception as e:
+                print(f"Error reading SMAP granule {day}: {e}")
+                continue
+
+            for (scenario_id, week, _, _), value in zip(entries, values):
+                if value is not None:
+                    total, count = sums.get((scenario_id, week), (0.0, 0))
+                    sums[(scenario_id, week)] = (total + value, count + 1)
+
+        lookup = {}
+        for scenario in scenarios:
+            weekly = []
+            for week in range(int(scenario['period'].get('total_weeks', 0))):
+                total, count = sums.get((scenario['id'], week), (0.0, 0))
+                weekly.append(round(total / count, 4) if count else None)
+
+            if any(value is not None for value in weekly):
+                lookup[scenario['id']] = weekly
+
+        return lookup
+
+    def get_smap_weekly(self, region_id, season_id):
+        """
+        Precomputed weekly SMAP soil moisture of a scenario
+
+        Returns:
+            list: Weekly volumetric soil moisture (m3/m3, None where missing), or None
+        """
+        self.get_available_scenarios()
+        return self._smap_lookup.get(f"{region_id}_{season_id}")
+
+    def get_weather_generator(self, region_id, season_id):
+        """
+        Weather generator fitted to a scenario's weekly weather
+
+        Returns:
+            WeatherGenerator: Fitted generator, or None if the scenario is missing
+        """
+        historical_data = self.load_historical_data(region_id, season_id)
+        if not historical_data:
+            return None
+
+        weather = historical_data['weather']
+        return WeatherGenerator.from_weekly(weather['weeks'], WeatherGenerator.profile_for_latitude(weather['lat']))
+
+    def get_weekly_arrays(self, region_id, season_id):
+        """
+        Numeric weekly weather fields of a scenario as arrays
+
+        Returns:
+            dict: Field name (e.g. 'precipitation_total') -> float array of weeks, or None
+        """
+        scenario_id = f"{region_id}_{season_id}"
+        if scenario_id not in self._weekly_arrays:
+            historical_data = self.load_historical_data(region_id, season_id)
+            if not historical_data:
+                return None
+
+            weeks = historical_data['weather']['weeks']
+            fields = [key for key, value in weeks[0].items()
+                      if isinstance(value, (int, float)) and key != 'week'] if weeks else []
+            self._weekly_arrays[scenario_id] = {
+                field: np.array([week.get(field, np.nan) for week in weeks], dtype=float)
+                for field in fields
+            }
+
+        return self._weekly_arrays[scenario_id]
+
+    def get_ensemble(self, region_id, season_id):
+        """
+        Block-bootstrap ensemble of a scenario (built once, then cached)
+
+        Seeded by the scenario id, so variant k is the same season in every
+        process. get_weekly_arrays(...)[field][ensemble] gives that field for
+        every variant in one indexing operation.
+
+        Returns:
+            ndarray: (Config.ENSEMBLE_SIZE, n_weeks) historical week indices, or None
+        """
+        scenario_id = f"{region_id}_{season_id}"
+        if scenario_id not in self._ensembles:
+            arrays = self.get_weekly_arrays(region_id, season_id)
+            if not arrays:
+                return None
+
+            n_weeks = len(next(iter(arrays.values())))
+            with self._lock:
+                if scenario_id not in self._ensembles:
+                    self._ensembles[scenario_id] = self.bootstrap.indices(
+                        n_weeks, Config.ENSEMBLE_SIZE, seed=f"{Config.WEATHER_SEED}_{scenario_id}"
+                    )
+
+        return self._ensembles[scenario_id]
+
+    def load_historical_data(self, region_id, season_id, variant=0, delta=None):
         """
         Load historical weather and MODIS data for a specific scenario
 
         Args:
             region_id: 'yaounde_cameroun'
             season_id: 'spring_2024'
+            variant (int): Weather ensemble member (0 = observed season)
+            delta (ClimateDelta): Climate-change delta applied to the weather (optional)
 
         Returns:
             dict: Complete historical data or None if not found
         """
+        if delta is not None and not delta.is_zero():
+            return self._load_delta(region_id, season_id, variant, delta)
+
+        if variant:
+            return self._load_variant(region_id, season_id, variant)
+
         folder_name = f"{region_id}_{season_id}"
+        if folder_name in self._data_cache:
+            return self._data_cache[folder_name]
+
         folder_path = os.path.join(self.data_dir, folder_name)
 
         if not os.path.exists(folder_path):
@@ -120,16 +327,100 @@ class HistoricalDataLoader:
                 with open(modis_path, 'r', encoding='utf-8') as f:
                     modis_data = json.load(f)
 
-            return {
+            historical_data = {
                 'metadata': metadata,
                 'weather': weather_data,
-                'modis': modis_data
+                'modis': modis_data,
+                'smap': self.get_smap_weekly(region_id, season_id)
             }
 
+            self._data_cache[folder_name] = historical_data
+
+            return historical_data
+
         except Exception as e:
             print(f"Error loading historical data for {region_id}_{season_id}: {e}")
             return None
 
+    def _load_variant(self, region_id, season_id, variant):
+        """
+        Scenario data with the weeks of an ensemble member
+
+        Calendar dates stay those of the scenario; each week's values come
+        from the historical week given by the ensemble row. SMAP observations
+        belong to the observed season and are dropped.
+        """
+        historical_data = self.load_historical_data(region_id, season_id)
+        ensemble = self.get_ensemble(region_id, season_id)
+        if not historical_data or ensemble is None:
+            return None
+
+        if not 0 <= variant < len(ensemble):
+            raise ValueError(f"variant must be between 0 and {len(ensemble) - 1}")
+
+        weeks = historical_data['weather']['weeks']
+        variant_weeks = []
+        for target, source in zip(weeks, ensemble[variant].tolist()):
+            week = dict(weeks[source])
+            week.update(week=target['week'], source_week=weeks[source]['week'])
+            for key in ('start_date', 'end_date'):
+                if key in target:
+                    week[key] = target[key]
+            variant_weeks.append(week)
+
+        return dict(
+            historical_data,
+            weather=dict(historical_data['weather'], weeks=variant_weeks),
+            smap=None,
+            variant=variant
+        )
+
+    def _load_delta(self, region_id, season_id, variant, delta):
+        """
+        Scenario data (or ensemble member) under a climate delta
+
+        Built from the in-memory weekly arrays and cached by the hash of
+        (scenario, variant, delta); later requests for the same delta are
+        dictionary lookups.
+        """
+        scenario_id = f"{region_id}_{season_id}"
+        key = delta.cache_key(scenario_id, variant)
+        with self._lock:
+            if key in self._delta_cache:
+                self._delta_cache.move_to_end(key)
+                return self._delta_cache[key]
+
+        historical_data = self.load_historical_data(region_id, season_id, variant)
+        arrays = self.get_weekly_arrays(region_id, season_id)
+        if not historical_data or not arrays:
+            return None
+
+        if variant:
+            rows = self.get_ensemble(region_id, season_id)[variant]
+            arrays = {field: values[rows] for field, values in arrays.items()}
+
+        perturbed = {field: np.round(values, 2).tolist() for field, values in delta.apply(arrays).items()
+                     if values is not arrays[field]}
+        weeks = []
+        for i, week in enumerate(historical_data['weather']['weeks']):
+            week = dict(week)
+            week.update({field: values[i] for field, values in perturbed.items()})
+            weeks.append(week)
+
+        data = dict(
+            historical_data,
+            weather=dict(historical_data['weather'], weeks=weeks),
+            smap=None,
+            delta=delta.to_dict()
+        )
+
+        with self._lock:
+            self._delta_cache[key] = data
+            while len(self._delta_cache) > Config.DELTA_CACHE_SIZE:
+                self._delta_cache.popitem(last=False)
+
+        return data
+
     def find_closest_scenario(self, lat, lon, season_id=None):
         """
         Find closest available scenario to given coordinates
@@ -142,46 +433,102 @@ class HistoricalDataLoader:
         Returns:
             dict: Closest scenario or None
         """
-        scenarios = self.get_available_scenarios()
+        nearest = self.find_nearest_scenarios(lat, lon, season_id, k=1)
+        return nearest[0] if nearest else None
 
-        if not scenarios:
-            return None
+    def find_nearest_scenarios(self, lat, lon, season_id=None, k=1, radius_km=None):
+        """
+        k nearest scenarios from the spatial index
 
-        # Filter by season if specified
-        if season_id:
-            scenarios = [s for s in scenarios if s['season_id'] == season_id]
+        Args:
+            lat: Latitude
+            lon: Longitude
+            season_id: Optional season filter
+            k (int): Number of scenarios
+            radius_km (float): Only scenarios closer than this (optional)
 
+        Returns:
+            list: Scenario copies with distance_km, nearest first
+        """
+        scenarios = self.get_available_scenarios()
         if not scenarios:
-            return None
-
-        # Find closest
-        min_distance = float('inf')
-        closest = None
+            return []
 
-        for scenario in scenarios:
-            distance = self._calculate_distance(
-                lat, lon,
-                scenario['lat'], scenario['lon']
-            )
-
-            if distance < min_distance:
-                min_distance = distance
-                closest = scenario
-                closest['distance_km'] = round(distance, 1)
+        mask = np.array([s['season_id'] == season_id for s in scenarios]) if season_id else None
+        indices, distances = self._index.nearest(lat, lon, k, radius_km, mask)
 
-        return closest
+        return [dict(scenarios[i], distance_km=round(float(distance), 1))
+                for i, distance in zip(indices.tolist(), distances)]
 
-    def _calculate_distance(self, lat1, lon1, lat2, lon2):
-        """Calculate distance between two coordinates (km) using Haversine formula"""
-        R = 6371  # Earth radius in km
+    def interpolate_scenario(self, lat, lon, season_id=None, k=None, radius_km=None, power=None):
+        """
+        Weekly weather of a location by inverse-distance weighting of nearby scenarios
 
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
+        Neighbours share one season (season_id, or that of the nearest
+        scenario) so their weeks line up; every numeric weekly field is
+        weighted, over the weeks all neighbours have.
 
-        a = (math.sin(dlat / 2) ** 2 +
-             math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-             math.sin(dlon / 2) ** 2)
+        Args:
+            lat: Latitude
+            lon: Longitude
+            season_id: Optional season
+            k (int): Neighbours (default Config.INTERPOLATION_NEIGHBOURS)
+            radius_km (float): Search radius (default Config.INTERPOLATION_RADIUS_KM)
+            power (float): Distance exponent (default Config.INTERPOLATION_POWER)
 
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        Returns:
+            dict: Historical data like load_historical_data, with 'interpolation'
+                (neighbours and weights), or None without neighbours in range
+        """
+        k = Config.INTERPOLATION_NEIGHBOURS if k is None else k
+        radius_km = Config.INTERPOLATION_RADIUS_KM if radius_km is None else radius_km
+        power = Config.INTERPOLATION_POWER if power is None else power
+
+        if not season_id:
+            nearest = self.find_nearest_scenarios(lat, lon, k=1, radius_km=radius_km)
+            if not nearest:
+                return None
+            season_id = nearest[0]['season_id']
+
+        neighbours = [s for s in self.find_nearest_scenarios(lat, lon, season_id, k, radius_km)
+                      if self.get_weekly_arrays(s['region_id'], s['season_id'])]
+        if not neighbours:
+            return None
 
-        return R * c
+        arrays = [self.get_weekly_arrays(s['region_id'], s['season_id']) for s in neighbours]
+        fields = [field for field in arrays[0] if all(field in a for a in arrays[1:])]
+        n_weeks = min(len(a[fields[0]]) for a in arrays) if fields else 0
+        weights = SpatialIndex.idw_weights([s['distance_km'] for s in neighbours], power)
+
+        # (fields, neighbours, weeks) @ weights -> (fields, weeks); missing values drop their weight
+        stack = np.array([[a[field][:n_weeks] for a in arrays] for field in fields])
+        valid = np.isfinite(stack)
+        weighted = np.einsum('fnw,n->fw', np.where(valid, stack, 0.0), weights)
+        total = np.einsum('fnw,n->fw', valid, weights)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = np.round(weighted / total, 2)
+
+        closest = self.load_historical_data(neighbours[0]['region_id'], season_id)
+        weeks = []
+        for i, template in enumerate(closest['weather']['weeks'][:n_weeks]):
+            week = {key: template[key] for key in ('week', 'start_date', 'end_date') if key in template}
+            week.update({field: float(values[f, i]) for f, field in enumerate(fields) if np.isfinite(values[f, i])})
+            weeks.append(week)
+
+        metadata = closest['metadata']
+        return {
+            'metadata': dict(
+                metadata,
+                region_id=None,
+                region_name=f'Location ({lat}, {lon})',
+                location=dict(metadata['location'], latitude=lat, longitude=lon),
+                period=dict(metadata['period'], total_weeks=n_weeks)
+            ),
+            'weather': dict(closest['weather'], lat=lat, lon=lon, weeks=weeks),
+            'modis': None,
+            'smap': None,
+            'interpolation': [
+                {'region_id': s['region_id'], 'distance_km': s['distance_km'], 'weight': round(float(w), 3)}
+                for s, w in zip(neighbours, weights)
+            ]
+        }
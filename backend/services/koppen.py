@@ -0,0 +1,192 @@
+"""
+Köppen-Geiger Service
+Climate classes from a memory-mapped uint8 raster, or from monthly climatology
+"""
+
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+# Raster codes (Beck et al. 2018 legend); 0 = no data (sea)
+KOPPEN_CODES = (
+    None, 'Af', 'Am', 'Aw', 'BWh', 'BWk', 'BSh', 'BSk',
+    'Csa', 'Csb', 'Csc', 'Cwa', 'Cwb', 'Cwc', 'Cfa', 'Cfb', 'Cfc',
+    'Dsa', 'Dsb', 'Dsc', 'Dsd', 'Dwa', 'Dwb', 'Dwc', 'Dwd', 'Dfa', 'Dfb', 'Dfc', 'Dfd',
+    'ET', 'EF'
+)
+KOPPEN_INDEX = {code: i for i, code in enumerate(KOPPEN_CODES) if code}
+KOPPEN_INDEX['As'] = KOPPEN_INDEX['Aw']  # older datasets (Kottek et al. 2006) keep dry-summer savanna apart
+
+# Game climate names (same vocabulary as the scenarios and popular regions)
+KOPPEN_LABELS = {
+    'Af': 'Tropical humide',
+    'Am': 'Tropical mousson',
+    'Aw': 'Tropical savane',
+    'BWh': 'Aride chaud',
+    'BWk': 'Aride froid',
+    'BSh': 'Semi-aride chaud',
+    'BSk': 'Continental semi-aride',
+    'Csa': 'Méditerranéen tempéré', 'Csb': 'Méditerranéen tempéré', 'Csc': 'Méditerranéen tempéré',
+    'Cwa': 'Subtropical humide', 'Cfa': 'Subtropical humide',
+    'Cwb': 'Subtropical montagnard', 'Cwc': 'Subtropical montagnard',
+    'Cfb': 'Océanique tempéré', 'Cfc': 'Océanique tempéré',
+    'ET': 'Polaire toundra',
+    'EF': 'Polaire glaciaire'
+}
+for _code in KOPPEN_CODES[17:29]:
+    KOPPEN_LABELS[_code] = 'Continental froid' if _code[2] in 'cd' else 'Continental humide'
+
+
+def classify_koppen(monthly_temperature, monthly_precipitation, lat):
+    """
+    Köppen-Geiger class of a monthly climatology (Peel et al. 2007 rules)
+
+    Args:
+        monthly_temperature (array-like): 12 monthly mean temperatures (°C), January first
+        monthly_precipitation (array-like): 12 monthly totals (mm)
+        lat (float): Latitude (summer is April-September in the north, October-March in the south)
+
+    Returns:
+        str: Class code, e.g. 'BSh'
+    """
+    t = np.asarray(monthly_temperature, dtype=float)
+    p = np.asarray(monthly_precipitation, dtype=float)
+
+    summer = np.zeros(12, dtype=bool)
+    summer[3:9] = True
+    if lat < 0:
+        summer = ~summer
+
+    annual_t, annual_p = t.mean(), p.sum()
+    t_hot, t_cold = t.max(), t.min()
+
+    # Dryness threshold (mm): depends on when the rain falls
+    summer_p = p[summer].sum()
+    if annual_p > 0 and summer_p >= 0.7 * annual_p:
+        threshold = 20 * annual_t + 280
+    elif annual_p > 0 and annual_p - summer_p >= 0.7 * annual_p:
+        threshold = 20 * annual_t
+    else:
+        threshold = 20 * annual_t + 140
+
+    if t_hot < 10:
+        return 'ET' if t_hot > 0 else 'EF'
+
+    if annual_p < threshold:
+        return ('BW' if annual_p < threshold / 2 else 'BS') + ('h' if annual_t >= 18 else 'k')
+
+    if t_cold >= 18:
+        if p.min() >= 60:
+            return 'Af'
+        return 'Am' if p.min() >= 100 - annual_p / 25 else 'Aw'
+
+    # Temperate (coldest month above 0 °C) or continental
+    summer_dry, summer_wet = p[summer].min(), p[summer].max()
+    winter_dry, winter_wet = p[~summer].min(), p[~summer].max()
+    if summer_dry < 40 and summer_dry < winter_wet / 3:
+        season = 's'
+    elif winter_dry < summer_wet / 10:
+        season = 'w'
+    else:
+        season = 'f'
+
+    warm_months = int((t >= 10).sum())
+    if t_hot >= 22:
+        heat = 'a'
+    elif warm_months >= 4:
+        heat = 'b'
+    elif t_cold >= -38:
+        heat = 'c'
+    else:
+        heat = 'd'
+
+    return ('C' if t_cold > 0 else 'D') + season + heat
+
+
+class KoppenRaster:
+    """
+    Global uint8 raster of Köppen-Geiger codes (KOPPEN_CODES indices)
+
+    Shape (rows, cols) covers the globe from -90° (row 0) and -180°
+    (col 0); the resolution follows from the shape. The .npy file is
+    opened memory-mapped on first use, a lookup reads one byte.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize raster
+
+        Args:
+            path (str): .npy file (may not exist: lookups then return None)
+        """
+        self.path = path
+        self._grid = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        """Check whether the raster file exists"""
+        return os.path.exists(self.path)
+
+    def lookup(self, lat, lon):
+        """
+        Köppen-Geiger class of a coordinate
+
+        Returns:
+            str: Class code (e.g. 'Aw'), or None (no raster, sea cell)
+        """
+        grid = self._open()
+        if grid is None:
+            return None
+
+        rows, cols = grid.shape
+        row = int(np.clip(np.floor((lat + 90) * rows / 180), 0, rows - 1))
+        col = int(np.floor(((lon + 180) % 360) * cols / 360)) % cols
+        code = int(grid[row, col])
+        return KOPPEN_CODES[code] if 0 < code < len(KOPPEN_CODES) else None
+
+    def _open(self):
+        """Memory-map the raster once"""
+        if self._grid is None and self.available:
+            with self._lock:
+                if self._grid is None:
+                    try:
+                        self._grid = np.load(self.path, mmap_mode='r')
+                    except Exception as e:
+                        print(f"Köppen raster unreadable ({e}), using climatology/latitude estimates")
+                        return None
+        return self._grid
+
+    @staticmethod
+    def from_points(lats, lons, codes, resolution):
+        """
+        Raster of point classes at cell centres (e.g. the Kottek et al. ASCII table)
+
+        Args:
+            lats (array-like): Cell-centre latitudes
+            lons (array-like): Cell-centre longitudes
+            codes (list): Class codes ('Af', 'BWh', ...), unknown codes stay 0
+            resolution (float): Cell size in degrees
+
+        Returns:
+            ndarray: uint8 (180 / resolution, 360 / resolution) raster
+        """
+        rows, cols = int(round(180 / resolution)), int(round(360 / resolution))
+        grid = np.zeros((rows, cols), dtype=np.uint8)
+        row = np.clip(np.floor((np.asarray(lats, dtype=float) + 90) / resolution).astype(int), 0, rows - 1)
+        col = np.floor(((np.asarray(lons, dtype=float) + 180) % 360) / resolution).astype(int) % cols
+        grid[row, col] = [KOPPEN_INDEX.get(code, 0) for code in codes]
+        return grid
+
+    def save(self, grid):
+        """Atomically write a raster to self.path (unique temp file: builds may run concurrently)"""
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npy')
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, np.asarray(grid, dtype=np.uint8))
+        os.replace(tmp_path, self.path)
+        with self._lock:
+            self._grid = None
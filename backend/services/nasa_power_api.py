@@ -3,16 +3,41 @@ NASA POWER API Service
 Handles weather data retrieval from NASA POWER API
 """
 
+import os
+import sys
 import requests
+import numpy as np
 from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import Config
+from .weather_generator import WeatherGenerator
+from .evapotranspiration import et0_from_columns
+from .power_cleaning import OBSERVED, clean_power, worst_quality
+from .weekly_aggregator import WeeklyAggregator
+
 
 class NASAPowerAPI:
     """Wrapper for NASA POWER API"""
 
-    def __init__(self):
-        self.base_url = "https://power.larc.nasa.gov/api/temporal/daily/point"
+    DAILY_FIELDS = ('temperature', 'precipitation', 'humidity', 'evapotranspiration')
+    WEEKLY_STATS = {
+        'temperature': ('temperature', 'mean'),
+        'precipitation': ('precipitation', 'sum'),
+        'humidity': ('humidity', 'mean'),
+        'evapotranspiration': ('evapotranspiration', 'sum')
+    }
+
+    def __init__(self, climatology=None):
+        """
+        Initialize API wrapper
+
+        Args:
+            climatology (ClimatologyStore): Optional per-cell climatology for fallback weather
+        """
+        self.base_url = Config.NASA_POWER_API_URL
         self.cache = {}
+        self.climatology = climatology
 
     def get_weather_data(self, lat, lon, days=90):
         """
@@ -36,7 +61,8 @@ class NASAPowerAPI:
         start_date = end_date - timedelta(days=days)
 
         params = {
-            "parameters": "T2M,PRECTOTCORR,RH2M",  # Temp, Precipitation, Humidity
+            # Temp, Precipitation, Humidity + Penman-Monteith inputs
+            "parameters": "T2M,T2M_MAX,T2M_MIN,PRECTOTCORR,RH2M,WS2M,ALLSKY_SFC_SW_DWN",
             "community": "AG",  # Agriculture community
             "longitude": lon,
             "latitude": lat,
@@ -55,21 +81,35 @@ class NASAPowerAPI:
             if 'properties' not in data or 'parameter' not in data['properties']:
                 raise ValueError("Invalid API response structure")
 
-            parameters = data['properties']['parameter']
-            temps = parameters.get('T2M', {})
-            precip = parameters.get('PRECTOTCORR', {})
-            humidity = parameters.get('RH2M', {})
-
-            # Convert to list of daily data
+            # Mask -999 fill values, bridge short gaps, climatology for long ones
+            cleaned = clean_power(data['properties']['parameter'])
+            arrays = cleaned['arrays']
+            for name in ('T2M', 'PRECTOTCORR', 'RH2M'):
+                if name not in arrays:
+                    arrays[name] = np.full(len(cleaned['dates']), np.nan)
+
+            # FAO-56 ET0 for all days at once (Hargreaves where radiation is missing)
+            coordinates = data.get('geometry', {}).get('coordinates', [])
+            elevation = coordinates[2] if len(coordinates) > 2 and coordinates[2] > -999 else 0.0
+            et = et0_from_columns(arrays, lat, cleaned['day_of_year'], elevation)
+            et = np.where(np.isfinite(et), et, self._estimate_et(arrays['T2M'], arrays['RH2M']))
+
+            observed = worst_quality(cleaned['quality'], ('T2M', 'PRECTOTCORR', 'RH2M')) == OBSERVED
+
+            # Convert to list of daily data (None where nothing could be filled)
+            columns = {
+                'temperature': arrays['T2M'],
+                'precipitation': arrays['PRECTOTCORR'],
+                'humidity': arrays['RH2M'],
+                'evapotranspiration': et
+            }
             weather_data = []
-            for date_key in sorted(temps.keys()):
-                weather_data.append({
-                    'date': date_key,
-                    'temperature': temps.get(date_key, 25),
-                    'precipitation': precip.get(date_key, 0),
-                    'humidity': humidity.get(date_key, 50),
-                    'evapotranspiration': self._estimate_et(temps.get(date_key, 25), humidity.get(date_key, 50))
-                })
+            for i, date_key in enumerate(cleaned['dates']):
+                day = {'date': date_key}
+                for key, values in columns.items():
+                    day[key] = round(float(values[i]), 2) if np.isfinite(values[i]) else None
+                day['observed'] = bool(observed[i])
+                weather_data.append(day)
 
             # Cache the result
             self.cache[cache_key] = weather_data
@@ -79,9 +119,18 @@ class NASAPowerAPI:
         except requests.exceptions.RequestException as e:
             print(f"NASA POWER API error: {e}")
             # Return fallback data
-            return self._get_fallback_data(lat, days)
+            return self._get_fallback_data(lat, days, lon=lon)
+
+    def get_cached_weather_data(self, lat, lon, days=90):
+        """
+        Daily records already fetched by get_weather_data (no request)
+
+        Returns:
+            list: Weather data for each day, or None if not fetched (or the fetch failed)
+        """
+        return self.cache.get(f"{lat}_{lon}_{days}")
 
-    def get_weekly_aggregates(self, lat, lon, weeks=12):
+    def get_weekly_aggregates(self, lat, lon, weeks=12, start_date=None):
         """
         Get weather data aggregated by week
 
@@ -89,102 +138,144 @@ class NASAPowerAPI:
             lat (float): Latitude
             lon (float): Longitude
             weeks (int): Number of weeks
+            start_date (datetime): First day of week 1, e.g. a sowing date (default: first day returned)
 
         Returns:
             list: Weekly aggregated weather data
         """
-        daily_data = self.get_weather_data(lat, lon, weeks * 7)
-
-        if not daily_data:
-            return self._get_fallback_weekly_data(weeks)
-
-        # Aggregate by week
-        weekly_data = []
-        for i in range(0, min(len(daily_data), weeks * 7), 7):
-            week_slice = daily_data[i:i+7]
-
-            if not week_slice:
-                continue
+        days = weeks * 7
+        if start_date is not None:
+            days = max(days, (datetime.now() - start_date).days + 1)
 
-            avg_temp = sum(d['temperature'] for d in week_slice) / len(week_slice)
-            total_precip = sum(d['precipitation'] for d in week_slice)
-            avg_humidity = sum(d['humidity'] for d in week_slice) / len(week_slice)
-            total_et = sum(d['evapotranspiration'] for d in week_slice)
+        daily_data = self.get_weather_data(lat, lon, days)
 
-            weekly_data.append({
-                'week': len(weekly_data) + 1,
-                'temperature': round(avg_temp, 1),
-                'precipitation': round(total_precip, 1),
-                'humidity': round(avg_humidity, 1),
-                'evapotranspiration': round(total_et, 1)
-            })
+        if not daily_data:
+            return self._get_fallback_weekly_data(weeks, lat, lon=lon)
 
-        return weekly_data[:weeks]
+        return self.get_weekly_aggregates_from_daily(daily_data, weeks, start_date)
 
     def _estimate_et(self, temperature, humidity):
         """
         Estimate daily evapotranspiration using simplified formula
 
+        Only used without max/min temperatures (generated fallback weather,
+        incomplete API days); see services.evapotranspiration otherwise.
+
         Args:
-            temperature (float): Temperature in °C
-            humidity (float): Relative humidity %
+            temperature (float or ndarray): Temperature in °C
+            humidity (float or ndarray): Relative humidity %
 
         Returns:
-            float: ET in mm/day
+            float or ndarray: ET in mm/day
         """
         # Simplified Hargreaves equation approximation
-        et = 0.0023 * (temperature + 17.8) * (100 - humidity) / 10
-        return max(0, et)
-
-    def _get_fallback_data(self, lat, days):
-        """Generate fallback weather data if API fails"""
-        import random
-
-        # Determine climate based on latitude
-        if abs(lat) < 23:  # Tropical
-            base_temp = 28
-            base_rain = 5
-        elif abs(lat) < 40:  # Subtropical
-            base_temp = 22
-            base_rain = 3
-        else:  # Temperate
-            base_temp = 15
-            base_rain = 2
-
-        fallback = []
-        for i in range(days):
-            temp = base_temp + random.uniform(-3, 3)
-            rain = max(0, base_rain + random.uniform(-2, 8))
-
-            fallback.append({
-                'date': f"day_{i+1}",
-                'temperature': round(temp, 1),
-                'precipitation': round(rain, 1),
-                'humidity': 50 + random.uniform(-15, 15),
-                'evapotranspiration': round(self._estimate_et(temp, 50), 1)
-            })
-
-        return fallback
-
-    def _get_fallback_weekly_data(self, weeks):
+        et = 0.0023 * (np.asarray(temperature) + 17.8) * (100 - np.asarray(humidity)) / 10
+        et = np.maximum(0, et)
+        return float(et) if et.ndim == 0 else et
+
+    def _get_fallback_data(self, lat, days, seed=None, lon=None):
+        """Generate fallback weather data if API fails (seeded weather generator)"""
+        series = self._generate_fallback(lat, days, seed, lon)
+        temperature = np.round(series['temperature'][0], 1).tolist()
+        precipitation = np.round(series['precipitation'][0], 1).tolist()
+        humidity = np.round(series['humidity'][0], 1).tolist()
+        et = np.round(series['evapotranspiration'][0], 1).tolist()
+
+        return [{
+            'date': f"day_{i+1}",
+            'temperature': temperature[i],
+            'precipitation': precipitation[i],
+            'humidity': humidity[i],
+            'evapotranspiration': et[i],
+            'observed': False
+        } for i in range(days)]
+
+    def _get_fallback_weekly_data(self, weeks, lat=0, seed=None, lon=None):
         """Generate fallback weekly data"""
-        daily = self._get_fallback_data(0, weeks * 7)
-        return self.get_weekly_aggregates_from_daily(daily, weeks)
+        weekly = WeatherGenerator.aggregate_weekly(self._generate_fallback(lat, weeks * 7, seed, lon), weeks)
+        columns = {key: np.round(values[0], 1).tolist() for key, values in weekly.items()}
+
+        return [{
+            'week': i + 1,
+            'temperature': columns['temperature'][i],
+            'precipitation': columns['precipitation'][i],
+            'humidity': columns['humidity'][i],
+            'evapotranspiration': columns['evapotranspiration'][i],
+            'completeness': 0.0,
+            'complete': False
+        } for i in range(weeks)]
+
+    def _generate_fallback(self, lat, days, seed=None, lon=None):
+        """
+        One generated season of the last `days` days
+
+        Fitted to the location's climatology when it has been built (see
+        ClimatologyStore), the latitude's climate profile otherwise. Seeded
+        from Config.WEATHER_SEED and the latitude, so a location always gets
+        the same fallback weather.
+        """
+        if seed is None:
+            seed = [Config.WEATHER_SEED, int(round((lat + 90) * 100))]
+
+        generator = None
+        if self.climatology is not None and lon is not None:
+            start_day = (datetime.now() - timedelta(days=days)).timetuple().tm_yday
+            generator = self.climatology.weather_generator(lat, lon, start_day, days)
+
+        series = (generator or WeatherGenerator.for_latitude(lat)).generate(1, days, seed)
+        series['evapotranspiration'] = self._estimate_et(series['temperature'], series['humidity'])
+        return series
+
+    def get_weekly_aggregates_from_daily(self, daily_data, weeks, start_date=None):
+        """
+        Aggregate daily data into weekly
+
+        Args:
+            daily_data (list): Daily dicts (get_weather_data)
+            weeks (int): Number of weeks
+            start_date (datetime): First day of week 1 (ignored if the days are not dated)
+
+        Returns:
+            list: One dict per calendar week, with 'completeness' (share of
+                observed days, the rest being filled or generated) and
+                'complete'. Weekly totals of weeks with missing days are the
+                mean of their valid days x 7; weeks without any valid day are
+                interpolated from the neighbouring weeks (completeness 0).
+                Empty if a field has no valid day at all
+        """
+        aggregator = WeeklyAggregator.from_records(daily_data, self.DAILY_FIELDS, fill_value=-999.0)
+        if aggregator.dates is None:
+            start_date = None
+
+        # Partial-count means: a missing day counts as an average day of its week, not a dry one
+        means = {key: (name, 'mean') for key, (name, _) in self.WEEKLY_STATS.items()}
+        columns = aggregator.weekly(means, start=start_date, weeks=weeks)
+        for key, (_, stat) in self.WEEKLY_STATS.items():
+            values = columns[key] * 7 if stat == 'sum' else columns[key]
+            valid = np.isfinite(values)
+            if not valid.any():
+                return []
+            columns[key] = np.interp(np.arange(weeks), np.flatnonzero(valid), values[valid]).round(1).tolist()
+
+        observed = WeeklyAggregator({'observed': self._observed_days(daily_data)}, aggregator.dates)
+        completeness = observed.weekly({'observed': ('observed', 'sum')}, start=start_date, weeks=weeks)['observed'] / 7
+        completeness = np.nan_to_num(completeness)  # weeks past the data
 
-    def get_weekly_aggregates_from_daily(self, daily_data, weeks):
-        """Aggregate daily data into weekly"""
         weekly = []
-        for i in range(0, min(len(daily_data), weeks * 7), 7):
-            week_slice = daily_data[i:i+7]
-            if not week_slice:
-                continue
-
-            weekly.append({
-                'week': len(weekly) + 1,
-                'temperature': round(sum(d['temperature'] for d in week_slice) / len(week_slice), 1),
-                'precipitation': round(sum(d['precipitation'] for d in week_slice), 1),
-                'humidity': round(sum(d['humidity'] for d in week_slice) / len(week_slice), 1),
-                'evapotranspiration': round(sum(d['evapotranspiration'] for d in week_slice), 1)
-            })
-
-        return weekly[:weeks]
+        for i in range(weeks):
+            week = {key: values[i] for key, values in columns.items()}
+            week['completeness'] = round(float(completeness[i]), 2)
+            week['complete'] = week['completeness'] == 1.0
+            weekly.append(dict(week=i + 1, **week))
+
+        return weekly
+
+    def _observed_days(self, daily_data):
+        """1 for days fully observed (the 'observed' flag, else all fields valid), 0 otherwise"""
+        def observed(day):
+            if 'observed' in day:
+                return day['observed']
+            values = [day.get(field) for field in self.DAILY_FIELDS]
+            return all(value is not None and value > -999.0 for value in values)
+
+        return np.array([observed(day) for day in daily_data], dtype=float)
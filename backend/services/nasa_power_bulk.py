@@ -0,0 +1,263 @@
+"""
+NASA POWER Bulk Fetcher
+Fetches daily weather for many locations with as few POWER requests as possible
+"""
+
+import json
+import math
+import time
+import requests
+
+from .power_cleaning import clean_power
+
+
+class NASAPowerBulkFetcher:
+    """
+    Groups locations into POWER regional (bounding-box) or multi-parameter
+    point requests and splits the responses into the local weather store
+    """
+
+    # POWER regional requests need a bounding box between 2° and 10° per side
+    REGIONAL_MIN_SPAN = 2.0
+    REGIONAL_MAX_SPAN = 10.0
+
+    QUALITY_SUFFIX = '_QC'  # stored quality codes of a parameter (power_cleaning.OBSERVED...)
+
+    def __init__(self, weather_store, parameters, point_url, regional_url,
+                 regional_max_params=1, point_max_params=20, request_interval=1.0):
+        """
+        Initialize bulk fetcher
+
+        Args:
+            weather_store (WeatherStore): Destination store
+            parameters (list): POWER parameter names
+            point_url (str): POWER daily point endpoint
+            regional_url (str): POWER daily regional endpoint
+            regional_max_params (int): Parameters allowed per regional request
+            point_max_params (int): Parameters allowed per point request
+            request_interval (float): Pause between requests (s), POWER rate limits
+        """
+        self.store = weather_store
+        self.parameters = list(parameters)
+        self.point_url = point_url
+        self.regional_url = regional_url
+        self.regional_max_params = regional_max_params
+        self.point_max_params = point_max_params
+        self.request_interval = request_interval
+        self.last_request_time = 0
+
+    @staticmethod
+    def load_parameters(params_file):
+        """
+        Load parameter names from nasa_all_params.json
+
+        Returns:
+            list: POWER parameter names
+        """
+        with open(params_file, 'r', encoding='utf-8') as f:
+            return list(json.load(f).keys())
+
+    def plan(self, points):
+        """
+        Plan the requests needed for a list of locations
+
+        Points falling in the same POWER cell are fetched once. Cells are then
+        grouped into 10° tiles: a tile becomes regional requests when that
+        needs fewer calls than one point request per cell.
+
+        Args:
+            points (list): (lat, lon) tuples
+
+        Returns:
+            list: Request dicts ('type', 'parameters', 'cells', and 'bbox' or 'lat'/'lon')
+        """
+        # Deduplicate on the POWER grid
+        cells = {}
+        for lat, lon in points:
+            cells.setdefault(self.store.cell_for(lat, lon), (lat, lon))
+
+        # Group cells into aligned tiles no larger than the regional max span
+        tiles = {}
+        for cell, (lat, lon) in cells.items():
+            tile = (math.floor(lat / self.REGIONAL_MAX_SPAN), math.floor(lon / self.REGIONAL_MAX_SPAN))
+            tiles.setdefault(tile, []).append((cell, lat, lon))
+
+        regional_chunks = self._chunk(self.parameters, self.regional_max_params)
+        point_chunks = self._chunk(self.parameters, self.point_max_params)
+
+        plan = []
+        for members in tiles.values():
+            if len(members) * len(point_chunks) > len(regional_chunks):
+                bbox = self._bbox([lat for _, lat, _ in members], [lon for _, _, lon in members])
+                for chunk in regional_chunks:
+                    plan.append({
+                        'type': 'regional',
+                        'bbox': bbox,
+                        'parameters': chunk,
+                        'cells': members
+                    })
+            else:
+                for cell, lat, lon in members:
+                    for chunk in point_chunks:
+                        plan.append({
+                            'type': 'point',
+                            'lat': lat,
+                            'lon': lon,
+                            'parameters': chunk,
+                            'cells': [(cell, lat, lon)]
+                        })
+
+        return plan
+
+    def fetch(self, points, start_date, end_date, skip_cached=True):
+        """
+        Fetch daily weather for all points into the weather store
+
+        Args:
+            points (list): (lat, lon) tuples
+            start_date (str): 'YYYYMMDD'
+            end_date (str): 'YYYYMMDD'
+            skip_cached (bool): Skip points whose cell already covers the range
+
+        Returns:
+            dict: Summary with request and cell counts
+        """
+        if skip_cached:
+            points = [
+                (lat, lon) for lat, lon in points
+                if not self.store.has_range(lat, lon, start_date, end_date, self.parameters)
+            ]
+
+        plan = self.plan(points)
+        summary = {'points': len(points), 'requests': len(plan), 'failed_requests': 0, 'cells': set()}
+
+        for i, request in enumerate(plan, 1):
+            print(f"  [{i}/{len(plan)}] POWER {request['type']} request "
+                  f"({len(request['cells'])} cells, {len(request['parameters'])} parameters)")
+
+            if request['type'] == 'regional':
+                features = self._get_features(self.regional_url, {
+                    'parameters': ','.join(request['parameters']),
+                    'community': 'AG',
+                    'latitude-min': request['bbox'][0],
+                    'latitude-max': request['bbox'][1],
+                    'longitude-min': request['bbox'][2],
+                    'longitude-max': request['bbox'][3],
+                    'start': start_date,
+                    'end': end_date,
+                    'format': 'JSON'
+                })
+            else:
+                features = self._get_features(self.point_url, {
+                    'parameters': ','.join(request['parameters']),
+                    'community': 'AG',
+                    'latitude': request['lat'],
+                    'longitude': request['lon'],
+                    'start': start_date,
+                    'end': end_date,
+                    'format': 'JSON'
+                })
+
+            if features is None:
+                summary['failed_requests'] += 1
+                continue
+
+            summary['cells'].update(self._split_features(features, request['cells']))
+
+        summary['cells'] = len(summary['cells'])
+        return summary
+
+    def _get_features(self, url, params):
+        """
+        Run one POWER request
+
+        Returns:
+            list: GeoJSON features (point responses are wrapped) or None on error
+        """
+        elapsed = time.time() - self.last_request_time
+        if elapsed < self.request_interval:
+            time.sleep(self.request_interval - elapsed)
+        self.last_request_time = time.time()
+
+        try:
+            response = requests.get(url, params=params, timeout=120)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"  [ERROR] NASA POWER bulk request failed: {e}")
+            return None
+
+        if 'features' in data:
+            return data['features']
+        if 'properties' in data:
+            return [data]
+
+        print(f"  [ERROR] Invalid POWER response structure")
+        return None
+
+    def _split_features(self, features, cells):
+        """
+        Split a POWER response into per-cell daily arrays in the store
+
+        Each requested cell takes the nearest returned grid point. Arrays are
+        cleaned first (services.power_cleaning): fill values masked, gaps
+        interpolated or filled from climatology.
+
+        Returns:
+            set: Updated (row, col) cells
+        """
+        grid = []
+        for feature in features:
+            coordinates = feature.get('geometry', {}).get('coordinates', [])
+            parameters = feature.get('properties', {}).get('parameter', {})
+            if len(coordinates) < 2 or not parameters:
+                continue
+            grid.append((coordinates[1], coordinates[0], coordinates[2] if len(coordinates) > 2 else None, parameters))
+
+        updated = set()
+        if not grid:
+            return updated
+
+        for cell, lat, lon in cells:
+            f_lat, f_lon, elevation, parameters = min(
+                grid,
+                key=lambda g: (g[0] - lat) ** 2 + ((g[1] - lon) * math.cos(math.radians(lat))) ** 2
+            )
+            # Cleaned arrays, with the quality code of every day alongside (<name>_QC)
+            cleaned = clean_power(parameters)
+            arrays = dict(cleaned['arrays'])
+            arrays.update({f"{name}{self.QUALITY_SUFFIX}": codes for name, codes in cleaned['quality'].items()})
+            updated.add(self.store.save(lat, lon, cleaned['dates'], arrays, elevation))
+
+        return updated
+
+    def _bbox(self, lats, lons):
+        """
+        Bounding box of a tile's points, widened to POWER's minimum span
+
+        Returns:
+            tuple: (lat_min, lat_max, lon_min, lon_max)
+        """
+        lat_min, lat_max = self._widen(min(lats), max(lats), -90, 90)
+        lon_min, lon_max = self._widen(min(lons), max(lons), -180, 180)
+        return lat_min, lat_max, lon_min, lon_max
+
+    def _widen(self, low, high, bound_low, bound_high):
+        """Widen [low, high] to the minimum span, staying inside the bounds"""
+        missing = self.REGIONAL_MIN_SPAN - (high - low)
+        if missing > 0:
+            low -= missing / 2
+            high += missing / 2
+            if low < bound_low:
+                high += bound_low - low
+                low = bound_low
+            if high > bound_high:
+                low -= high - bound_high
+                high = bound_high
+        return round(low, 4), round(high, 4)
+
+    @staticmethod
+    def _chunk(items, size):
+        """Split a list into chunks of at most size items"""
+        size = max(1, size)
+        return [items[i:i + size] for i in range(0, len(items), size)]
@@ -0,0 +1,231 @@
+"""
+Nearest-Location Raster Service
+Global grid of the nearest scenario / cached location of every cell, memory-mapped
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from .spatial_index import chord_to_km, to_unit_vectors
+
+
+class NearestRaster:
+    """
+    Precomputed nearest point of every grid cell, per layer
+
+    A layer is one set of points (e.g. the scenarios of one season). For
+    each cell of a global lat/lon grid it stores the index of the nearest
+    point (int16, -1 = none) and the distance from the cell centre (km,
+    float16). Arrays are .npy files of shape (layers, rows, cols) opened
+    memory-mapped; a lookup compares the exact distances to the winners of
+    the 3x3 cells around the coordinate, since a cell only stores the point
+    nearest its centre.
+
+    sync() keeps the raster in line with the point sets: added points only
+    update the cells they win, removed or moved points rebuild their layer.
+    """
+
+    MAX_POINTS = np.iinfo(np.int16).max
+    BUILD_ROWS = 64  # grid rows per vectorized block while building
+
+    def __init__(self, store_dir, resolution=0.25):
+        """
+        Initialize raster
+
+        Args:
+            store_dir (str): Directory of the raster files
+            resolution (float): Cell size in degrees
+        """
+        self.store_dir = store_dir
+        self.resolution = float(resolution)
+        self.rows = int(round(180 / self.resolution))
+        self.cols = int(round(360 / self.resolution))
+        self.prefix = os.path.join(store_dir, f"nearest_{self.resolution:g}")
+
+        self.catalog = {}  # layer -> [{'id', 'lat', 'lon'}]
+        self._layers = []
+        self._index = None
+        self._distance = None
+        self._lock = threading.Lock()
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.open()
+
+    def open(self):
+        """
+        Memory-map the raster files if they exist
+
+        Returns:
+            bool: True if a raster is loaded
+        """
+        paths = self._paths()
+        if not all(os.path.exists(path) for path in paths.values()):
+            return False
+
+        try:
+            with open(paths['catalog'], 'r', encoding='utf-8') as f:
+                catalog = json.load(f)
+            index = np.load(paths['index'], mmap_mode='r')
+            distance = np.load(paths['distance'], mmap_mode='r')
+        except Exception as e:
+            print(f"Nearest raster unreadable ({e}), ignoring it")
+            return False
+
+        if index.shape[1:] != (self.rows, self.cols) or len(catalog['layers']) != index.shape[0]:
+            print("Nearest raster does not match its catalog, ignoring it")
+            return False
+
+        with self._lock:
+            self._layers = catalog['layers']
+            self.catalog = catalog['points']
+            self._index, self._distance = index, distance
+        return True
+
+    def is_current(self, layer, points):
+        """Check whether a layer was built from exactly these points"""
+        return layer in self._layers and self.catalog.get(layer) == self._normalize(points)
+
+    def lookup(self, layer, lat, lon):
+        """
+        Nearest point to (lat, lon) among the winners of its 3x3 cells
+
+        Returns:
+            tuple: (point dict, distance in km from (lat, lon)), or None
+                if the layer is not built or has no points
+        """
+        with self._lock:
+            if layer not in self._layers:
+                return None
+            row, col = self.cell_for(lat, lon)
+            k = self._layers.index(layer)
+            rows = np.arange(max(row - 1, 0), min(row + 2, self.rows))
+            cols = (col + np.arange(-1, 2)) % self.cols
+            candidates = np.unique(np.asarray(self._index[k][np.ix_(rows, cols)]))
+            points = self.catalog[layer]
+
+        candidates = candidates[candidates >= 0]
+        if len(candidates) == 0:
+            return None
+
+        vectors = to_unit_vectors([points[i]['lat'] for i in candidates], [points[i]['lon'] for i in candidates])
+        chord = np.linalg.norm(vectors - to_unit_vectors(lat, lon), axis=-1)
+        best = int(np.argmin(chord))
+        return points[int(candidates[best])], float(chord_to_km(chord[best]))
+
+    def cell_for(self, lat, lon):
+        """Grid (row, col) of a coordinate"""
+        row = int(np.clip(np.floor((lat + 90) / self.resolution), 0, self.rows - 1))
+        col = int(np.floor(((lon + 180) % 360) / self.resolution)) % self.cols
+        return row, col
+
+    def sync(self, layers):
+        """
+        Bring the raster up to date with the given point sets
+
+        Args:
+            layers (dict): Layer name -> list of (id, lat, lon)
+
+        Returns:
+            dict: Layer -> 'unchanged', 'added N' or 'rebuilt'
+        """
+        layers = {name: self._normalize(points) for name, points in layers.items()}
+        for name, points in layers.items():
+            if len(points) > self.MAX_POINTS:
+                raise ValueError(f"Layer {name} has {len(points)} points, at most {self.MAX_POINTS} fit in a raster")
+
+        names = sorted(layers)
+        index = np.full((len(names), self.rows, self.cols), -1, dtype=np.int16)
+        distance = np.full((len(names), self.rows, self.cols), np.inf, dtype=np.float16)
+
+        changes = {}
+        for k, name in enumerate(names):
+            points = layers[name]
+            old = self.catalog.get(name) if name in self._layers else None
+
+            if old == points:
+                changes[name] = 'unchanged'
+                index[k], distance[k] = self._index[self._layers.index(name)], self._distance[self._layers.index(name)]
+            elif old is not None and points[:len(old)] == old:
+                changes[name] = f"added {len(points) - len(old)}"
+                j = self._layers.index(name)
+                index[k], distance[k] = self._assign(points, len(old), self._index[j])
+            else:
+                changes[name] = 'rebuilt'
+                index[k], distance[k] = self._assign(points, 0, None)
+
+        if all(change == 'unchanged' for change in changes.values()) and names == self._layers:
+            return changes
+
+        self._write(names, layers, index, distance)
+        self.open()
+        return changes
+
+    def _assign(self, points, first_new, index):
+        """
+        Nearest point of every cell, adding points[first_new:] to an existing assignment
+
+        Returns:
+            tuple: (index int16 array, distance float16 array) of shape (rows, cols)
+        """
+        vectors = to_unit_vectors([p['lat'] for p in points], [p['lon'] for p in points])
+        lats = -90 + (np.arange(self.rows) + 0.5) * self.resolution
+        lons = -180 + (np.arange(self.cols) + 0.5) * self.resolution
+
+        new_index = np.full((self.rows, self.cols), -1, dtype=np.int16)
+        new_distance = np.full((self.rows, self.cols), np.inf, dtype=np.float16)
+        for start in range(0, self.rows, self.BUILD_ROWS):
+            block = slice(start, min(start + self.BUILD_ROWS, self.rows))
+            centres = to_unit_vectors(*np.meshgrid(lats[block], lons, indexing='ij')).astype(np.float32)
+
+            # Current owner of each cell (exact, recomputed from its point)
+            if index is None or first_new == 0:
+                best = np.full(centres.shape[:2], -1, dtype=np.int64)
+                best_dot = np.full(centres.shape[:2], -np.inf, dtype=np.float32)
+            else:
+                best = np.asarray(index[block], dtype=np.int64)
+                best_dot = np.where(best >= 0, np.einsum('rcx,rcx->rc', centres, vectors[np.maximum(best, 0)]),
+                                    -np.inf).astype(np.float32)
+
+            # Larger dot product = shorter chord = nearer point
+            for i in range(first_new, len(points)):
+                dot = centres @ vectors[i].astype(np.float32)
+                closer = dot > best_dot
+                best[closer] = i
+                best_dot[closer] = dot[closer]
+
+            chord = np.sqrt(np.maximum(2 - 2 * best_dot.astype(float), 0))
+            new_index[block] = best
+            new_distance[block] = np.where(best >= 0, chord_to_km(chord), np.inf)
+
+        return new_index, new_distance
+
+    def _write(self, names, layers, index, distance):
+        """Atomically replace the raster files (unique temp files: workers may sync at once)"""
+        paths = self._paths()
+        for key, array in (('index', index), ('distance', distance)):
+            fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.npy')
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, paths[key])
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'resolution': self.resolution, 'layers': names,
+                       'points': {name: layers[name] for name in names}}, f)
+        os.replace(tmp_path, paths['catalog'])
+
+    def _paths(self):
+        """Paths of the raster files"""
+        return {
+            'index': f"{self.prefix}.index.npy",
+            'distance': f"{self.prefix}.distance.npy",
+            'catalog': f"{self.prefix}.json"
+        }
+
+    @staticmethod
+    def _normalize(points):
+        """(id, lat, lon) tuples as catalog dicts"""
+        return [{'id': str(point_id), 'lat': float(lat), 'lon': float(lon)} for point_id, lat, lon in points]
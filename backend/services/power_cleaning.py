@@ -0,0 +1,164 @@
+"""
+POWER Cleaning Service
+Vectorized cleaning of daily NASA POWER arrays: fill values, short gaps, climatology
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import Config
+
+POWER_FILL_VALUE = -999.0
+
+# Quality code of each cleaned day
+OBSERVED = 0
+INTERPOLATED = 1
+CLIMATOLOGY = 2
+MISSING = 3
+
+# Intermittent parameters: a straight line across a gap would invent rain
+NOT_INTERPOLATED = ('PRECTOTCORR', 'PRECTOT', 'precipitation')
+
+
+def mask_fill_values(values, fill_value=POWER_FILL_VALUE):
+    """
+    Float copy of daily values with fill values (<= fill_value) and None as NaN
+
+    Returns:
+        ndarray: Values
+    """
+    values = np.array(values, dtype=float)
+    values[values <= fill_value] = np.nan
+    return values
+
+
+def interpolate_gaps(values, max_gap):
+    """
+    Linear interpolation across runs of at most `max_gap` missing days
+
+    Gaps touching the start or end of the series are left missing.
+
+    Returns:
+        tuple: (values, bool mask of interpolated days)
+    """
+    values = np.asarray(values, dtype=float)
+    valid = np.isfinite(values)
+    n = len(values)
+    if n == 0 or valid.all() or not valid.any():
+        return values.copy(), np.zeros(n, dtype=bool)
+
+    index = np.arange(n)
+    previous = np.maximum.accumulate(np.where(valid, index, -1))
+    following = np.minimum.accumulate(np.where(valid, index, n)[::-1])[::-1]
+
+    filled = ~valid & (previous >= 0) & (following < n) & (following - previous - 1 <= max_gap)
+    result = values.copy()
+    result[filled] = np.interp(index[filled], index[valid], values[valid])
+    return result, filled
+
+
+def day_of_year_climatology(values, day_of_year, half_window):
+    """
+    Mean of each day of year over all years, pooled over +/- half_window days
+
+    Args:
+        values (ndarray): Daily values (NaN = missing)
+        day_of_year (ndarray): Day of year of each value (1-366; 366 counts as 365)
+        half_window (int): Days either side pooled (the year wraps around)
+
+    Returns:
+        ndarray: Climatology for days of year 1-365 (index 0-364), NaN without data
+    """
+    valid = np.isfinite(values)
+    day = np.minimum(np.asarray(day_of_year), 365) - 1
+
+    sums = np.bincount(day[valid], weights=values[valid], minlength=365)
+    counts = np.bincount(day[valid], minlength=365).astype(float)
+
+    # Circular moving sum: pad with the other end of the year
+    kernel = np.ones(2 * half_window + 1)
+    pooled_sums = np.convolve(np.concatenate((sums[-half_window:], sums, sums[:half_window])), kernel, 'valid')
+    pooled_counts = np.convolve(np.concatenate((counts[-half_window:], counts, counts[:half_window])), kernel, 'valid')
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(pooled_counts > 0, pooled_sums / pooled_counts, np.nan)
+
+
+def clean_series(values, day_of_year, interpolate=True, max_gap=None, half_window=None):
+    """
+    Clean one daily series
+
+    Fill values are masked, gaps up to max_gap days are interpolated and
+    everything still missing takes the day-of-year climatology of the
+    series itself.
+
+    Args:
+        values (array-like): Daily values (POWER fill values allowed)
+        day_of_year (array-like): Day of year of each value
+        interpolate (bool): Interpolate short gaps (False for rain)
+        max_gap (int): Longest interpolated gap (default Config.POWER_MAX_GAP_DAYS)
+        half_window (int): Climatology pooling (default Config.POWER_CLIMATOLOGY_WINDOW_DAYS)
+
+    Returns:
+        tuple: (cleaned values, quality codes) as arrays
+    """
+    max_gap = Config.POWER_MAX_GAP_DAYS if max_gap is None else max_gap
+    half_window = Config.POWER_CLIMATOLOGY_WINDOW_DAYS if half_window is None else half_window
+
+    values = mask_fill_values(values)
+    quality = np.where(np.isfinite(values), OBSERVED, MISSING)
+
+    if interpolate:
+        values, filled = interpolate_gaps(values, max_gap)
+        quality[filled] = INTERPOLATED
+
+    missing = ~np.isfinite(values)
+    if missing.any():
+        day_of_year = np.asarray(day_of_year)
+        climatology = day_of_year_climatology(values, day_of_year, half_window)
+        values[missing] = climatology[np.minimum(day_of_year[missing], 365) - 1]
+        quality[missing & np.isfinite(values)] = CLIMATOLOGY
+
+    return values, quality
+
+
+def clean_power(parameters, max_gap=None, half_window=None):
+    """
+    Clean a NASA POWER 'parameter' block on one shared calendar
+
+    Args:
+        parameters (dict): {parameter: {YYYYMMDD: value}}
+        max_gap (int): Longest interpolated gap (days)
+        half_window (int): Climatology pooling (days either side)
+
+    Returns:
+        dict: 'dates' (sorted YYYYMMDD), 'day_of_year', 'arrays' and 'quality'
+            ({parameter: ndarray})
+    """
+    dates = sorted(set().union(*(values.keys() for values in parameters.values() if values)))
+    day_of_year = np.array([datetime.strptime(date, '%Y%m%d').timetuple().tm_yday for date in dates], dtype=int)
+
+    arrays, quality = {}, {}
+    for name, values in parameters.items():
+        raw = [values.get(date, np.nan) if values else np.nan for date in dates]
+        arrays[name], quality[name] = clean_series(raw, day_of_year, name not in NOT_INTERPOLATED,
+                                                   max_gap, half_window)
+
+    return {'dates': dates, 'day_of_year': day_of_year, 'arrays': arrays, 'quality': quality}
+
+
+def worst_quality(quality, names):
+    """
+    Worst quality code per day over several parameters (missing parameters count as MISSING)
+
+    Returns:
+        ndarray: Quality codes
+    """
+    codes = [quality[name] for name in names if name in quality]
+    if len(codes) < len(names):
+        return np.full(len(codes[0]) if codes else 0, MISSING)
+    return np.max(codes, axis=0)
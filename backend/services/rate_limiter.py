@@ -0,0 +1,116 @@
+"""
+Rate Limiter Service
+Token bucket shared by all threads and worker processes through SQLite
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+
+class RateLimitDeferred(Exception):
+    """Raised when a call cannot be made within the caller's deadline"""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} rate limit: retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket whose state lives in a small SQLite file
+
+    Every process (gunicorn worker) and thread uses the same bucket row,
+    updated under SQLite's write lock, so the combined rate never exceeds
+    the configured one. A caller reserves a slot: if it is available within
+    its max wait, it sleeps until then; otherwise it gets RateLimitDeferred
+    right away and nothing is reserved.
+    """
+
+    def __init__(self, db_path, name, rate, capacity=1):
+        """
+        Initialize limiter
+
+        Args:
+            db_path (str): SQLite file shared between processes
+            name (str): Bucket name (one row per limited API)
+            rate (float): Tokens added per second
+            capacity (int): Max burst size
+        """
+        self.db_path = db_path
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def reserve(self, max_wait=0.0):
+        """
+        Reserve one token
+
+        Args:
+            max_wait (float): Longest acceptable wait (s)
+
+        Returns:
+            float: Seconds to wait before making the call (0 if immediate)
+
+        Raises:
+            RateLimitDeferred: If the token is not available within max_wait
+        """
+        conn = self._connection()
+        now = time.time()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)).fetchone()
+            tokens = self.capacity if row is None else min(self.capacity, row[0] + (now - row[1]) * self.rate)
+
+            # Tokens may go negative: each one below zero is a reservation
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            if wait > max_wait:
+                conn.execute("ROLLBACK")
+                raise RateLimitDeferred(self.name, wait)
+
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                (self.name, tokens - 1, now)
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+        return wait
+
+    def acquire(self, max_wait=0.0):
+        """
+        Reserve a token and sleep until it is due
+
+        Raises:
+            RateLimitDeferred: If the token is not available within max_wait
+        """
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            time.sleep(wait)
+
+    def _connection(self):
+        """
+        Per-thread SQLite connection (autocommit, explicit transactions)
+
+        Connections are never shared across fork: a worker forked from a
+        preloaded master opens its own instead of reusing the master's.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
@@ -0,0 +1,216 @@
+"""
+Reverse Geocode Cache
+Persistent place-name cache bucketed by geohash, with nearest-hit lookup
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+
+
+class ReverseGeocodeCache:
+    """
+    Reverse geocoding results stored in SQLite, keyed by geohash cell
+
+    A lookup scans the click's cell and its 8 neighbours and returns the
+    nearest stored place within the radius, so nearby clicks reuse the same
+    name. Entries older than the TTL are reported as stale: the caller
+    refreshes them from Nominatim but can still use them if that fails.
+    The radius should not exceed the cell size (about 4.9 km at precision 5,
+    narrower east-west at high latitudes).
+    """
+
+    BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+    def __init__(self, db_path, precision=5, radius_km=3.0, ttl_days=180):
+        """
+        Initialize cache
+
+        Args:
+            db_path (str): SQLite file shared between processes
+            precision (int): Geohash length of the buckets
+            radius_km (float): Max distance of a reusable hit
+            ttl_days (float): Age after which an entry is refreshed
+        """
+        self.db_path = db_path
+        self.precision = precision
+        self.radius_km = radius_km
+        self.ttl = ttl_days * 86400
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS places ("
+            "cell TEXT NOT NULL, lat REAL NOT NULL, lon REAL NOT NULL, "
+            "name TEXT NOT NULL, city TEXT, country TEXT, updated REAL NOT NULL, "
+            "PRIMARY KEY (cell, lat, lon))"
+        )
+
+    def get(self, lat, lon):
+        """
+        Find the nearest cached place
+
+        Args:
+            lat (float): Latitude
+            lon (float): Longitude
+
+        Returns:
+            tuple: (location dict for lat/lon, is_fresh) or (None, False)
+        """
+        cells = self.neighbours(self.encode(lat, lon, self.precision))
+        placeholders = ','.join('?' * len(cells))
+        rows = self._connection().execute(
+            f"SELECT lat, lon, name, city, country, updated FROM places WHERE cell IN ({placeholders})",
+            cells
+        ).fetchall()
+
+        best, best_distance = None, self.radius_km
+        for row in rows:
+            distance = self._calculate_distance(lat, lon, row[0], row[1])
+            if distance <= best_distance:
+                best, best_distance = row, distance
+
+        if best is None:
+            return None, False
+
+        result = {
+            'name': best[2],
+            'city': best[3] or '',
+            'country': best[4] or '',
+            'lat': lat,
+            'lon': lon
+        }
+        return result, time.time() - best[5] < self.ttl
+
+    def put(self, lat, lon, result):
+        """
+        Store a Nominatim result
+
+        Args:
+            lat (float): Latitude
+            lon (float): Longitude
+            result (dict): Location info (name, city, country)
+        """
+        cell = self.encode(lat, lon, self.precision)
+        conn = self._connection()
+
+        # A refresh replaces the stale entries it supersedes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for row_lat, row_lon in conn.execute(
+                    "SELECT lat, lon FROM places WHERE cell = ? AND updated < ?",
+                    (cell, time.time() - self.ttl)).fetchall():
+                if self._calculate_distance(lat, lon, row_lat, row_lon) <= self.radius_km:
+                    conn.execute("DELETE FROM places WHERE cell = ? AND lat = ? AND lon = ?",
+                                 (cell, row_lat, row_lon))
+
+            conn.execute(
+                "INSERT OR REPLACE INTO places (cell, lat, lon, name, city, country, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cell, lat, lon, result['name'], result.get('city', ''), result.get('country', ''), time.time())
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    @classmethod
+    def encode(cls, lat, lon, precision):
+        """Geohash of a coordinate"""
+        lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+        chars, bits, value, even = [], 0, 0, True
+
+        while len(chars) < precision:
+            interval, coord = (lon_range, lon) if even else (lat_range, lat)
+            mid = (interval[0] + interval[1]) / 2
+            value <<= 1
+            if coord >= mid:
+                value |= 1
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+
+            bits += 1
+            if bits == 5:
+                chars.append(cls.BASE32[value])
+                bits, value = 0, 0
+
+        return ''.join(chars)
+
+    @classmethod
+    def decode(cls, geohash):
+        """
+        Bounds of a geohash cell
+
+        Returns:
+            tuple: (lat_min, lat_max, lon_min, lon_max)
+        """
+        lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+        even = True
+
+        for char in geohash:
+            value = cls.BASE32.index(char)
+            for shift in range(4, -1, -1):
+                interval = lon_range if even else lat_range
+                mid = (interval[0] + interval[1]) / 2
+                if value >> shift & 1:
+                    interval[0] = mid
+                else:
+                    interval[1] = mid
+                even = not even
+
+        return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+    @classmethod
+    def neighbours(cls, geohash):
+        """The cell and its 8 neighbours (fewer at the poles)"""
+        lat_min, lat_max, lon_min, lon_max = cls.decode(geohash)
+        lat_c, lon_c = (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
+        dlat, dlon = lat_max - lat_min, lon_max - lon_min
+
+        cells = []
+        for i in (-1, 0, 1):
+            lat = lat_c + i * dlat
+            if not -90 < lat < 90:
+                continue
+            for j in (-1, 0, 1):
+                lon = (lon_c + j * dlon + 180) % 360 - 180
+                cell = cls.encode(lat, lon, len(geohash))
+                if cell not in cells:
+                    cells.append(cell)
+
+        return cells
+
+    def _calculate_distance(self, lat1, lon1, lat2, lon2):
+        """Calculate distance between two coordinates (km)"""
+        # Haversine formula
+        R = 6371  # Earth radius in km
+
+        dlat = math.radians(lat2 - lat1)
+        dlon = math.radians(lon2 - lon1)
+
+        a = (math.sin(dlat / 2) ** 2 +
+             math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
+             math.sin(dlon / 2) ** 2)
+
+        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+        return R * c
+
+    def _connection(self):
+        """
+        Per-thread SQLite connection (autocommit, explicit transactions)
+
+        Connections are never shared across fork: a worker forked from a
+        preloaded master opens its own instead of reusing the master's.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
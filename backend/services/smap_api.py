@@ -9,8 +9,15 @@ import requests
 from requests.auth import HTTPBasicAuth
 from datetime import datetime, timedelta
 import os
+import sys
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import Config
+from .download_manager import VerifiedDownloader
+from .smap_l3 import SMAPL3Extractor
+
 # Load credentials from .env
 load_dotenv()
 
@@ -30,12 +37,13 @@ class SMAPAPI:
         self.password = os.getenv('NASA_EARTHDATA_PASSWORD')
 
         # SMAP L3 dataset (Level 3 - daily global)
-        self.base_url = "https://n5eil01u.ecs.nsidc.org/SMAP/SPL3SMP.008"
+        self.base_url = Config.SMAP_DATA_URL
 
         # Alternative: OpenDAP endpoint (easier access)
         self.opendap_url = "https://n5eil01u.ecs.nsidc.org/opendap/SMAP/SPL3SMP.008"
 
         self.cache = {}
+        self.extractor = SMAPL3Extractor(Config.SMAP_DATA_DIR)
 
     def get_soil_moisture(self, lat, lon, date=None):
         """
@@ -49,13 +57,14 @@ class SMAPAPI:
         Returns:
             dict: Soil moisture data
         """
-        if not self.username or not self.password:
-            print("[WARNING] NASA Earthdata credentials not found in .env")
-            return self._get_fallback_soil_moisture(lat, lon)
-
         if date is None:
             date = datetime.now() - timedelta(days=1)  # Yesterday (SMAP has delay)
 
+        # Granules already on disk are usable without credentials
+        if (not self.username or not self.password) and self.extractor.granule_for(date) is None:
+            print("[WARNING] NASA Earthdata credentials not found in .env")
+            return self._get_fallback_soil_moisture(lat, lon)
+
         cache_key = f"{lat}_{lon}_{date.strftime('%Y%m%d')}"
         if cache_key in self.cache:
             return self.cache[cache_key]
@@ -78,20 +87,33 @@ class SMAPAPI:
 
     def _fetch_smap_simplified(self, lat, lon, date):
         """
-        Simplified SMAP fetch (if NSIDC provides REST API)
+        Read soil moisture from the SPL3SMP granule of the day
 
-        Note: SMAP data access is complex, often requires:
-        - File download (.h5 HDF5 format)
-        - Libraries: h5py, netCDF4
-        - Grid interpolation
+        The granule is downloaded once into Config.SMAP_DATA_DIR; only the
+        tile around the point's EASE-Grid cell is read from it.
 
-        For MVP, we use fallback simulation
+        Returns:
+            dict: Soil moisture data, None if no granule or no retrieval
         """
-        # TODO: Implement full SMAP access with h5py
-        # Requires: pip install h5py netCDF4
+        if not self.extractor.available:
+            return None
+
+        granule_path = self.extractor.granule_for(date)
+        if granule_path is None and self.username and self.password:
+            granule_path = SMAPAPI_Advanced().download_smap_file(date, self.username, self.password)
+        if granule_path is None:
+            return None
+
+        value = self.extractor.extract(granule_path, [(lat, lon)], date.strftime('%Y%m%d'))[0]
+        if value is None:
+            return None
 
-        # For now, return None to use fallback
-        return None
+        return {
+            'soil_moisture': round(value * 100, 1),
+            'unit': '%',
+            'source': 'SMAP L3',
+            'date': date.strftime('%Y-%m-%d')
+        }
 
     def _get_fallback_soil_moisture(self, lat, lon):
         """
@@ -153,6 +175,24 @@ class SMAPAPI:
             return False
 
 
+class EarthdataSession(requests.Session):
+    """Session keeping Basic auth on redirects to the Earthdata login host"""
+
+    AUTH_HOST = 'urs.earthdata.nasa.gov'
+
+    def __init__(self, username, password):
+        super().__init__()
+        self.auth = (username, password)
+
+    def rebuild_auth(self, prepared_request, response):
+        # requests drops credentials on cross-host redirects; only Earthdata may see them
+        original = urlparse(response.request.url).hostname
+        redirect = urlparse(prepared_request.url).hostname
+        if 'Authorization' in prepared_request.headers and original != redirect and \
+                self.AUTH_HOST not in (original, redirect):
+            del prepared_request.headers['Authorization']
+
+
 class SMAPAPI_Advanced:
     """
     Advanced SMAP implementation using h5py
@@ -173,15 +213,17 @@ class SMAPAPI_Advanced:
             print("[WARNING] h5py not installed. Install: pip install h5py")
             self.available = False
 
-    def download_smap_file(self, date, username, password):
+    def download_smap_file(self, date, username, password, output_dir=None):
         """
         Download SMAP HDF5 file for a specific date
 
         File format: SMAP_L3_SM_P_YYYYMMDD_R18290_001.h5
-        """
-        if not self.available:
-            return None
+        Granules are ~100 MB: the download resumes after a dropped
+        connection and is only renamed into place once complete.
 
+        Returns:
+            str: Local file path, None on failure
+        """
         # Build filename
         filename = f"SMAP_L3_SM_P_{date.strftime('%Y%m%d')}_R18290_001.h5"
 
@@ -190,14 +232,15 @@ class SMAPAPI_Advanced:
         month = date.strftime('%m')
         day = date.strftime('%d')
 
-        url = f"https://n5eil01u.ecs.nsidc.org/SMAP/SPL3SMP.008/{year}.{month}.{day}/{filename}"
+        url = f"{Config.SMAP_DATA_URL}/{year}.{month}.{day}/{filename}"
+        file_path = os.path.join(output_dir or Config.SMAP_DATA_DIR, filename)
 
-        # TODO: Implement download with authentication
-        # session = requests.Session()
-        # session.auth = (username, password)
-        # response = session.get(url)
+        if os.path.exists(file_path):
+            return file_path
 
-        return None
+        downloader = VerifiedDownloader(Config.DOWNLOAD_CACHE_DIR, max_attempts=Config.DOWNLOAD_MAX_ATTEMPTS)
+        with EarthdataSession(username, password) as session:
+            return downloader.download(url, file_path, session=session, timeout=120)
 
     def extract_soil_moisture_from_h5(self, h5_file, lat, lon):
         """
@@ -214,12 +257,8 @@ class SMAPAPI_Advanced:
         if not self.available:
             return None
 
-        # TODO: Implement H5 parsing
-        # with h5py.File(h5_file, 'r') as f:
-        #     soil_moisture = f['Soil_Moisture_Retrieval_Data']['soil_moisture'][...]
-        #     # Interpolate to lat/lon
-
-        return None
+        value = SMAPL3Extractor().extract(h5_file, [(lat, lon)])[0]
+        return round(value * 100, 1) if value is not None else None
 
 
 # Helper function for easy integration
@@ -0,0 +1,265 @@
+"""
+SMAP L3 Extraction
+Reads soil moisture for many points from SPL3SMP granules (EASE-Grid 2.0, 36 km)
+"""
+
+import glob
+import os
+import threading
+
+import numpy as np
+
+try:
+    import h5py
+except ImportError:  # Optional: only needed to read granules
+    h5py = None
+
+
+class EASEGrid2:
+    """
+    EASE-Grid 2.0 global grid (cylindrical equal-area, WGS84, standard parallel 30°)
+
+    The projection is separable: the column depends only on longitude and
+    the row only on latitude. Row boundaries are converted to latitudes once,
+    so locating points is a searchsorted on a 1-D table.
+    """
+
+    A = 6378137.0  # WGS84 semi-major axis (m)
+    E = 0.0818191908426215  # WGS84 eccentricity
+    STANDARD_PARALLEL = 30.0
+
+    def __init__(self, rows=406, cols=964, cell_size=36032.220840584):
+        """
+        Initialize grid (defaults: SMAP L3 M36 grid)
+
+        Args:
+            rows (int): Grid rows
+            cols (int): Grid columns
+            cell_size (float): Cell size (m)
+        """
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+
+        sin_phi1 = np.sin(np.radians(self.STANDARD_PARALLEL))
+        self.k0 = np.cos(np.radians(self.STANDARD_PARALLEL)) / np.sqrt(1 - self.E ** 2 * sin_phi1 ** 2)
+
+        # Row edges in y (north to south), then in latitude
+        y_edges = (rows / 2 - np.arange(rows + 1)) * cell_size
+        self.lat_edges = self._latitude(y_edges)
+        self.lat_centers = self._latitude((rows / 2 - np.arange(rows) - 0.5) * cell_size)
+        self.lon_centers = (np.arange(cols) + 0.5) * 360.0 / cols - 180.0
+
+    def locate(self, lats, lons):
+        """
+        Grid cells of points
+
+        Args:
+            lats (array-like): Latitudes
+            lons (array-like): Longitudes
+
+        Returns:
+            tuple: (rows, cols) integer arrays
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+
+        # lat_edges is decreasing: search the negated (increasing) table
+        rows = np.searchsorted(-self.lat_edges, -lats, side='right') - 1
+        cols = np.floor((lons + 180.0) * self.cols / 360.0).astype(int)
+
+        return np.clip(rows, 0, self.rows - 1), np.mod(cols, self.cols)
+
+    def _y(self, lat):
+        """Projected y (m) of latitudes"""
+        sin_phi = np.sin(np.radians(lat))
+        e = self.E
+        q = (1 - e ** 2) * (sin_phi / (1 - e ** 2 * sin_phi ** 2)
+                            - np.log((1 - e * sin_phi) / (1 + e * sin_phi)) / (2 * e))
+        return self.A * q / (2 * self.k0)
+
+    def _latitude(self, y):
+        """Latitudes of projected y values (bisection, vectorized)"""
+        y = np.asarray(y, dtype=float)
+        low = np.full(y.shape, -90.0)
+        high = np.full(y.shape, 90.0)
+
+        for _ in range(60):
+            mid = (low + high) / 2
+            above = self._y(mid) > y
+            high = np.where(above, mid, high)
+            low = np.where(above, low, mid)
+
+        return (low + high) / 2
+
+
+class SMAPL3Extractor:
+    """
+    Point extraction from SPL3SMP granules
+
+    Requested cells are grouped into tiles; each tile is read as one small
+    hyperslab (plus a one-cell margin) instead of loading the global
+    406x964 array. Cells without a retrieval use the mean of the valid
+    neighbours in that margin. Values are cached per (day, cell).
+    """
+
+    GROUPS = [
+        ('Soil_Moisture_Retrieval_Data_AM', 'soil_moisture'),
+        ('Soil_Moisture_Retrieval_Data_PM', 'soil_moisture_pm')
+    ]
+    FILL_VALUE = -9999.0
+    TILE = 16  # cells per tile side
+
+    def __init__(self, granule_dir=None, grid=None):
+        """
+        Initialize extractor
+
+        Args:
+            granule_dir (str): Directory of SMAP_L3_SM_P_YYYYMMDD_*.h5 granules
+            grid (EASEGrid2): Grid (default: 36 km)
+        """
+        self.granule_dir = granule_dir
+        self.grid = grid or _default_grid()
+        self.available = h5py is not None
+        self.cache = {}  # (YYYYMMDD, row, col) -> soil moisture (m3/m3) or None
+        self._lock = threading.Lock()
+
+    def granule_for(self, date):
+        """
+        Local granule of a day
+
+        Args:
+            date (datetime): Day
+
+        Returns:
+            str: File path or None
+        """
+        if not self.granule_dir:
+            return None
+
+        matches = sorted(glob.glob(os.path.join(self.granule_dir, f"SMAP_L3_SM_P_{date.strftime('%Y%m%d')}_*.h5")))
+        return matches[-1] if matches else None
+
+    def list_granules(self):
+        """
+        All local granules
+
+        Returns:
+            dict: YYYYMMDD -> file path
+        """
+        if not self.granule_dir or not os.path.isdir(self.granule_dir):
+            return {}
+
+        granules = {}
+        for file_path in sorted(glob.glob(os.path.join(self.granule_dir, 'SMAP_L3_SM_P_*.h5'))):
+            granules[self._day_from_name(file_path)] = file_path
+        return granules
+
+    def extract(self, granule_path, points, day=None):
+        """
+        Soil moisture at many points from one granule (single open)
+
+        Args:
+            granule_path (str): SPL3SMP HDF5 file
+            points (list): (lat, lon) tuples
+            day (str): YYYYMMDD cache key (default: from the file name)
+
+        Returns:
+            list: Volumetric soil moisture (m3/m3) per point, None where unavailable
+        """
+        if not points:
+            return []
+
+        day = day or self._day_from_name(granule_path)
+        lats, lons = zip(*points)
+        rows, cols = self.grid.locate(lats, lons)
+        cells = list(zip(rows.tolist(), cols.tolist()))
+
+        missing = sorted({cell for cell in cells if (day, *cell) not in self.cache})
+        if missing:
+            if not self.available:
+                print("[WARNING] h5py not installed. Install: pip install h5py")
+                return [None] * len(points)
+
+            values = self._read_cells(granule_path, missing)
+            with self._lock:
+                for cell, value in zip(missing, values):
+                    self.cache[(day, *cell)] = value
+
+        return [self.cache.get((day, *cell)) for cell in cells]
+
+    def extract_for_date(self, date, points):
+        """
+        Extract from the local granule of a day
+
+        Returns:
+            list: Values per point, or None if no granule is available
+        """
+        granule_path = self.granule_for(date)
+        if granule_path is None:
+            return None
+        return self.extract(granule_path, points, date.strftime('%Y%m%d'))
+
+    def _read_cells(self, granule_path, cells):
+        """Read cells tile by tile (AM retrievals, PM where AM has none)"""
+        values = {cell: None for cell in cells}
+
+        tiles = {}
+        for cell in cells:
+            tiles.setdefault((cell[0] // self.TILE, cell[1] // self.TILE), []).append(cell)
+
+        with h5py.File(granule_path, 'r') as f:
+            datasets = [f[group][name] for group, name in self.GROUPS if group in f and name in f[group]]
+
+            for tile_cells in tiles.values():
+                tile_rows = [r for r, _ in tile_cells]
+                tile_cols = [c for _, c in tile_cells]
+                r0 = max(0, min(tile_rows) - 1)
+                r1 = min(self.grid.rows, max(tile_rows) + 2)
+                c0 = max(0, min(tile_cols) - 1)
+                c1 = min(self.grid.cols, max(tile_cols) + 2)
+
+                windows = []
+                for dataset in datasets:
+                    window = dataset[r0:r1, c0:c1].astype(float)
+                    window[(window == self.FILL_VALUE) | (window < 0)] = np.nan
+                    windows.append(window)
+
+                for row, col in tile_cells:
+                    r, c = row - r0, col - c0
+                    values[(row, col)] = self._cell_value(windows, r, c)
+
+        return [values[cell] for cell in cells]
+
+    @staticmethod
+    def _cell_value(windows, r, c):
+        """Retrieval of the cell (AM, then PM), else mean of valid neighbours"""
+        for window in windows:
+            if np.isfinite(window[r, c]):
+                return round(float(window[r, c]), 4)
+
+        for window in windows:
+            neighbours = window[max(0, r - 1):r + 2, max(0, c - 1):c + 2]
+            if np.isfinite(neighbours).any():
+                return round(float(np.nanmean(neighbours)), 4)
+
+        return None
+
+    @staticmethod
+    def _day_from_name(granule_path):
+        """YYYYMMDD from SMAP_L3_SM_P_YYYYMMDD_*.h5"""
+        parts = os.path.basename(granule_path).split('_')
+        return parts[4] if len(parts) > 4 else os.path.basename(granule_path)
+
+
+_grid = None
+_grid_lock = threading.Lock()
+
+
+def _default_grid():
+    """Shared 36 km grid (lookup tables built once per process)"""
+    global _grid
+    with _grid_lock:
+        if _grid is None:
+            _grid = EASEGrid2()
+        return _grid
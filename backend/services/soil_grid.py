@@ -0,0 +1,187 @@
+"""
+Soil Grid Service
+Dominant soil texture (and water retention) from a memory-mapped uint8 grid
+"""
+
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+# Grid codes; 0 = no data (sea, ice, rock)
+SOIL_CLASSES = (None, 'sandy', 'loam', 'clay')
+SOIL_INDEX = {soil: i for i, soil in enumerate(SOIL_CLASSES) if soil}
+
+VWC_SCALE = 200  # volumetric water content stored as uint8 in 0.005 m3/m3 steps
+
+
+def texture_class(sand, clay):
+    """
+    Game soil type of USDA texture fractions
+
+    Sand, loamy sand and sandy loam are 'sandy'; clay, silty clay and
+    sandy clay are 'clay'; the other USDA classes are 'loam'.
+
+    Args:
+        sand (array-like): Sand content (%)
+        clay (array-like): Clay content (%)
+
+    Returns:
+        ndarray: SOIL_INDEX codes (uint8)
+    """
+    sand = np.asarray(sand, dtype=float)
+    clay = np.asarray(clay, dtype=float)
+    silt = 100 - sand - clay
+
+    sandy = ((clay < 20) & (sand > 52)) | ((clay < 7) & (silt < 50) & (sand > 43))
+    clayey = (clay >= 40) | ((clay >= 35) & (sand > 45))
+
+    codes = np.full(sand.shape, SOIL_INDEX['loam'], dtype=np.uint8)
+    codes[sandy] = SOIL_INDEX['sandy']
+    codes[clayey] = SOIL_INDEX['clay']
+    return codes
+
+
+def water_retention(sand, clay, organic_matter=2.5):
+    """
+    Field capacity and wilting point from texture (Saxton & Rawls 2006)
+
+    Args:
+        sand (array-like): Sand content (%)
+        clay (array-like): Clay content (%)
+        organic_matter (float): Organic matter (%)
+
+    Returns:
+        tuple: (field capacity, wilting point) volumetric water contents (m3/m3)
+    """
+    s = np.asarray(sand, dtype=float) / 100
+    c = np.asarray(clay, dtype=float) / 100
+    om = organic_matter
+
+    wp = -0.024 * s + 0.487 * c + 0.006 * om + 0.005 * s * om - 0.013 * c * om + 0.068 * s * c + 0.031
+    wp = wp + (0.14 * wp - 0.02)
+
+    fc = -0.251 * s + 0.195 * c + 0.011 * om + 0.006 * s * om - 0.027 * c * om + 0.452 * s * c + 0.299
+    fc = fc + (1.283 * fc ** 2 - 0.374 * fc - 0.015)
+    return fc, wp
+
+
+class SoilGrid:
+    """
+    Global uint8 grid of soil texture and water retention
+
+    Shape (3, rows, cols): SOIL_CLASSES index, field capacity and wilting
+    point (both VWC_SCALE steps, 0 = unknown). Rows start at -90°, columns
+    at -180°; the resolution follows from the shape. The .npy file is
+    opened memory-mapped on first use, a lookup reads three bytes.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize grid
+
+        Args:
+            path (str): .npy file (may not exist: lookups then return None)
+        """
+        self.path = path
+        self._grid = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        """Check whether the grid file exists"""
+        return os.path.exists(self.path)
+
+    def lookup(self, lat, lon):
+        """
+        Soil of a coordinate
+
+        Returns:
+            dict: 'soil_type' (Config.SOIL_TYPES key), 'vwc_field_capacity' and
+                'vwc_wilting_point' (m3/m3, None if not in the grid), or None
+                (no grid, no-data cell)
+        """
+        grid = self._open()
+        if grid is None:
+            return None
+
+        _, rows, cols = grid.shape
+        row = int(np.clip(np.floor((lat + 90) * rows / 180), 0, rows - 1))
+        col = int(np.floor(((lon + 180) % 360) * cols / 360)) % cols
+        code, fc, wp = (int(value) for value in grid[:, row, col])
+        if not 0 < code < len(SOIL_CLASSES):
+            return None
+
+        known = fc > wp > 0
+        return {
+            'soil_type': SOIL_CLASSES[code],
+            'vwc_field_capacity': fc / VWC_SCALE if known else None,
+            'vwc_wilting_point': wp / VWC_SCALE if known else None
+        }
+
+    def _open(self):
+        """Memory-map the grid once"""
+        if self._grid is None and self.available:
+            with self._lock:
+                if self._grid is None:
+                    try:
+                        self._grid = np.load(self.path, mmap_mode='r')
+                    except Exception as e:
+                        print(f"Soil grid unreadable ({e}), using climate-based soil types")
+                        return None
+        return self._grid
+
+    @staticmethod
+    def from_points(lats, lons, sand, clay, resolution, field_capacity=None, wilting_point=None):
+        """
+        Downsample point texture data (e.g. a SoilGrids/HWSD export) to a grid
+
+        Points falling in the same cell are averaged before classification,
+        so the cell gets the texture of its mean composition.
+
+        Args:
+            lats (array-like): Point latitudes
+            lons (array-like): Point longitudes
+            sand (array-like): Sand content (%)
+            clay (array-like): Clay content (%)
+            resolution (float): Cell size in degrees
+            field_capacity (array-like): Measured field capacity (m3/m3), else Saxton & Rawls
+            wilting_point (array-like): Measured wilting point (m3/m3), else Saxton & Rawls
+
+        Returns:
+            ndarray: uint8 (3, 180 / resolution, 360 / resolution) grid
+        """
+        rows, cols = int(round(180 / resolution)), int(round(360 / resolution))
+        row = np.clip(np.floor((np.asarray(lats, dtype=float) + 90) / resolution).astype(int), 0, rows - 1)
+        col = np.floor(((np.asarray(lons, dtype=float) + 180) % 360) / resolution).astype(int) % cols
+        cell = row * cols + col
+
+        def cell_mean(values):
+            total = np.bincount(cell, weights=np.asarray(values, dtype=float), minlength=rows * cols)
+            return total[filled] / count[filled]
+
+        count = np.bincount(cell, minlength=rows * cols)
+        filled = count > 0
+        sand_mean, clay_mean = cell_mean(sand), cell_mean(clay)
+        if field_capacity is not None and wilting_point is not None:
+            fc, wp = cell_mean(field_capacity), cell_mean(wilting_point)
+        else:
+            fc, wp = water_retention(sand_mean, clay_mean)
+
+        grid = np.zeros((3, rows * cols), dtype=np.uint8)
+        grid[0, filled] = texture_class(sand_mean, clay_mean)
+        grid[1, filled] = np.clip(np.round(fc * VWC_SCALE), 1, 255)
+        grid[2, filled] = np.clip(np.round(wp * VWC_SCALE), 1, 255)
+        return grid.reshape(3, rows, cols)
+
+    def save(self, grid):
+        """Atomically write a grid to self.path (unique temp file: builds may run concurrently)"""
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npy')
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, np.asarray(grid, dtype=np.uint8))
+        os.replace(tmp_path, self.path)
+        with self._lock:
+            self._grid = None
@@ -0,0 +1,252 @@
+"""
+Sowing Optimizer Service
+Scores every sowing day of the year over a multi-year daily weather record
+"""
+
+import os
+import sys
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import Config
+from models.batch_season import BatchSeason
+from .evapotranspiration import et0_from_columns
+from .power_cleaning import POWER_FILL_VALUE, mask_fill_values
+from .weekly_aggregator import WeeklyAggregator
+
+
+class SowingOptimizer:
+    """
+    Best sowing windows for a location and crop
+
+    Each (year, day of year) start is one season: weekly weather for all of
+    them comes from one WeeklyAggregator call and all seasons are played
+    together by BatchSeason under a reference plan. Days are then ranked on
+    expected yield minus a risk penalty (spread across years). Seasons are
+    always played with the weekly timestep, whatever SIMULATION_TIMESTEP.
+    """
+
+    STATS = {
+        'rain': ('precipitation', 'sum'),
+        'temperature': ('temperature', 'mean'),
+        'et': ('evapotranspiration', 'sum'),
+        'rain_days': ('precipitation', 'count'),
+        'temperature_days': ('temperature', 'count'),
+        'et_days': ('evapotranspiration', 'count')
+    }
+
+    def __init__(self, weather_store=None, nasa_api=None, years=None):
+        """
+        Initialize optimizer
+
+        Args:
+            weather_store (WeatherStore): Local daily POWER store (checked first)
+            nasa_api (NASAPowerAPI): Live POWER access when the store has no data
+            years (int): Years of daily record to scan (default Config.SOWING_YEARS)
+        """
+        self.store = weather_store
+        self.nasa_api = nasa_api
+        self.years = years or Config.SOWING_YEARS
+
+    def daily_record(self, lat, lon):
+        """
+        Multi-year daily temperature, precipitation and ET0 for a location
+
+        Args:
+            lat (float): Latitude
+            lon (float): Longitude
+
+        Returns:
+            dict: {'aggregator', 'source'} or None without dated daily weather
+        """
+        if self.store is not None:
+            cell = self.store.load(lat, lon)
+            if cell is not None and len(cell['dates']) >= 365:
+                return {'aggregator': self._from_store(cell, lat), 'source': 'weather_store'}
+
+        if self.nasa_api is not None:
+            records = self.nasa_api.get_weather_data(lat, lon, days=self.years * 365 + self.years // 4)
+            aggregator = WeeklyAggregator.from_records(records, ('temperature', 'precipitation', 'evapotranspiration'),
+                                                       fill_value=POWER_FILL_VALUE)
+            if aggregator.dates is not None and aggregator.n_days >= 365:  # generated fallback is undated
+                return {'aggregator': aggregator, 'source': 'nasa_power'}
+
+        return None
+
+    def scan(self, lat, lon, crop_type, soil_type='loam', plan='rainfed', top=3, weeks=12):
+        """
+        Simulate every sowing day of every year and rank sowing windows
+
+        Args:
+            lat (float): Latitude
+            lon (float): Longitude
+            crop_type (str): Crop (Config.CROPS key)
+            soil_type (str): Soil (Config.SOIL_TYPES key)
+            plan (str): Reference management (Config.SOWING_PLANS key)
+            top (int): Number of windows returned
+            weeks (int): Season length
+
+        Returns:
+            dict: Best windows with expected yield and risk, and the per-day
+                curve ('timestep' is always 'weekly'); None without daily
+                weather for the location
+        """
+        record = self.daily_record(lat, lon)
+        if record is None:
+            return None
+
+        aggregator = record['aggregator']
+        starts, first_year = self._start_grid(aggregator.dates, weeks)
+        valid = starts >= 0
+
+        # Weekly weather of every season, kept only when all days are present
+        seasons = aggregator.weekly(self.STATS, start=starts[valid].tolist(), weeks=weeks, partial=False)
+        complete = np.all([seasons[key] == 7 for key in ('rain_days', 'temperature_days', 'et_days')], axis=(0, 2))
+
+        simulation = BatchSeason(
+            crop_type, Config.CROPS[crop_type], Config.SOIL_TYPES[soil_type],
+            initial_budget=Config.INITIAL_BUDGET,
+            irrigation_cost=Config.IRRIGATION_COST_PER_MM,
+            fertilizer_cost=Config.FERTILIZER_COST_PER_KG
+        ).run(seasons['rain'][complete], seasons['temperature'][complete], seasons['et'][complete],
+              Config.SOWING_PLANS[plan])
+
+        # Back onto the (year, day of year) grid, NaN where no full season exists
+        rows = np.flatnonzero(valid)[complete]
+        yields = np.full(starts.size, np.nan)
+        profits = np.full(starts.size, np.nan)
+        yields[rows] = simulation['yield']
+        profits[rows] = simulation['profit']
+        yields = yields.reshape(starts.shape)
+        profits = profits.reshape(starts.shape)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # days without any full season
+            expected = np.nanmean(yields, axis=0)
+            spread = np.nanstd(yields, axis=0)
+            low = np.nanpercentile(yields, 10, axis=0)
+
+        score = expected - Config.SOWING_RISK_WEIGHT * spread
+        windows = [self._window_stats(yields, profits, day, Config.SOWING_WINDOW_DAYS)
+                   for day in self._best_windows(score, Config.SOWING_WINDOW_DAYS, top)]
+
+        return {
+            'lat': lat,
+            'lon': lon,
+            'crop_type': crop_type,
+            'soil_type': soil_type,
+            'plan': plan,
+            'timestep': 'weekly',  # BatchSeason has no daily water balance
+            'source': record['source'],
+            'years': [first_year, first_year + starts.shape[0] - 1],
+            'seasons_simulated': int(complete.sum()),
+            'windows': windows,
+            'curve': {
+                'expected_yield': self._rounded(expected),
+                'yield_p10': self._rounded(low)
+            }
+        }
+
+    def _from_store(self, cell, lat):
+        """Aggregator over the last years of a WeatherStore cell, on a gap-free calendar"""
+        end = cell['dates'][-1]
+        days = np.arange(max(cell['dates'][0], end - np.timedelta64(self.years * 365 + self.years // 4 - 1, 'D')),
+                         end + np.timedelta64(1, 'D'))
+        positions = np.searchsorted(days, cell['dates'])
+        inside = (positions < len(days)) & (days[np.minimum(positions, len(days) - 1)] == cell['dates'])
+
+        columns = {}
+        for name, values in cell['arrays'].items():
+            columns[name] = np.full(len(days), np.nan)
+            columns[name][positions[inside]] = mask_fill_values(values)[inside]
+
+        missing = np.full(len(days), np.nan)
+        temperature = columns.get('T2M')
+        if temperature is None and 'T2M_MAX' in columns and 'T2M_MIN' in columns:
+            temperature = (columns['T2M_MAX'] + columns['T2M_MIN']) / 2
+
+        day_of_year = (days - days.astype('datetime64[Y]')).astype(int) + 1
+        et = et0_from_columns(columns, lat, day_of_year, cell['elevation'] or 0.0)
+
+        return WeeklyAggregator({
+            'temperature': missing if temperature is None else temperature,
+            'precipitation': columns.get('PRECTOTCORR', missing),
+            'evapotranspiration': et
+        }, days)
+
+    @staticmethod
+    def _start_grid(dates, weeks):
+        """
+        Start index of every (year, day of year) season, -1 when out of the record
+
+        Days of year follow a 365-day calendar (29 February is skipped), so a
+        column is the same calendar day in every year.
+
+        Returns:
+            tuple: (ndarray of shape (years, 365), first year)
+        """
+        first_year = int(str(dates[0])[:4])
+        last_year = int(str(dates[-1])[:4])
+        offsets = np.arange(365)
+
+        starts = []
+        for year in range(first_year, last_year + 1):
+            leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+            days = np.datetime64(f"{year}-01-01") + offsets + (leap & (offsets >= 59))
+            starts.append((days - dates[0]).astype(int))
+
+        starts = np.array(starts)
+        starts[(starts < 0) | (starts + 7 * weeks > len(dates))] = -1
+        return starts, first_year
+
+    @staticmethod
+    def _best_windows(score, width, top):
+        """
+        First days of the best non-overlapping windows of `width` days
+
+        The year wraps around (a window may start late December).
+        """
+        padded = np.concatenate((score, score[:width - 1]))
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            window_score = np.nanmean(np.lib.stride_tricks.sliding_window_view(padded, width), axis=1)
+
+        days = []
+        window_score = np.where(np.isfinite(window_score), window_score, -np.inf)
+        while len(days) < top and np.isfinite(window_score).any():
+            best = int(np.argmax(window_score))
+            days.append(best)
+            distance = np.abs(np.arange(len(score)) - best)
+            window_score[np.minimum(distance, len(score) - distance) < width] = -np.inf
+        return days
+
+    @staticmethod
+    def _window_stats(yields, profits, first_day, width):
+        """Yield and risk of all seasons sown within a window"""
+        columns = (first_day + np.arange(width)) % yields.shape[1]
+        window_yields = yields[:, columns].ravel()
+        window_profits = profits[:, columns].ravel()
+        present = np.isfinite(window_yields)
+        window_yields, window_profits = window_yields[present], window_profits[present]
+
+        return {
+            'start': SowingOptimizer._calendar_day(columns[0]),
+            'end': SowingOptimizer._calendar_day(columns[-1]),
+            'expected_yield': round(float(window_yields.mean()), 2),
+            'yield_std': round(float(window_yields.std()), 2),
+            'yield_p10': round(float(np.percentile(window_yields, 10)), 2),
+            'expected_profit': round(float(window_profits.mean()), 2),
+            'seasons': int(present.sum())
+        }
+
+    @staticmethod
+    def _calendar_day(day):
+        """'MM-DD' of a day index in the 365-day calendar"""
+        return str(np.datetime64('2001-01-01') + int(day))[5:]
+
+    @staticmethod
+    def _rounded(values):
+        """JSON-friendly list, None where NaN"""
+        return [round(float(value), 2) if np.isfinite(value) else None for value in values]
@@ -0,0 +1,99 @@
+"""
+Spatial Index Service
+Nearest-neighbour search of geographic points on the sphere
+"""
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
+
+def to_unit_vectors(lat, lon):
+    """
+    3D unit vectors of coordinates in degrees
+
+    Returns:
+        ndarray: (..., 3) array
+    """
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)), axis=-1)
+
+
+def chord_to_km(chord):
+    """Great-circle distance (km) of a chord between unit vectors (same as Haversine)"""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+class SpatialIndex:
+    """
+    Points as unit vectors: k nearest by chord length, one vectorized pass
+
+    Chord length is monotonic in great-circle distance, so ranking needs no
+    trigonometry per point. Scenario catalogs hold tens to thousands of
+    points, well within a brute-force numpy scan.
+    """
+
+    def __init__(self, lats, lons):
+        """
+        Initialize index
+
+        Args:
+            lats (array-like): Point latitudes
+            lons (array-like): Point longitudes
+        """
+        self.vectors = to_unit_vectors(lats, lons).reshape(-1, 3)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def nearest(self, lat, lon, k=1, radius_km=None, mask=None):
+        """
+        k nearest points of a location
+
+        Args:
+            lat (float): Latitude
+            lon (float): Longitude
+            k (int): Number of neighbours
+            radius_km (float): Only points closer than this (optional)
+            mask (ndarray): Boolean mask of eligible points (optional)
+
+        Returns:
+            tuple: (indices, distances in km) arrays, nearest first
+        """
+        chords = np.linalg.norm(self.vectors - to_unit_vectors(lat, lon), axis=1)
+        if mask is not None:
+            chords = np.where(mask, chords, np.inf)
+
+        k = min(k, len(chords))
+        if k == 0:
+            return np.zeros(0, dtype=int), np.zeros(0)
+
+        candidates = np.argpartition(chords, k - 1)[:k]
+        candidates = candidates[np.argsort(chords[candidates])]
+        distances = chord_to_km(chords[candidates])
+
+        keep = np.isfinite(chords[candidates])
+        if radius_km is not None:
+            keep &= distances < radius_km
+        return candidates[keep], distances[keep]
+
+    @staticmethod
+    def idw_weights(distances, power=2):
+        """
+        Normalized inverse-distance weights (a point at distance 0 takes all the weight)
+
+        Args:
+            distances (ndarray): Distances (km)
+            power (float): Distance exponent
+
+        Returns:
+            ndarray: Weights summing to 1
+        """
+        distances = np.asarray(distances, dtype=float)
+        exact = distances < 1e-6
+        if exact.any():
+            return exact / exact.sum()
+        weights = distances ** -float(power)
+        return weights / weights.sum()
@@ -0,0 +1,122 @@
+"""
+Cache Warm-up Service
+Pre-loads scenario data and popular region weather at startup
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class CacheWarmer:
+    """Warms the data provider caches so first requests hit hot paths"""
+
+    def __init__(self, data_provider, popular_regions, max_workers=4, timeout=60, prefetch_live=True,
+                 sync_raster=True):
+        """
+        Initialize warmer
+
+        Args:
+            data_provider (DataProvider): Provider whose caches are warmed
+            popular_regions (dict): Config.POPULAR_REGIONS
+            max_workers (int): Size of the live prefetch pool
+            timeout (float): Max seconds spent on live prefetch
+            prefetch_live (bool): Also prefetch NASA POWER data for popular regions
+            sync_raster (bool): Update the data provider's nearest-location raster
+        """
+        self.data_provider = data_provider
+        self.popular_regions = popular_regions
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.prefetch_live = prefetch_live
+        self.sync_raster = sync_raster
+
+        self._ready = threading.Event()
+        self._thread = None
+        self.status = {
+            'state': 'pending',
+            'scenarios': 0,
+            'scenarios_loaded': 0,
+            'raster_layers': 0,
+            'live_prefetched': 0,
+            'live_failed': 0,
+            'duration_s': None
+        }
+
+    def start(self):
+        """Run the warm-up in a background thread"""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self.run, name='terragrow-warmup', daemon=True)
+        self._thread.start()
+
+    def run(self):
+        """Run the warm-up synchronously (e.g. before gunicorn forks)"""
+        started = time.monotonic()
+        self.status['state'] = 'warming'
+
+        try:
+            loader = self.data_provider.historical_loader
+
+            # 1. Scenario catalog
+            self.status['scenarios'] = len(loader.get_available_scenarios())
+
+            # 2. Parse every historical scenario
+            self.status['scenarios_loaded'] = loader.preload_all()
+
+            # 3. Nearest-location raster (incremental when locations were added)
+            if self.sync_raster:
+                changes = self.data_provider.sync_nearest_raster()
+                self.status['raster_layers'] = len(changes)
+
+            # 4. Live data for popular regions (bounded pool)
+            if self.prefetch_live:
+                self._prefetch_popular_regions()
+
+            self.status['state'] = 'ready'
+
+        except Exception as e:
+            print(f"[WARMUP] Error during warm-up: {e}")
+            self.status['state'] = 'degraded'
+
+        self.status['duration_s'] = round(time.monotonic() - started, 2)
+        print(f"[WARMUP] {self.status['state']}: {self.status['scenarios_loaded']} scenarios, "
+              f"{self.status['live_prefetched']} popular regions in {self.status['duration_s']}s")
+
+        # Degraded caches still serve requests through the cold path
+        self._ready.set()
+
+    def mark_ready(self):
+        """Flag as ready without warming (warm-up disabled)"""
+        self.status['state'] = 'disabled'
+        self._ready.set()
+
+    def is_ready(self):
+        """Check whether the warm-up finished"""
+        return self._ready.is_set()
+
+    def to_dict(self):
+        """Export warm-up status as dictionary"""
+        return dict(self.status, ready=self.is_ready())
+
+    def _prefetch_popular_regions(self):
+        """Fetch weather for every popular region in a bounded pool"""
+        nasa_api = self.data_provider.nasa_api
+        weeks = 12
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='terragrow-warmup')
+        futures = [
+            executor.submit(nasa_api.get_weather_data, region['lat'], region['lon'], weeks * 7)
+            for region in self.popular_regions.values()
+        ]
+
+        wait(futures, timeout=self.timeout)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        # Fallback data is never cached, so the cache tells what really succeeded
+        for region in self.popular_regions.values():
+            if f"{region['lat']}_{region['lon']}_{weeks * 7}" in nasa_api.cache:
+                self.status['live_prefetched'] += 1
+            else:
+                self.status['live_failed'] += 1
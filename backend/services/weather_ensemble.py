@@ -0,0 +1,60 @@
+"""
+Weather Ensemble Service
+Alternative seasons resampled from a scenario's historical weekly records
+"""
+
+import zlib
+
+import numpy as np
+
+
+class BlockBootstrap:
+    """
+    Local block bootstrap over weekly records
+
+    A variant is a sequence of blocks of consecutive historical weeks. Each
+    block is copied from near the position it fills (within window_weeks),
+    so the seasonal cycle stays in place while runs of wet or dry weeks
+    inside a block are preserved. Variants are stored as week indices into
+    the historical arrays: variant 0 is the observed season, variant k is
+    one row of an (n_variants, n_weeks) matrix built in a single vectorized
+    draw.
+    """
+
+    def __init__(self, block_weeks=3, window_weeks=2):
+        """
+        Initialize bootstrap
+
+        Args:
+            block_weeks (int): Consecutive weeks per block
+            window_weeks (int): Maximum shift of a block from its position
+        """
+        self.block_weeks = block_weeks
+        self.window_weeks = window_weeks
+
+    def indices(self, n_weeks, n_variants, seed=None):
+        """
+        Historical week index of every week of every variant
+
+        Args:
+            n_weeks (int): Weeks in the historical season
+            n_variants (int): Number of variants (including the observed season)
+            seed (int or str): Random seed; strings are hashed (stable across processes)
+
+        Returns:
+            ndarray: int array of shape (n_variants, n_weeks)
+        """
+        if isinstance(seed, str):
+            seed = zlib.crc32(seed.encode('utf-8'))
+        rng = np.random.default_rng(seed)
+
+        block = max(1, min(self.block_weeks, n_weeks))
+        n_blocks = -(-n_weeks // block)
+        positions = np.arange(n_blocks) * block
+
+        shifts = rng.integers(-self.window_weeks, self.window_weeks + 1, (n_variants, n_blocks))
+        starts = np.clip(positions + shifts, 0, n_weeks - block)
+
+        index = (starts[:, :, None] + np.arange(block)).reshape(n_variants, n_blocks * block)[:, :n_weeks]
+        index[0] = np.arange(n_weeks)
+        return index
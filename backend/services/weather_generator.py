@@ -0,0 +1,246 @@
+"""
+Weather Generator Service
+Seeded stochastic daily weather, generated for many seasons at once as arrays
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import Config
+
+
+class WeatherGenerator:
+    """
+    Richardson-type daily weather generator
+
+    - Wet/dry occurrence: two-state Markov chain
+    - Wet-day amounts: gamma distribution
+    - Temperature and humidity: AR(1) anomalies with correlated innovations
+      (Cholesky factor of the temperature/humidity correlation), shifted on wet days
+
+    Parameters are the keys of Config.WEATHER_PROFILES. temperature_mean,
+    humidity_mean, wet_fraction and wet_day_mean may also be per-week lists
+    (e.g. fitted from a weather.json); other values are scalars. Seasons are
+    generated together, so the only Python loop is over days.
+    """
+
+    SUM_KEYS = ('precipitation', 'evapotranspiration')  # weekly totals, other keys are averaged
+
+    def __init__(self, params):
+        """
+        Initialize generator
+
+        Args:
+            params (dict): Generator parameters (see Config.WEATHER_PROFILES)
+        """
+        self.params = dict(params)
+
+    @classmethod
+    def for_profile(cls, name):
+        """Generator of a named climate profile"""
+        return cls(Config.WEATHER_PROFILES[name])
+
+    @classmethod
+    def for_latitude(cls, lat):
+        """Generator of the climate profile of a latitude band"""
+        return cls.for_profile(cls.profile_for_latitude(lat))
+
+    @staticmethod
+    def profile_for_latitude(lat):
+        """Climate profile name of a latitude band"""
+        if abs(lat) < 23:
+            return 'tropical'
+        if abs(lat) < 40:
+            return 'subtropical'
+        return 'temperate'
+
+    @classmethod
+    def from_weekly(cls, weeks, base='tropical'):
+        """
+        Fit a generator to weekly records (weather.json 'weeks')
+
+        Weekly means of temperature and humidity become the per-week
+        climatology. Wet-day frequency and mean amount are moment-matched
+        to the mean and variance of the weekly rain totals (gamma shape and
+        day-to-day persistence keep the base profile values, they cannot be
+        identified from weekly sums). Anomaly spreads and their correlation
+        come from week-to-week differences.
+
+        Args:
+            weeks (list): Weekly dicts with temperature_avg, precipitation_total, humidity_avg
+            base (str): Profile supplying the parameters that are not fitted
+
+        Returns:
+            WeatherGenerator: Fitted generator
+        """
+        params = dict(Config.WEATHER_PROFILES[base])
+
+        temperature = np.array([w['temperature_avg'] for w in weeks], dtype=float)
+        precipitation = np.array([w['precipitation_total'] for w in weeks], dtype=float)
+        humidity = np.array([w['humidity_avg'] for w in weeks], dtype=float)
+
+        # Rain: weekly total of 7 days, E = 7*p*mu, Var ~ 7*(p*E[X^2] - (p*mu)^2)
+        shape = params['gamma_shape']
+        daily_mean = max(precipitation.mean() / 7, 0.01)
+        daily_var = precipitation.var() / 7
+        wet_day_mean = (daily_var + daily_mean ** 2) / (daily_mean * (1 + 1 / shape))
+        wet_fraction = float(np.clip(daily_mean / wet_day_mean, 0.05, 0.95))
+        params['wet_fraction'] = round(wet_fraction, 3)
+        params['wet_day_mean'] = round(daily_mean / wet_fraction, 2)
+
+        # Weekly climatology, net of the mean wet-day shift
+        params['temperature_mean'] = (temperature - wet_fraction * params['wet_temperature_shift']).round(2).tolist()
+        params['humidity_mean'] = (humidity - wet_fraction * params['wet_humidity_shift']).round(2).tolist()
+
+        if len(weeks) > 2:
+            # Var(weekly mean of AR(1)) ~ sigma^2 / 7 * (1 + phi) / (1 - phi)
+            phi = params['autocorrelation']
+            scale = np.sqrt(7 * (1 - phi) / (1 + phi) / 2)
+            d_temperature = np.diff(temperature)
+            d_humidity = np.diff(humidity)
+            params['temperature_std'] = round(max(float(d_temperature.std()) * scale, 0.5), 2)
+            params['humidity_std'] = round(max(float(d_humidity.std()) * scale, 2.0), 2)
+
+            if d_temperature.std() > 0 and d_humidity.std() > 0:
+                corr = float(np.corrcoef(d_temperature, d_humidity)[0, 1])
+                params['temperature_humidity_corr'] = round(float(np.clip(corr, -0.9, 0.9)), 3)
+
+        return cls(params)
+
+    @classmethod
+    def from_climatology(cls, daily, base='tropical'):
+        """
+        Fit a generator to a day-of-year climatology (ClimatologyStore.daily)
+
+        Weekly means of the climatology become the per-week temperature,
+        humidity, wet-day frequency and wet-day amount; persistence is
+        P(wet | wet) - P(wet | dry) and the temperature spread is the
+        climatological one. Gamma shape, humidity spread and the anomaly
+        correlation keep the base profile values.
+
+        Args:
+            daily (dict): Field -> per-day arrays (NaN = no data)
+            base (str): Profile supplying the parameters that are not fitted
+
+        Returns:
+            WeatherGenerator: Fitted generator
+        """
+        params = dict(Config.WEATHER_PROFILES[base])
+        days = len(daily['temperature_mean'])
+        weeks = max(1, -(-days // 7))
+        index = np.minimum(np.arange(weeks * 7), days - 1).reshape(weeks, 7)
+
+        def weekly(field, default):
+            values = np.asarray(daily[field], dtype=float)[index]
+            counts = np.isfinite(values).sum(axis=1)
+            means = np.nansum(values, axis=1) / np.maximum(counts, 1)
+            return np.where(counts > 0, means, default)
+
+        def overall(field):
+            values = np.asarray(daily[field], dtype=float)
+            values = values[np.isfinite(values)]
+            return float(values.mean()) if len(values) else None
+
+        wet_fraction = np.clip(weekly('wet_day_frequency', params['wet_fraction']), 0.01, 0.95)
+        params['wet_fraction'] = wet_fraction.round(3).tolist()
+        params['wet_day_mean'] = np.maximum(weekly('wet_day_mean', params['wet_day_mean']), 1.0).round(2).tolist()
+
+        # Weekly climatology, net of the mean wet-day shift
+        params['temperature_mean'] = (weekly('temperature_mean', params['temperature_mean'])
+                                      - wet_fraction * params['wet_temperature_shift']).round(2).tolist()
+        params['humidity_mean'] = (weekly('humidity_mean', params['humidity_mean'])
+                                   - wet_fraction * params['wet_humidity_shift']).round(2).tolist()
+
+        wet_after_wet, wet_after_dry = overall('wet_after_wet'), overall('wet_after_dry')
+        if wet_after_wet is not None and wet_after_dry is not None:
+            params['persistence'] = round(float(np.clip(wet_after_wet - wet_after_dry, 0, 0.8)), 3)
+
+        temperature_std = overall('temperature_std')
+        if temperature_std is not None:
+            params['temperature_std'] = round(max(temperature_std, 0.5), 2)
+
+        return cls(params)
+
+    def generate(self, n_seasons, days, seed=None):
+        """
+        Generate daily weather
+
+        Args:
+            n_seasons (int): Number of independent seasons
+            days (int): Days per season
+            seed (int): Random seed (same seed, same weather)
+
+        Returns:
+            dict: temperature (°C), precipitation (mm), humidity (%) arrays of shape (n_seasons, days)
+        """
+        p = self.params
+        rng = np.random.default_rng(seed)
+
+        # Occurrence: P(wet | dry) = pi * (1 - r), P(wet | wet) = P(wet | dry) + r
+        wet_fraction = self._daily(p['wet_fraction'], days)
+        persistence = p['persistence']
+        p_dry_wet = wet_fraction * (1 - persistence)
+        p_wet_wet = p_dry_wet + persistence
+
+        draws = rng.random((n_seasons, days))
+        wet = np.empty((n_seasons, days), dtype=bool)
+        wet[:, 0] = draws[:, 0] < wet_fraction[0]
+        for t in range(1, days):
+            wet[:, t] = draws[:, t] < np.where(wet[:, t - 1], p_wet_wet[t], p_dry_wet[t])
+
+        # Amounts: gamma with the wet-day mean
+        shape = p['gamma_shape']
+        wet_day_mean = self._daily(p['wet_day_mean'], days)
+        precipitation = rng.gamma(shape, 1.0, (n_seasons, days)) * (wet_day_mean / shape) * wet
+
+        # Temperature/humidity anomalies: correlated innovations, AR(1) in time
+        corr = p['temperature_humidity_corr']
+        cholesky = np.linalg.cholesky(np.array([[1.0, corr], [corr, 1.0]]))
+        innovations = rng.standard_normal((n_seasons, days, 2)) @ cholesky.T
+
+        phi = p['autocorrelation']
+        noise_scale = np.sqrt(1 - phi ** 2)
+        anomalies = np.empty_like(innovations)
+        anomalies[:, 0] = innovations[:, 0]
+        for t in range(1, days):
+            anomalies[:, t] = phi * anomalies[:, t - 1] + noise_scale * innovations[:, t]
+
+        temperature = (self._daily(p['temperature_mean'], days) + p['temperature_std'] * anomalies[..., 0]
+                       + p['wet_temperature_shift'] * wet)
+        humidity = (self._daily(p['humidity_mean'], days) + p['humidity_std'] * anomalies[..., 1]
+                    + p['wet_humidity_shift'] * wet)
+
+        return {
+            'temperature': temperature,
+            'precipitation': precipitation,
+            'humidity': np.clip(humidity, 5, 100)
+        }
+
+    @classmethod
+    def aggregate_weekly(cls, daily, weeks):
+        """
+        Weekly aggregates of generated arrays
+
+        Args:
+            daily (dict): Arrays of shape (n_seasons, days), days >= weeks * 7
+            weeks (int): Number of weeks
+
+        Returns:
+            dict: Arrays of shape (n_seasons, weeks); SUM_KEYS summed, others averaged
+        """
+        weekly = {}
+        for key, values in daily.items():
+            blocks = values[:, :weeks * 7].reshape(values.shape[0], weeks, 7)
+            weekly[key] = blocks.sum(axis=2) if key in cls.SUM_KEYS else blocks.mean(axis=2)
+        return weekly
+
+    @staticmethod
+    def _daily(value, days):
+        """Per-day array of a scalar or per-week parameter (last week repeats)"""
+        value = np.asarray(value, dtype=float)
+        if value.ndim == 0:
+            return np.full(days, float(value))
+        return value[np.minimum(np.arange(days) // 7, len(value) - 1)]
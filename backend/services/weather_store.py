@@ -0,0 +1,192 @@
+"""
+Weather Store Service
+Local store of daily NASA POWER arrays, one compressed file per grid cell
+"""
+
+import os
+import tempfile
+import threading
+import numpy as np
+
+
+class WeatherStore:
+    """
+    Per-cell store of daily weather arrays
+
+    Cells follow the NASA POWER (MERRA-2) grid: 0.5° latitude x 0.625° longitude.
+    Each cell is a .npz file holding a sorted 'dates' array (datetime64[D])
+    and one float32 array per POWER parameter.
+    """
+
+    LAT_STEP = 0.5
+    LON_STEP = 0.625
+
+    def __init__(self, store_dir):
+        """
+        Initialize store
+
+        Args:
+            store_dir (str): Directory holding the cell files
+        """
+        self.store_dir = store_dir
+        self._lock = threading.Lock()
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def cell_for(self, lat, lon):
+        """
+        Get grid cell indices for a coordinate
+
+        Returns:
+            tuple: (row, col)
+        """
+        row = int(round((lat + 90) / self.LAT_STEP))
+        col = int(round((lon + 180) / self.LON_STEP)) % int(round(360 / self.LON_STEP))
+        return row, col
+
+    def cell_center(self, row, col):
+        """
+        Get center coordinate of a grid cell
+
+        Returns:
+            tuple: (lat, lon)
+        """
+        lon = col * self.LON_STEP - 180
+        if lon >= 180:
+            lon -= 360
+        return row * self.LAT_STEP - 90, lon
+
+    def save(self, lat, lon, dates, arrays, elevation=None):
+        """
+        Save daily arrays for the cell containing (lat, lon)
+
+        Existing data is merged: new values replace stored ones on the same
+        dates, other dates are kept.
+
+        Args:
+            lat (float): Latitude
+            lon (float): Longitude
+            dates (array-like): Dates (datetime64 or 'YYYYMMDD' strings)
+            arrays (dict): Parameter name -> daily values aligned on dates
+            elevation (float): Optional cell elevation (m)
+
+        Returns:
+            tuple: (row, col) of the updated cell
+        """
+        row, col = self.cell_for(lat, lon)
+        dates = self._to_dates(dates)
+
+        with self._lock:
+            existing = self._load_cell(row, col)
+
+            if existing is not None:
+                all_dates = np.union1d(existing['dates'], dates)
+                merged = {}
+                for name in set(existing['arrays']) | set(arrays):
+                    values = np.full(len(all_dates), np.nan, dtype=np.float32)
+                    if name in existing['arrays']:
+                        values[np.searchsorted(all_dates, existing['dates'])] = existing['arrays'][name]
+                    if name in arrays:
+                        values[np.searchsorted(all_dates, dates)] = np.asarray(arrays[name], dtype=np.float32)
+                    merged[name] = values
+                if elevation is None:
+                    elevation = existing['elevation']
+                dates, arrays = all_dates, merged
+            else:
+                order = np.argsort(dates)
+                dates = dates[order]
+                arrays = {name: np.asarray(values, dtype=np.float32)[order] for name, values in arrays.items()}
+
+            payload = {f'param_{name}': values for name, values in arrays.items()}
+            payload['dates'] = dates.astype('datetime64[D]')
+            payload['elevation'] = np.float32(np.nan if elevation is None else elevation)
+
+            path = self._cell_path(row, col)
+            # Unique temp file: other processes (warm-up, bulk fetch) may write the same cell
+            fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.npz')
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **payload)
+            os.replace(tmp_path, path)
+
+        return row, col
+
+    def load(self, lat, lon, start=None, end=None):
+        """
+        Load daily arrays for the cell containing (lat, lon)
+
+        Args:
+            lat (float): Latitude
+            lon (float): Longitude
+            start (str or datetime64): Optional first date (inclusive)
+            end (str or datetime64): Optional last date (inclusive)
+
+        Returns:
+            dict: {'dates', 'arrays', 'elevation', 'cell'} or None if not stored
+        """
+        row, col = self.cell_for(lat, lon)
+        cell = self._load_cell(row, col)
+
+        if cell is None:
+            return None
+
+        if start is not None or end is not None:
+            dates = cell['dates']
+            lo = 0 if start is None else np.searchsorted(dates, self._to_dates([start])[0], side='left')
+            hi = len(dates) if end is None else np.searchsorted(dates, self._to_dates([end])[0], side='right')
+            cell['dates'] = dates[lo:hi]
+            cell['arrays'] = {name: values[lo:hi] for name, values in cell['arrays'].items()}
+
+        return cell
+
+    def has_range(self, lat, lon, start, end, parameters=()):
+        """Check whether a cell already covers a date range for given parameters"""
+        cell = self.load(lat, lon, start, end)
+        if cell is None:
+            return False
+
+        expected = int((self._to_dates([end])[0] - self._to_dates([start])[0]).astype(int)) + 1
+        if len(cell['dates']) < expected:
+            return False
+
+        return all(name in cell['arrays'] for name in parameters)
+
+    def list_cells(self):
+        """
+        List stored cells
+
+        Returns:
+            list: (row, col) tuples
+        """
+        cells = []
+        for file_name in os.listdir(self.store_dir):
+            if file_name.startswith('cell_') and file_name.endswith('.npz') and '.tmp' not in file_name:
+                row, col = file_name[5:-4].split('_')
+                cells.append((int(row), int(col)))
+        return sorted(cells)
+
+    def _load_cell(self, row, col):
+        """Read one cell file"""
+        path = self._cell_path(row, col)
+        if not os.path.exists(path):
+            return None
+
+        with np.load(path) as data:
+            return {
+                'cell': (row, col),
+                'dates': data['dates'].astype('datetime64[D]'),
+                'arrays': {key[6:]: data[key] for key in data.files if key.startswith('param_')},
+                'elevation': None if np.isnan(data['elevation']) else float(data['elevation'])
+            }
+
+    def _cell_path(self, row, col):
+        """Path of a cell file"""
+        return os.path.join(self.store_dir, f"cell_{row}_{col}.npz")
+
+    def _to_dates(self, dates):
+        """Convert POWER 'YYYYMMDD' keys or date-likes to datetime64[D]"""
+        values = np.asarray(dates)
+        if values.dtype.kind in ('U', 'S', 'O'):
+            values = np.array([
+                f"{d[:4]}-{d[4:6]}-{d[6:8]}" if len(d) == 8 and d.isdigit() else d
+                for d in values.astype(str)
+            ])
+        return values.astype('datetime64[D]')
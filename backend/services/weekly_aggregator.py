@@ -0,0 +1,186 @@
+"""
+Weekly Aggregator Service
+Columnar daily -> weekly aggregation for any start day, from prefix sums
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+
+class WeeklyAggregator:
+    """
+    Weekly mean/sum/min/max over daily columns
+
+    Cumulative sums (and counts of valid days) are built once per column,
+    so the sum or mean of any window is one subtraction. Min/max use a
+    sparse table (min/max of every power-of-two run), so they are two
+    lookups. Missing values (NaN) are skipped. Every week of every
+    requested start day is computed in one vectorized step: trying other
+    sowing dates or windows does not re-read the daily data.
+    """
+
+    STATS = ('mean', 'sum', 'min', 'max', 'count')
+
+    def __init__(self, columns, dates=None):
+        """
+        Initialize aggregator
+
+        Args:
+            columns (dict): Column name -> daily values (NaN = missing)
+            dates (list): Day of each value (datetime, datetime64 or 'YYYYMMDD'), optional
+        """
+        self.columns = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+        self.n_days = len(next(iter(self.columns.values()))) if self.columns else 0
+        self.dates = None
+        if dates is not None:
+            self.dates = np.array([self._to_day(date) for date in dates], dtype='datetime64[D]')
+
+        self._sums = {}
+        self._counts = {}
+        self._tables = {}
+        for name, values in self.columns.items():
+            valid = np.isfinite(values)
+            self._sums[name] = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+            self._counts[name] = np.concatenate(([0], np.cumsum(valid)))
+
+    @classmethod
+    def from_records(cls, records, fields, date_key='date', fill_value=None):
+        """
+        Build from a list of daily dicts (e.g. NASAPowerAPI.get_weather_data)
+
+        Args:
+            records (list): Daily dicts
+            fields (list): Keys to aggregate
+            date_key (str): Key holding the day ('YYYYMMDD'); ignored if not a date
+            fill_value (float): Values at or below it count as missing (POWER: -999)
+
+        Returns:
+            WeeklyAggregator: Aggregator
+        """
+        columns = {}
+        for field in fields:
+            values = np.array([record.get(field, np.nan) for record in records], dtype=float)
+            if fill_value is not None:
+                values[values <= fill_value] = np.nan
+            columns[field] = values
+
+        dates = [record.get(date_key) for record in records]
+        if not dates or any(cls._to_day(date) is None for date in dates):
+            dates = None
+
+        return cls(columns, dates)
+
+    def day_index(self, start):
+        """
+        Index of a start day
+
+        Args:
+            start: int index, datetime, or 'YYYYMMDD' / 'YYYY-MM-DD' string
+
+        Returns:
+            int: Index into the daily arrays (may be out of range)
+        """
+        if start is None:
+            return 0
+        if isinstance(start, (int, np.integer)):
+            return int(start)
+        if self.dates is None:
+            raise ValueError("Start dates need an aggregator built with dates")
+        return int((np.datetime64(self._to_day(start), 'D') - self.dates[0]).astype(int))
+
+    def window(self, name, start, end, stat='mean'):
+        """
+        Statistic of a column over days [start, end) (index arrays allowed)
+
+        Returns:
+            ndarray: Statistic per window (NaN where no valid day)
+        """
+        start = np.clip(np.asarray(start), 0, self.n_days)
+        end = np.clip(np.asarray(end), start, self.n_days)
+
+        if stat in ('min', 'max'):
+            return self._range_extreme(name, start, end, stat)
+
+        count = self._counts[name][end] - self._counts[name][start]
+        if stat == 'count':
+            return count
+
+        total = self._sums[name][end] - self._sums[name][start]
+        if stat == 'sum':
+            return np.where(count > 0, total, np.nan)
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+    def weekly(self, stats, start=None, weeks=12, partial=True):
+        """
+        Weekly statistics from one or several start days
+
+        Args:
+            stats (dict): Output name -> (column, stat), e.g. {'precipitation': ('precipitation', 'sum')}
+            start: Start day (index/date) or list of start days
+            weeks (int): Number of weeks
+            partial (bool): Keep a last week cut by the end of the data
+
+        Returns:
+            dict: Output name -> array of shape (weeks,) or (n_starts, weeks);
+                weeks past the end of the data are NaN
+        """
+        single = start is None or isinstance(start, (int, np.integer, str, datetime))
+        starts = np.array([self.day_index(s) for s in ([start] if single else start)])
+
+        week_starts = starts[:, None] + 7 * np.arange(weeks)
+        week_ends = week_starts + 7
+        outside = (week_starts >= self.n_days) | (week_starts < 0)
+        if not partial:
+            outside |= week_ends > self.n_days
+
+        result = {}
+        for output, (name, stat) in stats.items():
+            values = self.window(name, week_starts, week_ends, stat).astype(float)
+            values[outside] = np.nan
+            result[output] = values[0] if single else values
+
+        return result
+
+    def _range_extreme(self, name, start, end, stat):
+        """Min/max of [start, end) from the sparse table: two overlapping power-of-two runs"""
+        table = self._sparse_table(name, stat)
+        length = end - start
+        level = np.floor(np.log2(np.maximum(length, 1))).astype(int)
+        span = 1 << level
+
+        combine = np.fmin if stat == 'min' else np.fmax
+        first = table[level, np.minimum(start, self.n_days - 1)]
+        second = table[level, np.clip(end - span, 0, self.n_days - 1)]
+        return np.where(length > 0, combine(first, second), np.nan)
+
+    def _sparse_table(self, name, stat):
+        """table[k, i] = min/max of values[i:i + 2**k] (NaN ignored), built on first use"""
+        key = (name, stat)
+        if key not in self._tables:
+            combine = np.fmin if stat == 'min' else np.fmax
+            values = self.columns[name]
+            levels = max(1, int(np.log2(max(self.n_days, 1))) + 1)
+            table = np.full((levels, max(self.n_days, 1)), np.nan)
+            table[0, :self.n_days] = values
+            for k in range(1, levels):
+                half = 1 << (k - 1)
+                table[k, :self.n_days - half] = combine(table[k - 1, :self.n_days - half],
+                                                         table[k - 1, half:self.n_days])
+            self._tables[key] = table
+        return self._tables[key]
+
+    @staticmethod
+    def _to_day(value):
+        """datetime64[D]-compatible day of a datetime, datetime64 or date string, None if not a date"""
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d')
+        if isinstance(value, np.datetime64):
+            return str(value.astype('datetime64[D]'))
+        if isinstance(value, str):
+            for pattern in ('%Y%m%d', '%Y-%m-%d'):
+                try:
+                    return datetime.strptime(value, pattern).strftime('%Y-%m-%d')
+                except ValueError:
+                    continue
+        return None
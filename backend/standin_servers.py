@@ -0,0 +1,606 @@
+"""
+Offline stand-in servers for NASA POWER, Nominatim and AppEEARS
+
+Synthesizes responses from the local scenario data, with configurable
+latency, error rate and rate limits. No recordings ship with the repo: run
+with --record to capture real API responses into data/standin/, which are
+then replayed ahead of the synthesized ones.
+Point the backend at them through the environment, e.g.:
+
+    python standin_servers.py --latency 0.3 --error-rate 0.05
+    NASA_POWER_API_URL=http://127.0.0.1:8801/api/temporal/daily/point \\
+    NASA_POWER_REGIONAL_API_URL=http://127.0.0.1:8801/api/temporal/daily/regional \\
+    NOMINATIM_BASE_URL=http://127.0.0.1:8802 \\
+    APPEEARS_API_URL=http://127.0.0.1:8803/api \\
+    python app.py
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import unicodedata
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+import requests
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from config import Config
+from services.historical_data_loader import HistoricalDataLoader
+
+
+class StandinBehaviour:
+    """Latency, error and rate-limit behaviour shared by a stand-in server"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit=None, seed=42):
+        """
+        Initialize behaviour
+
+        Args:
+            latency (float): Mean added latency per request (s)
+            jitter (float): Standard deviation of the latency (s)
+            error_rate (float): Probability of answering 500
+            rate_limit (float): Requests per second before answering 429 (None = unlimited)
+            seed (int): Random seed (reproducible error/latency sequences)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self.stats = {'requests': 0, 'errors': 0, 'rate_limited': 0}
+
+    def admit(self):
+        """
+        Decide how to answer the next request
+
+        Returns:
+            tuple: (status, delay) with status None (serve), 429 or 500
+        """
+        with self._lock:
+            self.stats['requests'] += 1
+            delay = max(0.0, self.rng.gauss(self.latency, self.jitter)) if self.latency or self.jitter else 0.0
+
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(1.0, self._tokens + (now - self._last_refill) * self.rate_limit)
+                self._last_refill = now
+                if self._tokens < 1.0:
+                    self.stats['rate_limited'] += 1
+                    return 429, 0.0
+                self._tokens -= 1.0
+
+            if self.error_rate and self.rng.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return 500, delay
+
+            return None, delay
+
+
+class RecordingStore:
+    """Recorded upstream responses, one JSON file per canonical request"""
+
+    def __init__(self, recordings_dir):
+        self.recordings_dir = recordings_dir
+
+    def key(self, service, path, query):
+        """Canonical key of a request (query parameters sorted)"""
+        canonical = f"{path}?{urlencode(sorted(query.items()))}"
+        return os.path.join(service, hashlib.sha1(canonical.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, service, path, query):
+        """Recorded response or None"""
+        file_path = os.path.join(self.recordings_dir, self.key(service, path, query))
+        if not os.path.exists(file_path):
+            return None
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def put(self, service, path, query, status, body):
+        """Save a response for later replay"""
+        file_path = os.path.join(self.recordings_dir, self.key(service, path, query))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump({'path': path, 'query': query, 'status': status, 'body': body}, f, ensure_ascii=False)
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Base handler: behaviour, replay/record, then synthesize"""
+
+    service = None
+    behaviour = None
+    recordings = None
+    upstream = None  # Real API base URL when recording
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        query = dict(parse_qsl(url.query))
+
+        # Consume the body first: a reply that leaves it unread breaks the keep-alive connection
+        length = int(self.headers.get('Content-Length') or 0)
+        self.body = self.rfile.read(length) if length else b''
+
+        status, delay = self.behaviour.admit()
+        if delay:
+            time.sleep(delay)
+
+        if status == 429:
+            return self.send_json({'error': 'Too Many Requests'}, 429, {'Retry-After': '1'})
+        if status == 500:
+            return self.send_json({'error': 'Internal Server Error (stand-in)'}, 500)
+
+        if method == 'GET':
+            recorded = self.recordings.get(self.service, url.path, query)
+            if recorded is not None:
+                return self.send_json(recorded['body'], recorded['status'])
+
+            if self.upstream:
+                return self._record(url.path, query)
+
+        self.route(method, url.path, query)
+
+    def _record(self, path, query):
+        """Proxy to the real API and save the answer"""
+        try:
+            response = requests.get(self.upstream + path, params=query, timeout=120,
+                                    headers={'User-Agent': 'TerraGrow-Academy/1.0 (NASA Space Apps Challenge)'})
+            body = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return self.send_json({'error': f'Upstream error: {e}'}, 502)
+
+        if response.status_code == 200:
+            self.recordings.put(self.service, path, query, response.status_code, body)
+        self.send_json(body, response.status_code)
+
+    def route(self, method, path, query):
+        self.send_json({'error': 'Not found'}, 404)
+
+    def read_json_body(self):
+        if not self.body:
+            return {}
+        return json.loads(self.body.decode('utf-8'))
+
+    def send_json(self, body, status=200, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_bytes(payload, status, 'application/json', headers)
+
+    def send_bytes(self, payload, status=200, content_type='application/octet-stream', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class ScenarioCatalog:
+    """Scenario weeks and place names used to synthesize answers"""
+
+    def __init__(self):
+        loader = HistoricalDataLoader()
+        self.places = []  # (lat, lon, name, country)
+        self.weeks = []   # (lat, lon, day_of_year, week record)
+
+        for scenario in loader.get_available_scenarios():
+            data = loader.load_historical_data(scenario['region_id'], scenario['season_id'])
+            for week in data['weather']['weeks']:
+                start = datetime.strptime(week['start_date'], '%Y-%m-%d')
+                self.weeks.append((scenario['lat'], scenario['lon'], start.timetuple().tm_yday, week))
+
+        for region in Config.POPULAR_REGIONS.values():
+            name, _, country = region['name'].partition(', ')
+            self.places.append((region['lat'], region['lon'], name, country))
+
+    def nearest_place(self, lat, lon):
+        return min(self.places, key=lambda p: (p[0] - lat) ** 2 + (p[1] - lon) ** 2)
+
+    def week_for(self, lat, lon, day):
+        """Closest scenario week: nearest location first, then closest day of year"""
+        site = min(self.weeks, key=lambda w: (w[0] - lat) ** 2 + (w[1] - lon) ** 2)
+        candidates = [w for w in self.weeks if (w[0], w[1]) == (site[0], site[1])]
+        doy = day.timetuple().tm_yday
+        return min(candidates, key=lambda w: min(abs(w[2] + 3 - doy), 365 - abs(w[2] + 3 - doy)))[3]
+
+
+class PowerHandler(StandinHandler):
+    """NASA POWER daily point/regional stand-in"""
+
+    service = 'power'
+    catalog = None
+    fill_rate = 0.0
+
+    def route(self, method, path, query):
+        try:
+            start = datetime.strptime(query['start'], '%Y%m%d')
+            end = datetime.strptime(query['end'], '%Y%m%d')
+            parameters = query['parameters'].split(',')
+        except (KeyError, ValueError):
+            return self.send_json({'messages': ['Invalid request'], 'header': {}}, 422)
+
+        if path.endswith('/point'):
+            lat, lon = float(query['latitude']), float(query['longitude'])
+            return self.send_json(self._feature(lat, lon, start, end, parameters))
+
+        if path.endswith('/regional'):
+            lat_min, lat_max = float(query['latitude-min']), float(query['latitude-max'])
+            lon_min, lon_max = float(query['longitude-min']), float(query['longitude-max'])
+            features = []
+            lat = math.floor(lat_min / 0.5) * 0.5
+            while lat <= lat_max:
+                lon = math.floor(lon_min / 0.625) * 0.625
+                while lon <= lon_max:
+                    features.append(self._feature(lat, lon, start, end, parameters))
+                    lon += 0.625
+                lat += 0.5
+            return self.send_json({'type': 'FeatureCollection', 'features': features})
+
+        self.send_json({'error': 'Not found'}, 404)
+
+    def _feature(self, lat, lon, start, end, parameters):
+        """Daily values around the closest scenario week, deterministic per location/day"""
+        values = {name: {} for name in parameters}
+        day = start
+
+        while day <= end:
+            week = self.catalog.week_for(lat, lon, day)
+            key = day.strftime('%Y%m%d')
+            rng = random.Random(f"{lat:.3f}_{lon:.3f}_{key}")
+
+            t_avg = week['temperature_avg'] + rng.uniform(-1.5, 1.5)
+            t_max = week.get('temperature_max', t_avg + 6) + rng.uniform(-1, 1)
+            t_min = week.get('temperature_min', t_avg - 6) + rng.uniform(-1, 1)
+            rh = min(100.0, max(5.0, week['humidity_avg'] + rng.uniform(-5, 5)))
+            rain = week['precipitation_total'] * rng.expovariate(1.0) if rng.random() < 0.6 else 0.0
+            wind = max(0.2, week.get('wind_speed_avg', 2) + rng.uniform(-0.5, 0.5))
+            synthetic = {
+                'T2M': t_avg, 'T2M_MAX': t_max, 'T2M_MIN': t_min,
+                'T2MDEW': t_avg - (100 - rh) / 5, 'T2MWET': t_avg - (100 - rh) / 10,
+                'RH2M': rh, 'PRECTOTCORR': rain, 'PS': 101.3 - max(0.0, lat) * 0.01,
+                'WS2M': wind, 'WS10M': wind * 1.3, 'WS50M': wind * 1.8,
+                'ALLSKY_SFC_SW_DWN': max(2.0, 24 - abs(lat) / 5 - rain / 3 + rng.uniform(-2, 2))
+            }
+
+            for name in parameters:
+                value = synthetic.get(name, 0.0)
+                if self.fill_rate and rng.random() < self.fill_rate:
+                    value = -999.0
+                values[name][key] = round(value, 2)
+            day += timedelta(days=1)
+
+        return {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [lon, lat, 300.0]},
+            'properties': {'parameter': values}
+        }
+
+
+class NominatimHandler(StandinHandler):
+    """Nominatim search/reverse stand-in"""
+
+    service = 'nominatim'
+    catalog = None
+
+    def route(self, method, path, query):
+        if path == '/search':
+            needle = _fold(query.get('q', ''))
+            results = [
+                self._place(lat, lon, name, country)
+                for lat, lon, name, country in self.catalog.places
+                if needle and needle in _fold(f"{name}, {country}")
+            ]
+            return self.send_json(results[:int(query.get('limit', 5))])
+
+        if path == '/reverse':
+            lat, lon = float(query.get('lat', 0)), float(query.get('lon', 0))
+            p_lat, p_lon, name, country = self.catalog.nearest_place(lat, lon)
+            place = self._place(lat, lon, f"Near {name}", country)
+            place['address'] = {'city': name, 'country': country}
+            return self.send_json(place)
+
+        self.send_json({'error': 'Not found'}, 404)
+
+    def _place(self, lat, lon, name, country):
+        return {
+            'place_id': abs(hash((round(lat, 3), round(lon, 3)))) % 10 ** 8,
+            'lat': str(lat),
+            'lon': str(lon),
+            'display_name': f"{name}, {country}",
+            'type': 'city',
+            'importance': 0.6
+        }
+
+
+class AppEEARSHandler(StandinHandler):
+    """AppEEARS login/task/status/bundle stand-in"""
+
+    service = 'appeears'
+    bundle_dir = None
+    processing_time = 5.0
+    truncate_rate = 0.0
+    tasks = {}
+    tasks_lock = threading.Lock()
+
+    def route(self, method, path, query):
+        parts = [p for p in path.split('/') if p]
+        if parts[:1] == ['api']:
+            parts = parts[1:]
+
+        if method == 'POST' and parts == ['login']:
+            return self.send_json({
+                'token_type': 'Bearer',
+                'token': uuid.uuid4().hex,
+                'expiration': (datetime.utcnow() + timedelta(days=2)).isoformat() + 'Z'
+            })
+
+        if parts == ['product']:
+            return self.send_json([{'Product': 'MOD13Q1', 'ProductAndVersion': 'MOD13Q1.061',
+                                    'Description': 'Vegetation Indices (NDVI & EVI)'}])
+
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            return self.send_json({'message': 'You are not authorized'}, 403)
+
+        if method == 'POST' and parts == ['task']:
+            return self._submit(self.read_json_body())
+
+        if len(parts) == 2 and parts[0] in ('task', 'status'):
+            task = self.tasks.get(parts[1])
+            if task is None:
+                return self.send_json({'message': 'Task not found'}, 404)
+            return self.send_json(self._task_view(task))
+
+        if parts[:1] == ['bundle'] and len(parts) in (2, 3):
+            task = self.tasks.get(parts[1])
+            if task is None or self._status(task) != 'done':
+                return self.send_json({'message': 'Bundle not found'}, 404)
+            if len(parts) == 2:
+                return self.send_json({
+                    'files': [{k: v for k, v in f.items() if k != 'content'} for f in task['files'].values()],
+                    'task_id': task['task_id'],
+                    'bundle_type': 'point'
+                })
+            file_info = task['files'].get(parts[2])
+            if file_info is None:
+                return self.send_json({'message': 'File not found'}, 404)
+            return self.send_file(file_info['content'])
+
+        self.send_json({'error': 'Not found'}, 404)
+
+    def send_file(self, content):
+        """File body with Range support; may be cut short (truncate_rate)"""
+        status, start, end = 200, 0, len(content)
+        headers = {'Accept-Ranges': 'bytes'}
+
+        range_header = self.headers.get('Range', '')
+        if range_header.startswith('bytes='):
+            first, _, last = range_header[6:].partition('-')
+            start = int(first or 0)
+            end = min(len(content), int(last) + 1) if last else len(content)
+            if start >= len(content):
+                return self.send_bytes(b'', 416, headers={'Content-Range': f'bytes */{len(content)}'})
+            status = 206
+            headers['Content-Range'] = f'bytes {start}-{end - 1}/{len(content)}'
+
+        payload = content[start:end]
+        if len(payload) > 1 and self.truncate_rate and self.behaviour.rng.random() < self.truncate_rate:
+            # Announce the full length, send half, drop the connection
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(len(payload)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload[:len(payload) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            self.behaviour.stats['truncated'] = self.behaviour.stats.get('truncated', 0) + 1
+            return
+
+        self.send_bytes(payload, status, headers=headers)
+
+    def _submit(self, task):
+        task_id = str(uuid.uuid4())
+        record = {
+            'task_id': task_id,
+            'task_name': task.get('task_name', 'standin'),
+            'task_type': task.get('task_type', 'point'),
+            'params': task.get('params', {}),
+            'created': time.time()
+        }
+        record['files'] = self._build_bundle(record)
+
+        with self.tasks_lock:
+            self.tasks[task_id] = record
+
+        self.send_json({'task_id': task_id, 'status': 'pending'}, 202)
+
+    def _build_bundle(self, task):
+        """Recorded bundle files, results replicated for every requested coordinate"""
+        files = {}
+        prefix = task['task_name'].replace('_', '-')
+
+        for file_name in sorted(os.listdir(self.bundle_dir)):
+            with open(os.path.join(self.bundle_dir, file_name), 'rb') as f:
+                content = f.read()
+
+            if file_name.endswith('-results.csv'):
+                content = self._expand_results(content, task['params'].get('coordinates', []))
+
+            renamed = file_name.replace('terragrow-yaounde-cameroun', prefix)
+            file_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{task['task_id']}/{renamed}"))
+            files[file_id] = {
+                'file_id': file_id,
+                'file_name': renamed,
+                'file_size': len(content),
+                'file_type': renamed.rsplit('.', 1)[-1],
+                'sha256': hashlib.sha256(content).hexdigest(),
+                'content': content
+            }
+
+        return files
+
+    def _expand_results(self, content, coordinates):
+        lines = content.decode('utf-8').splitlines()
+        if not coordinates:
+            return content
+
+        rows = [lines[0]]
+        for coordinate in coordinates:
+            for line in lines[1:]:
+                _, _, _, rest = line.split(',', 3)
+                rows.append(f"{coordinate.get('id', '')},{coordinate['latitude']},{coordinate['longitude']},{rest}")
+        return ('\n'.join(rows) + '\n').encode('utf-8')
+
+    def _status(self, task):
+        elapsed = time.time() - task['created']
+        if elapsed >= self.processing_time:
+            return 'done'
+        if elapsed >= self.processing_time / 3:
+            return 'processing'
+        return 'pending'
+
+    def _task_view(self, task):
+        status = self._status(task)
+        view = {k: v for k, v in task.items() if k not in ('files', 'created')}
+        view['status'] = status
+        if status == 'processing':
+            progress = int(100 * (time.time() - task['created']) / self.processing_time)
+            view['progress'] = {'summary': min(99, progress)}
+        return view
+
+
+def _fold(text):
+    """Lowercase, accent-free text for matching"""
+    normalized = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in normalized if not unicodedata.combining(c))
+
+
+def start_standin_servers(host='127.0.0.1', power_port=8801, nominatim_port=8802, appeears_port=8803,
+                          behaviours=None, recordings_dir=None, record=False, fill_rate=0.0,
+                          processing_time=5.0, truncate_rate=0.0):
+    """
+    Start the three stand-in servers in background threads
+
+    Args:
+        host (str): Bind address
+        power_port, nominatim_port, appeears_port (int): Ports (0 = any free port)
+        behaviours (dict): Service name -> StandinBehaviour
+        recordings_dir (str): Directory of recorded responses
+        record (bool): Proxy unknown GET requests to the real APIs and record them
+        fill_rate (float): Share of POWER values replaced by the -999 fill value
+        processing_time (float): Seconds before an AppEEARS task is done
+        truncate_rate (float): Share of AppEEARS file downloads cut off halfway
+
+    Returns:
+        dict: Service name -> running ThreadingHTTPServer
+    """
+    behaviours = behaviours or {}
+    recordings = RecordingStore(recordings_dir or Config.STANDIN_RECORDINGS_DIR)
+    catalog = ScenarioCatalog()
+
+    handlers = {
+        'power': (power_port, type('Power', (PowerHandler,), {
+            'catalog': catalog, 'fill_rate': fill_rate,
+            'upstream': 'https://power.larc.nasa.gov' if record else None
+        })),
+        'nominatim': (nominatim_port, type('Nominatim', (NominatimHandler,), {
+            'catalog': catalog,
+            'upstream': 'https://nominatim.openstreetmap.org' if record else None
+        })),
+        'appeears': (appeears_port, type('AppEEARS', (AppEEARSHandler,), {
+            'bundle_dir': os.path.join(Config.DATA_DIR, 'appeears'),
+            'processing_time': processing_time, 'truncate_rate': truncate_rate, 'tasks': {}
+        }))
+    }
+
+    servers = {}
+    for name, (port, handler) in handlers.items():
+        handler.behaviour = behaviours.get(name) or StandinBehaviour()
+        handler.recordings = recordings
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=f'standin-{name}', daemon=True).start()
+        servers[name] = server
+
+    return servers
+
+
+def standin_environment(servers):
+    """Environment variables pointing the backend services at running stand-ins"""
+    host, power_port = servers['power'].server_address[:2]
+    return {
+        'NASA_POWER_API_URL': f"http://{host}:{power_port}/api/temporal/daily/point",
+        'NASA_POWER_REGIONAL_API_URL': f"http://{host}:{power_port}/api/temporal/daily/regional",
+        'NOMINATIM_BASE_URL': f"http://{host}:{servers['nominatim'].server_address[1]}",
+        'APPEEARS_API_URL': f"http://{host}:{servers['appeears'].server_address[1]}/api"
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-ins for NASA POWER, Nominatim and AppEEARS")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--power-port', type=int, default=8801)
+    parser.add_argument('--nominatim-port', type=int, default=8802)
+    parser.add_argument('--appeears-port', type=int, default=8803)
+    parser.add_argument('--latency', type=float, default=0.0, help="Mean latency per request (s)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Latency standard deviation (s)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Probability of a 500 answer")
+    parser.add_argument('--power-rate-limit', type=float, default=None, help="POWER requests/s before 429")
+    parser.add_argument('--nominatim-rate-limit', type=float, default=1.0, help="Nominatim requests/s before 429")
+    parser.add_argument('--fill-rate', type=float, default=0.0, help="Share of POWER values set to -999")
+    parser.add_argument('--processing-time', type=float, default=5.0, help="AppEEARS task duration (s)")
+    parser.add_argument('--truncate-rate', type=float, default=0.0, help="Share of AppEEARS downloads cut off halfway")
+    parser.add_argument('--record', action='store_true', help="Record unknown requests from the real APIs")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    behaviours = {
+        'power': StandinBehaviour(args.latency, args.jitter, args.error_rate, args.power_rate_limit, args.seed),
+        'nominatim': StandinBehaviour(args.latency, args.jitter, args.error_rate, args.nominatim_rate_limit, args.seed + 1),
+        'appeears': StandinBehaviour(args.latency, args.jitter, args.error_rate, None, args.seed + 2)
+    }
+
+    servers = start_standin_servers(
+        args.host, args.power_port, args.nominatim_port, args.appeears_port,
+        behaviours=behaviours, record=args.record, fill_rate=args.fill_rate,
+        processing_time=args.processing_time, truncate_rate=args.truncate_rate
+    )
+
+    print("TerraGrow stand-in servers running. Point the backend at them with:")
+    for name, value in standin_environment(servers).items():
+        print(f"  export {name}={value}")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for server in servers.values():
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
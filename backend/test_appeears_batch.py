@@ -0,0 +1,127 @@
+"""
+Test orchestration AppEEARS: taches multi-coordonnees, reprise apres redemarrage,
+telechargements interrompus (Range) verifies par sha256
+Utilise le stand-in AppEEARS local
+"""
+
+import csv
+import hashlib
+import os
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+# Endpoints and caches must be in the environment before config.py is imported
+ports = {'power_port': free_port(), 'nominatim_port': free_port(), 'appeears_port': free_port()}
+work_dir = tempfile.mkdtemp(prefix='terragrow-appeears-')
+os.environ.update({
+    'APPEEARS_API_URL': f"http://127.0.0.1:{ports['appeears_port']}/api",
+    'TERRAGROW_CACHE_DIR': work_dir
+})
+
+from config import Config
+from standin_servers import start_standin_servers
+from services.appeears_api import AppEEARSAPI
+from services.appeears_orchestrator import AppEEARSOrchestrator
+
+print("=" * 70)
+print("TEST ORCHESTRATION APPEEARS")
+print("=" * 70)
+
+# One download in three is cut off halfway
+servers = start_standin_servers(**ports, processing_time=1.0, truncate_rate=0.3)
+submitted_tasks = servers['appeears'].RequestHandlerClass.tasks
+appeears_stats = servers['appeears'].RequestHandlerClass.behaviour.stats
+
+state_file = os.path.join(work_dir, 'tasks.json')
+layers = [{'product': 'MOD13Q1.061', 'layer': '_250m_16_days_NDVI'}]
+locations = [{'id': f'loc{i}', 'lat': -10 + i, 'lon': 20 + i / 2} for i in range(25)]
+
+api = AppEEARSAPI()
+api.login('standin', 'standin')
+
+
+def orchestrator():
+    return AppEEARSOrchestrator(api, state_file, os.path.join(work_dir, 'out'),
+                                max_coordinates=10, poll_min=0.1, poll_max=0.4)
+
+
+# Test 1: Interrupted before the tasks finish
+print("\n[TEST 1] Soumission (25 lieux, 10 par tache), arret avant la fin")
+print("-" * 70)
+
+result = orchestrator().run('terragrow_test', locations, '01-01-2024', '12-31-2024', layers, max_wait=0)
+print(f"  Tasks: {len(result['tasks'])}, submitted: {len(submitted_tasks)}, complete: {result['complete']}")
+
+if len(submitted_tasks) != 3 or result['complete']:
+    print("ERROR: expected 3 unfinished tasks")
+    sys.exit(1)
+
+# Test 2: Restart resumes the same tasks
+print("\n[TEST 2] Redemarrage: reprise sans nouvelle soumission")
+print("-" * 70)
+
+start = time.perf_counter()
+result = orchestrator().run('terragrow_test', locations, '01-01-2024', '12-31-2024', layers, max_wait=30)
+print(f"  Complete: {result['complete']} in {time.perf_counter() - start:.2f}s, "
+      f"submitted: {len(submitted_tasks)}, files: {len(result['files'])}")
+
+if not result['complete'] or len(submitted_tasks) != 3:
+    print("ERROR: tasks were not resumed")
+    sys.exit(1)
+
+rows = 0
+for csv_file in result['csv_files']:
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        ids = {row['ID'] for row in csv.DictReader(f)}
+    rows += len(ids)
+print(f"  Coordinates in results: {rows}")
+
+if rows != len(locations):
+    print("ERROR: results do not cover every location")
+    sys.exit(1)
+
+# Every file matches the bundle manifest, no partial file left behind
+files = [f for task in result['tasks'] for f in task['files'].values()]
+corrupted = 0
+for file_info in files:
+    with open(file_info['path'], 'rb') as f:
+        corrupted += hashlib.sha256(f.read()).hexdigest() != file_info['sha256']
+leftovers = [name for _, _, names in os.walk(work_dir) for name in names if name.endswith(('.part', '.tmp'))]
+blobs = sum(len(names) for _, _, names in os.walk(Config.DOWNLOAD_CACHE_DIR))
+print(f"  Truncated transfers: {appeears_stats.get('truncated', 0)}, corrupted files: {corrupted}, "
+      f"leftovers: {len(leftovers)}, unique blobs: {blobs}/{len(files)}")
+
+if corrupted or leftovers or not appeears_stats.get('truncated') or blobs >= len(files):
+    print("ERROR: downloads should resume, verify and deduplicate")
+    sys.exit(1)
+
+# Test 3: Nothing left to do
+print("\n[TEST 3] Relance: rien a telecharger")
+print("-" * 70)
+
+requests_before = servers['appeears'].RequestHandlerClass.behaviour.stats['requests']
+result = orchestrator().run('terragrow_test', locations, '01-01-2024', '12-31-2024', layers)
+requests_made = servers['appeears'].RequestHandlerClass.behaviour.stats['requests'] - requests_before
+print(f"  Requests: {requests_made}, complete: {result['complete']}")
+
+if requests_made != 0 or not result['complete']:
+    print("ERROR: finished extraction should not hit AppEEARS")
+    sys.exit(1)
+
+for server in servers.values():
+    server.shutdown()
+
+print("\n" + "=" * 70)
+print("SUCCESS: AppEEARS batches resume after restart")
+print("=" * 70)
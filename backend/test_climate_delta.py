@@ -0,0 +1,105 @@
+"""
+Test scenarios de changement climatique (deltas)
++2 °C, -15% pluie, ET recalculee, cache par (scenario, delta)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches and settings must be in the environment before config.py is imported
+os.environ.update({
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-delta-'),
+    'WARMUP_ENABLED': 'false'
+})
+
+from services.climate_delta import ClimateDelta
+from services.historical_data_loader import HistoricalDataLoader
+
+print("=" * 70)
+print("TEST DELTAS CLIMATIQUES")
+print("=" * 70)
+
+region_id, season_id = 'maroua_cameroun', 'spring_2024'
+scenario_id = f"{region_id}_{season_id}"
+
+# Loader on a private copy of the scenario, removed once parsed
+loader = HistoricalDataLoader()
+data_dir = tempfile.mkdtemp(prefix='terragrow-regions-')
+shutil.copytree(os.path.join(loader.data_dir, scenario_id), os.path.join(data_dir, scenario_id))
+loader.data_dir = data_dir
+observed = loader.load_historical_data(region_id, season_id)
+shutil.rmtree(data_dir)
+
+# Test 1: Deltas on the weekly fields
+print("\n[TEST 1] +2 °C, -15% pluie")
+print("-" * 70)
+
+delta = ClimateDelta.from_dict({'temperature': 2, 'precipitation': -15})
+warmer = loader.load_historical_data(region_id, season_id, delta=delta)
+
+for before, after in list(zip(observed['weather']['weeks'], warmer['weather']['weeks']))[5:8]:
+    print(f"  Week {after['week']}: T {before['temperature_avg']} -> {after['temperature_avg']}, "
+          f"rain {before['precipitation_total']} -> {after['precipitation_total']}, "
+          f"ET0 {before['et0_total']} -> {after['et0_total']}")
+
+errors = []
+for before, after in zip(observed['weather']['weeks'], warmer['weather']['weeks']):
+    ratio = (before['temperature_avg'] + 19.8) / (before['temperature_avg'] + 17.8)
+    errors += [
+        abs(after['temperature_max'] - before['temperature_max'] - 2),
+        abs(after['precipitation_total'] - before['precipitation_total'] * 0.85),
+        abs(after['et0_total'] - before['et0_total'] * ratio),
+        abs(after['humidity_avg'] - before['humidity_avg'])
+    ]
+
+if max(errors) > 0.01 or warmer['delta'] != {'temperature': 2.0, 'precipitation': -15.0}:
+    print("ERROR: wrong delta applied")
+    sys.exit(1)
+
+# Test 2: Cache by (scenario, variant, delta), no file access
+print("\n[TEST 2] Cache par (scenario, delta), sans relire les fichiers")
+print("-" * 70)
+
+again = loader.load_historical_data(region_id, season_id, delta=ClimateDelta(2, -15))
+variant = loader.load_historical_data(region_id, season_id, variant=3, delta=delta)
+variant_plain = loader.load_historical_data(region_id, season_id, variant=3)
+print(f"  Same delta served from cache: {again is warmer}")
+print(f"  Cached scenarios: {len(loader._delta_cache)}")
+
+shifted = np.array([w['temperature_avg'] for w in variant['weather']['weeks']])
+plain = np.array([w['temperature_avg'] for w in variant_plain['weather']['weeks']])
+
+if again is not warmer or len(loader._delta_cache) != 2 or np.abs(shifted - plain - 2).max() > 0.01:
+    print("ERROR: delta results should be cached per scenario, variant and delta")
+    sys.exit(1)
+
+# Test 3: /api/init with a delta
+print("\n[TEST 3] /api/init avec delta")
+print("-" * 70)
+
+from app import app
+
+client = app.test_client()
+body = {'lat': 10.6, 'lon': 14.3, 'crop_type': 'sorghum', 'region_id': region_id, 'season_id': season_id}
+response = client.post('/api/init', json=dict(body, delta={'temperature': 2, 'precipitation': -15}))
+preview = [w['temperature'] for w in response.get_json()['weather_preview']]
+expected = [w['temperature_avg'] for w in warmer['weather']['weeks'][:4]]
+print(f"  Preview temperature: {preview} (expected {expected})")
+
+invalid = [client.post('/api/init', json=dict(body, delta=bad)).status_code
+           for bad in ({'temperature': 25}, {'wind': 1}, {'precipitation': 'less'})]
+print(f"  Invalid deltas: HTTP {invalid}")
+
+if response.status_code != 200 or preview != expected or invalid != [400, 400, 400]:
+    print("ERROR: /api/init should serve the delta scenario")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: Climate deltas")
+print("=" * 70)
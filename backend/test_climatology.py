@@ -0,0 +1,174 @@
+"""
+Test climatologie multi-annuelle par cellule
+Statistiques par jour de l'annee, fichiers memory-mapped, annee type, meteo de secours
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches and settings must be in the environment before config.py is imported
+os.environ.update({
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-climatology-'),
+    'WARMUP_ENABLED': 'false'
+})
+
+from config import Config
+from models import Region
+from services.climatology import ClimatologyStore
+from services.nasa_power_api import NASAPowerAPI
+from services.power_cleaning import INTERPOLATED, OBSERVED
+from services.weather_store import WeatherStore
+
+print("=" * 70)
+print("TEST CLIMATOLOGIE PAR CELLULE")
+print("=" * 70)
+
+# Sahel-like cell: 10 years, rainy season June-September, hot dry season
+rng = np.random.default_rng(3)
+lat, lon = 13.5, 2.1
+days = np.arange(np.datetime64('2014-01-01'), np.datetime64('2024-01-01'))
+day_of_year = (days - days.astype('datetime64[Y]')).astype(int)
+wet_season = (day_of_year >= 152) & (day_of_year < 273)
+t_mean = 29 + 4 * np.cos(2 * np.pi * (day_of_year - 120) / 365) + rng.normal(0, 1.5, len(days))
+rain = np.where(wet_season, rng.gamma(0.8, 10, len(days)) * (rng.random(len(days)) < 0.5), 0.0)
+arrays = {
+    'T2M': t_mean,
+    'T2M_MAX': t_mean + 7,
+    'T2M_MIN': t_mean - 7,
+    'PRECTOTCORR': rain,
+    'RH2M': np.where(wet_season, 70.0, 25.0),
+    'WS2M': np.full(len(days), 2.5),
+    'ALLSKY_SFC_SW_DWN': np.where(wet_season, 19.0, 23.0)
+}
+arrays['T2M'][1000:1005] = -999.0  # POWER fill values
+weather_store = WeatherStore(Config.WEATHER_STORE_DIR)
+weather_store.save(lat, lon, days, arrays, elevation=220)
+
+# Test 1: Day-of-year statistics match a direct computation
+print("\n[TEST 1] Statistiques par jour de l'annee")
+print("-" * 70)
+
+store = ClimatologyStore(Config.CLIMATOLOGY_DIR, weather_store)
+cell = store.build(lat, lon)
+climatology = store.load(lat, lon)
+print(f"  Cell {cell}: {len(ClimatologyStore.FIELDS)} fields x {len(climatology['temperature_mean'])} days, "
+      f"memory-mapped {isinstance(store._maps[cell], np.memmap)}")
+
+day = 200  # 0-based day of year, mid rainy season (29 February dropped from leap years)
+half = Config.CLIMATOLOGY_WINDOW_DAYS
+offset = day_of_year - ((days.astype('datetime64[Y]').astype(int) + 1970) % 4 == 0) * (day_of_year > 59)
+leap_day = ((days.astype('datetime64[Y]').astype(int) + 1970) % 4 == 0) & (day_of_year == 59)
+pooled = (np.abs(offset - day) <= half) & ~leap_day & (arrays['T2M'] > -999)
+expected_t = t_mean[pooled].mean()
+expected_wet = (rain[(np.abs(offset - day) <= half) & ~leap_day] >= Config.CLIMATOLOGY_WET_DAY_MM).mean()
+print(f"  Day {day + 1}: temperature {climatology['temperature_mean'][day]:.3f} (expected {expected_t:.3f}), "
+      f"wet days {climatology['wet_day_frequency'][day]:.3f} (expected {expected_wet:.3f})")
+
+if (cell is None or not isinstance(store._maps[cell], np.memmap) or store._maps[cell].dtype != np.float32
+        or abs(climatology['temperature_mean'][day] - expected_t) > 1e-3
+        or abs(climatology['wet_day_frequency'][day] - expected_wet) > 1e-3
+        or not climatology['temperature_p10'][day] < climatology['temperature_p50'][day]
+        < climatology['temperature_p90'][day]):
+    print("ERROR: wrong day-of-year statistics")
+    sys.exit(1)
+
+# Days the cleaning filled in (<param>_QC not OBSERVED) are left out of the statistics
+filled = np.zeros(len(days), dtype=bool)
+filled[(days.astype('datetime64[Y]').astype(int) == 2016 - 1970) & (np.abs(offset - day) <= 3)] = True
+filled_t = np.where(filled, 45.0, arrays['T2M'])
+weather_store.save(lat + 5, lon, days, dict(arrays, T2M=filled_t, T2M_QC=np.where(filled, INTERPOLATED, OBSERVED)),
+                   elevation=220)
+filled_cell = store.build(lat + 5, lon)
+masked_t = store.load(lat + 5, lon)['temperature_mean'][day]
+expected_masked = t_mean[pooled & ~filled].mean()
+print(f"  {filled.sum()} interpolated days at 45°C: temperature {masked_t:.3f} (expected {expected_masked:.3f})")
+if filled_cell is None or abs(masked_t - expected_masked) > 1e-3:
+    print("ERROR: only observed days should enter the climatology")
+    sys.exit(1)
+
+if store.build(40.0, -100.0) is not None or ClimatologyStore(Config.CLIMATOLOGY_DIR, weather_store).load(0, 0):
+    print("ERROR: cells without daily data should have no climatology")
+    sys.exit(1)
+
+# Test 2: Typical year, anomalies and climate summary
+print("\n[TEST 2] Annee type, anomalies, resume climatique")
+print("-" * 70)
+
+typical = store.typical_weeks(lat, lon, start_day=152, weeks=12)
+dry = store.typical_weeks(lat, lon, start_day=1, weeks=12)
+print(f"  Typical rain from 1 June: {[week['precipitation'] for week in typical]}")
+
+weeks = [dict(week, temperature=week['temperature'] + 2, precipitation=0.0) for week in typical]
+store.add_anomalies(lat, lon, weeks, 152)
+summary = store.summary(lat, lon)
+label = ClimatologyStore.climate_label(summary)
+print(f"  Anomalies week 1: {weeks[0]['temperature_anomaly']}°C, {weeks[0]['precipitation_anomaly']} mm")
+print(f"  Summary: {label}, {summary['annual_rain']} mm/yr, {summary['rain_variability']}, "
+      f"events {summary['event_probabilities']} -> {summary['typical_events']}")
+
+if (len(typical) != 12 or sum(week['precipitation'] for week in typical) < 150
+        or sum(week['precipitation'] for week in dry) > 1
+        or weeks[0]['temperature_anomaly'] != 2.0 or weeks[0]['precipitation_anomaly'] >= 0):
+    print("ERROR: wrong typical year or anomalies")
+    sys.exit(1)
+
+if (label != 'Semi-aride chaud' or summary['koppen'] != 'BSh' or summary['rain_variability'] != 'very_high'
+        or sorted(summary['typical_events']) != ['drought', 'heatwave']
+        or summary['event_probabilities']['frost'] > 0):
+    print("ERROR: wrong climate summary")
+    sys.exit(1)
+
+# Test 3: Fallback weather and region characteristics use the climatology
+print("\n[TEST 3] Meteo de secours et caracteristiques de la region")
+print("-" * 70)
+
+generator = store.weather_generator(lat, lon, start_day=152, days=84)
+season = generator.generate(300, 84, seed=1)
+generated = season['precipitation'].sum(axis=1).mean()
+normal = sum(week['precipitation'] for week in typical)
+print(f"  Generated rain over 12 weeks from 1 June: {generated:.0f} mm (climatology {normal:.0f} mm)")
+
+fallback = NASAPowerAPI(climatology=store)._get_fallback_weekly_data(12, lat, lon=lon)
+banded = NASAPowerAPI()._get_fallback_weekly_data(12, lat)
+print(f"  Fallback week 1: {fallback[0]} (latitude band: {banded[0]['temperature']}°C)")
+
+if abs(generated - normal) > 0.15 * normal or fallback == banded or fallback[0]['complete']:
+    print("ERROR: fallback weather should follow the climatology")
+    sys.exit(1)
+
+characteristics = Region('Niamey', lat, lon, label, 'sandy', data={'climatology': summary}).get_climate_characteristics()
+constants = Region('Niamey', lat, lon, label, 'sandy').get_climate_characteristics()
+print(f"  Characteristics: {characteristics['avg_temp']}°C, {characteristics['avg_rain']} mm/month "
+      f"(constants: {constants['avg_temp']}°C, {constants['avg_rain']} mm/month)")
+
+if characteristics != summary or constants['avg_rain'] != 50:
+    print("ERROR: region characteristics should come from the climatology")
+    sys.exit(1)
+
+# Test 4: /api/climatology
+print("\n[TEST 4] /api/climatology")
+print("-" * 70)
+
+from app import app
+
+client = app.test_client()
+response = client.get(f'/api/climatology?lat={lat}&lon={lon}&start=06-01&weeks=4')
+body = response.get_json()
+missing = client.get('/api/climatology?lat=-40&lon=60').status_code
+invalid = client.get(f'/api/climatology?lat={lat}&lon={lon}&start=13-45').status_code
+print(f"  HTTP {response.status_code}: {body['climate']}, {len(body['typical_weeks'])} weeks; "
+      f"no data HTTP {missing}, bad start HTTP {invalid}")
+
+if (response.status_code != 200 or body['climate'] != label or body['typical_weeks'] != typical[:4]
+        or missing != 404 or invalid != 400):
+    print("ERROR: /api/climatology")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: Climatology")
+print("=" * 70)
@@ -0,0 +1,195 @@
+"""
+Test pas de temps journalier
+Physique journaliere, decisions hebdomadaires: drainage converti en taux journalier, meme schema de reponse
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches must be in the environment before config.py is imported
+os.environ.update({
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-daily-'),
+    'WARMUP_ENABLED': 'false'
+})
+
+from config import Config
+from models import GameState, Region, Soil
+from models.soil import daily_water_balance
+from services.climate_delta import ClimateDelta
+from services.data_provider import DataProvider
+from services.historical_data_loader import HistoricalDataLoader
+
+print("=" * 70)
+print("TEST PAS DE TEMPS JOURNALIER")
+print("=" * 70)
+
+
+def schema(value):
+    """Keys and value types of a JSON response, recursively"""
+    if isinstance(value, dict):
+        return {key: schema(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [schema(value[0])] if value else []
+    return 'number' if isinstance(value, (int, float)) and not isinstance(value, bool) else type(value).__name__
+
+
+# Test 1: Daily balance = Soil.update_moisture day after day at the daily drainage rate
+print("\n[TEST 1] Bilan journalier = Soil jour par jour (taux de drainage journalier)")
+print("-" * 70)
+
+rng = np.random.default_rng(2)
+rain = rng.gamma(0.5, 12, (300, 7)) * (rng.random((300, 7)) < 0.4)
+et = rng.uniform(2, 7, (300, 7))
+start_moisture = rng.uniform(30, 90, 300)
+params = Config.SOIL_TYPES['loam']
+daily_rate = 1 - (1 - params['drainage_rate']) ** (1 / 7)
+levels, drainage = daily_water_balance(start_moisture, rain, et, params['field_capacity'],
+                                       daily_rate, params['wilting_point'])
+
+errors = []
+for row in (0, 150, 299):
+    soil = Soil('loam', dict(params, drainage_rate=daily_rate), start_moisture[row])
+    for day in range(7):
+        info = soil.update_moisture(rain[row, day], 0, et[row, day])
+        errors += [abs(info['moisture'] - levels[row, day]), abs(info['drainage'] - drainage[row, day])]
+print(f"  {levels.shape} daily levels, max difference {max(errors):.1e}")
+
+if max(errors) > 1e-9:
+    print("ERROR: daily balance should repeat the water balance step once per day")
+    sys.exit(1)
+
+# Seven daily drainages of an excess left alone remove the weekly share
+soil = Soil('loam', params, params['field_capacity'] + 20)
+drained = soil.update_moisture_daily(np.zeros(7), np.zeros(7), np.zeros(7))['drainage']
+print(f"  Excess of 20 mm over a dry week: {drained:.2f} mm drained (weekly rate {params['drainage_rate']})")
+if abs(drained - 20 * params['drainage_rate']) > 1e-9:
+    print("ERROR: daily drainage should compound to the weekly rate")
+    sys.exit(1)
+
+# Test 2: A storm then a dry spell: the weekly step misses both
+print("\n[TEST 2] Orage puis secheresse dans la semaine")
+print("-" * 70)
+
+storm = np.array([70, 0, 0, 0, 0, 0, 0], dtype=float)
+dry = np.full(7, 6.0)
+weekly, daily = Soil('loam', params, 60), Soil('loam', params, 60)
+weekly_info = weekly.update_moisture(storm.sum(), 0, dry.sum())
+daily_info = daily.update_moisture_daily(storm, np.zeros(7), dry)
+print(f"  Weekly step: {weekly_info['moisture']:.1f}%, drained {weekly_info['drainage']:.1f} mm")
+print(f"  Daily steps: {[round(m, 1) for m in daily_info['daily_moisture']]}, "
+      f"drained {daily_info['drainage']:.1f} mm")
+
+if (daily_info['drainage'] <= weekly_info['drainage'] or daily_info['moisture'] >= weekly_info['moisture']
+        or set(daily_info) - {'daily_moisture'} != set(weekly_info)):
+    print("ERROR: daily steps should drain the storm before the week's ET")
+    sys.exit(1)
+
+# Test 3: GameState, daily pattern rescaled to the weekly weather
+print("\n[TEST 3] GameState journalier")
+print("-" * 70)
+
+week = {'precipitation': 42.0, 'temperature': 27.0, 'evapotranspiration': 35.0}
+daily_weather = {
+    'precipitation': [[0, 0, 30, 0, 0, 10, 0]],
+    'temperature': [[24, 25, 26, 27, 28, 29, None]],  # incomplete: constant temperature
+    'evapotranspiration': [[5, 5, 4, 6, 6, 5, 4]]
+}
+game = GameState(Region('Test', 10.6, 14.3, 'Sahel', 'loam'), 'maize', Config.CROPS['maize'], params,
+                 timestep='daily')
+game.weather_data = [week] * 12
+game.daily_weather = daily_weather
+days = game._week_days(0, week['precipitation'], week['temperature'], week['evapotranspiration'])
+even = game._week_days(5, week['precipitation'], week['temperature'], week['evapotranspiration'])
+print(f"  Week 1 rain {days['precipitation'].round(1).tolist()}, ET {days['evapotranspiration'].round(1).tolist()}")
+print(f"  Week 6 (no daily data) rain {even['precipitation'].round(1).tolist()}")
+
+if (abs(days['precipitation'].sum() - 42) > 1e-9 or abs(days['evapotranspiration'].sum() - 35) > 1e-9
+        or days['precipitation'][2] != 42 * 30 / 40 or not (days['temperature'] == 27).all()
+        or not np.allclose(even['precipitation'], 6)):
+    print("ERROR: daily weather should keep the weekly totals")
+    sys.exit(1)
+
+timings = {}
+for timestep in Config.SIMULATION_TIMESTEPS:
+    game = GameState(Region('Test', 10.6, 14.3, 'Sahel', 'loam'), 'maize', Config.CROPS['maize'], params,
+                     timestep=timestep)
+    game.weather_data = [week] * 12
+    game.daily_weather = daily_weather
+    start = time.perf_counter()
+    for _ in range(12):
+        game.simulate_week(5, 10, week)
+    timings[timestep] = (time.perf_counter() - start) / 12
+    print(f"  {timestep:6s}: final moisture {game.soil.moisture:.1f}%, NDVI {game.crop.ndvi:.3f}, "
+          f"{timings[timestep] * 1e6:.0f} us/week")
+
+# Test 4: Scenario daily weather from the weather store
+print("\n[TEST 4] Meteo journaliere des scenarios")
+print("-" * 70)
+
+provider = DataProvider()
+scenario = HistoricalDataLoader().load_historical_data('maroua_cameroun', 'summer_2024')
+location = scenario['metadata']['location']
+if provider.get_game_data(10.6, 14.3, season_id='summer_2024')['daily_weather'] is not None:
+    print("ERROR: without stored days there is no daily weather")
+    sys.exit(1)
+
+dates = np.arange(np.datetime64('2024-05-01'), np.datetime64('2024-09-30'))
+provider.climatology.weather_store.save(location['latitude'], location['longitude'], dates, {
+    'PRECTOTCORR': rng.gamma(0.5, 10, len(dates)),
+    'T2M': 28 + 3 * np.sin(np.arange(len(dates)))
+})
+game_data = provider.get_game_data(10.6, 14.3, season_id='summer_2024')
+stored = game_data['daily_weather']
+print(f"  {len(stored['precipitation'])} weeks x {len(stored['precipitation'][0])} days, "
+      f"fields {sorted(stored)}")
+
+if (len(stored['precipitation']) != len(game_data['weather_data'])
+        or sorted(stored) != ['precipitation', 'temperature']):
+    print("ERROR: scenario weeks should get their stored days")
+    sys.exit(1)
+
+# Ensemble variants take the days of each week's source week; deltas get no observed days
+variant_scenario = HistoricalDataLoader().load_historical_data('maroua_cameroun', 'summer_2024', 3)
+sources = [week['source_week'] - 1 for week in variant_scenario['weather']['weeks']]
+variant_days = provider.get_game_data(10.6, 14.3, season_id='summer_2024', variant=3)['daily_weather']
+shifted = provider.get_game_data(10.6, 14.3, season_id='summer_2024', delta=ClimateDelta(2, -15))
+print(f"  Variant 3 source weeks {[week + 1 for week in sources]}, delta daily weather {shifted['daily_weather']}")
+
+if (variant_days['precipitation'] != [stored['precipitation'][week] for week in sources]
+        or sources == list(range(len(sources))) or shifted['daily_weather'] is not None):
+    print("ERROR: variant days should follow their source weeks, delta series should have none")
+    sys.exit(1)
+
+# Test 5: /api/init timestep, same /api/action schema
+print("\n[TEST 5] /api/init et /api/action")
+print("-" * 70)
+
+from app import app
+
+client = app.test_client()
+body = {'lat': 10.6, 'lon': 14.3, 'crop_type': 'sorghum', 'region_id': 'maroua_cameroun', 'season_id': 'summer_2024'}
+responses = {}
+for timestep in Config.SIMULATION_TIMESTEPS:
+    init = client.post('/api/init', json=dict(body, timestep=timestep)).get_json()
+    random.seed(4)  # same random event for both timesteps
+    responses[timestep] = client.post('/api/action', json={'session_id': init['session_id'], 'irrigation': 10,
+                                                           'fertilizer': 20}).get_json()
+    print(f"  {timestep:6s}: state timestep {init['state']['timestep']}, "
+          f"moisture after week 1 {responses[timestep]['soil']['moisture']}")
+invalid = client.post('/api/init', json=dict(body, timestep='hourly')).status_code
+print(f"  Invalid timestep: HTTP {invalid}")
+
+if schema(responses['daily']) != schema(responses['weekly']) or invalid != 400:
+    print("ERROR: both timesteps should answer with the same schema")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: Daily timestep")
+print("=" * 70)
@@ -0,0 +1,80 @@
+"""
+Test ET0 FAO-56 Penman-Monteith (exemples du bulletin FAO-56)
+Repli Hargreaves si le rayonnement manque, calcul vectorise
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from services.evapotranspiration import (
+    extraterrestrial_radiation, hargreaves, penman_monteith, reference_et, wind_speed_2m, et0_from_power
+)
+
+print("=" * 70)
+print("TEST EVAPOTRANSPIRATION FAO-56")
+print("=" * 70)
+
+# Test 1: FAO-56 worked examples
+print("\n[TEST 1] Exemples FAO-56")
+print("-" * 70)
+
+checks = [
+    ('Ex. 8  Ra, 20°S, 3 September', extraterrestrial_radiation(-20, 246), 32.2, 0.1),
+    ('Ex. 14 wind 3.2 m/s at 10 m -> 2 m', wind_speed_2m(3.2, 10), 2.4, 0.05),
+    # Uccle, 6 July: ea = 1.409 kPa is RH mean 70.55% of es = 1.997 kPa
+    ('Ex. 18 ET0 Uccle, 6 July', penman_monteith(21.5, 12.3, 70.55, 2.078, 22.07, 50.8, 187, elevation=100), 3.9, 0.05),
+]
+for label, value, expected, tolerance in checks:
+    print(f"  {label}: {float(value):.3f} (FAO-56: {expected})")
+    if abs(value - expected) > tolerance:
+        print("ERROR: does not match FAO-56")
+        sys.exit(1)
+
+# Test 2: Hargreaves where radiation is missing, POWER fill values
+print("\n[TEST 2] Repli Hargreaves (valeurs -999 de POWER)")
+print("-" * 70)
+
+parameters = {
+    'T2M_MAX': {'20240706': 21.5, '20240707': 21.5, '20240708': -999.0},
+    'T2M_MIN': {'20240706': 12.3, '20240707': 12.3, '20240708': 12.3},
+    'RH2M': {'20240706': 70.55, '20240707': 70.55, '20240708': 70.55},
+    'WS10M': {'20240706': 2.78, '20240707': 2.78, '20240708': 2.78},
+    'ALLSKY_SFC_SW_DWN': {'20240706': 22.07, '20240707': -999.0, '20240708': 22.07},
+}
+et0 = et0_from_power(parameters, 50.8, elevation=100)
+fallback = float(hargreaves(21.5, 12.3, 50.8, 189))
+print(f"  {et0} (Hargreaves 7 July: {fallback:.2f})")
+
+if abs(et0['20240706'] - 3.9) > 0.05 or abs(et0['20240707'] - fallback) > 0.01 or et0['20240708'] is not None:
+    print("ERROR: wrong Penman-Monteith / Hargreaves selection")
+    sys.exit(1)
+
+# Test 3: Many locations and days in one call
+print("\n[TEST 3] 2000 localisations x 365 jours")
+print("-" * 70)
+
+rng = np.random.default_rng(0)
+lat = rng.uniform(-60, 60, (2000, 1))
+t_max = rng.uniform(15, 38, (2000, 365))
+t_min = t_max - rng.uniform(5, 15, (2000, 365))
+radiation = rng.uniform(5, 28, (2000, 365))
+radiation[:, ::10] = np.nan
+
+start = time.perf_counter()
+batch = reference_et(t_max, t_min, lat, np.arange(1, 366), rh=rng.uniform(20, 90, (2000, 365)),
+                     wind_2m=rng.uniform(0.5, 5, (2000, 365)), radiation=radiation)
+elapsed = time.perf_counter() - start
+print(f"  Shape {batch.shape}, {elapsed * 1000:.0f} ms, range {batch.min():.2f}-{batch.max():.2f} mm/day")
+
+if batch.shape != (2000, 365) or not np.isfinite(batch).all() or batch.min() < 0:
+    print("ERROR: batch ET0 should be finite and non-negative")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: FAO-56 ET0")
+print("=" * 70)
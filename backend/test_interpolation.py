@@ -0,0 +1,126 @@
+"""
+Test interpolation meteo depuis les scenarios voisins
+Index spatial, ponderation inverse a la distance, lieux personnalises sans reseau
+"""
+
+import math
+import os
+import socket
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+# Interpolation on, and every external service on a closed port: any network call fails
+closed_port = free_port()
+os.environ.update({
+    'NASA_POWER_API_URL': f"http://127.0.0.1:{closed_port}/api/temporal/daily/point",
+    'NOMINATIM_BASE_URL': f"http://127.0.0.1:{closed_port}",
+    'INTERPOLATION_ENABLED': 'true',
+    'WARMUP_ENABLED': 'false',
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-interpolation-')
+})
+
+from config import Config
+from services.data_provider import DataProvider
+from services.historical_data_loader import HistoricalDataLoader
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    dlat, dlon = math.radians(lat2 - lat1), math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 6371 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+print("=" * 70)
+print("TEST INTERPOLATION DEPUIS LES SCENARIOS VOISINS")
+print("=" * 70)
+
+loader = HistoricalDataLoader()
+
+# Test 1: Spatial index agrees with a Haversine scan of the catalog
+print("\n[TEST 1] Index spatial = parcours Haversine")
+print("-" * 70)
+
+errors = []
+for lat, lon, season_id in [(10.1, 13.9, 'summer_2024'), (-20.0, -50.0, None), (47.0, 3.0, 'spring_2024')]:
+    nearest = loader.find_nearest_scenarios(lat, lon, season_id, k=3)
+    brute = sorted((haversine(lat, lon, s['lat'], s['lon']), s['id']) for s in loader.get_available_scenarios()
+                   if season_id is None or s['season_id'] == season_id)[:3]
+    print(f"  ({lat}, {lon}): {[(s['id'], s['distance_km']) for s in nearest]}")
+    errors += [abs(s['distance_km'] - d) for s, (d, _) in zip(nearest, brute)]
+    if season_id and [s['id'] for s in nearest] != [i for _, i in brute]:
+        print("ERROR: wrong nearest scenarios")
+        sys.exit(1)
+
+closest = loader.find_closest_scenario(10.1, 13.9, 'summer_2024')
+if max(errors) > 0.1 or closest['id'] != 'maroua_cameroun_summer_2024' \
+        or loader.find_nearest_scenarios(0.0, -150.0, k=4, radius_km=500):
+    print("ERROR: spatial index distances or radius")
+    sys.exit(1)
+
+# Test 2: Inverse-distance weighting of scenario weeks
+print("\n[TEST 2] Ponderation inverse a la distance")
+print("-" * 70)
+
+garoua = loader.get_weekly_arrays('garoua_cameroun', 'summer_2024')
+maroua = loader.get_weekly_arrays('maroua_cameroun', 'summer_2024')
+interpolated = loader.interpolate_scenario(10.1, 13.9, 'summer_2024', k=2)
+weights = {n['region_id']: n['weight'] for n in interpolated['interpolation']}
+weeks = interpolated['weather']['weeks']
+rain = np.array([week['precipitation_total'] for week in weeks])
+expected = (weights['garoua_cameroun'] * garoua['precipitation_total']
+            + weights['maroua_cameroun'] * maroua['precipitation_total'])
+print(f"  Neighbours: {interpolated['interpolation']}")
+print(f"  Rain week 1-4: {rain[:4].tolist()} (Garoua {garoua['precipitation_total'][:4].tolist()}, "
+      f"Maroua {maroua['precipitation_total'][:4].tolist()})")
+
+if (len(weeks) != len(garoua['precipitation_total']) or abs(sum(weights.values()) - 1) > 0.01
+        or np.abs(rain - expected).max() > 0.05 or interpolated['metadata']['location']['latitude'] != 10.1):
+    print("ERROR: wrong inverse-distance weighting")
+    sys.exit(1)
+
+exact = loader.interpolate_scenario(10.6, 14.3, 'summer_2024')
+if [w['temperature_avg'] for w in exact['weather']['weeks']] != maroua['temperature_avg'].tolist():
+    print("ERROR: a scenario location should get the scenario's weather")
+    sys.exit(1)
+
+if loader.interpolate_scenario(0.0, -150.0) is not None:
+    print("ERROR: no scenario within the radius should give no interpolation")
+    sys.exit(1)
+
+# Test 3: Custom location starts from nearby scenarios, without network
+print("\n[TEST 3] Lieu personnalise sans reseau")
+print("-" * 70)
+
+provider = DataProvider()
+start = time.perf_counter()
+data = provider.get_game_data(10.1, 13.9)
+elapsed = time.perf_counter() - start
+print(f"  {data['source']} in {elapsed * 1000:.0f} ms: {data['name']}, {data['climate']}, "
+      f"{len(data['weather_data'])} weeks, week 1 {data['weather_data'][0]}")
+
+if data['source'] != 'interpolated' or elapsed > 1 or len(data['weather_data']) != len(weeks) \
+        or 'name_future' not in data:
+    print("ERROR: custom location should be interpolated from nearby scenarios")
+    sys.exit(1)
+
+remote = provider._get_interpolated_region_data(0.0, -150.0)
+print(f"  Mid-Pacific: {remote} (falls back to the API, radius {Config.INTERPOLATION_RADIUS_KM} km)")
+if remote is not None:
+    print("ERROR: remote location should not be interpolated")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: Scenario interpolation")
+print("=" * 70)
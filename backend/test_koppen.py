@@ -0,0 +1,161 @@
+"""
+Test classification Koppen-Geiger et profils climatiques
+Regles de Peel et al., grille uint8 memory-mapped, profils identiques aux anciens noms
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches and the raster must be in the environment before config.py is imported
+cache_dir = tempfile.mkdtemp(prefix='terragrow-koppen-')
+os.environ.update({
+    'TERRAGROW_CACHE_DIR': cache_dir,
+    'KOPPEN_RASTER_FILE': os.path.join(cache_dir, 'koppen.npy'),
+    'WARMUP_ENABLED': 'false'
+})
+
+from config import Config
+from models import ClimateProfile, GameState, Region
+from services.data_provider import DataProvider
+from services.historical_data_loader import HistoricalDataLoader
+from services.koppen import KOPPEN_LABELS, KoppenRaster, classify_koppen
+
+print("=" * 70)
+print("TEST KOPPEN-GEIGER ET PROFILS CLIMATIQUES")
+print("=" * 70)
+
+# Test 1: Classification of monthly climatologies
+print("\n[TEST 1] Classification de climatologies mensuelles")
+print("-" * 70)
+
+stations = {
+    'Niamey': (13.5, [24, 27, 31, 34, 34, 32, 29, 28, 29, 31, 28, 25],
+               [0, 0, 3, 6, 33, 77, 141, 188, 91, 15, 1, 0], 'BSh'),
+    'Le Caire': (30.0, [14, 15, 18, 22, 25, 28, 28, 28, 26, 23, 19, 15], [5, 4, 4, 1, 0, 0, 0, 0, 0, 1, 3, 5], 'BWh'),
+    'Singapour': (1.3, [27] * 12, [240, 160, 180, 170, 170, 130, 150, 150, 140, 160, 250, 290], 'Af'),
+    'Kinshasa': (-4.3, [26, 26, 27, 27, 26, 24, 23, 24, 26, 26, 26, 26],
+                 [160, 150, 200, 200, 130, 10, 5, 10, 40, 130, 240, 150], 'Aw'),
+    'Paris': (48.9, [5, 6, 9, 12, 15, 18, 20, 20, 17, 13, 8, 5], [50, 45, 50, 50, 60, 55, 60, 55, 50, 60, 55, 55], 'Cfb'),
+    'Rome': (41.9, [8, 9, 11, 14, 18, 22, 25, 25, 21, 17, 12, 9],
+             [70, 65, 55, 60, 40, 20, 15, 25, 70, 110, 100, 80], 'Csa'),
+    'Montreal': (45.5, [-10, -8, -2, 6, 13, 18, 21, 20, 15, 8, 1, -6], [80] * 12, 'Dfb'),
+    'Buenos Aires': (-34.6, [25, 24, 22, 18, 15, 12, 11, 13, 15, 18, 21, 24],
+                     [120, 120, 140, 110, 90, 60, 60, 70, 70, 120, 110, 110], 'Cfa'),
+    'Nuuk': (64.2, [-7, -8, -8, -4, 1, 5, 7, 6, 3, -1, -4, -6], [40, 45, 45, 30, 40, 50, 80, 85, 85, 65, 55, 50], 'ET')
+}
+
+for name, (lat, temperature, precipitation, expected) in stations.items():
+    koppen = classify_koppen(temperature, precipitation, lat)
+    print(f"  {name:13s} {koppen:4s} -> {KOPPEN_LABELS[koppen]}")
+    if koppen != expected:
+        print(f"ERROR: {name} should be {expected}")
+        sys.exit(1)
+
+# Test 2: uint8 raster, memory-mapped, one cell per lookup
+print("\n[TEST 2] Grille uint8 memory-mapped")
+print("-" * 70)
+
+raster = KoppenRaster(Config.KOPPEN_RASTER_FILE)
+if raster.lookup(0.0, 20.0) is not None:
+    print("ERROR: without a raster file lookups should return None")
+    sys.exit(1)
+
+# Same latitude band, different climates: Sahara vs. Sahel, Congo basin vs. East African highlands
+grid = KoppenRaster.from_points([20.25, 13.75, 0.25, 0.25, 64.25], [10.25, 2.25, 20.25, 37.25, 179.75],
+                                ['BWh', 'BSh', 'Af', 'Cwb', 'ET'], resolution=0.5)
+raster.save(grid)
+lookups = {point: raster.lookup(*point) for point in [(20.4, 10.1), (13.6, 2.1), (0.3, 20.4), (0.2, 37.3),
+                                                      (64.3, -180.0 + 359.8), (-30.0, -140.0)]}
+print(f"  {lookups}")
+print(f"  {grid.shape} {grid.dtype}, {grid.nbytes / 1e6:.2f} MB, memory-mapped {isinstance(raster._grid, np.memmap)}")
+
+if (list(lookups.values()) != ['BWh', 'BSh', 'Af', 'Cwb', 'ET', None] or grid.dtype != np.uint8
+        or not isinstance(raster._grid, np.memmap)):
+    print("ERROR: wrong raster lookups")
+    sys.exit(1)
+
+# Test 3: Profiles reproduce the former name matching
+print("\n[TEST 3] Profils = ancienne correspondance par nom")
+print("-" * 70)
+
+
+def former_crops(climate):
+    climate = climate.lower()
+    if 'tropical' in climate or 'humid' in climate:
+        return ['maize', 'sorghum']
+    elif 'sahel' in climate or 'arid' in climate or 'semi-arid' in climate:
+        return ['sorghum', 'maize']
+    elif 'continental' in climate or 'océanique' in climate or 'tempéré' in climate:
+        return ['wheat', 'maize']
+    return ['maize']
+
+
+def former_events_and_average(climate):
+    climate = climate.lower()
+    if 'tropical' in climate:
+        events = ['heavy_rain', 'drought']
+    elif 'sahel' in climate or 'semi-arid' in climate:
+        events = ['drought', 'heatwave']
+    elif 'continental' in climate:
+        events = ['frost', 'cold_snap']
+    else:
+        events = ['drought']
+
+    if 'tropical' in climate:
+        average = 5.2
+    elif 'sahel' in climate or 'arid' in climate:
+        average = 3.8
+    elif 'continental' in climate:
+        average = 6.5
+    else:
+        average = 5.5
+    return events, average
+
+
+names = ({region['climate'] for region in Config.POPULAR_REGIONS.values()}
+         | {scenario['climate'] for scenario in HistoricalDataLoader().get_available_scenarios()}
+         | set(KOPPEN_LABELS.values()) | {'Tropical équatorial', 'Subtropical', 'Continental tempéré', 'Semi-arid'})
+differences = []
+for climate in sorted(names):
+    region = Region('Test', 0, 0, climate)
+    game = GameState(region, 'maize', Config.CROPS['maize'], Config.SOIL_TYPES['loam'])
+    events, average = former_events_and_average(climate)
+    if (region.get_recommended_crops() != former_crops(climate)
+            or region.get_climate_characteristics()['typical_events'] != events
+            or game._get_regional_average() != average):
+        differences.append(climate)
+print(f"  {len(names)} climate names, differences: {differences}")
+
+region = Region('Test', 13.5, 2.1, 'Semi-aride chaud', data={'koppen': 'BSh'})
+if differences or region.profile is not region.profile or region.to_dict()['koppen'] != 'BSh' \
+        or not isinstance(region.profile, ClimateProfile):
+    print("ERROR: profiles should match the former name matching and be built once")
+    sys.exit(1)
+
+# Test 4: Custom locations get their Köppen climate
+print("\n[TEST 4] Lieux personnalises")
+print("-" * 70)
+
+provider = DataProvider()
+sahara, congo = provider._estimate_climate(20.4, 10.1), provider._estimate_climate(0.3, 20.4)
+highlands = provider._estimate_climate(0.2, 37.3)
+ocean = provider._estimate_climate(-30.0, -140.0)
+print(f"  Sahara {sahara}, Congo {congo}, Kenyan highlands {highlands}, Pacific {ocean} (latitude band)")
+
+if (sahara, congo, highlands, ocean) != ('Aride chaud', 'Tropical humide', 'Subtropical montagnard', 'Subtropical'):
+    print("ERROR: climate should come from the Köppen raster")
+    sys.exit(1)
+
+if (provider._estimate_soil_type(sahara) != 'sandy'
+        or Region('X', 20.4, 10.1, sahara).get_recommended_crops()[0] != 'sorghum'):
+    print("ERROR: Köppen climate names should drive soil and crops")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: Köppen-Geiger")
+print("=" * 70)
@@ -0,0 +1,161 @@
+"""
+Test recherche de lieux: gazetteer local, Nominatim (stand-in) en dernier recours
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+# Endpoints and caches must be in the environment before config.py is imported
+ports = {'power_port': free_port(), 'nominatim_port': free_port(), 'appeears_port': free_port()}
+os.environ.update({
+    'NOMINATIM_BASE_URL': f"http://127.0.0.1:{ports['nominatim_port']}",
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-cache-')
+})
+
+from config import Config
+from standin_servers import start_standin_servers
+from services.geocoding_service import GeocodingService
+from services.historical_data_loader import HistoricalDataLoader
+from services.rate_limiter import TokenBucketLimiter, RateLimitDeferred
+
+print("=" * 70)
+print("TEST RECHERCHE DE LIEUX")
+print("=" * 70)
+
+servers = start_standin_servers(**ports)
+nominatim_stats = servers['nominatim'].RequestHandlerClass.behaviour.stats
+
+geocoding = GeocodingService()
+geocoding.gazetteer.add_scenarios(HistoricalDataLoader().get_available_scenarios())
+
+# Test 1: Typeahead answered locally
+print("\n[TEST 1] Typeahead local (sans Nominatim)")
+print("-" * 70)
+
+for query in ['Yaoundé', 'yaounde', 'Kano, Nigeria', 'kano', 'addis']:
+    start = time.perf_counter()
+    results = geocoding.search_location(query)
+    elapsed_us = (time.perf_counter() - start) * 1e6
+    print(f"  {query:15s} -> {results[0]['name']:25s} score={results[0]['score']:.2f} ({elapsed_us:.0f} us)")
+
+    if results[0]['source'] not in ('popular', 'scenario'):
+        print("ERROR: expected a local result")
+        sys.exit(1)
+
+if nominatim_stats['requests'] != 0:
+    print(f"ERROR: Nominatim was called {nominatim_stats['requests']} times")
+    sys.exit(1)
+
+# A partial name is not a confident match: "Paris" must not be settled by "Parisot"
+geocoding.gazetteer.add('Parisot', 44.27, 1.86, 'village')
+partial = geocoding.gazetteer.search('Paris')[0]
+print(f"  {'Paris':15s} -> {partial['name']:25s} score={partial['score']:.2f} (local best)")
+if partial['score'] >= Config.GAZETTEER_MIN_SCORE:
+    print("ERROR: prefix-only matches should fall back to Nominatim")
+    sys.exit(1)
+
+# Test 2: No confident local match goes to Nominatim, then is resolved locally
+print("\n[TEST 2] Requete non confiante -> Nominatim -> gazetteer")
+print("-" * 70)
+
+results = geocoding.search_location('Cameroun')
+print(f"  First search:  {len(results)} results, Nominatim calls={nominatim_stats['requests']}")
+
+fresh = GeocodingService()
+results = fresh.search_location('cameroun')
+print(f"  After restart: {results[0]['name']} (source={results[0]['source']}), "
+      f"Nominatim calls={nominatim_stats['requests']}")
+
+if nominatim_stats['requests'] != 1 or results[0]['source'] != 'nominatim':
+    print("ERROR: resolved place not persisted in the gazetteer")
+    sys.exit(1)
+
+# Test 3: Rate limit shared across workers, searches deferred instead of queued
+print("\n[TEST 3] Limiteur partage entre workers (requete differee)")
+print("-" * 70)
+
+# Another worker process holds the next Nominatim slots
+other_worker = TokenBucketLimiter(Config.RATE_LIMIT_DB, 'nominatim', Config.NOMINATIM_RATE)
+other_worker.reserve(max_wait=10)
+other_worker.reserve(max_wait=10)
+
+start = time.perf_counter()
+try:
+    geocoding.search_location('Tanzania')
+    print("ERROR: search was not deferred")
+    sys.exit(1)
+except RateLimitDeferred as e:
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"  Deferred in {elapsed_ms:.1f} ms, retry after {e.retry_after:.1f}s")
+    if elapsed_ms > 100 or e.retry_after <= Config.NOMINATIM_SEARCH_MAX_WAIT:
+        print("ERROR: deferral should be immediate")
+        sys.exit(1)
+
+start = time.perf_counter()
+name = geocoding.reverse_geocode(-6.8, 39.3)['name']
+elapsed = time.perf_counter() - start
+print(f"  Reverse geocode waited {elapsed:.2f}s for its slot -> {name}")
+if elapsed < 1 or name.startswith('Location ('):
+    print("ERROR: reverse geocode should wait for the shared slot")
+    sys.exit(1)
+
+# Preloaded master (gunicorn preload_app): forked workers open their own connection
+def forked_connection_is_new(service):
+    parent = service._connection()
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if service._connection() is not parent else 1)
+    return os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) == 0 and service._connection() is parent
+
+
+if not (forked_connection_is_new(geocoding.limiter) and forked_connection_is_new(geocoding.reverse_cache)):
+    print("ERROR: forked workers should not reuse the master's SQLite connections")
+    sys.exit(1)
+
+# Test 4: Reverse geocoding reused by nearby clicks and across restarts
+print("\n[TEST 4] Cache de geocodage inverse (voisinage, redemarrage)")
+print("-" * 70)
+
+calls = nominatim_stats['requests']
+restarted = GeocodingService()
+for lat, lon in [(-6.81, 39.31), (-6.79, 39.28), (-6.8, 39.3)]:
+    start = time.perf_counter()
+    name = restarted.reverse_geocode(lat, lon)['name']
+    print(f"  ({lat}, {lon}) -> {name} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+far = restarted.reverse_cache.get(-6.9, 39.3)[0]
+print(f"  Nominatim calls: {nominatim_stats['requests'] - calls}, 11 km away cached: {far is not None}")
+
+if nominatim_stats['requests'] != calls or far is not None:
+    print("ERROR: nearby clicks should be served from the cache only")
+    sys.exit(1)
+
+# An expired entry is refreshed, but still used if Nominatim is unavailable
+restarted.reverse_cache.ttl = 0
+for _ in range(int(Config.NOMINATIM_REVERSE_MAX_WAIT * Config.NOMINATIM_RATE) + 2):
+    restarted.limiter.reserve(max_wait=60)
+calls = nominatim_stats['requests']
+name = restarted.reverse_geocode(-6.8, 39.3)['name']
+print(f"  Stale entry while rate limited -> {name}")
+if name.startswith('Location (') or nominatim_stats['requests'] != calls:
+    print("ERROR: stale entry should be used as a fallback")
+    sys.exit(1)
+
+for server in servers.values():
+    server.shutdown()
+
+print("\n" + "=" * 70)
+print("SUCCESS: location search served locally")
+print("=" * 70)
@@ -0,0 +1,133 @@
+"""
+Test fetch NASA POWER en masse
+Planification des requetes (regionales ou ponctuelles), decoupage par cellule, fusion du stockage
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches must be in the environment before config.py is imported
+os.environ.update({
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-bulk-'),
+    'WARMUP_ENABLED': 'false'
+})
+
+from config import Config
+from services.nasa_power_bulk import NASAPowerBulkFetcher
+from services.power_cleaning import INTERPOLATED, OBSERVED
+from services.weather_store import WeatherStore
+
+print("=" * 70)
+print("TEST FETCH NASA POWER EN MASSE")
+print("=" * 70)
+
+store = WeatherStore(os.path.join(Config.CACHE_DIR, 'bulk'))
+parameters = NASAPowerBulkFetcher.load_parameters(Config.POWER_PARAMS_FILE)
+fetcher = NASAPowerBulkFetcher(store, parameters, point_url=Config.NASA_POWER_API_URL,
+                               regional_url=Config.NASA_POWER_REGIONAL_API_URL,
+                               regional_max_params=1, point_max_params=20, request_interval=0)
+rng = np.random.default_rng(8)
+
+# Test 1: 300 clustered points -> one regional request per parameter
+print("\n[TEST 1] 300 points groupes -> requetes regionales")
+print("-" * 70)
+
+points = list(zip(rng.uniform(10.5, 14.5, 300), rng.uniform(12.5, 16.5, 300)))
+plan = fetcher.plan(points)
+cells = {store.cell_for(lat, lon) for lat, lon in points}
+print(f"  {len(parameters)} parameters, {len(points)} points in {len(cells)} cells -> {len(plan)} requests "
+      f"({sorted({request['type'] for request in plan})}), bbox {plan[0]['bbox']}")
+
+bbox = plan[0]['bbox']
+if (len(plan) != len(parameters) or {request['type'] for request in plan} != {'regional'}
+        or sorted(p for request in plan for p in request['parameters']) != sorted(parameters)
+        or len(plan[0]['cells']) != len(cells)
+        or not all(bbox[0] - 1e-4 <= lat <= bbox[1] + 1e-4 and bbox[2] - 1e-4 <= lon <= bbox[3] + 1e-4
+                    for _, lat, lon in plan[0]['cells'])):
+    print("ERROR: 300 points of one tile should plan one regional request per parameter")
+    sys.exit(1)
+
+# Test 2: A tile goes regional only when cells x point chunks > regional chunks
+print("\n[TEST 2] Seuil regional / ponctuel")
+print("-" * 70)
+
+regional_chunks = len(parameters)  # one parameter per regional request
+counts = {}
+for n_cells in (1, regional_chunks, regional_chunks + 1):
+    # One point per cell along a row of the POWER grid, plus duplicates of the first cell
+    tile = [(2.0, 0.3 + i * WeatherStore.LON_STEP) for i in range(n_cells)] + [(2.05, 0.25)] * 3
+    counts[n_cells] = [request['type'] for request in fetcher.plan(tile)]
+    print(f"  {n_cells:2d} cells -> {len(counts[n_cells])} {sorted(set(counts[n_cells]))} requests")
+
+if (counts[1] != ['point'] or counts[regional_chunks] != ['point'] * regional_chunks
+        or counts[regional_chunks + 1] != ['regional'] * regional_chunks):
+    print("ERROR: regional requests should only be used when they need fewer calls")
+    sys.exit(1)
+
+# A small tile's bounding box is widened to POWER's 2° minimum
+small = fetcher.plan([(45.1, 2.1 + i * WeatherStore.LON_STEP) for i in range(regional_chunks + 1)])
+lat_min, lat_max, lon_min, lon_max = small[0]['bbox']
+if lat_max - lat_min < NASAPowerBulkFetcher.REGIONAL_MIN_SPAN or lon_max - lon_min < 2:
+    print("ERROR: regional bounding boxes should span at least 2°")
+    sys.exit(1)
+
+# Test 3: Regional response split into cells (nearest grid point, quality codes)
+print("\n[TEST 3] Decoupage d'une reponse regionale")
+print("-" * 70)
+
+dates = [f"202401{day:02d}" for day in range(1, 11)]
+features = [{
+    'geometry': {'coordinates': [lon, lat, 300.0]},
+    'properties': {'parameter': {'T2M': {d: lat + lon / 100 for d in dates},
+                                 'PRECTOTCORR': {d: (-999.0 if d == '20240105' else 1.0) for d in dates}}}
+} for lat in (10.0, 10.5) for lon in (12.5, 13.125)]
+requested = [(store.cell_for(10.1, 13.0), 10.1, 13.0), (store.cell_for(10.6, 12.6), 10.6, 12.6)]
+updated = fetcher._split_features(features, requested)
+near = store.load(10.1, 13.0)
+print(f"  Updated {sorted(updated)}, T2M {near['arrays']['T2M'][0]:.4f}, elevation {near['elevation']}, "
+      f"PRECTOTCORR_QC {near['arrays']['PRECTOTCORR_QC'].astype(int).tolist()}")
+
+if (updated != {cell for cell, _, _ in requested} or abs(near['arrays']['T2M'][0] - 10.13125) > 1e-4
+        or abs(store.load(10.6, 12.6)['arrays']['T2M'][0] - 10.625) > 1e-4 or near['elevation'] != 300.0
+        or near['arrays']['PRECTOTCORR_QC'][4] == OBSERVED or (near['arrays']['T2M_QC'] != OBSERVED).any()
+        or (near['arrays']['PRECTOTCORR'] <= -999).any()):
+    print("ERROR: each cell should take the nearest grid point, cleaned, with quality codes")
+    sys.exit(1)
+
+# Test 4: Saving overlapping ranges merges them
+print("\n[TEST 4] Fusion de periodes qui se chevauchent")
+print("-" * 70)
+
+lat, lon = 48.0, 2.0
+first = np.arange(np.datetime64('2024-01-01'), np.datetime64('2024-01-21'))
+second = np.arange(np.datetime64('2024-01-11'), np.datetime64('2024-02-01'))
+store.save(lat, lon, first, {'T2M': np.full(len(first), 1.0), 'RH2M': np.full(len(first), 60.0)}, elevation=120)
+store.save(lat, lon, [str(d).replace('-', '') for d in second[::-1]],
+           {'T2M': np.full(len(second), 2.0), 'T2M_QC': np.full(len(second), INTERPOLATED)})
+merged = store.load(lat, lon)
+t2m, rh = merged['arrays']['T2M'], merged['arrays']['RH2M']
+print(f"  {len(merged['dates'])} days {merged['dates'][0]} -> {merged['dates'][-1]}, "
+      f"T2M 1.0 x {int((t2m == 1).sum())} / 2.0 x {int((t2m == 2).sum())}, "
+      f"RH2M missing {int(np.isnan(rh).sum())}, elevation {merged['elevation']}")
+
+if (len(merged['dates']) != 31 or (np.diff(merged['dates']).astype(int) != 1).any()
+        or (t2m[:10] != 1).any() or (t2m[10:] != 2).any() or np.isnan(rh[:20]).any()
+        or not np.isnan(rh[20:]).all() or not np.isnan(merged['arrays']['T2M_QC'][:10]).all()
+        or merged['elevation'] != 120):
+    print("ERROR: newer values should replace overlapping days, other days and parameters kept")
+    sys.exit(1)
+
+window = store.load(lat, lon, '20240115', '20240117')
+if (len(window['dates']) != 3 or not store.has_range(lat, lon, '20240101', '20240131', ['T2M'])
+        or store.has_range(lat, lon, '20240101', '20240205', ['T2M'])):
+    print("ERROR: wrong date range lookups")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: POWER bulk fetch")
+print("=" * 70)
@@ -0,0 +1,130 @@
+"""
+Test grille du lieu le plus proche
+Recherche O(1) par cellule, mise a jour incrementale, fichiers memory-mapped
+"""
+
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches and settings must be in the environment before config.py is imported
+os.environ.update({
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-raster-'),
+    'WARMUP_ENABLED': 'false'
+})
+
+from config import Config
+from services.data_provider import DataProvider
+from services.nearest_raster import NearestRaster
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    dlat, dlon = math.radians(lat2 - lat1), math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 6371 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+print("=" * 70)
+print("TEST GRILLE DU LIEU LE PLUS PROCHE")
+print("=" * 70)
+
+rng = np.random.default_rng(11)
+points = [(f"p{i}", float(lat), float(lon))
+          for i, (lat, lon) in enumerate(zip(rng.uniform(-60, 70, 40), rng.uniform(-180, 180, 40)))]
+raster_dir = os.path.join(Config.CACHE_DIR, 'raster')
+
+# Test 1: Cell lookup agrees with a Haversine scan
+print("\n[TEST 1] Recherche par cellule = parcours Haversine")
+print("-" * 70)
+
+raster = NearestRaster(raster_dir, resolution=0.5)
+started = time.perf_counter()
+changes = raster.sync({'test': points[:30]})
+print(f"  Built {raster.rows}x{raster.cols} in {time.perf_counter() - started:.2f}s: {changes}")
+
+queries = np.column_stack((rng.uniform(-89, 89, 2000), rng.uniform(-180, 180, 2000)))
+mismatches, worst = 0, 0.0
+for lat, lon in queries:
+    point, _ = raster.lookup('test', lat, lon)
+    distances = [haversine(lat, lon, p_lat, p_lon) for _, p_lat, p_lon in points[:30]]
+    if point['id'] != points[int(np.argmin(distances))][0]:
+        mismatches += 1
+        worst = max(worst, haversine(lat, lon, point['lat'], point['lon']) - min(distances))
+print(f"  {len(queries) - mismatches}/{len(queries)} exact, worst extra distance {worst:.1f} km")
+
+if mismatches > 0:
+    print("ERROR: raster should give the nearest point")
+    sys.exit(1)
+
+# Test 2: Added points update only the cells they win; removals rebuild
+print("\n[TEST 2] Mise a jour incrementale")
+print("-" * 70)
+
+added = raster.sync({'test': points})
+index_added = np.array(raster._index)
+rebuilt = NearestRaster(os.path.join(Config.CACHE_DIR, 'raster-full'), resolution=0.5)
+rebuilt.sync({'test': points})
+removed = raster.sync({'test': points[5:]})
+print(f"  Add: {added}, remove: {removed}, "
+      f"incremental = full rebuild: {(index_added == np.array(rebuilt._index)).mean():.6f}")
+
+if added != {'test': 'added 10'} or removed != {'test': 'rebuilt'} \
+        or (index_added != np.array(rebuilt._index)).mean() > 1e-4:
+    print("ERROR: incremental update should match a full rebuild")
+    sys.exit(1)
+
+reopened = NearestRaster(raster_dir, resolution=0.5)
+if not isinstance(reopened._index, np.memmap) or not reopened.is_current('test', points[5:]) \
+        or reopened.lookup('test', 10.0, 10.0) != raster.lookup('test', 10.0, 10.0):
+    print("ERROR: raster should be memory-mapped from disk")
+    sys.exit(1)
+
+# Test 3: DataProvider resolves scenarios and popular regions through the raster
+print("\n[TEST 3] DataProvider: resolution en une lecture")
+print("-" * 70)
+
+provider = DataProvider()
+print(f"  Sync: {provider.sync_nearest_raster()}")
+
+start = time.perf_counter()
+for _ in range(1000):
+    closest = provider._find_closest_scenario(10.1, 13.9, 'summer_2024')
+elapsed = (time.perf_counter() - start) / 1000
+region = provider._find_closest_region(47.0, 3.0)
+scan = provider.historical_loader.find_closest_scenario(10.1, 13.9, 'summer_2024')
+print(f"  Scenario {closest['id']} at {closest['distance_km']} km ({elapsed * 1e6:.0f} us), region {region['name']}")
+
+game = provider.get_game_data(10.55, 14.25, season_id='summer_2024')
+if (closest['id'] != scan['id'] or closest['distance_km'] != scan['distance_km'] or region['name'] != 'Beauce, France'
+        or game['region_id'] != 'maroua_cameroun' or game['source'] != 'historical'):
+    print("ERROR: raster lookups should match the catalog search")
+    sys.exit(1)
+
+# Popular regions are close together: queries near cell borders still get the nearest
+regions = list(provider.static_regions.values())
+wrong = 0
+for lat, lon in np.column_stack((rng.uniform(-60, 70, 3000), rng.uniform(-180, 180, 3000))):
+    nearest = min(regions, key=lambda r: haversine(lat, lon, r['lat'], r['lon']))
+    wrong += provider._find_closest_region(lat, lon)['name'] != nearest['name']
+print(f"  Popular regions: {3000 - wrong}/3000 nearest")
+if wrong:
+    print("ERROR: raster regions should match the catalog search")
+    sys.exit(1)
+
+# Stale layer (scenario added since the last sync): back to the catalog search
+provider._raster_current = None
+provider.static_regions = dict(provider.static_regions, test={'name': 'Test', 'lat': 46.9, 'lon': 3.1})
+if provider._find_closest_region(47.0, 3.0)['name'] != 'Test':
+    print("ERROR: out-of-date raster layers should not be used")
+    sys.exit(1)
+print(f"  Stale layer skipped, sync: {provider.sync_nearest_raster()['popular_regions']}")
+
+print("\n" + "=" * 70)
+print("SUCCESS: Nearest-location raster")
+print("=" * 70)
@@ -0,0 +1,147 @@
+"""
+Test phenologie en temps thermique
+Stades par degres-jours, tables precalculees par saison, partagees avec les saisons en lot
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches must be in the environment before config.py is imported
+os.environ.update({
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-phenology-'),
+    'WARMUP_ENABLED': 'false'
+})
+
+from config import Config
+from models import BatchSeason, Crop, GameState, Region
+from services.historical_data_loader import HistoricalDataLoader
+
+print("=" * 70)
+print("TEST PHENOLOGIE EN TEMPS THERMIQUE")
+print("=" * 70)
+
+
+def fixed_stage(age, stage_weeks=(3, 4, 3, 2)):
+    """Former Crop.get_growth_stage: fixed weeks per stage"""
+    cumulative = 0
+    for i, weeks in enumerate(stage_weeks):
+        cumulative += weeks
+        if age < cumulative:
+            return i
+    return 3
+
+
+def stage_starts(crop, weeks=12):
+    """Age (weeks) at which each stage after germination starts, None if not reached"""
+    stages = []
+    for age in range(weeks + 1):
+        crop.age_weeks = age
+        stages.append(crop.get_growth_stage()[0])
+    return [stages.index(i) if i in stages else None for i in (1, 2, 3)]
+
+
+# Test 1: At the optimal temperature the former fixed stages are reproduced
+print("\n[TEST 1] Temperature optimale = stades fixes [3, 4, 3, 2]")
+print("-" * 70)
+
+errors = []
+for crop_type, params in Config.CROPS.items():
+    crop = Crop(crop_type, params)
+    for age in range(16):
+        crop.age_weeks = age
+        stage = fixed_stage(age)
+        former_need = params['nitrogen_need'] * params['nitrogen_curve'][stage] / [3, 4, 3, 2][stage]
+        errors += [crop.get_growth_stage()[0] != stage, abs(crop.get_nitrogen_requirement() - former_need)]
+print(f"  {len(Config.CROPS)} crops, ages 0-15, max difference {max(errors):.1e}")
+
+if max(errors) > 1e-9:
+    print("ERROR: nominal season should keep the former stages and N uptake")
+    sys.exit(1)
+
+# Test 2: Stage transitions follow accumulated GDD
+print("\n[TEST 2] Transitions par degres-jours")
+print("-" * 70)
+
+maize = Crop('maize', Config.CROPS['maize'])
+starts = {}
+for label, temperature in [('optimal 25°C', 25), ('hot 30°C', 30), ('heatwave 40°C', 40), ('cool 18°C', 18),
+                           ('cold 8°C', 8)]:
+    maize.set_temperatures([temperature] * 12)
+    starts[label] = stage_starts(maize)
+    maize.age_weeks = 12
+    print(f"  Maize {label:14s}: vegetative/flowering/maturation from week {starts[label]}, "
+          f"{maize.to_dict()['gdd']} GDD")
+
+if (starts['optimal 25°C'] != [3, 7, 10] or starts['hot 30°C'] != [3, 6, 8]
+        or starts['heatwave 40°C'] != starts['hot 30°C'] or starts['cool 18°C'] != [6, None, None]
+        or starts['cold 8°C'] != [None, None, None]):
+    print("ERROR: stages should follow thermal time (base 10°C, cutoff 30°C for maize)")
+    sys.exit(1)
+
+# Wheat develops at temperatures where maize stalls
+wheat = Crop('wheat', Config.CROPS['wheat'])
+wheat.set_temperatures([12] * 12)
+print(f"  Wheat cool 12°C: {stage_starts(wheat)}")
+if stage_starts(wheat)[0] is None:
+    print("ERROR: wheat (base 0°C) should develop at 12°C")
+    sys.exit(1)
+
+# Test 3: Batched tables = per-crop tables; stage lookups are precomputed
+print("\n[TEST 3] Tables en lot = tables par culture")
+print("-" * 70)
+
+rng = np.random.default_rng(3)
+temperature = rng.normal(24, 5, (500, 12))
+batch = BatchSeason('maize', Config.CROPS['maize'], Config.SOIL_TYPES['loam'])
+needs = batch.nitrogen_requirements(temperature)
+
+differences = []
+for row in (0, 123, 499):
+    game = GameState(Region('Test', 10.6, 14.3, 'Sahel'), 'maize', Config.CROPS['maize'], Config.SOIL_TYPES['loam'])
+    game.weather_data = [{'temperature': t} for t in temperature[row]]
+    for age in range(12):
+        game.crop.age_weeks = age
+        differences.append(abs(game.crop.get_nitrogen_requirement() - needs[row, age]))
+
+start = time.perf_counter()
+for _ in range(10000):
+    game.crop.get_growth_stage()
+    game.crop.get_nitrogen_requirement()
+elapsed = (time.perf_counter() - start) / 10000
+print(f"  {needs.shape} table, max difference {max(differences):.1e}, stage + N lookup {elapsed * 1e6:.1f} us")
+
+if max(differences) > 1e-12:
+    print("ERROR: BatchSeason and Crop should share the phenology tables")
+    sys.exit(1)
+
+# Test 4: Historical scenarios
+print("\n[TEST 4] Scenarios historiques")
+print("-" * 70)
+
+loader = HistoricalDataLoader()
+scenario_starts = {}
+for region_id, season_id, crop_type in [('maroua_cameroun', 'summer_2024', 'sorghum'),
+                                        ('beauce_france', 'spring_2024', 'wheat'),
+                                        ('montreal_canada', 'spring_2024', 'maize')]:
+    temperatures = [week['temperature_avg']
+                    for week in loader.load_historical_data(region_id, season_id)['weather']['weeks']]
+    crop = Crop(crop_type, Config.CROPS[crop_type])
+    crop.set_temperatures(temperatures)
+    scenario_starts[region_id] = stage_starts(crop, len(temperatures))
+    print(f"  {region_id:16s} {crop_type:8s} {min(temperatures):5.1f}-{max(temperatures):4.1f}°C -> "
+          f"stages from week {scenario_starts[region_id]}")
+
+# Warm Sahel season reaches maturity, a cold spring holds maize at germination
+if scenario_starts['maroua_cameroun'][2] is None or scenario_starts['montreal_canada'][0] is not None:
+    print("ERROR: scenario stages should follow their temperatures")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: GDD phenology")
+print("=" * 70)
@@ -0,0 +1,123 @@
+"""
+Test nettoyage des donnees NASA POWER
+Valeurs -999, trous courts interpoles, climatologie, completude hebdomadaire
+"""
+
+import os
+import socket
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+# Endpoints and caches must be in the environment before config.py is imported
+power_port = free_port()
+os.environ.update({
+    'NASA_POWER_API_URL': f"http://127.0.0.1:{power_port}/api/temporal/daily/point",
+    'NASA_POWER_REGIONAL_API_URL': f"http://127.0.0.1:{power_port}/api/temporal/daily/regional",
+    'WARMUP_ENABLED': 'false',
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-cleaning-')
+})
+
+from config import Config
+from services.nasa_power_api import NASAPowerAPI
+from services.nasa_power_bulk import NASAPowerBulkFetcher
+from services.power_cleaning import CLIMATOLOGY, INTERPOLATED, MISSING, OBSERVED, clean_series
+from services.weather_store import WeatherStore
+from standin_servers import start_standin_servers
+
+print("=" * 70)
+print("TEST NETTOYAGE NASA POWER")
+print("=" * 70)
+
+# Test 1: Short gaps interpolated, long gaps from climatology, rain never interpolated
+print("\n[TEST 1] Trous courts / longs")
+print("-" * 70)
+
+day_of_year = np.tile(np.arange(1, 366), 3)
+temperature = 20 + 8 * np.sin(2 * np.pi * day_of_year / 365)
+raw = temperature.copy()
+raw[100:102] = -999.0  # 2 days: interpolated
+raw[400:420] = -999.0  # 20 days: climatology of the other years
+raw[0] = -999.0  # start of the record: no left neighbour
+
+values, quality = clean_series(raw, day_of_year)
+print(f"  Quality counts: {np.bincount(quality, minlength=4).tolist()} (observed, interpolated, climatology, missing)")
+print(f"  Max error: short gap {np.abs(values[100:102] - temperature[100:102]).max():.3f}, "
+      f"long gap {np.abs(values[400:420] - temperature[400:420]).max():.3f}")
+
+if ((quality[100:102] != INTERPOLATED).any() or (quality[400:420] != CLIMATOLOGY).any()
+        or quality[0] != CLIMATOLOGY or np.abs(values - temperature).max() > 0.5):
+    print("ERROR: wrong gap filling")
+    sys.exit(1)
+
+rain = np.where(day_of_year % 3 == 0, 6.0, 0.0)
+rain[[10, 11]] = -999.0
+rain_values, rain_quality = clean_series(rain, day_of_year, interpolate=False)
+empty_values, empty_quality = clean_series(np.full(10, -999.0), np.arange(1, 11))
+
+if (rain_quality[[10, 11]] != CLIMATOLOGY).any() or not np.isnan(empty_values).all() \
+        or (empty_quality != MISSING).any():
+    print("ERROR: rain should use climatology, all-missing series should stay missing")
+    sys.exit(1)
+print(f"  Rain gap filled with climatology: {rain_values[[10, 11]].round(2).tolist()} mm")
+
+# Test 2: Service on POWER responses with 15% fill values
+print("\n[TEST 2] get_weather_data avec 15% de -999")
+print("-" * 70)
+
+servers = start_standin_servers(power_port=power_port, nominatim_port=0, appeears_port=0, fill_rate=0.15)
+
+api = NASAPowerAPI()
+daily = api.get_weather_data(10.6, 14.3, days=90)
+values = [day[key] for day in daily for key in NASAPowerAPI.DAILY_FIELDS]
+observed = sum(day['observed'] for day in daily)
+print(f"  {len(daily)} days, {observed} fully observed, "
+      f"none missing: {all(v is not None for v in values)}, no fill value: {min(values) > -999}")
+
+if not daily or not all(v is not None and v > -999 for v in values) or not 0 < observed < len(daily):
+    print("ERROR: daily data should be cleaned and flagged")
+    sys.exit(1)
+
+weekly = api.get_weekly_aggregates_from_daily(daily, 12)
+print(f"  Weekly completeness: {[week['completeness'] for week in weekly]}")
+
+expected = [round(sum(day['observed'] for day in daily[i * 7:(i + 1) * 7]) / 7, 2) for i in range(12)]
+if [week['completeness'] for week in weekly] != expected or any(week['complete'] for week in weekly
+                                                                 if week['completeness'] < 1):
+    print("ERROR: wrong weekly completeness flags")
+    sys.exit(1)
+
+# Test 3: Bulk fetcher stores cleaned arrays with their quality codes
+print("\n[TEST 3] Fetch en masse: tableaux nettoyes + codes qualite")
+print("-" * 70)
+
+store = WeatherStore(os.path.join(Config.CACHE_DIR, 'bulk'))
+fetcher = NASAPowerBulkFetcher(store, ['T2M', 'PRECTOTCORR'],
+                               point_url=Config.NASA_POWER_API_URL,
+                               regional_url=Config.NASA_POWER_REGIONAL_API_URL,
+                               point_max_params=20, request_interval=0)
+fetcher.fetch([(10.6, 14.3)], '20240101', '20240331')
+cell = store.load(10.6, 14.3)
+codes = cell['arrays']['T2M_QC'].astype(int)
+print(f"  Stored: {sorted(cell['arrays'])}, T2M quality counts {np.bincount(codes, minlength=4).tolist()}")
+
+if (cell['arrays']['T2M'] <= -999).any() or not (codes == OBSERVED).any() or (codes == OBSERVED).all():
+    print("ERROR: bulk fetcher should store cleaned arrays and quality codes")
+    sys.exit(1)
+
+for server in servers.values():
+    server.shutdown()
+
+print("\n" + "=" * 70)
+print("SUCCESS: POWER cleaning")
+print("=" * 70)
@@ -0,0 +1,110 @@
+"""
+Test assimilation SMAP dans le modele de sol
+Granules SPL3SMP generes localement pour la periode d'un scenario
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches and settings must be in the environment before config.py is imported
+cache_dir = tempfile.mkdtemp(prefix='terragrow-smap-')
+os.environ.update({
+    'TERRAGROW_CACHE_DIR': cache_dir,
+    'SMAP_NUDGE_WEIGHT': '0.5',
+    'WARMUP_ENABLED': 'false'
+})
+
+from config import Config
+from services.smap_l3 import EASEGrid2, h5py
+
+print("=" * 70)
+print("TEST ASSIMILATION SMAP")
+print("=" * 70)
+
+if h5py is None:
+    print("\nSKIPPED: h5py not installed (pip install h5py)")
+    sys.exit(0)
+
+from app import app, data_provider, game_sessions
+
+scenario = next(s for s in data_provider.historical_loader.get_available_scenarios()
+                if s['region_id'] == 'yaounde_cameroun' and s['season_id'] == 'spring_2024')
+row, col = EASEGrid2().locate([scenario['lat']], [scenario['lon']])
+
+# Wet start drying out: 0.32 m3/m3 in week 1, -0.02 per week
+os.makedirs(Config.SMAP_DATA_DIR, exist_ok=True)
+start = datetime.strptime(scenario['period']['start_date'], '%Y-%m-%d')
+expected = []
+for week in range(scenario['period']['total_weeks']):
+    value = 0.32 - 0.02 * week
+    expected.append(value)
+    for day in (1, 4):  # Two overpasses a week
+        date = start + timedelta(days=week * 7 + day)
+        grid = np.full((406, 964), -9999.0, dtype=np.float32)
+        grid[row[0], col[0]] = value
+        with h5py.File(os.path.join(Config.SMAP_DATA_DIR, f"SMAP_L3_SM_P_{date.strftime('%Y%m%d')}_R19240_001.h5"), 'w') as f:
+            f.create_dataset('Soil_Moisture_Retrieval_Data_AM/soil_moisture', data=grid)
+
+# Test 1: Lookup built with the catalog
+print("\n[TEST 1] Table SMAP precalculee au chargement du catalogue")
+print("-" * 70)
+
+data_provider.historical_loader.refresh_catalog()
+scenarios = data_provider.historical_loader.get_available_scenarios()
+weekly = data_provider.historical_loader.get_smap_weekly('yaounde_cameroun', 'spring_2024')
+with_smap = [s['id'] for s in scenarios if s['has_smap']]
+print(f"  Scenarios with SMAP: {with_smap}")
+print(f"  Weekly SMAP: {weekly}")
+
+if weekly is None or any(abs(w - e) > 1e-3 for w, e in zip(weekly, expected)):
+    print("ERROR: wrong weekly SMAP lookup")
+    sys.exit(1)
+
+# Granules are no longer needed once the catalog is built
+shutil.rmtree(Config.SMAP_DATA_DIR)
+
+# Test 2: Initial state and weekly nudging
+print("\n[TEST 2] Etat initial + rappel hebdomadaire")
+print("-" * 70)
+
+client = app.test_client()
+response = client.post('/api/init', json={
+    'lat': scenario['lat'], 'lon': scenario['lon'], 'crop_type': 'maize',
+    'region_id': 'yaounde_cameroun', 'season_id': 'spring_2024'
+})
+data = response.get_json()
+game_state = game_sessions[data['session_id']]
+soil = game_state.soil
+
+initial = data['state']['soil']['moisture']
+target = soil.moisture_from_volumetric(expected[0])
+print(f"  Initial moisture: {initial}% (SMAP {expected[0]} m3/m3 -> {target:.1f}%, default 50%)")
+
+if abs(initial - target) > 0.1:
+    print("ERROR: soil not initialized from SMAP")
+    sys.exit(1)
+
+errors = []
+for week in range(4):
+    before = soil.moisture
+    weather = game_state.weather_data[week]
+    client.post('/api/action', json={'session_id': data['session_id'], 'irrigation': 0, 'fertilizer': 0})
+    free_run = max(soil.wilting_point, min(before + weather['precipitation'] - weather['evapotranspiration'], 100))
+    observed = soil.moisture_from_volumetric(expected[week])
+    errors.append((abs(free_run - observed), abs(soil.moisture - observed)))
+    print(f"  Week {week + 1}: moisture {soil.moisture:5.1f}% (observed {observed:5.1f}%)")
+
+if not all(nudged <= free + 1e-6 for free, nudged in errors):
+    print("ERROR: nudging should move moisture toward the observations")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: SMAP soil moisture assimilated")
+print("=" * 70)
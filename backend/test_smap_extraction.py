@@ -0,0 +1,119 @@
+"""
+Test extraction SMAP L3 (granule SPL3SMP genere localement)
+Grille EASE-Grid 2.0 36 km, lectures par tuiles, cache par (jour, cellule)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches must be in the environment before config.py is imported
+cache_dir = tempfile.mkdtemp(prefix='terragrow-smap-')
+os.environ['TERRAGROW_CACHE_DIR'] = cache_dir
+
+from config import Config
+from services.smap_l3 import EASEGrid2, SMAPL3Extractor, h5py
+from services.smap_api import SMAPAPI
+
+print("=" * 70)
+print("TEST EXTRACTION SMAP L3")
+print("=" * 70)
+
+if h5py is None:
+    print("\nSKIPPED: h5py not installed (pip install h5py)")
+    sys.exit(0)
+
+grid = EASEGrid2()
+
+# Synthetic granule: value encodes the cell, some cells without retrieval
+rows, cols = np.meshgrid(np.arange(grid.rows), np.arange(grid.cols), indexing='ij')
+am = (0.05 + rows * 0.0005 + cols * 0.0001).astype(np.float32)
+pm = am + np.float32(0.01)
+am[189, 512] = -9999.0                  # Yaounde: AM missing, PM available
+am[100, 100] = pm[100, 100] = -9999.0   # No retrieval at all
+
+os.makedirs(Config.SMAP_DATA_DIR, exist_ok=True)
+granule_path = os.path.join(Config.SMAP_DATA_DIR, 'SMAP_L3_SM_P_20240615_R19240_001.h5')
+with h5py.File(granule_path, 'w') as f:
+    f.create_dataset('Soil_Moisture_Retrieval_Data_AM/soil_moisture', data=am, chunks=(58, 241))
+    f.create_dataset('Soil_Moisture_Retrieval_Data_PM/soil_moisture_pm', data=pm, chunks=(58, 241))
+
+extractor = SMAPL3Extractor(Config.SMAP_DATA_DIR)
+
+# Test 1: Grid lookup
+print("\n[TEST 1] Grille EASE-Grid 2.0 M36")
+print("-" * 70)
+
+print(f"  Latitude range: +/-{grid.lat_edges[0]:.4f} (expected 85.0446)")
+row, col = grid.locate([grid.lat_centers[150]], [grid.lon_centers[700]])
+print(f"  Cell center (150, 700) -> ({row[0]}, {col[0]})")
+
+if abs(grid.lat_edges[0] - 85.0446) > 1e-3 or (row[0], col[0]) != (150, 700):
+    print("ERROR: wrong EASE-Grid lookup")
+    sys.exit(1)
+
+# Test 2: Values, PM fallback, neighbour fill
+print("\n[TEST 2] Valeurs (AM, repli PM, voisins)")
+print("-" * 70)
+
+points = [
+    (grid.lat_centers[150], grid.lon_centers[700]),
+    (3.87, 11.52),
+    (grid.lat_centers[100], grid.lon_centers[100])
+]
+values = extractor.extract(granule_path, points)
+expected = [
+    float(am[150, 700]),
+    float(pm[189, 512]),
+    float(np.mean([am[r, c] for r in (99, 100, 101) for c in (99, 100, 101) if (r, c) != (100, 100)]))
+]
+for point, value, target in zip(points, values, expected):
+    print(f"  ({point[0]:7.2f}, {point[1]:7.2f}) -> {value} (expected {target:.4f})")
+
+if any(abs(v - t) > 1e-3 for v, t in zip(values, expected)):
+    print("ERROR: wrong soil moisture values")
+    sys.exit(1)
+
+# Test 3: Many points, one open granule, then served from the cache
+print("\n[TEST 3] 2000 points, puis cache (jour, cellule)")
+print("-" * 70)
+
+rng = np.random.default_rng(1)
+many = list(zip(rng.uniform(-60, 60, 2000), rng.uniform(-180, 180, 2000)))
+
+start = time.perf_counter()
+values = extractor.extract(granule_path, many)
+first = time.perf_counter() - start
+
+os.rename(granule_path, granule_path + '.moved')
+start = time.perf_counter()
+cached = extractor.extract(granule_path, many, day='20240615')
+second = time.perf_counter() - start
+os.rename(granule_path + '.moved', granule_path)
+
+print(f"  First pass: {first * 1000:.1f} ms, cached: {second * 1000:.1f} ms")
+
+if cached != values or any(v is None for v in values):
+    print("ERROR: cache should answer without the granule")
+    sys.exit(1)
+
+# Test 4: SMAPAPI uses local granules instead of the latitude-band guess
+print("\n[TEST 4] SMAPAPI.get_soil_moisture")
+print("-" * 70)
+
+result = SMAPAPI().get_soil_moisture(3.87, 11.52, datetime(2024, 6, 15))
+print(f"  {result}")
+
+if result['source'] != 'SMAP L3' or abs(result['soil_moisture'] - round(float(pm[189, 512]) * 100, 1)) > 0.05:
+    print("ERROR: SMAP granule not used")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: SMAP L3 extraction")
+print("=" * 70)
@@ -0,0 +1,112 @@
+"""
+Test grille de sols
+Texture USDA -> type de sol du jeu, retention Saxton & Rawls, grille uint8 memory-mapped
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches and the grid must be in the environment before config.py is imported
+cache_dir = tempfile.mkdtemp(prefix='terragrow-soil-')
+os.environ.update({
+    'TERRAGROW_CACHE_DIR': cache_dir,
+    'SOIL_GRID_FILE': os.path.join(cache_dir, 'soil_grid.npy'),
+    'KOPPEN_RASTER_FILE': os.path.join(cache_dir, 'koppen.npy'),
+    'WARMUP_ENABLED': 'false'
+})
+
+from config import Config
+from models import Soil
+from services.data_provider import DataProvider
+from services.soil_grid import SOIL_CLASSES, SoilGrid, texture_class, water_retention
+
+print("=" * 70)
+print("TEST GRILLE DE SOLS")
+print("=" * 70)
+
+# Test 1: USDA textures collapse onto the three game soils
+print("\n[TEST 1] Textures USDA -> sols du jeu")
+print("-" * 70)
+
+textures = {
+    'sand': (92, 3, 'sandy'), 'loamy sand': (80, 8, 'sandy'), 'sandy loam': (65, 12, 'sandy'),
+    'loam': (40, 20, 'loam'), 'silt loam': (20, 15, 'loam'), 'clay loam': (32, 34, 'loam'),
+    'sandy clay': (50, 40, 'clay'), 'silty clay': (8, 45, 'clay'), 'clay': (20, 60, 'clay')
+}
+for name, (sand, clay, expected) in textures.items():
+    soil = SOIL_CLASSES[int(texture_class([sand], [clay])[0])]
+    fc, wp = (float(value[0]) for value in water_retention([sand], [clay]))
+    print(f"  {name:11s} {sand:3d}% sand {clay:3d}% clay -> {soil:6s} FC {fc:.3f} WP {wp:.3f} m3/m3")
+    if soil != expected:
+        print(f"ERROR: {name} should be {expected}")
+        sys.exit(1)
+
+# Pedotransfer retention sits near the game's per-type SMAP calibration
+for soil, (sand, clay) in {'sandy': (85, 5), 'loam': (40, 20), 'clay': (20, 50)}.items():
+    fc, wp = (float(value[0]) for value in water_retention([sand], [clay]))
+    params = Config.SOIL_TYPES[soil]
+    if abs(fc - params['vwc_field_capacity']) > 0.08 or abs(wp - params['vwc_wilting_point']) > 0.08:
+        print(f"ERROR: {soil} retention ({fc:.3f}, {wp:.3f}) far from Config.SOIL_TYPES")
+        sys.exit(1)
+
+# Test 2: Downsampled uint8 grid, memory-mapped, one cell per lookup
+print("\n[TEST 2] Grille uint8 sous-echantillonnee")
+print("-" * 70)
+
+grid_file = SoilGrid(Config.SOIL_GRID_FILE)
+if grid_file.lookup(10.6, 14.3) is not None:
+    print("ERROR: without a grid file lookups should return None")
+    sys.exit(1)
+
+rng = np.random.default_rng(5)
+# Maroua vertisols, Sahel sands near Kano, Iowa loams: 25 points per 0.5° cell averaged
+centres = [(10.75, 14.25, 20, 55), (12.25, 8.75, 88, 4), (41.75, -93.25, 30, 25)]
+lats, lons, sand, clay = (np.concatenate(column) for column in zip(*[
+    (lat + rng.uniform(-0.24, 0.24, 25), lon + rng.uniform(-0.24, 0.24, 25),
+     np.clip(s + rng.normal(0, 3, 25), 0, 100), np.clip(c + rng.normal(0, 3, 25), 0, 100))
+    for lat, lon, s, c in centres]))
+grid = SoilGrid.from_points(lats, lons, sand, clay, resolution=0.5)
+grid_file.save(grid)
+
+lookups = [grid_file.lookup(lat, lon) for lat, lon in [(10.6, 14.3), (12.0, 8.52), (41.88, -93.1), (-30.0, -140.0)]]
+print(f"  {[cell['soil_type'] if cell else None for cell in lookups]}")
+print(f"  Maroua FC {lookups[0]['vwc_field_capacity']:.3f} WP {lookups[0]['vwc_wilting_point']:.3f}")
+print(f"  {grid.shape} {grid.dtype}, {grid.nbytes / 1e6:.2f} MB, "
+      f"memory-mapped {isinstance(grid_file._grid, np.memmap)}")
+
+if ([cell['soil_type'] if cell else None for cell in lookups] != ['clay', 'sandy', 'loam', None]
+        or grid.dtype != np.uint8 or not isinstance(grid_file._grid, np.memmap)
+        or not lookups[0]['vwc_field_capacity'] > lookups[2]['vwc_field_capacity'] > lookups[1]['vwc_field_capacity']):
+    print("ERROR: wrong grid lookups")
+    sys.exit(1)
+
+# Test 3: DataProvider uses the grid, the climate estimate without a cell
+print("\n[TEST 3] DataProvider")
+print("-" * 70)
+
+provider = DataProvider()
+maroua = provider.get_game_data(10.6, 14.3, season_id='summer_2024')
+ocean = provider._estimate_soil(-30.0, -140.0, climate='Aride chaud')
+known = provider._estimate_soil(10.6, 14.3, soil_type='loam')
+print(f"  Maroua {maroua['soil_type']} {maroua['soil_properties']}")
+print(f"  Pacific {ocean}, region file {known}")
+
+if (maroua['soil_type'] != 'clay' or maroua['soil_properties'] is None
+        or ocean != {'soil_type': 'sandy', 'soil_properties': None} or known != {'soil_type': 'loam', 'soil_properties': None}):
+    print("ERROR: soil should come from the grid, else the region file or the climate")
+    sys.exit(1)
+
+# Grid retention replaces the per-type SMAP calibration
+soil = Soil('clay', dict(Config.SOIL_TYPES['clay'], **maroua['soil_properties']))
+if soil.vwc_field_capacity != maroua['soil_properties']['vwc_field_capacity'] or soil.drainage_rate != 0.35:
+    print("ERROR: grid water retention should override the soil type defaults only")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: Soil grid")
+print("=" * 70)
@@ -0,0 +1,140 @@
+"""
+Test optimiseur de date de semis
+Saisons en lot identiques a GameState, meilleures fenetres sur plusieurs annees
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches and settings must be in the environment before config.py is imported
+os.environ.update({
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-sowing-'),
+    'WARMUP_ENABLED': 'false'
+})
+
+from config import Config
+from models import BatchSeason, GameState, Region
+from services.sowing_optimizer import SowingOptimizer
+from services.weather_store import WeatherStore
+
+print("=" * 70)
+print("TEST OPTIMISEUR DE DATE DE SEMIS")
+print("=" * 70)
+
+# Test 1: Batch seasons reproduce GameState week by week
+print("\n[TEST 1] Saisons en lot = GameState")
+print("-" * 70)
+
+rng = np.random.default_rng(7)
+rain = rng.gamma(0.7, 20, (200, 12)) * (rng.random((200, 12)) < 0.6)
+temperature = rng.normal(27, 4, (200, 12))
+et = rng.uniform(20, 45, (200, 12))
+
+crop_type, soil_type = 'maize', 'loam'
+for plan_name, plan in Config.SOWING_PLANS.items():
+    batch = BatchSeason(crop_type, Config.CROPS[crop_type], Config.SOIL_TYPES[soil_type],
+                        initial_budget=Config.INITIAL_BUDGET,
+                        irrigation_cost=Config.IRRIGATION_COST_PER_MM,
+                        fertilizer_cost=Config.FERTILIZER_COST_PER_KG).run(rain, temperature, et, plan)
+
+    errors = []
+    for row in (0, 57, 199):
+        random.seed(row)  # events only change messages
+        game = GameState(Region('Test', 10.6, 14.3, 'Sahel', soil_type), crop_type,
+                         Config.CROPS[crop_type], Config.SOIL_TYPES[soil_type], Config.INITIAL_BUDGET)
+        game.weather_data = [{
+            'precipitation': rain[row, week],
+            'temperature': temperature[row, week],
+            'evapotranspiration': et[row, week]
+        } for week in range(12)]
+        for week in range(12):
+            game.simulate_week(batch['irrigation'][row, week], batch['fertilizer'][row, week],
+                               game.weather_data[week])
+            errors += [abs(game.crop.ndvi - batch['ndvi'][row, week]),
+                       abs(game.soil.moisture - batch['moisture'][row, week])]
+        errors.append(abs(game.crop.get_yield() - batch['yield'][row]))
+
+    print(f"  {plan_name}: yields {batch['yield'].min():.2f}-{batch['yield'].max():.2f} t/ha, "
+          f"max difference vs. GameState {max(errors):.2e}")
+    if max(errors) > 1e-9:
+        print("ERROR: batch simulation differs from GameState")
+        sys.exit(1)
+
+# Test 2: Every sowing day of 8 years, rainy season June-September
+print("\n[TEST 2] Toutes les dates de semis sur 8 ans")
+print("-" * 70)
+
+lat, lon = 10.6, 14.3
+days = np.arange(np.datetime64('2015-01-01'), np.datetime64('2023-01-01'))
+day_of_year = (days - days.astype('datetime64[Y]')).astype(int)
+wet_season = (day_of_year >= 152) & (day_of_year < 273)
+t_mean = 29 + 4 * np.cos(2 * np.pi * (day_of_year - 120) / 365) + rng.normal(0, 1.5, len(days))
+arrays = {
+    'T2M': t_mean,
+    'T2M_MAX': t_mean + 6,
+    'T2M_MIN': t_mean - 6,
+    'PRECTOTCORR': np.where(wet_season, rng.gamma(0.8, 12, len(days)) * (rng.random(len(days)) < 0.55), 0.0),
+    'RH2M': np.where(wet_season, 75.0, 30.0),
+    'WS2M': np.full(len(days), 2.0),
+    'ALLSKY_SFC_SW_DWN': np.where(wet_season, 18.0, 23.0)
+}
+arrays['PRECTOTCORR'][500:503] = -999.0  # POWER fill values
+WeatherStore(Config.WEATHER_STORE_DIR).save(lat, lon, days, arrays, elevation=400)
+
+optimizer = SowingOptimizer(WeatherStore(Config.WEATHER_STORE_DIR))
+start = time.perf_counter()
+result = optimizer.scan(lat, lon, crop_type, soil_type, 'rainfed', top=3)
+elapsed = time.perf_counter() - start
+
+print(f"  {result['seasons_simulated']} seasons ({result['years']}) in {elapsed * 1000:.0f} ms")
+for window in result['windows']:
+    print(f"  {window['start']} -> {window['end']}: {window['expected_yield']} t/ha "
+          f"(std {window['yield_std']}, p10 {window['yield_p10']}, {window['seasons']} seasons)")
+
+best = result['windows'][0]
+dry_season = result['curve']['expected_yield'][0]  # sown 1 January
+print(f"  Sown 1 January: {dry_season} t/ha")
+
+if (not '06-01' <= best['start'] <= '09-01' or best['expected_yield'] < dry_season + 2
+        or len(result['windows']) != 3 or len(result['curve']['expected_yield']) != 365):
+    print("ERROR: best rainfed window should fall in the rainy season")
+    sys.exit(1)
+
+if elapsed > 2 or result['seasons_simulated'] < 7 * 365 - 84 - 20:
+    print("ERROR: scan should be batched over all seasons")
+    sys.exit(1)
+
+if result['timestep'] != 'weekly':
+    print("ERROR: the optimizer plays weekly steps and should say so")
+    sys.exit(1)
+
+# Test 3: /api/sowing-dates
+print("\n[TEST 3] /api/sowing-dates")
+print("-" * 70)
+
+from app import app
+
+client = app.test_client()
+response = client.get(f'/api/sowing-dates?lat={lat}&lon={lon}&crop_type={crop_type}&plan=irrigated&top=2')
+irrigated = response.get_json()
+print(f"  Irrigated best window: {irrigated['windows'][0]}")
+
+invalid = [client.get(f'/api/sowing-dates?lat={lat}&lon={lon}&{query}').status_code
+           for query in ('crop_type=banana', 'crop_type=maize&plan=flood', 'crop_type=maize&soil_type=peat')]
+print(f"  Invalid requests: HTTP {invalid}")
+
+if (response.status_code != 200 or len(irrigated['windows']) != 2
+        or irrigated['windows'][0]['expected_yield'] < best['expected_yield'] or invalid != [400, 400, 400]):
+    print("ERROR: /api/sowing-dates should rank irrigated windows")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: Sowing-date optimizer")
+print("=" * 70)
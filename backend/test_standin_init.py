@@ -0,0 +1,171 @@
+"""
+Test + benchmark du chemin /api/init hors ligne
+Demarre les stand-ins NASA POWER / Nominatim / AppEEARS en local,
+pointe le backend dessus et mesure l'initialisation des lieux personnalises
+"""
+
+import http.client
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+# Endpoints and caches must be in the environment before config.py is imported
+ports = {'power_port': free_port(), 'nominatim_port': free_port(), 'appeears_port': free_port()}
+os.environ.update({
+    'NASA_POWER_API_URL': f"http://127.0.0.1:{ports['power_port']}/api/temporal/daily/point",
+    'NASA_POWER_REGIONAL_API_URL': f"http://127.0.0.1:{ports['power_port']}/api/temporal/daily/regional",
+    'NOMINATIM_BASE_URL': f"http://127.0.0.1:{ports['nominatim_port']}",
+    'APPEEARS_API_URL': f"http://127.0.0.1:{ports['appeears_port']}/api",
+    'NOMINATIM_RATE': '50',  # The stand-in has no usage policy
+    'WARMUP_ENABLED': 'false',
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-cache-')
+})
+
+from standin_servers import StandinBehaviour, StandinHandler, start_standin_servers
+
+print("=" * 70)
+print("TEST INIT HORS LIGNE (STAND-INS)")
+print("=" * 70)
+
+servers = start_standin_servers(
+    **ports,
+    behaviours={
+        'power': StandinBehaviour(latency=0.05, seed=1),
+        'nominatim': StandinBehaviour(latency=0.2, seed=2),
+        'appeears': StandinBehaviour(seed=3)
+    },
+    processing_time=1.0
+)
+
+from app import app, data_provider, game_sessions
+from services.appeears_api import AppEEARSAPI
+
+client = app.test_client()
+
+# Test 1: Custom locations (no scenario within 50 km)
+print("\n[TEST 1] Init lieux personnalises")
+print("-" * 70)
+
+locations = [(-10.0, 20.0), (15.5, -5.2), (35.1, 105.3), (-30.2, 25.7), (55.0, 40.0)]
+timings = []
+
+for lat, lon in locations:
+    start = time.perf_counter()
+    response = client.post('/api/init', json={'lat': lat, 'lon': lon, 'crop_type': 'maize'})
+    timings.append(time.perf_counter() - start)
+    data = response.get_json()
+
+    if response.status_code != 200 or len(data['weather_preview']) != 4:
+        print(f"ERROR: init failed for ({lat}, {lon}): {data}")
+        sys.exit(1)
+
+    session = game_sessions[data['session_id']]
+    if len(session.weather_data) != 12:
+        print(f"ERROR: expected 12 weeks of weather, got {len(session.weather_data)}")
+        sys.exit(1)
+
+    print(f"  ({lat:6.1f}, {lon:6.1f}) {timings[-1] * 1000:7.1f} ms  "
+          f"T={session.weather_data[0]['temperature']}C  name_pending={data['name_pending']}")
+
+timings.sort()
+print(f"\n  Median: {timings[len(timings) // 2] * 1000:.1f} ms, max: {timings[-1] * 1000:.1f} ms")
+
+# A failing weather fetch falls back like a missed deadline
+def failing_fetch(*args, **kwargs):
+    raise ValueError("unexpected POWER payload")
+
+
+fetch, data_provider.nasa_api.get_weekly_aggregates = data_provider.nasa_api.get_weekly_aggregates, failing_fetch
+response = client.post('/api/init', json={'lat': -20.5, 'lon': 30.5, 'crop_type': 'maize'})
+data_provider.nasa_api.get_weekly_aggregates = fetch
+print(f"  Failing POWER fetch: HTTP {response.status_code}, "
+      f"{len(game_sessions['-20.5_30.5_maize'].weather_data) if response.status_code == 200 else 0} fallback weeks")
+
+if response.status_code != 200 or len(game_sessions['-20.5_30.5_maize'].weather_data) != 12:
+    print("ERROR: a weather fetch error should fall back to typical weather")
+    sys.exit(1)
+
+# Test 2: Name backfilled once geocoding is done
+print("\n[TEST 2] Nom de region complete apres geocodage")
+print("-" * 70)
+
+time.sleep(1.5)
+names = [game_sessions[f"{lat}_{lon}_maize"].region.name for lat, lon in locations]
+for name in names:
+    print(f"  {name}")
+
+if any(name.startswith('Location (') for name in names):
+    print("ERROR: region names were not backfilled")
+    sys.exit(1)
+
+# Test 3: AppEEARS task lifecycle
+print("\n[TEST 3] AppEEARS task (login -> task -> bundle)")
+print("-" * 70)
+
+appeears = AppEEARSAPI()
+if not appeears.login('standin', 'standin'):
+    print("ERROR: login failed")
+    sys.exit(1)
+
+task_id = appeears.submit_point_task(
+    'terragrow_standin', 3.87, 11.52, '01-01-2024', '12-31-2024',
+    [{'product': 'MOD13Q1.061', 'layer': '_250m_16_days_NDVI'}]
+)
+status = None
+deadline = time.time() + 10
+while time.time() < deadline:
+    status = appeears.get_task_status(task_id)
+    if status and status.get('status') == 'done':
+        break
+    time.sleep(0.2)
+
+print(f"  Task {task_id}: {status.get('status') if status else None}")
+if not status or status.get('status') != 'done':
+    print("ERROR: task did not complete")
+    sys.exit(1)
+
+# Test 4: Error replies keep the connection usable (POST body consumed)
+print("\n[TEST 4] Reponses d'erreur et connexion keep-alive")
+print("-" * 70)
+
+failing = ThreadingHTTPServer(('127.0.0.1', 0), type('Failing', (StandinHandler,), {
+    'behaviour': StandinBehaviour(error_rate=1.0)
+}))
+threading.Thread(target=failing.serve_forever, daemon=True).start()
+connection = http.client.HTTPConnection('127.0.0.1', failing.server_address[1], timeout=5)
+statuses = []
+for _ in range(3):
+    connection.request('POST', '/api/task', body=json.dumps({'task_name': 'x' * 500}),
+                       headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    response.read()
+    statuses.append(response.status)
+print(f"  3 POST on one connection -> {statuses}")
+connection.close()
+failing.shutdown()
+
+if statuses != [500] * 3:
+    print("ERROR: error replies should leave the keep-alive connection usable")
+    sys.exit(1)
+
+for name, server in servers.items():
+    print(f"  {name:10s} {server.RequestHandlerClass.behaviour.stats}")
+    server.shutdown()
+
+print("\n" + "=" * 70)
+print("SUCCESS: init path runs fully offline")
+print("=" * 70)
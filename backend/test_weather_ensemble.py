@@ -0,0 +1,106 @@
+"""
+Test ensembles meteo par bootstrap par blocs
+Variantes des scenarios historiques, variante k en O(1)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Caches and settings must be in the environment before config.py is imported
+os.environ.update({
+    'TERRAGROW_CACHE_DIR': tempfile.mkdtemp(prefix='terragrow-ensemble-'),
+    'WARMUP_ENABLED': 'false'
+})
+
+from config import Config
+from services.historical_data_loader import HistoricalDataLoader
+
+print("=" * 70)
+print("TEST ENSEMBLES METEO (BOOTSTRAP PAR BLOCS)")
+print("=" * 70)
+
+loader = HistoricalDataLoader()
+region_id, season_id = 'maroua_cameroun', 'spring_2024'
+
+# Test 1: Ensemble structure
+print("\n[TEST 1] Blocs de semaines consecutives pres de leur position")
+print("-" * 70)
+
+start = time.perf_counter()
+ensemble = loader.get_ensemble(region_id, season_id)
+elapsed = time.perf_counter() - start
+n_variants, n_weeks = ensemble.shape
+print(f"  {n_variants} variants x {n_weeks} weeks built in {elapsed * 1000:.1f} ms")
+
+block = Config.ENSEMBLE_BLOCK_WEEKS
+inside_blocks = np.arange(1, n_weeks) % block != 0
+consecutive = (np.diff(ensemble, axis=1)[:, inside_blocks] == 1).all()
+max_shift = np.abs(ensemble - np.arange(n_weeks)).max()
+print(f"  Consecutive inside blocks: {consecutive}, max shift: {max_shift} weeks")
+
+if (n_variants != Config.ENSEMBLE_SIZE or not consecutive
+        or max_shift > Config.ENSEMBLE_WINDOW_WEEKS or (ensemble[0] != np.arange(n_weeks)).any()):
+    print("ERROR: wrong block bootstrap ensemble")
+    sys.exit(1)
+
+# Test 2: Variants are stable and keep the calendar
+print("\n[TEST 2] Variante k identique entre processus, dates conservees")
+print("-" * 70)
+
+observed = loader.load_historical_data(region_id, season_id)
+variant = loader.load_historical_data(region_id, season_id, 7)
+again = HistoricalDataLoader().load_historical_data(region_id, season_id, 7)
+
+rain = [w['precipitation_total'] for w in variant['weather']['weeks']]
+print(f"  Observed rain: {[w['precipitation_total'] for w in observed['weather']['weeks']]}")
+print(f"  Variant 7 rain: {rain}")
+
+same_dates = all(v['start_date'] == o['start_date']
+                 for v, o in zip(variant['weather']['weeks'], observed['weather']['weeks']))
+
+if variant['weather'] != again['weather'] or not same_dates or variant['smap'] is not None:
+    print("ERROR: variant should be reproducible and keep the scenario calendar")
+    sys.exit(1)
+
+# Test 3: Vectorized access to every variant
+print("\n[TEST 3] Tous les variants en une operation")
+print("-" * 70)
+
+arrays = loader.get_weekly_arrays(region_id, season_id)
+totals = arrays['precipitation_total'][ensemble].sum(axis=1)
+print(f"  Season rain: observed {totals[0]:.1f} mm, "
+      f"ensemble 10-90%: {np.percentile(totals, 10):.1f}-{np.percentile(totals, 90):.1f} mm")
+
+if totals.shape != (n_variants,) or abs(totals[7] - sum(rain)) > 1e-6:
+    print("ERROR: array view disagrees with the variant weeks")
+    sys.exit(1)
+
+# Test 4: /api/init with a variant
+print("\n[TEST 4] /api/init avec variant")
+print("-" * 70)
+
+from app import app
+
+client = app.test_client()
+body = {'lat': 10.6, 'lon': 14.3, 'crop_type': 'sorghum', 'region_id': region_id, 'season_id': season_id}
+response = client.post('/api/init', json=dict(body, variant=7))
+preview = [w['temperature'] for w in response.get_json()['weather_preview']]
+expected = [w['temperature_avg'] for w in variant['weather']['weeks'][:4]]
+print(f"  Variant 7 preview temperature: {preview} (expected {expected})")
+invalid = client.post('/api/init', json=dict(body, variant=Config.ENSEMBLE_SIZE))
+boolean = client.post('/api/init', json=dict(body, variant=True))
+print(f"  Out of range variant: HTTP {invalid.status_code}, boolean variant: HTTP {boolean.status_code}")
+
+if response.status_code != 200 or preview != expected or invalid.status_code != 400 or boolean.status_code != 400:
+    print("ERROR: /api/init should serve the requested variant")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: Weather ensembles")
+print("=" * 70)
@@ -0,0 +1,88 @@
+"""
+Test generateur meteo stochastique
+Chaine de Markov sec/humide, pluie gamma, temperature/humidite correlees
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from services.weather_generator import WeatherGenerator
+from services.historical_data_loader import HistoricalDataLoader
+from services.nasa_power_api import NASAPowerAPI
+
+print("=" * 70)
+print("TEST GENERATEUR METEO")
+print("=" * 70)
+
+# Test 1: Reproducible from a seed
+print("\n[TEST 1] Meme graine, meme meteo")
+print("-" * 70)
+
+api = NASAPowerAPI()
+first = api._get_fallback_weekly_data(12, 3.87)
+second = api._get_fallback_weekly_data(12, 3.87)
+other = api._get_fallback_weekly_data(12, 3.87, seed=7)
+print(f"  Week 1: {first[0]}")
+
+if first != second or first == other or len(first) != 12:
+    print("ERROR: fallback weather should depend only on the seed")
+    sys.exit(1)
+
+# Test 2: Profile statistics over many seasons
+print("\n[TEST 2] Statistiques du profil tropical (5000 saisons)")
+print("-" * 70)
+
+generator = WeatherGenerator.for_profile('tropical')
+params = generator.params
+
+start = time.perf_counter()
+daily = generator.generate(5000, 84, seed=1)
+elapsed = time.perf_counter() - start
+
+wet = daily['precipitation'] > 0
+wet_fraction = wet.mean()
+wet_day_mean = daily['precipitation'][wet].mean()
+persistence = wet[:, 1:][wet[:, :-1]].mean() - wet[:, 1:][~wet[:, :-1]].mean()
+dry = ~wet
+corr = np.corrcoef(daily['temperature'][dry], daily['humidity'][dry])[0, 1]
+
+print(f"  Generated in {elapsed * 1000:.0f} ms")
+print(f"  Wet fraction {wet_fraction:.3f} (profile {params['wet_fraction']})")
+print(f"  Wet-day mean {wet_day_mean:.2f} mm (profile {params['wet_day_mean']})")
+print(f"  Persistence {persistence:.3f} (profile {params['persistence']})")
+print(f"  Temperature/humidity correlation {corr:.2f} (profile {params['temperature_humidity_corr']})")
+
+if (abs(wet_fraction - params['wet_fraction']) > 0.01
+        or abs(wet_day_mean - params['wet_day_mean']) > 0.2
+        or abs(persistence - params['persistence']) > 0.02
+        or abs(corr - params['temperature_humidity_corr']) > 0.05):
+    print("ERROR: generated weather does not follow the profile")
+    sys.exit(1)
+
+# Test 3: Fitted to a historical weather.json
+print("\n[TEST 3] Ajuste sur weather.json (Yaounde)")
+print("-" * 70)
+
+loader = HistoricalDataLoader()
+fitted = loader.get_weather_generator('yaounde_cameroun', 'spring_2024')
+weeks = loader.load_historical_data('yaounde_cameroun', 'spring_2024')['weather']['weeks']
+weekly = WeatherGenerator.aggregate_weekly(fitted.generate(5000, len(weeks) * 7, seed=2), len(weeks))
+
+for key, source in (('precipitation', 'precipitation_total'), ('temperature', 'temperature_avg'),
+                    ('humidity', 'humidity_avg')):
+    observed = np.mean([w[source] for w in weeks])
+    generated = weekly[key].mean()
+    print(f"  {key}: observed {observed:.2f}, generated {generated:.2f}")
+
+    if abs(generated - observed) > 0.02 * max(abs(observed), 1):
+        print(f"ERROR: fitted generator does not reproduce the observed {key}")
+        sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: Weather generator")
+print("=" * 70)
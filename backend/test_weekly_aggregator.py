@@ -0,0 +1,116 @@
+"""
+Test agregation hebdomadaire par sommes cumulees
+Debut de saison arbitraire (date de semis), plusieurs debuts en un appel
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from services.nasa_power_api import NASAPowerAPI
+from services.weekly_aggregator import WeeklyAggregator
+
+print("=" * 70)
+print("TEST AGREGATION HEBDOMADAIRE")
+print("=" * 70)
+
+rng = np.random.default_rng(3)
+first_day = datetime(2024, 1, 1)
+n_days = 366
+dates = [(first_day + timedelta(days=i)).strftime('%Y%m%d') for i in range(n_days)]
+daily = [{
+    'date': date,
+    'temperature': float(rng.normal(25, 3)),
+    'precipitation': float(rng.gamma(0.8, 6) * (rng.random() < 0.4)),
+    'humidity': float(rng.uniform(40, 90)),
+    'evapotranspiration': float(rng.uniform(2, 6))
+} for date in dates]
+daily[40]['precipitation'] = -999.0  # POWER fill value
+
+# Test 1: Same weeks as slicing the daily list, from a sowing date
+print("\n[TEST 1] Semaines depuis une date de semis")
+print("-" * 70)
+
+api = NASAPowerAPI()
+sowing = datetime(2024, 2, 5)
+weekly = api.get_weekly_aggregates_from_daily(daily, 12, start_date=sowing)
+
+offset = (sowing - first_day).days
+errors = []
+for week in weekly:
+    days = daily[offset + (week['week'] - 1) * 7:offset + week['week'] * 7]
+    rain = [d['precipitation'] for d in days if d['precipitation'] > -999]
+    errors += [
+        abs(week['temperature'] - round(np.mean([d['temperature'] for d in days]), 1)),
+        abs(week['precipitation'] - round(np.mean(rain) * 7, 1)),  # missing day = average day
+        abs(week['evapotranspiration'] - round(sum(d['evapotranspiration'] for d in days), 1))
+    ]
+print(f"  Week 1 from {sowing.date()}: {weekly[0]}")
+print(f"  {len(weekly)} weeks, max difference vs. slicing: {max(errors):.3f}")
+
+if len(weekly) != 12 or max(errors) > 0.051:
+    print("ERROR: weekly aggregates differ from the daily data")
+    sys.exit(1)
+
+# Test 2: Min/max over any window (sparse table)
+print("\n[TEST 2] Min/max sur fenetres quelconques")
+print("-" * 70)
+
+aggregator = WeeklyAggregator.from_records(daily, NASAPowerAPI.DAILY_FIELDS, fill_value=-999.0)
+temperature = np.array([d['temperature'] for d in daily])
+starts = rng.integers(0, n_days, 500)
+ends = starts + rng.integers(1, 60, 500)
+expected_max = np.array([temperature[s:e].max() for s, e in zip(starts, ends)])
+expected_min = np.array([temperature[s:e].min() for s, e in zip(starts, ends)])
+
+if (np.abs(aggregator.window('temperature', starts, ends, 'max') - expected_max).max() > 1e-9
+        or np.abs(aggregator.window('temperature', starts, ends, 'min') - expected_min).max() > 1e-9):
+    print("ERROR: wrong window min/max")
+    sys.exit(1)
+print("  500 random windows match")
+
+# Test 3: Every sowing date of the year at once
+print("\n[TEST 3] Toutes les dates de semis en un appel")
+print("-" * 70)
+
+start = time.perf_counter()
+seasons = aggregator.weekly({'rain': ('precipitation', 'sum'), 'rain_mean': ('precipitation', 'mean'),
+                             'tmax': ('temperature', 'max')},
+                            start=list(range(n_days - 84)), weeks=12, partial=False)
+elapsed = time.perf_counter() - start
+print(f"  {seasons['rain'].shape[0]} start days x 12 weeks in {elapsed * 1000:.1f} ms")
+
+if seasons['rain'].shape != (n_days - 84, 12) or np.isnan(seasons['rain']).any():
+    print("ERROR: wrong multi-start aggregation")
+    sys.exit(1)
+
+if abs((seasons['rain_mean'][offset] * 7).round(1) - [w['precipitation'] for w in weekly]).max() > 0.051:
+    print("ERROR: multi-start row differs from the single-start weeks")
+    sys.exit(1)
+
+# Test 4: A week without any valid day keeps its calendar number, filled and flagged
+print("\n[TEST 4] Semaine sans donnee valide")
+print("-" * 70)
+
+gap = [dict(day) for day in daily[offset:offset + 84]]
+for day in gap[21:28]:  # week 4
+    day.update({field: -999.0 for field in NASAPowerAPI.DAILY_FIELDS})
+filled = api.get_weekly_aggregates_from_daily(gap, 12)
+week_4 = filled[3]
+print(f"  Weeks {[w['week'] for w in filled]}, week 4 T {week_4['temperature']} "
+      f"(weeks 3/5: {filled[2]['temperature']}/{filled[4]['temperature']}), completeness {week_4['completeness']}")
+
+if ([w['week'] for w in filled] != list(range(1, 13)) or week_4['completeness'] != 0 or week_4['complete']
+        or abs(week_4['temperature'] - (filled[2]['temperature'] + filled[4]['temperature']) / 2) > 0.051
+        or filled[4]['temperature'] != weekly[4]['temperature']):
+    print("ERROR: an empty week should be interpolated in place, not dropped")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("SUCCESS: Weekly aggregation")
+print("=" * 70)
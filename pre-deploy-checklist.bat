@@ -75,7 +75,18 @@ if exist ".gitignore" (
     echo   [WARNING] .gitignore not found
 )
 
-REM Check 6: Documentation
+REM Check 6: Bundled grids built at deploy time
+echo.
+echo Checking bundled grids build step...
+findstr /C:"fetch_static_data.py" render.yaml >nul
+if %errorlevel% equ 0 (
+    echo   [OK] render.yaml builds the bundled grids
+) else (
+    echo   [ERROR] render.yaml does not run scripts\fetch_static_data.py
+    exit /b 1
+)
+
+REM Check 7: Documentation
 echo.
 echo Checking documentation...
 if exist "DEPLOYMENT.md" (
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Script pour précalculer la climatologie multi-annuelle de chaque cellule du weather store
+À lancer après fetch_weather_bulk.py sur plusieurs années (Config.CLIMATOLOGY_MIN_YEARS minimum)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from config import Config
+from services.climatology import ClimatologyStore
+from services.weather_store import WeatherStore
+
+
+def main():
+    weather_store = WeatherStore(Config.WEATHER_STORE_DIR)
+    climatology = ClimatologyStore(Config.CLIMATOLOGY_DIR, weather_store)
+    cells = weather_store.list_cells()
+
+    print("=" * 60)
+    print(f"CLIMATOLOGIE: {len(cells)} cellules du weather store")
+    print("=" * 60)
+
+    built = climatology.build_all()
+
+    for row, col in built:
+        lat, lon = weather_store.cell_center(row, col)
+        summary = climatology.summary(lat, lon)
+        print(f"  ({lat:.2f}, {lon:.2f}) {climatology.climate_label(summary)}: "
+              f"{summary['avg_temp']}°C, {summary['annual_rain']} mm/an, {summary['typical_events']}")
+
+    print("\n" + "=" * 60)
+    print(f"TERMINE: {len(built)} climatologies, {len(cells) - len(built)} cellules sans assez d'années")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Script pour générer la grille Köppen-Geiger embarquée (uint8, memory-mapped au démarrage)
+Source: table ASCII "Lat Lon Cls" (Kottek et al. 2006, 0.5°) et/ou climatologies du weather store
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from config import Config
+from services.climatology import ClimatologyStore
+from services.koppen import KOPPEN_CODES, KOPPEN_INDEX, KoppenRaster
+from services.weather_store import WeatherStore
+
+
+def load_ascii(path):
+    """
+    Lit la table Kottek et al.: une ligne d'en-tête puis "lat lon classe" par cellule
+    """
+    lats, lons, codes = [], [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        next(f)
+        for line in f:
+            fields = line.split()
+            if len(fields) == 3:
+                lats.append(float(fields[0]))
+                lons.append(float(fields[1]))
+                codes.append(fields[2])
+    return lats, lons, codes
+
+
+def load_climatology():
+    """
+    Classe Köppen de chaque cellule du weather store ayant une climatologie
+    """
+    weather_store = WeatherStore(Config.WEATHER_STORE_DIR)
+    climatology = ClimatologyStore(Config.CLIMATOLOGY_DIR, weather_store)
+
+    lats, lons, codes = [], [], []
+    for row, col in weather_store.list_cells():
+        lat, lon = weather_store.cell_center(row, col)
+        summary = climatology.summary(lat, lon)
+        if summary is not None:
+            lats.append(lat)
+            lons.append(lon)
+            codes.append(summary['koppen'])
+    return lats, lons, codes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the bundled Köppen-Geiger raster")
+    parser.add_argument('--ascii', help="Kottek et al. table (Koeppen-Geiger-ASCII.txt)")
+    parser.add_argument('--climatology', action='store_true',
+                        help="Classify the built climatology cells (fills cells the table leaves empty)")
+    parser.add_argument('--resolution', type=float, default=0.5, help="Cell size in degrees")
+    parser.add_argument('--output', default=Config.KOPPEN_RASTER_FILE)
+    args = parser.parse_args()
+
+    if not args.ascii and not args.climatology:
+        parser.error("give --ascii and/or --climatology")
+
+    grid = np.zeros((int(round(180 / args.resolution)), int(round(360 / args.resolution))), dtype=np.uint8)
+    sources = []
+    if args.ascii:
+        sources.append(load_ascii(args.ascii))
+    if args.climatology:
+        sources.append(load_climatology())
+
+    for lats, lons, codes in sources:
+        layer = KoppenRaster.from_points(lats, lons, codes, args.resolution)
+        grid = np.where(grid == 0, layer, grid)
+
+    KoppenRaster(args.output).save(grid)
+
+    counts = np.bincount(grid.ravel(), minlength=len(KOPPEN_CODES))
+    print("=" * 60)
+    print(f"KÖPPEN: {grid.shape[0]} x {grid.shape[1]} cellules -> {args.output}")
+    print("=" * 60)
+    for code, index in sorted(KOPPEN_INDEX.items(), key=lambda item: item[1]):
+        if counts[index] and KOPPEN_CODES[index] == code:
+            print(f"  {code:4s} {counts[index]:8d} cellules")
+    print(f"\nTERMINE: {int((grid > 0).sum())} cellules terrestres classées")
+
+
+if __name__ == "__main__":
+    main()
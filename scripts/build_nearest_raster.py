@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Script pour précalculer la grille mondiale du scénario / de la région populaire le plus proche
+Relancer après l'ajout de localisations: seules les cellules gagnées par les nouveaux points changent
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from config import Config
+from services.data_provider import DataProvider
+
+
+def main():
+    provider = DataProvider()
+    raster = provider.nearest_raster
+
+    print("=" * 60)
+    print(f"GRILLE DU PLUS PROCHE: {raster.rows} x {raster.cols} cellules ({Config.NEAREST_RASTER_RESOLUTION}°)")
+    print("=" * 60)
+
+    started = time.monotonic()
+    changes = provider.sync_nearest_raster()
+
+    for layer, change in sorted(changes.items()):
+        print(f"  {layer:30s} {len(raster.catalog[layer]):5d} points  {change}")
+
+    print("\n" + "=" * 60)
+    print(f"TERMINE en {time.monotonic() - started:.1f}s: {raster.prefix}.*")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Script pour générer la grille de sols embarquée (uint8, memory-mapped au démarrage)
+Source: table "lat lon sable argile [cc pf]" exportée d'un jeu global (SoilGrids, HWSD),
+ou GeoTIFF SoilGrids agrégés (sable, argile en g/kg, EPSG:4326), sous-échantillonnés
+par moyenne des points de chaque cellule
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from config import Config
+from services.soil_grid import SOIL_CLASSES, SoilGrid
+
+
+def load_table(path):
+    """
+    Lit la table: une ligne d'en-tête puis "lat lon sable% argile%" par point,
+    avec en option capacité au champ et point de flétrissement (m3/m3)
+    """
+    table = np.loadtxt(path, skiprows=1, ndmin=2)
+    if table.shape[1] not in (4, 6):
+        raise ValueError(f"{path}: expected 4 or 6 columns, got {table.shape[1]}")
+
+    lats, lons, sand, clay = table[:, 0], table[:, 1], table[:, 2], table[:, 3]
+    valid = (sand >= 0) & (clay >= 0) & (sand + clay <= 100)  # drops no-data fill values
+    retention = (table[valid, 4], table[valid, 5]) if table.shape[1] == 6 else (None, None)
+    return lats[valid], lons[valid], sand[valid], clay[valid], retention
+
+
+def load_soilgrids(sand_path, clay_path, resolution, samples=5):
+    """
+    Lit une paire de GeoTIFF SoilGrids (g/kg, grille lat/lon) en points "lat lon sable% argile%",
+    environ samples x samples points par cellule de la grille de sortie
+    """
+    import tifffile  # build-time only (scripts/requirements.txt)
+
+    layers = []
+    for path in (sand_path, clay_path):
+        with tifffile.TiffFile(path) as tif:
+            page = tif.pages[0]
+            scale = page.tags['ModelPixelScaleTag'].value
+            tie = page.tags['ModelTiepointTag'].value
+            nodata = page.tags.get('GDAL_NODATA')
+            values = page.asarray().astype(float)
+        if not 0 < scale[0] < 1:
+            raise ValueError(f"{path}: expected a lat/lon (EPSG:4326) GeoTIFF, pixel size {scale[0]}")
+        if nodata is not None:
+            values[values == float(str(nodata.value).strip('\x00 '))] = np.nan
+        layers.append(values)
+
+    stride = max(1, int(resolution / scale[0] / samples))
+    sand, clay = (values[stride // 2::stride, stride // 2::stride] for values in layers)
+    rows, cols = np.meshgrid(np.arange(sand.shape[0]) * stride + stride // 2,
+                             np.arange(sand.shape[1]) * stride + stride // 2, indexing='ij')
+    lats = tie[4] - (rows - tie[1] + 0.5) * scale[1]
+    lons = tie[3] + (cols - tie[0] + 0.5) * scale[0]
+
+    valid = np.isfinite(sand) & np.isfinite(clay) & (sand >= 0) & (clay >= 0) & (sand + clay > 0) \
+        & (sand + clay <= 1000)
+    return lats[valid], lons[valid], sand[valid] / 10, clay[valid] / 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the bundled soil texture grid")
+    parser.add_argument('table', nargs='?', help="Point table: lat lon sand clay [field_capacity wilting_point]")
+    parser.add_argument('--soilgrids', nargs=2, metavar=('SAND_TIF', 'CLAY_TIF'),
+                        help="SoilGrids GeoTIFFs (g/kg, EPSG:4326) instead of a point table")
+    parser.add_argument('--resolution', type=float, default=0.5, help="Cell size in degrees")
+    parser.add_argument('--output', default=Config.SOIL_GRID_FILE)
+    args = parser.parse_args()
+
+    if bool(args.table) == bool(args.soilgrids):
+        parser.error("give a point table or --soilgrids")
+    if args.soilgrids:
+        lats, lons, sand, clay = load_soilgrids(*args.soilgrids, args.resolution)
+        field_capacity = wilting_point = None
+    else:
+        lats, lons, sand, clay, (field_capacity, wilting_point) = load_table(args.table)
+    grid = SoilGrid.from_points(lats, lons, sand, clay, args.resolution, field_capacity, wilting_point)
+    SoilGrid(args.output).save(grid)
+
+    counts = np.bincount(grid[0].ravel(), minlength=len(SOIL_CLASSES))
+    print("=" * 60)
+    print(f"SOLS: {len(lats)} points -> {grid.shape[1]} x {grid.shape[2]} cellules "
+          f"({grid.nbytes / 1e6:.1f} MB) -> {args.output}")
+    print("=" * 60)
+    for index, soil in enumerate(SOIL_CLASSES):
+        if soil:
+            print(f"  {soil:6s} {counts[index]:8d} cellules")
+    print(f"\nTERMINE: {int((grid[0] > 0).sum())} cellules terrestres")
+
+
+if __name__ == "__main__":
+    main()
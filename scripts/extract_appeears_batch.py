@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Script pour extraire NDVI/EVI AppEEARS pour toutes les régions en quelques tâches
+Reprend les tâches déjà soumises après une interruption
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from config import Config
+from services.appeears_api import AppEEARSAPI
+from services.appeears_orchestrator import AppEEARSOrchestrator
+from services.historical_data_loader import HistoricalDataLoader
+
+
+DEFAULT_LAYERS = [
+    {'product': 'MOD13Q1.061', 'layer': '_250m_16_days_NDVI'},
+    {'product': 'MOD13Q1.061', 'layer': '_250m_16_days_EVI'}
+]
+
+
+def load_locations():
+    """Scénarios historiques + régions populaires"""
+    locations = [{'id': s['region_id'], 'lat': s['lat'], 'lon': s['lon']}
+                 for s in HistoricalDataLoader().get_available_scenarios()]
+    locations += [{'id': key, 'lat': r['lat'], 'lon': r['lon']} for key, r in Config.POPULAR_REGIONS.items()]
+    return locations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch AppEEARS point extraction for all regions")
+    parser.add_argument('--start', required=True, help="Start date MM-DD-YYYY")
+    parser.add_argument('--end', required=True, help="End date MM-DD-YYYY")
+    parser.add_argument('--name', default='terragrow_regions', help="Task name prefix")
+    parser.add_argument('--max-wait', type=float, default=3600, help="Max polling time (s)")
+    args = parser.parse_args()
+
+    username = os.environ.get('EARTHDATA_USERNAME')
+    password = os.environ.get('EARTHDATA_PASSWORD')
+    if not username or not password:
+        print("❌ EARTHDATA_USERNAME et EARTHDATA_PASSWORD requis")
+        sys.exit(1)
+
+    api = AppEEARSAPI()
+    if not api.login(username, password):
+        sys.exit(1)
+
+    orchestrator = AppEEARSOrchestrator(
+        api, Config.APPEEARS_STATE_FILE, Config.APPEEARS_OUTPUT_DIR,
+        max_coordinates=Config.APPEEARS_MAX_COORDINATES,
+        download_workers=Config.APPEEARS_DOWNLOAD_WORKERS,
+        poll_min=Config.APPEEARS_POLL_MIN,
+        poll_max=Config.APPEEARS_POLL_MAX
+    )
+
+    locations = load_locations()
+
+    print("=" * 60)
+    print(f"APPEEARS: {len(locations)} localisations")
+    print("=" * 60)
+
+    result = orchestrator.run(args.name, locations, args.start, args.end, DEFAULT_LAYERS, max_wait=args.max_wait)
+
+    print("\n" + "=" * 60)
+    if result['complete']:
+        print(f"TERMINE: {len(result['tasks'])} tâches, {len(result['files'])} fichiers")
+    else:
+        print("INCOMPLET: relancer la même commande pour reprendre")
+    print("=" * 60)
+
+    if not result['complete']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Script de déploiement: télécharge les sources et génère les grilles embarquées
+qui ne sont pas versionnées (Köppen-Geiger, sols). Lancé par le buildCommand de render.yaml.
+Une source injoignable n'arrête pas le build (l'application garde ses replis), sauf avec --strict
+"""
+
+import argparse
+import os
+import sys
+import zipfile
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from config import Config
+from services.koppen import KoppenRaster
+from services.soil_grid import SoilGrid
+from build_koppen_raster import load_ascii
+from build_soil_grid import load_soilgrids
+
+# Kottek et al. (2006), Köppen-Geiger 1951-2000, 0.5° ASCII table
+KOTTEK_ASCII_URL = "https://koeppen-geiger.vu-wien.ac.at/data/Koeppen-Geiger-ASCII.zip"
+
+# SoilGrids 2.0 aggregated to 5 km (EPSG:4326), 5-15 cm, g/kg
+SOILGRIDS_URL = "https://files.isric.org/soilgrids/latest/data_aggregated/5000m/{0}/{0}_5-15cm_mean_5000.tif"
+
+SOURCE_DIR = os.path.join(Config.CACHE_DIR, 'static')
+
+
+def download(url, file_name):
+    """Télécharge une source dans SOURCE_DIR (par blocs)"""
+    print(f"  Telechargement {url}")
+    os.makedirs(SOURCE_DIR, exist_ok=True)
+    path = os.path.join(SOURCE_DIR, file_name)
+    with requests.get(url, stream=True, timeout=300) as response:
+        response.raise_for_status()
+        with open(path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+    return path
+
+
+def build_koppen(args):
+    """Grille Köppen-Geiger depuis la table ASCII de Kottek et al."""
+    archive = zipfile.ZipFile(download(args.koppen_url, 'koppen_ascii.zip'))
+    member = next(name for name in archive.namelist() if name.lower().endswith('.txt'))
+    path = archive.extract(member, SOURCE_DIR)
+
+    grid = KoppenRaster.from_points(*load_ascii(path), args.resolution)
+    KoppenRaster(Config.KOPPEN_RASTER_FILE).save(grid)
+    return f"{int((grid > 0).sum())} cellules classees"
+
+
+def build_soil(args):
+    """Grille de sols depuis les GeoTIFF SoilGrids (sable, argile)"""
+    sand_path, clay_path = (download(args.soilgrids_url.format(name), f"{name}.tif") for name in ('sand', 'clay'))
+    grid = SoilGrid.from_points(*load_soilgrids(sand_path, clay_path, args.resolution), args.resolution)
+    SoilGrid(Config.SOIL_GRID_FILE).save(grid)
+    return f"{int((grid[0] > 0).sum())} cellules terrestres"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download sources and build the bundled grids at deploy time")
+    parser.add_argument('--koppen-url', default=KOTTEK_ASCII_URL)
+    parser.add_argument('--soilgrids-url', default=SOILGRIDS_URL, help="URL pattern, {0} = sand or clay")
+    parser.add_argument('--resolution', type=float, default=0.5, help="Cell size in degrees")
+    parser.add_argument('--force', action='store_true', help="Rebuild grids that already exist")
+    parser.add_argument('--strict', action='store_true', help="Fail the build when a source cannot be built")
+    args = parser.parse_args()
+
+    steps = [('KOPPEN', Config.KOPPEN_RASTER_FILE, build_koppen),
+             ('SOLS', Config.SOIL_GRID_FILE, build_soil)]
+
+    failed = 0
+    print("=" * 60)
+    print("GRILLES EMBARQUEES")
+    print("=" * 60)
+    for name, path, build in steps:
+        if os.path.exists(path) and not args.force:
+            print(f"[{name}] deja present: {path}")
+            continue
+        try:
+            print(f"[{name}] {build(args)} -> {path}")
+        except Exception as e:
+            failed += 1
+            print(f"[{name}] ERREUR: {e} (repli de l'application conserve)")
+
+    print(f"\nTERMINE: {len(steps) - failed}/{len(steps)} grilles disponibles")
+    if failed and args.strict:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Script pour remplir le weather store local avec NASA POWER en masse
+Regroupe les localisations en requêtes régionales ou multi-paramètres
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from config import Config
+from services.historical_data_loader import HistoricalDataLoader
+from services.nasa_power_bulk import NASAPowerBulkFetcher
+from services.weather_store import WeatherStore
+
+
+def load_points(points_file=None):
+    """
+    Charge les localisations: fichier JSON [[lat, lon], ...] ou scénarios + régions populaires
+    """
+    if points_file:
+        with open(points_file, 'r', encoding='utf-8') as f:
+            return [tuple(p) for p in json.load(f)]
+
+    points = [(s['lat'], s['lon']) for s in HistoricalDataLoader().get_available_scenarios()]
+    points += [(r['lat'], r['lon']) for r in Config.POPULAR_REGIONS.values()]
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk NASA POWER fetch into the local weather store")
+    parser.add_argument('--start', required=True, help="Start date YYYYMMDD")
+    parser.add_argument('--end', required=True, help="End date YYYYMMDD")
+    parser.add_argument('--points', help="JSON file with [[lat, lon], ...] (default: scenarios + popular regions)")
+    parser.add_argument('--dry-run', action='store_true', help="Only print the request plan")
+    args = parser.parse_args()
+
+    fetcher = NASAPowerBulkFetcher(
+        WeatherStore(Config.WEATHER_STORE_DIR),
+        NASAPowerBulkFetcher.load_parameters(Config.POWER_PARAMS_FILE),
+        point_url=Config.NASA_POWER_API_URL,
+        regional_url=Config.NASA_POWER_REGIONAL_API_URL,
+        regional_max_params=Config.POWER_REGIONAL_MAX_PARAMS,
+        point_max_params=Config.POWER_POINT_MAX_PARAMS,
+        request_interval=Config.POWER_REQUEST_INTERVAL
+    )
+
+    points = load_points(args.points)
+    plan = fetcher.plan(points)
+
+    print("=" * 60)
+    print(f"BULK NASA POWER: {len(points)} localisations -> {len(plan)} requêtes")
+    print("=" * 60)
+
+    if args.dry_run:
+        for request in plan:
+            target = request.get('bbox') or (request['lat'], request['lon'])
+            print(f"  {request['type']:8s} {target} {','.join(request['parameters'])}")
+        return
+
+    summary = fetcher.fetch(points, args.start, args.end)
+
+    print("\n" + "=" * 60)
+    print(f"TERMINE: {summary['cells']} cellules, {summary['requests']} requêtes "
+          f"({summary['failed_requests']} échecs)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
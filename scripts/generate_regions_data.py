@@ -7,9 +7,18 @@ Script pour générer les données des 15 régions populaires
 import requests
 import json
 import os
+import sys
 from datetime import datetime, timedelta
 import time
 
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.evapotranspiration import et0_from_columns
+from services.power_cleaning import OBSERVED, clean_power, worst_quality
+from services.weekly_aggregator import WeeklyAggregator
+
 # Configuration
 REGIONS = {
     'yaounde_cameroun': {
@@ -124,14 +133,14 @@ def get_nasa_power_data(lat, lon, days=90):
     """
     Récupère les données NASA POWER pour une localisation
     """
-    url = "https://power.larc.nasa.gov/api/temporal/daily/point"
+    url = os.environ.get('NASA_POWER_API_URL') or "https://power.larc.nasa.gov/api/temporal/daily/point"
 
     # Date range (derniers 90 jours)
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
 
     params = {
-        "parameters": "T2M,PRECTOTCORR,RH2M",
+        "parameters": "T2M,T2M_MAX,T2M_MIN,PRECTOTCORR,RH2M,WS2M,ALLSKY_SFC_SW_DWN",
         "community": "AG",
         "longitude": lon,
         "latitude": lat,
@@ -159,39 +168,50 @@ def get_nasa_power_data(lat, lon, days=90):
         return None
 
 
-def aggregate_weekly(daily_data):
+def aggregate_weekly(daily_data, lat, start_date=None, weeks=12):
     """
-    Agrège les données quotidiennes en données hebdomadaires
+    Agrège les données quotidiennes en données hebdomadaires (semaines complètes)
+    Valeurs -999 masquées, trous courts interpolés, climatologie pour les longs
+    ET0 FAO-56 Penman-Monteith (Hargreaves si le rayonnement manque)
+    start_date: premier jour de la semaine 1 (ex: date de semis), défaut = premier jour reçu
     """
-    temps = daily_data.get('T2M', {})
-    precip = daily_data.get('PRECTOTCORR', {})
-    humidity = daily_data.get('RH2M', {})
-
-    dates = sorted(temps.keys())
-
-    weekly = []
-    for i in range(0, len(dates), 7):
-        week_dates = dates[i:i+7]
+    cleaned = clean_power(daily_data)
+    arrays = cleaned['arrays']
+    missing = np.full(len(cleaned['dates']), np.nan)
+
+    columns = {
+        'temperature': arrays.get('T2M', missing),
+        'precipitation': arrays.get('PRECTOTCORR', missing),
+        'humidity': arrays.get('RH2M', missing)
+    }
 
-        if len(week_dates) < 7:
-            continue
+    # ET0 journalière, formule simplifiée les jours incomplets
+    et0 = et0_from_columns(arrays, lat, cleaned['day_of_year'])
+    simplified = 0.0023 * (columns['temperature'] + 17.8) * (100 - columns['humidity']) / 10
+    columns['evapotranspiration'] = np.where(np.isfinite(et0), et0, simplified)
 
-        avg_temp = sum(temps[d] for d in week_dates) / len(week_dates)
-        total_rain = sum(precip[d] for d in week_dates)
-        avg_humidity = sum(humidity[d] for d in week_dates) / len(week_dates)
+    # Part des jours réellement observés (ni interpolés ni climatologie)
+    columns['observed'] = (worst_quality(cleaned['quality'], ('T2M', 'PRECTOTCORR', 'RH2M')) == OBSERVED).astype(float)
 
-        # Calculer ET simplifié
-        et = 0.0023 * (avg_temp + 17.8) * (100 - avg_humidity) / 10 * 7
+    aggregator = WeeklyAggregator(columns, cleaned['dates'])
+    stats = aggregator.weekly({
+        'temperature': ('temperature', 'mean'),
+        'precipitation': ('precipitation', 'sum'),
+        'humidity': ('humidity', 'mean'),
+        'evapotranspiration': ('evapotranspiration', 'sum'),
+        'completeness': ('observed', 'mean')
+    }, start=start_date, weeks=weeks, partial=False)
 
-        weekly.append({
-            'week': len(weekly) + 1,
-            'temperature': round(avg_temp, 1),
-            'precipitation': round(total_rain, 1),
-            'humidity': round(avg_humidity, 1),
-            'evapotranspiration': round(et, 1)
-        })
+    weekly = []
+    for i in range(weeks):
+        week = {key: round(float(values[i]), 1) for key, values in stats.items() if key != 'completeness'}
+        if any(np.isnan(value) for value in week.values()):
+            continue
+        week['completeness'] = round(float(stats['completeness'][i]), 2)
+        week['complete'] = week['completeness'] == 1.0
+        weekly.append(dict(week=len(weekly) + 1, **week))
 
-    return weekly[:12]  # Limiter à 12 semaines
+    return weekly
 
 
 def generate_region_file(region_id, region_info):
@@ -211,7 +231,7 @@ def generate_region_file(region_id, region_info):
         return False
 
     # Agréger en semaines
-    weekly_data = aggregate_weekly(daily_data)
+    weekly_data = aggregate_weekly(daily_data, region_info['lat'])
 
     print(f"  [OK] {len(weekly_data)} semaines de données générées")
 